@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import os
 import sys
-from pathlib import Path
 import streamlit as st
 from ui.theme import inject_theme
+from senior_nav import navigation, page_manifest
+from senior_nav.lib import session_store
 
 # ✅ Always set page config first
 st.set_page_config(page_title="Senior Navigator", layout="wide")
@@ -33,24 +34,16 @@ inject_theme()
 # ------------------------------------------
 # Preflight check (safe now that session is up)
 # ------------------------------------------
-def _syntax_preflight(paths=("app_pages",), stop_on_error=True):  # 🔁 updated folder name
-    import pathlib, io, tokenize
-    errors = []
-    for root in paths:
-        for p in pathlib.Path(root).rglob("*.py"):
-            try:
-                src = p.read_text(encoding="utf-8")
-                tokenize.generate_tokens(io.StringIO(src).readline)
-                compile(src, str(p), "exec", dont_inherit=True)
-            except SyntaxError as e:
-                errors.append((p, e.lineno or 0, e.offset or 0, e.msg, e.text or ""))
-            except Exception as e:
-                errors.append((p, 0, 0, f"{type(e).__name__}: {e}", ""))
+def _syntax_preflight(stop_on_error=True):
+    # Pages are validated once by tools/build_page_manifest.py; here we only
+    # re-compile files whose content hash differs from the manifest.
+    errors = page_manifest.preflight_errors()
     if errors:
         st.error("Syntax/parse error(s) found. Fix these before running pages.")
-        for p, line, col, msg, txt in errors:
+        for rec in errors:
+            line, col, msg, txt = rec.line, rec.col, rec.msg, rec.text
             pointer = " " * (max((col or 1) - 1, 0)) + "^" if txt else ""
-            st.write(f"**{p}**")
+            st.write(f"**{rec.path}**")
             st.code(f"line {line}, col {col}: {msg}\n{(txt or '').rstrip()}\n{pointer}")
             st.markdown("---")
         if stop_on_error:
@@ -62,83 +55,33 @@ _syntax_preflight()
 # Session bootstrap
 # ------------------------------------------
 st.session_state.setdefault("is_authenticated", False)
+# Restore saved buckets (no-op unless SENIOR_NAV_SESSION_STORE is configured).
+session_store.rehydrate()
 
 # ------------------------------------------
-# Page builder
+# Page registry (resolved once per process; see senior_nav/navigation.py)
 # ------------------------------------------
-def ensure_page(path: str, title: str, icon: str, default: bool = False):
-    p = Path(path)
-    if not p.exists():
-        return None
-    return st.Page(path, title=title, icon=icon, default=default)
-
-# 🔁 Rename your folder from `pages/` ➜ `app_pages/` and update paths here
-INTENDED = [
-    ("app_pages/welcome.py", "Welcome", "👋", True),
-
-    # Home & Welcome
-    ("app_pages/SeniorNav_welcome_self.py", "Welcome · For You", "🙂", False),
-    ("app_pages/SeniorNav_welcome_someone_else.py", "Welcome · Someone Else", "👥", False),
-    ("app_pages/SeniorNav_welcome_professional.py", "Welcome · Professional", "🩺", False),
-    ("app_pages/about_us.py", "More About Us", "📘", False),
-    ("app_pages/professional_mode.py", "Professional Mode", "🧑", False),
-
-    # Concierge Care Hub
-    ("app_pages/hub.py", "Your Concierge Care Hub", "🏠", False),
-    ("app_pages/SeniorNav_professional_hub.py", "Professional Hub", "🧰", False),
-
-    # Guided Care Plan (V3)
-    ("app_pages/gcp_v3/gcp_intro_v3.py", "Guided Care Plan · Start (V3)", "🗺️", False),
-    ("app_pages/gcp_v3/gcp_eligibility_v3.py", "GCP · Eligibility (V3)", "✅", False),
-    ("app_pages/gcp_v3/gcp_daily_life_v3.py", "GCP · Daily Life & Support (V3)", "🧭", False),
-    ("app_pages/gcp_v3/gcp_health_safety_v3.py", "GCP · Health & Safety (V3)", "🩺", False),
-    ("app_pages/gcp_v3/gcp_results_v3.py", "GCP · Results (V3)", "📊", False),
-
-    # Cost Planner
-    ("app_pages/cost_planner_v2/cost_planner_landing_v2.py", "Cost Planner v2 · Landing", "💰", False),
-    ("app_pages/cost_planner_v2/cost_planner_modules_hub_v2.py", "Cost Planner v2 · Modules", "🧰", False),
-    ("app_pages/cost_planner_v2/cost_planner_income_v2.py", "Cost Planner v2 · Income", "🧾", False),
-    ("app_pages/cost_planner_v2/cost_planner_expenses_v2.py", "Cost Planner v2 · Expenses", "🧮", False),
-    ("app_pages/cost_planner_v2/cost_planner_benefits_v2.py", "Cost Planner v2 · Benefits", "🎖️", False),
-    ("app_pages/cost_planner_v2/cost_planner_home_v2.py", "Cost Planner v2 · Home", "🏠", False),
-    ("app_pages/cost_planner_v2/cost_planner_home_mods_v2.py", "Cost Planner v2 · Home Mods", "🔧", False),
-    ("app_pages/cost_planner_v2/cost_planner_liquidity_v2.py", "Cost Planner v2 · Liquidity", "💵", False),
-    ("app_pages/cost_planner_v2/cost_planner_caregiver_v2.py", "Cost Planner v2 · Caregiver", "👥", False),
-    ("app_pages/cost_planner_v2/cost_planner_assets_v2.py", "Cost Planner v2 · Assets", "🏦", False),
-    ("app_pages/cost_planner_v2/cost_planner_timeline_v2.py", "Cost Planner v2 · Timeline", "📈", False),
-    ("app_pages/expert_review.py", "Expert Review", "🔎", False),
-
-    # PFMA
-    ("app_pages/pfma.py", "Plan for My Advisor", "🧭", False),
-    ("app_pages/pfma_confirm_care_plan.py", "PFMA * Care Plan Confirmer", "✅", False),
-    ("app_pages/pfma_confirm_cost_plan.py", "PFMA * Cost Plan Confirmer", "💰", False),
-    ("app_pages/pfma_confirm_care_needs.py", "PFMA * Care Needs", "🩺", False),
-    ("app_pages/pfma_confirm_care_prefs.py", "PFMA * Care Preferences", "🎯", False),
-    ("app_pages/pfma_confirm_household_legal.py", "PFMA * Household & Legal", "🏠", False),
-    ("app_pages/pfma_confirm_benefits_coverage.py", "PFMA * Benefits & Coverage", "💳", False),
-    ("app_pages/pfma_confirm_personal_info.py", "PFMA * Personal Info", "👤", False),
-
-    # AI + Waiting Room
-    ("app_pages/SeniorNav_ai_advisor.py", "AI Advisor", "🤖", False),
-    ("app_pages/SeniorNav_waiting_room.py", "Waiting Room", "⏳", False),
+def _report_stale_targets():
+    stale = navigation.stale_targets()
+    if not stale or navigation.is_production():
+        return
+    with st.sidebar.expander(f"⚠️ {len(stale)} stale navigation target(s)", expanded=False):
+        for path, line, target in stale:
+            st.caption(f"{path}:{line} → {target}")
 
-    # Utilities
-    ("app_pages/SeniorNav_login.py", "Login", "🔐", False),
-    ("app_pages/SeniorNav_trusted_partners.py", "Trusted Partners", "🤝", False),
-    ("app_pages/SeniorNav_export_details.py", "Export Details", "📤", False),
-    ("app_pages/SeniorNav_my_documents.py", "My Documents", "📁", False),
-    ("app_pages/SeniorNav_my_account.py", "My Account", "👤", False),
-    ("app_pages/SeniorNav_terms.py", "Terms of Use", "📄", False),
-    ("app_pages/SeniorNav_privacy.py", "Privacy Policy", "🔒", False),
-]
+_report_stale_targets()
 
-pages = [p for (path, title, icon, default) in INTENDED if (p := ensure_page(path, title, icon, default))]
+pages = navigation.build_pages()
 
 if pages:
     nav = st.navigation(pages, position="sidebar", expanded=True)
-    nav.run()
+    try:
+        nav.run()
+    finally:
+        # Also runs on st.rerun()/st.stop(); staging is cheap and writes happen off-thread.
+        session_store.persist()
 else:
-    st.error("No pages available. Check file paths in app.py.")
+    st.error("No pages available. Check the page paths in senior_nav/page_manifest.py.")
 
 # ------------------------------------------
 # Sidebar Auth Mock (fixed indentation)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import streamlit as st
 from app_pages.seniornav_util import top_nav, safe_switch
+from senior_nav.exports import export_button
 top_nav()
 
 st.markdown("## Export Results")
@@ -20,11 +21,11 @@ c1, c2 = st.columns(2)
 with c1:
     st.markdown("#### Export Care Plan")
     st.caption("Your guided care plan: Home care + VA benefits + hearing aids.")
-    st.button("Export Care Plan", type="primary", disabled=not authed, help=None if authed else "Login required", width="stretch")
+    export_button("care_plan", "pdf", "Export Care Plan", disabled=not authed, help=None if authed else "Login required")
 with c2:
     st.markdown("#### Export Cost Summary")
     st.caption("Your budget breakdown: $1,500/month for your loved one's care.")
-    st.button("Export Cost Summary", type="primary", disabled=not authed, help=None if authed else "Login required", width="stretch")
+    export_button("cost_summary", "pdf", "Export Cost Summary", disabled=not authed, help=None if authed else "Login required")
 
 st.divider()
 if st.button("Back to Hub", width="stretch"):
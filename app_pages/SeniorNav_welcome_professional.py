@@ -1,12 +1,9 @@
 from __future__ import annotations
 
-import base64
-import mimetypes
-from pathlib import Path
-
 import streamlit as st
 
 from app_pages.seniornav_util import ensure_aud, top_nav
+from senior_nav import image_assets
 
 PRO_ROLE_OPTIONS = [
     "Discharge Planner",
@@ -24,15 +21,6 @@ def _safe_switch_page(target: str) -> None:
         st.rerun()
 
 
-def _image_payload(path: str) -> tuple[str, str] | None:
-    file_path = Path(path)
-    if not file_path.exists():
-        return None
-    mime = mimetypes.guess_type(file_path.name)[0] or "image/png"
-    data = base64.b64encode(file_path.read_bytes()).decode("ascii")
-    return data, mime
-
-
 def _render_hero_image() -> None:
     for candidate in (
         "static/images/Professional.png",
@@ -40,15 +28,18 @@ def _render_hero_image() -> None:
         "static/images/professional.jpeg",
         "static/images/contextual_welcome_professional.png",
     ):
-        payload = _image_payload(candidate)
-        if payload:
-            data, mime = payload
+        image = image_assets.get_image(candidate, profile="hero")
+        if image:
+            tag = image.img_tag(
+                alt="Professional advisor reviewing care options with a family",
+                cls="hero-photo",
+                style="width:min(420px, 100%);",
+            )
             st.markdown(
                 f"""
                 <div style="background: radial-gradient(120% 120% at 80% 10%, #eef2ff 0%, #ffffff 60%);
                             padding: 18px; border-radius: 18px;">
-                  <img src="data:{mime};base64,{data}" class="hero-photo"
-                       style="width:min(420px, 100%);" alt="Professional advisor reviewing care options with a family">
+                  {tag}
                 </div>
                 """,
                 unsafe_allow_html=True,
@@ -1,12 +1,9 @@
 from __future__ import annotations
 
-import base64
-import mimetypes
-from pathlib import Path
-
 import streamlit as st
 
 from app_pages.seniornav_util import ensure_aud, top_nav
+from senior_nav import image_assets
 
 
 def _safe_switch_page(
@@ -33,25 +30,19 @@ def _goto(path: str, *, query_key: str | None = None, query_value: str | None =
 
 
 def _render_hero(image_path: str, alt: str) -> None:
-    img_file = Path(image_path)
-    if not img_file.exists():
+    image = image_assets.get_image(image_path, profile="hero")
+    if image is None:
         st.info(f"Add image at {image_path}")
         return
-    try:
-        mime = mimetypes.guess_type(img_file.name)[0] or "image/png"
-        data = base64.b64encode(img_file.read_bytes()).decode("ascii")
-        st.markdown(
-            f"""
-            <div style="background: radial-gradient(120% 120% at 80% 10%, #eef2ff 0%, #ffffff 60%);
-                        padding: 18px; border-radius: 18px;">
-              <img src="data:{mime};base64,{data}" class="hero-photo"
-                   style="width:min(420px, 100%);" alt="{alt}">
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-    except Exception:
-        st.image(str(img_file), use_container_width=True, caption=None)
+    st.markdown(
+        f"""
+        <div style="background: radial-gradient(120% 120% at 80% 10%, #eef2ff 0%, #ffffff 60%);
+                    padding: 18px; border-radius: 18px;">
+          {image.img_tag(alt=alt, cls="hero-photo", style="width:min(420px, 100%);")}
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
 
 
 top_nav()
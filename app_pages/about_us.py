@@ -1,13 +1,8 @@
 from __future__ import annotations
 
-import base64
-import io
-import mimetypes
-from pathlib import Path
-from urllib.parse import urlparse
-
 import streamlit as st
-from PIL import Image, UnidentifiedImageError
+
+from senior_nav import image_resolver
 
 
 st.markdown('<div class="sn-scope dashboard">', unsafe_allow_html=True)
@@ -21,52 +16,9 @@ def _switch_page(target: str) -> None:
         st.rerun()
 
 
-def _resolve_path(path_str: str) -> Path:
-    cand = Path(path_str)
-    if cand.is_absolute():
-        return cand
-    here = Path(__file__).resolve().parent
-    if cand.exists():
-        return cand
-    local = here / path_str
-    if local.exists():
-        return local
-    return here.parent / path_str
-
-
-@st.cache_data(show_spinner=False)
-def _load_bytes(path_str: str) -> bytes | None:
-    try:
-        parsed = urlparse(path_str)
-        if parsed.scheme in {"http", "https"}:
-            import urllib.request
-
-            with urllib.request.urlopen(path_str, timeout=10) as resp:
-                data = resp.read()
-        else:
-            target = _resolve_path(path_str)
-            if not target.exists():
-                return None
-            data = target.read_bytes()
-        Image.open(io.BytesIO(data)).verify()
-        return data
-    except UnidentifiedImageError:
-        return None
-    except Exception:
-        return None
-
-
-def _image_tag(path_str: str, *, alt: str = "", style: str = "", cls: str = "") -> str | None:
-    raw = _load_bytes(path_str)
-    if not raw:
-        return None
-    suffix = Path(urlparse(path_str).path).suffix.lower()
-    mime = mimetypes.types_map.get(suffix, "image/png")
-    encoded = base64.b64encode(raw).decode("ascii")
-    cls_attr = f' class="{cls}"' if cls else ""
-    style_attr = f' style="{style}"' if style else ""
-    alt_attr = f' alt="{alt}"' if alt else ' alt=""'
-    return f'<img src="data:{mime};base64,{encoded}"{cls_attr}{style_attr}{alt_attr}>'
+def _image_tag(path_str: str, *, alt: str = "", style: str = "", cls: str = "", profile: str = "hero") -> str | None:
+    # Validation, caching and any remote fetch happen off the render path.
+    return image_resolver.img_html(path_str, alt=alt, style=style, cls=cls, profile=profile)
 
 
 # ---------------- Hero ----------------
@@ -197,6 +149,7 @@ with trust_cols[0]:
         "static/images/better-business-bureau-logo.png",
         alt="Better Business Bureau A+ Rating",
         style="width:160px;height:auto;display:block;margin:0 auto;",
+        profile="logo",
     )
     if bbb_tag:
         st.markdown(bbb_tag, unsafe_allow_html=True)
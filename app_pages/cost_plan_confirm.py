@@ -5,6 +5,7 @@ import json
 
 import streamlit as st
 from cost_planner_shared import ensure_core_state, format_currency, recompute_costs
+from senior_nav.lib.frozen import json_default
 from ui.cost_planner_template import (
 
 Metric,
@@ -45,7 +46,7 @@ with cost_planner_page_container():
     st.subheader("Ready to share?")
     confirm = st.checkbox("I reviewed these numbers and they reflect our plan.")
 
-    snapshot_json = json.dumps(cp["snapshot_for_crm"], indent=2).encode("utf-8")
+    snapshot_json = json.dumps(cp["snapshot_for_crm"], indent=2, default=json_default).encode("utf-8")
     st.download_button(
         "Download CRM snapshot",
         data=snapshot_json,
@@ -3,6 +3,11 @@ from __future__ import annotations
 import math
 import streamlit as st
 from ui.state import mark_complete, set_completion
+from cost_planner_v2.projection import inputs_from_state, project
+from cost_planner_v2.runway_sim import MAX_HORIZON_MONTHS, RunwayInputs, simulate_runway
+
+# Months simulated past the straight-line runway, so the likely range is not cut off at the horizon.
+RUNWAY_BUFFER_MONTHS = 24
 
 # ---------------- Theme helpers (match working Income pattern) ----------------
 try:
@@ -76,6 +81,9 @@ def _fmt_money(v: float | int) -> str:
     except Exception:
         return "$0"
 
+def _fmt_months(months, horizon: int) -> str:
+    return f"{months} months" if months is not None else f"{horizon}+ months"
+
 def goto(page: str) -> None:
     st.switch_page(f"app_pages/cost_planner_v2/{page}")
 
@@ -119,6 +127,11 @@ def render() -> None:
         # Prefer assets_total_effective; fall back to liquidity if assets missing
         effective_assets = assets_total_effective if assets_total_effective > 0 else liquidity_total
 
+        # Timeline & Scenarios answers (horizon, expected yearly cost change)
+        timeline_answers = st.session_state.get("cp_answers") or {}
+        horizon_months = int(_to_num(timeline_answers.get("tl_horizon_months"), 12)) or 12
+        cost_change_pct = _to_num(timeline_answers.get("tl_cost_change_pct"), 0)
+
         if gap <= 0:
             runway_label = "Unlimited"
             runway_detail = "Monthly income + benefits cover your monthly costs."
@@ -127,6 +140,12 @@ def render() -> None:
             runway_label = f"{months} months"
             runway_detail = "Based on current assets divided by your monthly shortfall (gap)."
 
+        # Simulate (and project) at least past the straight-line runway, up to the simulator's limit.
+        sim_horizon = horizon_months
+        if gap > 0 and effective_assets > 0:
+            sim_horizon = max(horizon_months, math.ceil(effective_assets / gap) + RUNWAY_BUFFER_MONTHS)
+        sim_horizon = min(sim_horizon, MAX_HORIZON_MONTHS)
+
         # --- Summary cards (use Streamlit containers for consistent styling) ---
         left, right = st.columns([1.05, 0.95], gap="large")
 
@@ -181,9 +200,63 @@ def render() -> None:
                 st.subheader("Runway estimate")
                 st.markdown(f"**{runway_label}**")
                 st.caption(runway_detail)
+                if gap > 0 and effective_assets > 0:
+                    bands = simulate_runway(RunwayInputs(
+                        assets=float(effective_assets),
+                        monthly_cost=float(monthly_all_in),
+                        monthly_inflows=float(inflows),
+                        horizon_months=sim_horizon,
+                        cost_change_pct=cost_change_pct,
+                    ))
+                    low, mid, high = (bands.month_at(p) for p in (10, 50, 90))
+                    span = bands.horizon_months
+                    st.markdown(
+                        f"Likely range: **{_fmt_months(low, span)} - {_fmt_months(high, span)}** "
+                        f"(typical {_fmt_months(mid, span)})"
+                    )
+                    st.caption(
+                        f"{bands.depletion_probability:.0%} chance of running out within {bands.horizon_months} months, "
+                        "across 10,000 simulated paths with cost inflation, market returns and changing care needs."
+                    )
                 if gap > 0 and (effective_assets <= 0 or (effective_assets / gap) < 24):
                     st.warning("Tight runway — consider talking to an advisor.")
 
+        # --- Month-by-month projection (memoized by inputs) ---
+        # Same inflows (income + benefits), outflows, assets and horizon as the runway above.
+        ledger = project(inputs_from_state(
+            {
+                "income": income_total,
+                "benefits": benefits_total,
+                "setting": monthly_cost,
+                "other": other_monthly_total,
+                "mods": mods_monthly_total,
+                "caregiver": caregiver_cost,
+                "assets": effective_assets,
+            },
+            months=sim_horizon,
+            cost_change_pct=cost_change_pct,
+        ))
+        with st.expander(f"Month-by-month projection ({ledger.months} months)"):
+            if ledger.depletion_month is not None:
+                st.caption(f"Assets run out in month {ledger.depletion_month} if nothing changes.")
+            else:
+                st.caption("Assets last through the whole projection.")
+            st.line_chart(ledger.chart_series)
+            st.dataframe(
+                [
+                    {
+                        "Year": row["year"],
+                        "Inflows": _fmt_money(row["inflows"]),
+                        "Outflows": _fmt_money(row["outflows"]),
+                        "Net": _fmt_money(row["net"]),
+                        "Assets (year end)": _fmt_money(row["assets"]),
+                        "Shortfall": _fmt_money(row["shortfall"]),
+                    }
+                    for row in ledger.annual_rows()
+                ],
+                hide_index=True,
+            )
+
         # --- Actions (same functionality) ---
         c1, c2 = st.columns([1, 1])
         with c1:
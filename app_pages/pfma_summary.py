@@ -2,12 +2,12 @@
 from __future__ import annotations
 
 import streamlit as st
+from senior_nav.exports import export_button
 from ui.pfma import (
 
 DRAWER_KEYS,
     DUCK_BADGES,
     apply_pfma_theme,
-    build_export_payloads,
     duck_parade,
     ensure_pfma_state,
     mark_step_complete,
@@ -81,13 +81,10 @@ with left:
     duck_parade()
 
 with right:
-    pdf_buffer, csv_buffer = build_export_payloads()
-    pdf_buffer.seek(0)
-    csv_buffer.seek(0)
     st.markdown('<div class="pfma-download-card">', unsafe_allow_html=True)
     st.markdown("<h3>Exports</h3><p style='margin:0;color:var(--ink-muted);'>Share with family or care pros.</p>", unsafe_allow_html=True)
-    st.download_button("Download PFMA (PDF)", data=pdf_buffer, file_name="pfma_summary.pdf", mime="application/pdf")
-    st.download_button("Download Data (CSV)", data=csv_buffer, file_name="pfma_data.csv", mime="text/csv")
+    export_button("pfma", "pdf", "Export PFMA (PDF)")
+    export_button("pfma", "csv", "Export Data (CSV)")
     st.markdown("<div class=\"pfma-note\">We'll call you soon - check your messages for confirmation.</div>", unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1,5 +1,8 @@
 from __future__ import annotations
 import streamlit as st
+
+from senior_nav import navigation
+
 def ensure_aud():
     if "aud" not in st.session_state or not isinstance(st.session_state.aud, dict):
         st.session_state.aud = {
@@ -15,11 +18,8 @@ def ensure_aud():
     return st.session_state.aud
 
 def safe_switch(path: str):
-    try:
-        st.switch_page(path)
-    except Exception:
-        st.query_params["next"] = path
-        st.rerun()
+    # Resolves legacy ``pages/...`` targets through the navigation registry.
+    navigation.switch_page(path)
 
 def top_nav():
     st.markdown(
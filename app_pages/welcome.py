@@ -1,13 +1,8 @@
 from __future__ import annotations
 
-import base64
-import io
-import mimetypes
-from pathlib import Path
-from urllib.parse import urlparse
-
 import streamlit as st
-from PIL import Image, UnidentifiedImageError
+
+from senior_nav import image_resolver
 
 st.markdown('<div class="sn-scope dashboard">', unsafe_allow_html=True)
 
@@ -237,57 +232,9 @@ st.markdown(
 )
 
 # ------------------ Image helpers ------------------
-def _resolve_path(path_str: str) -> Path:
-    p = Path(path_str)
-    if p.is_absolute() or p.exists():
-        return p
-    here = Path(__file__).resolve().parent
-    cand = here / path_str
-    if cand.exists():
-        return cand
-    root = here.parents[1] if len(here.parents) > 1 else here.parent
-    return root / path_str
-
-
-@st.cache_data(show_spinner=False)
-def load_bytes(path_str: str) -> bytes | None:
-    try:
-        parsed = urlparse(path_str)
-        if parsed.scheme in ("http", "https"):
-            import urllib.request
-
-            with urllib.request.urlopen(path_str, timeout=10) as r:
-                data = r.read()
-        else:
-            p = _resolve_path(path_str)
-            if not p.exists():
-                return None
-            data = p.read_bytes()
-        Image.open(io.BytesIO(data)).verify()
-        return data
-    except UnidentifiedImageError:
-        return None
-    except Exception:
-        return None
-
-
-def data_uri(path_str: str) -> str | None:
-    raw = load_bytes(path_str)
-    if not raw:
-        return None
-    ext = Path(urlparse(path_str).path).suffix.lower()
-    mime = mimetypes.types_map.get(ext, "image/png")
-    return f"data:{mime};base64,{base64.b64encode(raw).decode('ascii')}"
-
-
-def img_html(path_str: str, *, cls: str = "", style: str = "", alt: str = "") -> str | None:
-    uri = data_uri(path_str)
-    if not uri:
-        return None
-    cls_attr = f' class="{cls}"' if cls else ""
-    style_attr = f' style="{style}"' if style else ""
-    alt_attr = f' alt="{alt}"' if alt else ' alt=""'
-    return f'<img src="{uri}"{cls_attr}{style_attr}{alt_attr}>'
+def img_html(path_str: str, *, cls: str = "", style: str = "", alt: str = "", profile: str = "hero") -> str | None:
+    # Validation, caching and any remote fetch happen off the render path.
+    return image_resolver.img_html(path_str, cls=cls, style=style, alt=alt, profile=profile)
 
 
 # ------------------ Navigation helper ------------------
@@ -355,6 +302,7 @@ bbb_html = img_html(
     "static/images/better-business-bureau-logo.png",
     style="width:120px;height:auto;",
     alt="Better Business Bureau A+ Rating badge",
+    profile="logo",
 )
 
 st.markdown('<hr class="divider">', unsafe_allow_html=True)
@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 
-from copy import deepcopy
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import streamlit as st
 
+from senior_nav.lib.event_log import session_event_log
+from senior_nav.lib.frozen import FrozenDict, refreeze
+
 # ---------------------------------------------------------------------------
 # State schema constants
 # ---------------------------------------------------------------------------
@@ -118,8 +120,13 @@ def compute_audiencing_route(
     return route
 
 
-def snapshot_audiencing(state: Dict[str, Any]) -> Dict[str, Any]:
-    """Create a canonical snapshot for downstream consumers."""
+def snapshot_audiencing(state: Dict[str, Any], previous: Optional[FrozenDict] = None) -> FrozenDict:
+    """Create a canonical, immutable snapshot for downstream consumers.
+
+    Parts that match ``previous`` (by default the session's current
+    ``audiencing_snapshot``) are shared with it instead of copied; if
+    nothing changed, ``previous`` itself is returned.
+    """
 
     ensure_audiencing_state()
     qualifiers = {
@@ -132,10 +139,10 @@ def snapshot_audiencing(state: Dict[str, Any]) -> Dict[str, Any]:
         "qualifiers": qualifiers,
         "route": {
             "next": state.get("route", {}).get("next"),
-            "meta": deepcopy(state.get("route", {}).get("meta", {})),
+            "meta": state.get("route", {}).get("meta", {}),
         },
-        "people": deepcopy(state.get("people", {})),
-        "sanitized": deepcopy(state.get("sanitized", {})),
+        "people": state.get("people", {}),
+        "sanitized": state.get("sanitized", {}),
         "visibility": {
             "partner": bool(qualifiers["has_partner"]),
             "home": bool(qualifiers["owns_home"]),
@@ -146,14 +153,15 @@ def snapshot_audiencing(state: Dict[str, Any]) -> Dict[str, Any]:
             "urgent": bool(qualifiers["urgent"]),
         },
     }
-    return snapshot
+    if previous is None:
+        previous = st.session_state.get("audiencing_snapshot")
+    return refreeze(previous, snapshot)
 
 
 def log_audiencing_set(snapshot: Dict[str, Any]) -> None:
-    """Append an audiencing_set event to the shared event log."""
+    """Append an audiencing_set event to the session's bounded event log."""
 
-    event_log = st.session_state.setdefault("event_log", [])
-    event_log.append({"event": "audiencing_set", "snapshot": deepcopy(snapshot)})
+    session_event_log().append("audiencing_set", snapshot)
 
 
 def reset_audiencing_state() -> None:
@@ -0,0 +1,125 @@
+"""Compiled Cost Planner totals.
+
+``cost_planner_user_data_map.csv`` maps each input field to a normalized key;
+the category table below groups normalized keys into subtotals.  Both are
+compiled once into a field -> category index (and the equivalent 0/1 matrix),
+so one household is totalled in a single pass over its inputs and a batch of
+households is one ``(N, fields) @ (fields, categories)`` product.
+
+This module has no Streamlit dependency; ``cost_planner_shared.recompute_costs``
+feeds it ``st.session_state["cost_planner"]["inputs"]``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Subtotal category -> normalized keys it sums.  "offsets" is subtracted.
+CATEGORIES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("housing", ("housing_rent", "housing_util", "housing_maint")),
+    ("care", ("care_base", "care_level_addon", "care_second_person", "care_suppl_services")),
+    ("medical", ("med_rx", "med_supplies", "med_transport")),
+    ("insurance", ("ins_health", "ins_ltc", "ins_other")),
+    ("debts", ("debt_cc", "debt_loans")),
+    ("other", ("other_misc",)),
+    ("offsets", ("inc_ss", "inc_pension", "inc_annuity", "inc_other", "off_va", "off_medicaid", "off_ltc_payout")),
+)
+CATEGORY_NAMES: Tuple[str, ...] = tuple(name for name, _keys in CATEGORIES)
+OFFSETS = CATEGORY_NAMES.index("offsets")
+_EXPENSES = [row for row, name in enumerate(CATEGORY_NAMES) if name != "offsets"]
+ASSETS_FIELD = "assets_total"
+
+
+@dataclass(frozen=True)
+class CostModel:
+    field_ids: Tuple[str, ...]
+    category_of: Mapping[str, int]  # field id -> row in CATEGORY_NAMES
+    matrix: np.ndarray  # (fields, categories) 0/1
+
+    def column(self, field_id: str) -> int:
+        return self.field_ids.index(field_id)
+
+
+@dataclass(frozen=True)
+class CostTotals:
+    subtotals: Dict[str, float]
+    monthly_total: float
+    net_out_of_pocket: float
+    assets: float
+    runway_months: Optional[float]
+
+
+def compile_cost_model(field_map: Mapping[str, str]) -> CostModel:
+    """Compile ``field_id -> normalized_key`` into the category index and matrix."""
+    row_of_key = {key: row for row, (_name, keys) in enumerate(CATEGORIES) for key in keys}
+    field_ids = tuple(field_map)
+    category_of = {fid: row_of_key[norm] for fid, norm in field_map.items() if norm in row_of_key}
+    matrix = np.zeros((len(field_ids), len(CATEGORIES)), dtype=np.float64)
+    for col, fid in enumerate(field_ids):
+        if fid in category_of:
+            matrix[col, category_of[fid]] = 1.0
+    return CostModel(field_ids, category_of, matrix)
+
+
+def _finish(sums: Sequence[float], assets: float, planning: bool) -> CostTotals:
+    subtotals = dict(zip(CATEGORY_NAMES, (float(v) for v in sums)))
+    monthly_total = sum(v for name, v in subtotals.items() if name != "offsets")
+    net = max(0.0, monthly_total - subtotals["offsets"])
+    if not planning:
+        return CostTotals(subtotals, monthly_total, net, 0.0, None)
+    return CostTotals(subtotals, monthly_total, net, assets, assets / net if net > 0 else None)
+
+
+def compute_totals(model: CostModel, inputs: Mapping[str, object], planning: bool = False) -> CostTotals:
+    """Subtotals, offsets, monthly total, net out-of-pocket and runway in one pass over ``inputs``."""
+    sums = [0.0] * len(CATEGORIES)
+    for fid, row in model.category_of.items():
+        value = inputs.get(fid)
+        if value:
+            sums[row] += float(value)
+    return _finish(sums, float(inputs.get(ASSETS_FIELD, 0) or 0), planning)
+
+
+def encode_inputs(model: CostModel, households: Iterable[Mapping[str, object]]) -> np.ndarray:
+    """``(N, fields)`` float matrix of household inputs in ``model.field_ids`` order."""
+    rows: List[List[float]] = [
+        [float(inputs.get(fid, 0) or 0) for fid in model.field_ids] for inputs in households
+    ]
+    return np.asarray(rows, dtype=np.float64).reshape(len(rows), len(model.field_ids))
+
+
+RESULT_DTYPE = np.dtype(
+    [(name, np.float64) for name in CATEGORY_NAMES]
+    + [("monthly_total", np.float64), ("net_out_of_pocket", np.float64), ("assets", np.float64),
+       ("runway_months", np.float64)]
+)
+
+
+def compute_batch(
+    model: CostModel,
+    households: Sequence[Mapping[str, object]] | np.ndarray,
+    planning: bool | np.ndarray = True,
+) -> np.ndarray:
+    """Totals for many households at once as a ``RESULT_DTYPE`` array.
+
+    ``households`` is a sequence of input dicts or an already encoded
+    ``(N, fields)`` matrix.  ``runway_months`` is NaN where
+    :func:`compute_totals` would return ``None``.
+    """
+    values = households if isinstance(households, np.ndarray) else encode_inputs(model, households)
+    sums = values @ model.matrix
+    out = np.zeros(len(values), dtype=RESULT_DTYPE)
+    for row, name in enumerate(CATEGORY_NAMES):
+        out[name] = sums[:, row]
+    monthly = sums[:, _EXPENSES].sum(axis=1)
+    net = np.maximum(0.0, monthly - sums[:, OFFSETS])
+    planning = np.broadcast_to(np.asarray(planning, dtype=bool), net.shape)
+    assets = values[:, model.column(ASSETS_FIELD)] if ASSETS_FIELD in model.field_ids else np.zeros(len(values))
+    out["monthly_total"] = monthly
+    out["net_out_of_pocket"] = net
+    out["assets"] = np.where(planning, assets, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["runway_months"] = np.where(planning & (net > 0), assets / net, np.nan)
+    return out
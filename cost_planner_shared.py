@@ -5,15 +5,21 @@ import csv
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Callable, Dict, Iterable, List, Tuple, TypeVar
 
 import streamlit as st
 
+from cost_planner_model import CostModel, compile_cost_model, compute_totals
+from senior_nav.lib.crm_sync import get_crm_sync
+from senior_nav.lib.frozen import FrozenDict, refreeze
+
 
 ROOT = Path(__file__).resolve().parent
 FIELD_SPEC_PATH = ROOT / "cost_planner_user_data_inputs_only.csv"
 FIELD_MAP_PATH = ROOT / "cost_planner_user_data_map.csv"
 
+T = TypeVar("T")
+
 
 @dataclass
 class FieldSpec:
@@ -61,6 +67,68 @@ def load_field_map() -> Dict[str, str]:
     return mapping
 
 
+class CostPlannerState(dict):
+    """``st.session_state["cost_planner"]`` with a revision counter.
+
+    Writes to input keys (and :func:`set_numeric`, :func:`expert_flag`,
+    :func:`add_decision_log`) bump ``revision``; writes to the derived keys
+    recompute_costs fills in do not.  :meth:`memoize` caches a derived value
+    until the revision (or another part of its key) changes.  Mutating
+    ``cp["inputs"]`` directly bypasses tracking; go through the helpers.
+    """
+
+    DERIVED = frozenset(
+        {"subtotals", "monthly_total", "net_out_of_pocket", "assets", "runway_months", "snapshot_for_crm"}
+    )
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.revision = 0
+        self.hits = 0
+        self.misses = 0
+        self.applied: object = None  # last totals written into the derived keys
+        self._memo: Dict[str, Tuple[object, object]] = {}
+
+    def touch(self) -> None:
+        self.revision += 1
+
+    def __setitem__(self, key, value) -> None:
+        if key not in self.DERIVED:
+            self.revision += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key) -> None:
+        self.revision += 1
+        super().__delitem__(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def pop(self, key, *default):
+        if key in self:
+            self.revision += 1
+        return super().pop(key, *default)
+
+    def memoize(self, name: str, key: object, compute: Callable[[], T]) -> T:
+        cached = self._memo.get(name)
+        if cached is not None and cached[0] == key:
+            self.hits += 1
+            return cached[1]  # type: ignore[return-value]
+        self.misses += 1
+        value = compute()
+        self._memo[name] = (key, value)
+        return value
+
+    def cache_stats(self) -> Dict[str, int]:
+        return {"revision": self.revision, "hits": self.hits, "misses": self.misses}
+
+
 def ensure_core_state() -> None:
     """Ensure required session state blocks exist and honor audience gates."""
     st.session_state.setdefault(
@@ -112,11 +180,14 @@ def ensure_core_state() -> None:
         "snapshot_for_crm": {},
     }
     cp = st.session_state.setdefault("cost_planner", cost_defaults)
+    if not isinstance(cp, CostPlannerState):
+        cp = CostPlannerState(cp)
+        st.session_state["cost_planner"] = cp
 
     aud = st.session_state["audiencing"]
     quals = aud.get("qualifiers", {})
 
-    if not quals.get("has_partner", False):
+    if not quals.get("has_partner", False) and cp.get("household") != "single":
         cp["household"] = "single"
     cp.setdefault("custom_line_items", [])
     cp.setdefault("notes", "")
@@ -126,6 +197,7 @@ def ensure_core_state() -> None:
     if quals.get("on_medicaid"):
         if "Medicaid short-circuit" not in cp["decision_log"]:
             cp["decision_log"].append("Medicaid short-circuit")
+            cp.touch()
         gcp_state = st.session_state["gcp"]
         if gcp_state.get("payment_context") != "medicaid":
             gcp_state["payment_context"] = "medicaid"
@@ -135,6 +207,7 @@ def ensure_core_state() -> None:
         entry != f"Recommendation: {recommended}" for entry in cp["decision_log"]
     ):
         cp["decision_log"].append(f"Recommendation: {recommended}")
+        cp.touch()
 
 
 def inputs_dict() -> Dict[str, float]:
@@ -154,70 +227,84 @@ def get_numeric(field_id: str) -> float:
 
 
 def set_numeric(field_id: str, value: float) -> None:
-    inputs_dict()[field_id] = float(value or 0.0)
+    inputs = inputs_dict()
+    value = float(value or 0.0)
+    if inputs.get(field_id) != value:
+        inputs[field_id] = value
+        st.session_state["cost_planner"].touch()
+
+
+@lru_cache(maxsize=1)
+def cost_model() -> CostModel:
+    """The field map compiled into a category index (see ``cost_planner_model``)."""
+    return compile_cost_model(load_field_map())
 
 
 def summarize_categories(keys: Iterable[str], mapping: Dict[str, str]) -> float:
-    normalized_inputs = {
-        mapping[fid]: float(inputs_dict().get(fid, 0) or 0)
-        for fid in mapping
-    }
-    return sum(normalized_inputs.get(k, 0.0) for k in keys)
+    wanted = set(keys)
+    inputs = inputs_dict()
+    return sum(float(inputs.get(fid, 0) or 0) for fid, norm in mapping.items() if norm in wanted)
 
 
 def recompute_costs() -> None:
+    """Refresh derived totals and the CRM snapshot; a no-op when nothing changed.
+
+    A snapshot that changed is offered to CRM sync when that is configured.
+    """
     ensure_core_state()
-    cp = st.session_state["cost_planner"]
-    mapping = load_field_map()
-
-    def total(*normalized: str) -> float:
-        total_value = 0.0
-        for fid, norm in mapping.items():
-            if norm in normalized:
-                total_value += float(cp["inputs"].get(fid, 0) or 0)
-        return total_value
-
-    cp["subtotals"]["housing"] = total("housing_rent", "housing_util", "housing_maint")
-    cp["subtotals"]["care"] = total("care_base", "care_level_addon", "care_second_person", "care_suppl_services")
-    cp["subtotals"]["medical"] = total("med_rx", "med_supplies", "med_transport")
-    cp["subtotals"]["insurance"] = total("ins_health", "ins_ltc", "ins_other")
-    cp["subtotals"]["debts"] = total("debt_cc", "debt_loans")
-    cp["subtotals"]["other"] = total("other_misc")
-
-    offsets_income = total("inc_ss", "inc_pension", "inc_annuity", "inc_other")
-    offsets_benefits = total("off_va", "off_medicaid", "off_ltc_payout")
-    cp["subtotals"]["offsets"] = offsets_income + offsets_benefits
-
-    cp["monthly_total"] = sum(
-        v for k, v in cp["subtotals"].items() if k != "offsets"
+    cp: CostPlannerState = st.session_state["cost_planner"]
+    totals = cp.memoize(
+        "totals",
+        cp.revision,
+        lambda: compute_totals(cost_model(), cp["inputs"], planning=cp["mode"] == "planning"),
     )
-    cp["net_out_of_pocket"] = max(0.0, cp["monthly_total"] - cp["subtotals"]["offsets"])
-
-    if cp["mode"] == "planning":
-        assets_value = float(cp["inputs"].get("assets_total", 0) or 0)
-        cp["assets"] = assets_value
-        cp["runway_months"] = (
-            assets_value / cp["net_out_of_pocket"] if cp["net_out_of_pocket"] > 0 else None
-        )
-    else:
-        cp["assets"] = 0.0
-        cp["runway_months"] = None
-
-    cp["snapshot_for_crm"] = {
-        "audiencing": st.session_state.get("audiencing_snapshot")
-        or st.session_state.get("audiencing"),
-        "gcp": st.session_state.get("gcp"),
-        "inputs": cp["inputs"],
-        "subtotals": cp["subtotals"],
-        "monthly_total": cp["monthly_total"],
-        "net_out_of_pocket": cp["net_out_of_pocket"],
-        "assets": cp["assets"],
-        "runway_months": cp["runway_months"],
-        "decision_log": cp["decision_log"],
-        "expert_flags": cp["expert_flags"],
-        "custom_line_items": cp.get("custom_line_items", []),
-        "notes": cp.get("notes", ""),
-    }
+    if cp.applied is not totals:
+        cp["subtotals"].update(totals.subtotals)
+        cp["monthly_total"] = totals.monthly_total
+        cp["net_out_of_pocket"] = totals.net_out_of_pocket
+        cp["assets"] = totals.assets
+        cp["runway_months"] = totals.runway_months
+        cp.applied = totals
+
+    # The CRM snapshot is frozen: exporters and background jobs can hold it
+    # while the session keeps editing.  The planner half is rebuilt only when
+    # the revision changes; audiencing and GCP are re-frozen against the last
+    # snapshot, so unchanged parts (and an unchanged snapshot) are reused.
+    previous = cp.get("snapshot_for_crm")
+    previous = previous if isinstance(previous, FrozenDict) else None
+    planner = cp.memoize(
+        "snapshot",
+        cp.revision,
+        lambda: refreeze(
+            previous,
+            {
+                "inputs": cp["inputs"],
+                "subtotals": cp["subtotals"],
+                "monthly_total": cp["monthly_total"],
+                "net_out_of_pocket": cp["net_out_of_pocket"],
+                "assets": cp["assets"],
+                "runway_months": cp["runway_months"],
+                "decision_log": cp["decision_log"],
+                "expert_flags": cp["expert_flags"],
+                "custom_line_items": cp.get("custom_line_items", []),
+                "notes": cp.get("notes", ""),
+            },
+        ),
+    )
+    audiencing = st.session_state.get("audiencing_snapshot") or st.session_state.get("audiencing")
+    snapshot = refreeze(previous, {"audiencing": audiencing, "gcp": st.session_state.get("gcp"), **planner})
+    cp["snapshot_for_crm"] = snapshot
+    sync = get_crm_sync()
+    if sync is not None and snapshot is not previous:
+        from senior_nav.documents import document_namespace
+
+        sync.offer(document_namespace(), snapshot)
+
+
+def recompute_stats() -> Dict[str, int]:
+    """Revision and memo hit/miss counters for the current session."""
+    ensure_core_state()
+    return st.session_state["cost_planner"].cache_stats()
 
 
 def format_currency(value: float) -> str:
@@ -247,6 +334,7 @@ def expert_flag(flag: str) -> None:
     cp = st.session_state["cost_planner"]
     if flag not in cp["expert_flags"]:
         cp["expert_flags"].append(flag)
+        cp.touch()
 
 
 def add_decision_log(entry: str) -> None:
@@ -254,3 +342,4 @@ def add_decision_log(entry: str) -> None:
     cp = st.session_state["cost_planner"]
     if entry not in cp["decision_log"]:
         cp["decision_log"].append(entry)
+        cp.touch()
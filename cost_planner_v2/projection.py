@@ -0,0 +1,128 @@
+"""Month-by-month cash-flow projection for the Cost Planner.
+
+:func:`project` turns the timeline inputs into a :class:`Ledger`: one
+``(columns, months)`` float array holding every inflow, outflow, the net
+flow, the asset balance and any unfunded shortfall for each month of the
+horizon: ``months`` when given (1-360, the runway simulation's range), else a
+10-30 year ``years`` horizon.  Ledgers are memoized by the (frozen, hashable) inputs, and the
+derived views (annual rollups, depletion month, chart series) are computed
+from the array once per ledger, so Streamlit reruns re-use them.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+INFLOWS: Tuple[str, ...] = ("income", "benefits", "va")
+OUTFLOWS: Tuple[str, ...] = ("setting", "other", "mods", "caregiver")
+COLUMNS: Tuple[str, ...] = INFLOWS + OUTFLOWS + ("inflows", "outflows", "net", "assets", "shortfall")
+_ROW = {name: row for row, name in enumerate(COLUMNS)}
+MIN_YEARS, MAX_YEARS = 10, 30
+MAX_MONTHS = 12 * MAX_YEARS
+
+
+@dataclass(frozen=True)
+class ProjectionInputs:
+    income: float = 0.0
+    benefits: float = 0.0
+    va: float = 0.0
+    setting: float = 0.0
+    other: float = 0.0
+    mods: float = 0.0
+    caregiver: float = 0.0
+    assets: float = 0.0
+    years: int = 20
+    months: int = 0  # exact horizon in months; overrides ``years`` when set
+    cost_change_pct: float = 3.0  # yearly change applied to outflows
+    income_change_pct: float = 0.0  # yearly change applied to inflows (e.g. COLA)
+    asset_return_pct: float = 0.0  # yearly return on the remaining balance
+
+
+@dataclass(frozen=True)
+class Ledger:
+    inputs: ProjectionInputs
+    data: np.ndarray  # (len(COLUMNS), months), read-only
+
+    @property
+    def months(self) -> int:
+        return self.data.shape[1]
+
+    def column(self, name: str) -> np.ndarray:
+        return self.data[_ROW[name]]
+
+    @cached_property
+    def depletion_month(self) -> Optional[int]:
+        """First month (1-based) with an unfunded shortfall, ``None`` if assets last."""
+        short = np.flatnonzero(self.column("shortfall") > 0)
+        return int(short[0]) + 1 if short.size else None
+
+    @cached_property
+    def annual(self) -> np.ndarray:
+        """``(len(COLUMNS), years)``: flows summed per year, assets at year end.
+
+        A horizon that is not whole years ends with a partial year.
+        """
+        starts = np.arange(0, self.months, 12)
+        rolled = np.add.reduceat(self.data, starts, axis=1)
+        rolled[_ROW["assets"]] = self.column("assets")[np.minimum(starts + 12, self.months) - 1]
+        rolled.flags.writeable = False
+        return rolled
+
+    def annual_rows(self) -> List[Dict[str, float]]:
+        return [
+            {"year": year + 1, **{name: float(self.annual[row, year]) for row, name in enumerate(COLUMNS)}}
+            for year in range(self.annual.shape[1])
+        ]
+
+    @cached_property
+    def chart_series(self) -> Dict[str, List[float]]:
+        """Monthly series for ``st.line_chart``: assets, inflows and outflows."""
+        return {name: self.column(name).round(2).tolist() for name in ("assets", "inflows", "outflows")}
+
+
+def _growth(months: int, yearly_pct: float) -> np.ndarray:
+    # Changes apply once a year, from month 13 on.
+    return (1.0 + yearly_pct / 100.0) ** (np.arange(months) // 12)
+
+
+@lru_cache(maxsize=32)
+def project(inputs: ProjectionInputs) -> Ledger:
+    if inputs.months:
+        months = max(1, min(int(inputs.months), MAX_MONTHS))
+    else:
+        months = 12 * max(MIN_YEARS, min(int(inputs.years), MAX_YEARS))
+    data = np.zeros((len(COLUMNS), months))
+    income_growth = _growth(months, inputs.income_change_pct)
+    cost_growth = _growth(months, inputs.cost_change_pct)
+    for name in INFLOWS:
+        data[_ROW[name]] = getattr(inputs, name) * income_growth
+    for name in OUTFLOWS:
+        data[_ROW[name]] = getattr(inputs, name) * cost_growth
+    inflows = data[[_ROW[n] for n in INFLOWS]].sum(axis=0)
+    outflows = data[[_ROW[n] for n in OUTFLOWS]].sum(axis=0)
+    data[_ROW["inflows"]] = inflows
+    data[_ROW["outflows"]] = outflows
+    net = data[_ROW["net"]]
+    np.subtract(inflows, outflows, out=net)
+
+    # Asset drawdown; a month the balance cannot cover is recorded as shortfall.
+    assets, shortfall = data[_ROW["assets"]], data[_ROW["shortfall"]]
+    rate = (1.0 + inputs.asset_return_pct / 100.0) ** (1.0 / 12.0)
+    balance = float(inputs.assets)
+    for month, flow in enumerate(net.tolist()):
+        balance = balance * rate + flow
+        if balance < 0:
+            shortfall[month] = -balance
+            balance = 0.0
+        assets[month] = balance
+    data.flags.writeable = False
+    return Ledger(inputs, data)
+
+
+def inputs_from_state(values: Mapping[str, object], **assumptions) -> ProjectionInputs:
+    """Build inputs from the figures the timeline page already pulled from session state."""
+    fields = {name: float(values.get(name, 0) or 0) for name in INFLOWS + OUTFLOWS + ("assets",)}
+    return ProjectionInputs(**fields, **assumptions)
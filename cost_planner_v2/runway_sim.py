@@ -0,0 +1,105 @@
+"""Monte Carlo runway simulation for the Cost Planner timeline.
+
+``assets / gap`` assumes costs, income and asset values never move.  Here
+every path draws its own care-cost inflation (centred on the user's
+``tl_cost_change_pct``), yearly asset returns and the months care needs step
+up a level, adds any one-time events, and reports the month, counted from
+the first simulated month, in which the assets run out.
+
+All random draws are made up front, per path.  The month loop then advances
+every path at once with a handful of length-``paths`` array operations, which
+keeps 10,000 paths over a 30-year horizon well under 100 ms and never holds
+a ``(paths, months)`` grid in memory.  Results are cached by the (frozen,
+hashable) inputs, so Streamlit reruns with unchanged inputs cost a dict
+lookup.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+PERCENTILES: Tuple[int, ...] = (10, 25, 50, 75, 90)
+MAX_HORIZON_MONTHS = 360
+
+
+@dataclass(frozen=True)
+class RunwayInputs:
+    assets: float
+    monthly_cost: float
+    monthly_inflows: float
+    horizon_months: int = 120
+    cost_change_pct: float = 3.0  # expected yearly change in monthly care cost
+    cost_volatility_pct: float = 2.0  # yearly std-dev around that change
+    asset_return_pct: float = 4.0  # expected yearly return on remaining assets
+    asset_volatility_pct: float = 10.0
+    escalation_prob_pct: float = 15.0  # yearly chance care needs step up a level
+    escalation_step_pct: float = 25.0  # cost increase per step
+    max_escalations: int = 2
+    events: Tuple[Tuple[int, float], ...] = ()  # (month, amount); positive amounts are costs
+    paths: int = 10_000
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class RunwayBands:
+    horizon_months: int
+    percentiles: Tuple[int, ...]
+    months: Tuple[Optional[int], ...]  # runway at each percentile; None = lasts past the horizon
+    depletion_probability: float  # share of paths that run out within the horizon
+
+    def month_at(self, percentile: int) -> Optional[int]:
+        return self.months[self.percentiles.index(percentile)]
+
+
+def _runway_months(inputs: RunwayInputs) -> np.ndarray:
+    """Month each path runs out of assets (``horizon + 1`` when it never does)."""
+    horizon = max(1, min(int(inputs.horizon_months), MAX_HORIZON_MONTHS))
+    rng = np.random.default_rng(inputs.seed)
+    n = inputs.paths
+
+    # Per-path draws: a yearly care-cost inflation rate, the months care needs
+    # step up a level (geometric waiting times) and one asset return per year.
+    inflation = rng.normal(inputs.cost_change_pct, inputs.cost_volatility_pct, n) / 100.0
+    cost_factor = (1.0 + np.maximum(inflation, -0.99)) ** (1.0 / 12.0)
+    step_prob = 1.0 - (1.0 - inputs.escalation_prob_pct / 100.0) ** (1.0 / 12.0)
+    if step_prob > 0 and inputs.max_escalations > 0:
+        waits = rng.geometric(step_prob, (inputs.max_escalations, n)).cumsum(axis=0)
+    else:
+        waits = np.empty((0, n), dtype=np.int64)
+    step_factor = 1.0 + inputs.escalation_step_pct / 100.0
+    yearly = rng.normal(inputs.asset_return_pct, inputs.asset_volatility_pct, (-(-horizon // 12), n)) / 100.0
+    return_factor = (1.0 + np.maximum(yearly, -0.99)) ** (1.0 / 12.0)
+    events = dict(inputs.events)
+
+    assets = np.full(n, float(inputs.assets))
+    cost = np.full(n, float(inputs.monthly_cost))
+    runway = np.full(n, horizon + 1, dtype=np.int32)
+    alive = np.ones(n, dtype=bool)
+    for month in range(1, horizon + 1):
+        cost *= cost_factor
+        for wait in waits:
+            cost[wait == month] *= step_factor
+        assets *= return_factor[(month - 1) // 12]
+        assets -= cost - inputs.monthly_inflows + events.get(month, 0.0)
+        out = alive & (assets < 0)
+        if out.any():
+            runway[out] = month
+            alive &= ~out
+    return runway
+
+
+@lru_cache(maxsize=64)
+def simulate_runway(inputs: RunwayInputs) -> RunwayBands:
+    """Percentile runway bands (months until assets are exhausted)."""
+    runway = _runway_months(inputs)
+    horizon = max(1, min(int(inputs.horizon_months), MAX_HORIZON_MONTHS))
+    values = np.percentile(runway, PERCENTILES, method="lower")
+    return RunwayBands(
+        horizon_months=horizon,
+        percentiles=PERCENTILES,
+        months=tuple(int(v) if v <= horizon else None for v in values),
+        depletion_probability=float((runway <= horizon).mean()),
+    )
@@ -0,0 +1,418 @@
+"""Offline re-scoring of stored Guided Care Plan answers.
+
+Answers how past users would be placed under another engine or new weights,
+e.g. how many would flip from assisted living to memory care::
+
+    python -m gcp_core.batch answers.jsonl --candidate compiled:new_scoring_model.json --out report/
+
+The input is JSONL (``-`` for stdin, ``.gz`` is read transparently), one
+stored record per line: ``{"id": ..., "answers": {...}, "audiencing": {...}}``,
+a session/CRM snapshot with ``gcp.answers``, or a bare answers dict.  Each
+record is scored by a *baseline* and a *candidate* engine:
+
+* ``compiled[:PATH]`` - :mod:`gcp_core.compiled_scoring` with the scoring
+  model at ``PATH`` (default: the shipped ``scoring_model.json``), vectorized
+  per chunk.  When both sides are compiled with the same token vocabularies
+  (only weights changed) each chunk is encoded once and scored twice.
+* ``bundle`` - the bundle engine, one call per record (reference results).
+* ``legacy`` - ``guided_care_plan.engine``, one call per record.
+
+Lines are read in chunks and scored on a :mod:`multiprocessing` pool with a
+fixed number of chunks in flight, so memory stays flat however long the input
+is.  Workers parse the JSON themselves and send back transition counts plus
+the changed records already encoded as JSONL, which are appended to
+``changes.jsonl`` as chunks complete, in input order.  ``summary.json`` holds
+the totals and the ``before -> after`` matrix, which is also printed.
+"""
+from __future__ import annotations
+
+import abc
+import argparse
+import gzip
+import json
+import multiprocessing
+import os
+import sys
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import compiled_scoring
+
+ENGINES: Tuple[str, ...] = ("compiled", "bundle", "legacy")
+INVALID = "invalid"  # answers the engine rejects
+LABELS: Tuple[str, ...] = ("home", "assisted", "memory", "none", INVALID)
+CHUNK_SIZE = 2000
+SAMPLE_SIZE = 20  # unreadable line numbers kept for the summary
+
+Rows = List[Tuple[Dict[str, Any], Dict[str, Any]]]  # (answers, audiencing)
+
+
+# ---------------------------------------------------------------------------
+# Engines (built once per worker process)
+# ---------------------------------------------------------------------------
+class Engine(abc.ABC):
+    """``score(rows)`` -> (recommended setting per row, optional ``RESULT_DTYPE`` scores)."""
+
+    spec: str
+    version: str
+
+    @abc.abstractmethod
+    def score(self, rows: Rows) -> Tuple[List[str], Optional[np.ndarray]]:
+        ...
+
+
+class CompiledEngine(Engine):
+    _LABELS = np.array(compiled_scoring.SETTINGS + (INVALID,), dtype=object)
+
+    def __init__(self, spec: str, path: str) -> None:
+        self.spec = spec
+        self.model = compiled_scoring.load_model(path)
+        self.version = self.model.version
+
+    def encode(self, rows: Rows) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+        """Token codes, the on-Medicaid column and a mask of rows whose answers could not be encoded."""
+        answers_list = [answers for answers, _ in rows]
+        broken = np.zeros(len(rows), dtype=bool)
+        try:
+            codes = compiled_scoring.encode(answers_list, self.model)
+        except Exception:
+            # A malformed record (e.g. a non-list behavior_risks) fails the whole
+            # chunk; find it row by row and encode it as an empty answer set.
+            for i, answers in enumerate(answers_list):
+                try:
+                    compiled_scoring.encode([answers], self.model)
+                except Exception:
+                    broken[i] = True
+                    answers_list[i] = {}
+            codes = compiled_scoring.encode(answers_list, self.model)
+        on_medicaid = np.fromiter((bool(aud.get("on_medicaid")) for _, aud in rows), dtype=bool, count=len(rows))
+        return codes, on_medicaid, broken
+
+    def score_codes(
+        self, codes: Dict[str, np.ndarray], on_medicaid: np.ndarray, broken: np.ndarray
+    ) -> Tuple[List[str], np.ndarray]:
+        result = compiled_scoring.score_encoded(codes, on_medicaid, self.model)
+        result["valid"] &= ~broken
+        index = np.where(result["valid"], result["outcome"], len(compiled_scoring.SETTINGS))
+        return self._LABELS[index].tolist(), result
+
+    def score(self, rows: Rows) -> Tuple[List[str], Optional[np.ndarray]]:
+        return self.score_codes(*self.encode(rows))
+
+
+class RowEngine(Engine):
+    """An engine called once per record; any exception marks the record invalid."""
+
+    def __init__(self, spec: str, version: str, evaluate: Callable[[Dict, Dict], str]) -> None:
+        self.spec = spec
+        self.version = version
+        self._evaluate = evaluate
+
+    def score(self, rows: Rows) -> Tuple[List[str], Optional[np.ndarray]]:
+        settings = []
+        for answers, aud in rows:
+            try:
+                settings.append(self._evaluate(answers, aud))
+            except Exception:
+                settings.append(INVALID)
+        return settings, None
+
+
+def resolve_engine(spec: str) -> Engine:
+    """Build the engine for ``spec``; raises ``ValueError`` for unknown names or model files."""
+    name, _, arg = spec.partition(":")
+    if name == "compiled":
+        path = arg or str(compiled_scoring.SCORING_JSON)
+        try:
+            return CompiledEngine(spec, path)
+        except (OSError, KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"cannot load scoring model {path!r}: {exc}") from exc
+    if arg:
+        raise ValueError(f"engine {name!r} takes no argument")
+    if name == "bundle":
+        from gcp_pr_tool_bundle.guided_care_plan import engine as bundle
+
+        version = str(bundle.scoring_model().get("version", ""))
+        return RowEngine(spec, version, lambda answers, aud: bundle.evaluate_guided_care(answers, aud)[1][
+            "recommended_setting"])
+    if name == "legacy":
+        from guided_care_plan import engine as legacy
+
+        return RowEngine(spec, "guided_care_plan", lambda answers, aud: legacy.evaluate_guided_care(answers, aud)[
+            "recommended_setting"])
+    raise ValueError(f"unknown engine {spec!r} (expected one of {', '.join(ENGINES)})")
+
+
+# ---------------------------------------------------------------------------
+# Chunk scoring (runs in the workers)
+# ---------------------------------------------------------------------------
+def _parse(first_line: int, lines: List[bytes]) -> Tuple[List[Tuple[int, Any]], List[int]]:
+    """(line number, decoded JSON) for each non-blank line, and the lines that are not JSON."""
+    numbered = [(first_line + offset, raw) for offset, raw in enumerate(lines) if raw.strip()]
+    try:
+        # One decode call for the whole chunk is about twice as fast as one per line.
+        values = json.loads(b"[" + b",".join(raw for _, raw in numbered) + b"]")
+        if len(values) == len(numbered):
+            return [(line, value) for (line, _), value in zip(numbered, values)], []
+    except ValueError:
+        pass
+    decoded, unreadable = [], []
+    for line, raw in numbered:
+        try:
+            decoded.append((line, json.loads(raw)))
+        except ValueError:
+            unreadable.append(line)
+    return decoded, unreadable
+
+
+def _record(obj: Any) -> Tuple[Any, Dict[str, Any], Dict[str, Any]]:
+    if not isinstance(obj, dict):
+        raise ValueError("record is not an object")
+    record_id = obj.get("id", obj.get("session_id"))
+    aud = obj.get("audiencing") or obj.get("aud") or {}
+    if "answers" in obj:
+        answers = obj["answers"]
+    elif isinstance(obj.get("gcp"), dict) and "answers" in obj["gcp"]:
+        answers = obj["gcp"]["answers"]
+    else:
+        answers, aud = obj, {}
+    if not isinstance(answers, dict) or not isinstance(aud, dict):
+        raise ValueError("answers and audiencing must be objects")
+    return record_id, answers, aud
+
+
+def _scores(result: Optional[np.ndarray], i: int) -> Optional[Dict[str, float]]:
+    if result is None:
+        return None
+    row = result[i]
+    return {"MC": round(float(row["MC"]), 4), "AL": round(float(row["AL"]), 4), "HC": round(float(row["HC"]), 4)}
+
+
+@dataclass
+class ChunkResult:
+    records: int
+    transitions: Counter
+    changed: int
+    changes: bytes  # JSONL, one line per changed record
+    unreadable: List[int]
+
+
+class Scorer:
+    """Scores chunks of raw JSONL lines with a baseline and a candidate engine."""
+
+    def __init__(self, baseline: str, candidate: str) -> None:
+        self.baseline = resolve_engine(baseline)
+        self.candidate = resolve_engine(candidate)
+        a, b = self.baseline, self.candidate
+        self._shared_codes = (
+            isinstance(a, CompiledEngine) and isinstance(b, CompiledEngine) and a.model.vocab == b.model.vocab
+        )
+
+    def __call__(self, chunk: Tuple[int, List[bytes]]) -> ChunkResult:
+        decoded, unreadable = _parse(*chunk)
+        ids: List[Tuple[int, Any]] = []
+        rows: Rows = []
+        for line, obj in decoded:
+            try:
+                record_id, answers, aud = _record(obj)
+            except ValueError:
+                unreadable.append(line)
+                continue
+            ids.append((line, record_id))
+            rows.append((answers, aud))
+        unreadable.sort()
+
+        if self._shared_codes:
+            encoded = self.baseline.encode(rows)  # type: ignore[attr-defined]
+            before, before_scores = self.baseline.score_codes(*encoded)  # type: ignore[attr-defined]
+            after, after_scores = self.candidate.score_codes(*encoded)  # type: ignore[attr-defined]
+        else:
+            before, before_scores = self.baseline.score(rows)
+            after, after_scores = self.candidate.score(rows)
+
+        changes = []
+        for i, (old, new) in enumerate(zip(before, after)):
+            if old != new:
+                line, record_id = ids[i]
+                change: Dict[str, Any] = {"line": line, "id": record_id, "before": old, "after": new}
+                if before_scores is not None:
+                    change["before_scores"] = _scores(before_scores, i)
+                if after_scores is not None:
+                    change["after_scores"] = _scores(after_scores, i)
+                changes.append(json.dumps(change, default=str))
+        payload = ("\n".join(changes) + "\n").encode("utf-8") if changes else b""
+        return ChunkResult(len(rows), Counter(zip(before, after)), len(changes), payload, unreadable)
+
+
+_SCORER: Optional[Scorer] = None
+
+
+def _init_worker(baseline: str, candidate: str) -> None:
+    global _SCORER
+    _SCORER = Scorer(baseline, candidate)
+
+
+def _score_chunk(chunk: Tuple[int, List[bytes]]) -> ChunkResult:
+    assert _SCORER is not None, "worker not initialised"
+    return _SCORER(chunk)
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+@dataclass
+class Report:
+    """Totals and the ``(before, after) -> count`` matrix of one run."""
+
+    baseline: str
+    candidate: str
+    versions: Dict[str, str] = field(default_factory=dict)
+    records: int = 0
+    changed: int = 0
+    unreadable: int = 0
+    unreadable_sample: List[int] = field(default_factory=list)
+    transitions: Counter = field(default_factory=Counter)
+
+    def add(self, chunk: ChunkResult) -> None:
+        self.records += chunk.records
+        self.changed += chunk.changed
+        self.unreadable += len(chunk.unreadable)
+        self.unreadable_sample.extend(chunk.unreadable[: SAMPLE_SIZE - len(self.unreadable_sample)])
+        self.transitions.update(chunk.transitions)
+
+    def flips(self, before: str, after: str) -> int:
+        """Records recommended ``before`` by the baseline and ``after`` by the candidate."""
+        return self.transitions.get((before, after), 0)
+
+    def labels(self) -> List[str]:
+        seen = {label for pair in self.transitions for label in pair}
+        return [label for label in LABELS if label in seen] + sorted(seen.difference(LABELS))
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = self.labels()
+        return {
+            "baseline": {"engine": self.baseline, "version": self.versions.get("baseline", "")},
+            "candidate": {"engine": self.candidate, "version": self.versions.get("candidate", "")},
+            "records": self.records,
+            "changed": self.changed,
+            "unreadable": self.unreadable,
+            "unreadable_sample": self.unreadable_sample,
+            "transitions": {
+                old: {new: self.transitions[(old, new)] for new in labels if self.transitions[(old, new)]}
+                for old in labels
+                if any(self.transitions[(old, new)] for new in labels)
+            },
+        }
+
+    def format_table(self) -> str:
+        labels = self.labels()
+        width = max([len("before \\ after")] + [len(label) for label in labels]) + 2
+        lines = ["before \\ after".ljust(width) + "".join(label.rjust(width) for label in labels)]
+        for old in labels:
+            lines.append(old.ljust(width) + "".join(f"{self.transitions[(old, new)]:>{width},}" for new in labels))
+        share = f" ({self.changed / self.records:.2%})" if self.records else ""
+        lines.append(f"{self.records:,} records, {self.changed:,} changed{share}, {self.unreadable:,} unreadable")
+        return "\n".join(lines)
+
+
+def _chunks(lines: Iterable[bytes], size: int) -> Iterator[Tuple[int, List[bytes]]]:
+    it = iter(lines)
+    line = 1
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield line, chunk
+        line += len(chunk)
+
+
+def _results(
+    chunks: Iterable[Tuple[int, List[bytes]]], baseline: str, candidate: str, workers: int
+) -> Iterator[ChunkResult]:
+    if workers <= 0:
+        scorer = Scorer(baseline, candidate)
+        yield from map(scorer, chunks)
+        return
+    # Pool.imap drains its input eagerly; a window of async results keeps the
+    # number of chunks held in memory at 2 per worker.
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(baseline, candidate)) as pool:
+        pending: Deque[Any] = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(_score_chunk, (chunk,)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def rescore(
+    lines: Iterable[bytes],
+    baseline: str = "compiled",
+    candidate: str = "compiled",
+    *,
+    changes: Optional[IO[bytes]] = None,
+    workers: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+) -> Report:
+    """Score JSONL ``lines`` with both engines; changed records go to ``changes``.
+
+    ``workers=0`` scores in this process.  Engine specs are checked here
+    first, so a bad spec raises ``ValueError`` before any worker starts.
+    """
+    scorer = Scorer(baseline, candidate)
+    report = Report(baseline, candidate, {"baseline": scorer.baseline.version, "candidate": scorer.candidate.version})
+    for result in _results(_chunks(lines, chunk_size), baseline, candidate, workers):
+        report.add(result)
+        if changes is not None and result.changes:
+            changes.write(result.changes)
+    return report
+
+
+def _open_input(path: str) -> IO[bytes]:
+    if path == "-":
+        return sys.stdin.buffer
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")  # type: ignore[return-value]
+    return open(path, "rb")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m gcp_core.batch",
+        description="Re-score stored GCP answers with two engines and report recommendation changes.",
+    )
+    parser.add_argument("input", help="JSONL of stored answer records ('-' for stdin, .gz accepted)")
+    parser.add_argument("--baseline", default="compiled", help="engine spec, default: compiled (current weights)")
+    parser.add_argument("--candidate", required=True, help="engine spec: compiled[:PATH], bundle or legacy")
+    parser.add_argument("--out", default="gcp_batch_report", help="directory for summary.json and changes.jsonl")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 scores in this process")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many input lines")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be positive")
+    try:
+        Scorer(args.baseline, args.candidate)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    with _open_input(args.input) as source, open(out / "changes.jsonl", "wb") as changes:
+        lines: Iterable[bytes] = source if args.limit is None else islice(source, args.limit)
+        report = rescore(
+            lines, args.baseline, args.candidate, changes=changes, workers=args.workers, chunk_size=args.chunk_size
+        )
+    (out / "summary.json").write_text(json.dumps(report.to_dict(), indent=2) + "\n", encoding="utf-8")
+    print(report.format_table())
+    print(f"report written to {out}/summary.json and {out}/changes.jsonl")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""Shared, lazily loaded question catalog for the Guided Care Plan.
+
+Question metadata lives in four places: ``gcp_core/assets/questions.csv``,
+the bundle's ``questions/questions.csv``, ``guided_care_plan/labels.json`` and
+the ``gcp_v2.schema.QUESTIONS`` literal.  :func:`catalog` loads a source on
+first use, once per process, and serves immutable views indexed by question
+id, section and ``(question id, choice id)``.
+
+:class:`Question` and :class:`Choice` also answer ``q["label"]`` /
+``q.get("conditional_show")`` so callers written against the old dict rows
+keep working without a copy per call.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import threading
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+_ROOT = Path(__file__).resolve().parents[1]
+BUNDLE_QUESTIONS_CSV = _ROOT / "gcp_pr_tool_bundle" / "guided_care_plan" / "questions" / "questions.csv"
+LABELS_JSON = _ROOT / "guided_care_plan" / "labels.json"
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+class Choice(NamedTuple):
+    """A choice; unpacks as ``(id, label)`` and also supports ``c["id"]``."""
+
+    id: str
+    label: str
+
+    def __getitem__(self, key):  # type: ignore[override]
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+@dataclass(frozen=True)
+class Question:
+    id: str
+    label: str
+    type: str = "single"
+    choices: Tuple[Choice, ...] = ()
+    conditional_show: str = ""
+    section: str = ""
+    order: int = 0
+    extra: Mapping[str, Any] = field(default_factory=lambda: _EMPTY, compare=False, repr=False)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _QUESTION_FIELDS:
+            return getattr(self, key)
+        return self.extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def label_for(self, choice_id: Optional[str]) -> Optional[str]:
+        for choice in self.choices:
+            if choice.id == choice_id:
+                return choice.label
+        return None
+
+
+_QUESTION_FIELDS = frozenset(f.name for f in fields(Question)) - {"extra"}
+
+
+@dataclass(frozen=True)
+class Catalog:
+    source: str
+    questions: Tuple[Question, ...]
+    by_id: Mapping[str, Question]
+    by_section: Mapping[str, Tuple[Question, ...]]
+    by_choice: Mapping[Tuple[str, str], Choice]
+
+    def get(self, qid: str) -> Optional[Question]:
+        return self.by_id.get(qid)
+
+    def section(self, name: str) -> Tuple[Question, ...]:
+        return self.by_section.get(name, ())
+
+    def label_for(self, qid: str, choice_id: Optional[str]) -> Optional[str]:
+        choice = self.by_choice.get((qid, choice_id or ""))
+        return choice.label if choice else None
+
+
+def _index(source: str, questions: Iterable[Question]) -> Catalog:
+    ordered = tuple(questions)
+    sections: Dict[str, List[Question]] = {}
+    for q in ordered:
+        if q.section:
+            sections.setdefault(q.section, []).append(q)
+    return Catalog(
+        source=source,
+        questions=ordered,
+        by_id=MappingProxyType({q.id: q for q in ordered}),
+        by_section=MappingProxyType(
+            {name: tuple(sorted(qs, key=lambda q: q.order)) for name, qs in sections.items()}
+        ),
+        by_choice=MappingProxyType({(q.id, c.id): c for q in ordered for c in q.choices}),
+    )
+
+
+def _group_rows(rows: Iterable[Mapping[str, str]], sections: Mapping[str, Tuple[str, int]] = _EMPTY) -> List[Question]:
+    """Group one-row-per-choice CSV rows into questions (first row wins for metadata)."""
+    order: List[str] = []
+    meta: Dict[str, Mapping[str, str]] = {}
+    choices: Dict[str, List[Choice]] = {}
+    for row in rows:
+        qid = row["id"]
+        if qid not in meta:
+            order.append(qid)
+            meta[qid] = row
+            choices[qid] = []
+        if row.get("choice_id"):
+            choices[qid].append(Choice(row["choice_id"], (row.get("choice_label") or "").strip()))
+    questions = []
+    for qid in order:
+        row = meta[qid]
+        section, position = sections.get(qid, ("", len(questions)))
+        questions.append(Question(
+            id=qid,
+            label=(row.get("label") or "").strip(),
+            type=(row.get("type") or "single").strip(),
+            choices=tuple(choices[qid]),
+            conditional_show=(row.get("conditional_show") or "").strip(),
+            section=section,
+            order=position,
+        ))
+    return questions
+
+
+# ------------------------------------------------------------------
+# Sources
+# ------------------------------------------------------------------
+def _load_gcp_core() -> Catalog:
+    from .questions import SECTION_ORDER, load_questions
+
+    sections = {
+        qid: (section, position)
+        for section, qids in SECTION_ORDER
+        for position, qid in enumerate(qids)
+    }
+    return _index("gcp_core", _group_rows(load_questions(), sections))
+
+
+def _load_bundle() -> Catalog:
+    with BUNDLE_QUESTIONS_CSV.open(newline="", encoding="utf-8") as fh:
+        return _index("bundle", _group_rows(csv.DictReader(fh)))
+
+
+def _load_labels() -> Catalog:
+    data = json.loads(LABELS_JSON.read_text(encoding="utf-8"))
+    questions = []
+    for position, (qid, meta) in enumerate((data.get("questions") or {}).items()):
+        questions.append(Question(
+            id=qid,
+            label=meta.get("label", ""),
+            type="multi" if meta.get("multi") else "single",
+            choices=tuple(Choice(o["value"], o["label"]) for o in meta.get("options", ())),
+            order=position,
+            extra=MappingProxyType(meta),
+        ))
+    return _index("labels", questions)
+
+
+def _load_gcp_v2() -> Catalog:
+    from gcp_v2.schema import QUESTIONS
+
+    questions = []
+    for raw in QUESTIONS:
+        extra = {k: v for k, v in raw.items() if k not in _QUESTION_FIELDS}
+        questions.append(Question(
+            id=raw["id"],
+            label=raw["label"],
+            type=raw.get("type", "single"),
+            choices=tuple(Choice(cid, label) for cid, label in raw.get("choices", ())),
+            section=raw.get("section", ""),
+            order=raw.get("order", 0),
+            extra=MappingProxyType(extra),
+        ))
+    return _index("gcp_v2", questions)
+
+
+SOURCES: Dict[str, Callable[[], Catalog]] = {
+    "gcp_core": _load_gcp_core,
+    "bundle": _load_bundle,
+    "labels": _load_labels,
+    "gcp_v2": _load_gcp_v2,
+}
+
+_LOCK = threading.Lock()
+_LOADED: Dict[str, Catalog] = {}
+
+
+def catalog(source: str = "gcp_core") -> Catalog:
+    """Return the catalog for ``source``, loading it on first use."""
+    cached = _LOADED.get(source)
+    if cached is not None:
+        return cached
+    with _LOCK:
+        cached = _LOADED.get(source)
+        if cached is None:
+            cached = SOURCES[source]()
+            _LOADED[source] = cached
+        return cached
+
+
+def loaded_sources() -> Tuple[str, ...]:
+    return tuple(_LOADED)
+
+
+def reset() -> None:
+    """Forget loaded catalogs (used by tests/benchmarks)."""
+    with _LOCK:
+        _LOADED.clear()
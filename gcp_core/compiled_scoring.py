@@ -0,0 +1,346 @@
+"""Compiled, vectorized form of the scoring_model.json recommendation engine.
+
+``gcp_pr_tool_bundle.guided_care_plan.engine.evaluate_guided_care`` looks up
+every MC/AL/HC encoding in nested dicts for each call.  Here the encoding
+tables are compiled once per process into NumPy arrays indexed by token code,
+so a batch of answer sets is encoded with one dict lookup per field and scored
+with a handful of array operations.
+
+``score_batch(list_of_answers)`` returns a structured array (see
+``RESULT_DTYPE``); ``evaluate_guided_care`` rebuilds the bundle engine's
+``(context, gcp)`` tuple from a single-row batch and must stay identical to it
+(see ``tests/test_compiled_scoring.py``).  The arithmetic below mirrors the
+bundle engine term by term so float results match bit for bit.
+
+Encoding dominates batch cost.  When only weights change, the token codes from
+:func:`encode` can be re-scored against a new :func:`compile_model` result
+with :func:`score_encoded` as long as the token vocabularies are unchanged.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from senior_nav.lib.trace import trace
+
+SCORING_JSON = Path(__file__).parent / "assets" / "scoring_model.json"
+
+# (model field, answer key, default token) in bundle-engine order.
+INPUTS: Tuple[Tuple[str, str, str], ...] = (
+    ("cognition", "cognition", "normal"),
+    ("adl", "adl_help", "0-1"),
+    ("meds", "med_mgmt", "simple"),
+    ("falls", "falls", "none"),
+    ("home", "home_safety", "safe"),
+    ("mobility", "mobility", "no_issues"),
+    ("supervision", "supervision", "always"),
+    ("isolation", "social_isolation", "daily_or_often"),
+    ("access", "geographic_access", "easy"),
+    ("support", "caregiver_support", "none"),
+    ("behav", "behavior_risks", "none"),
+)
+_BEHAVIOR_PRIORITY = ("exit_seeking", "wandering", "agitation")
+
+OUTCOMES: Tuple[str, ...] = ("none", "In-Home Care", "Assisted Living", "Memory Care")
+SETTINGS: Tuple[str, ...] = ("none", "home", "assisted", "memory")
+INTENSITIES: Tuple[str, ...] = ("low", "low", "med", "high")
+DECISIONS: Tuple[str, ...] = (
+    "",
+    "gcp.rec.memory.wandering_dementia",
+    "gcp.rec.memory.high_score",
+    "gcp.rec.assisted.safety_supervision",
+    "gcp.rec.home.viable_support",
+)
+PAYMENT_CONTEXTS: Tuple[str, ...] = ("private", "medicaid")
+
+RESULT_DTYPE = np.dtype(
+    [
+        ("MC", "f8"),
+        ("AL", "f8"),
+        ("HC", "f8"),
+        ("al_bias", "?"),
+        ("hard_stop", "?"),
+        ("outcome", "i1"),
+        ("decision", "i1"),
+        ("payment", "i1"),
+        ("falls_flag", "?"),
+        ("wandering_flag", "?"),
+        ("med_mgmt_flag", "?"),
+        ("valid", "?"),
+    ]
+)
+
+# Which encoding tables each input feeds: (E tables, HCM tables).
+_TABLES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "cognition": (("cognition",), ("cog_map",)),
+    "adl": (("adl",), ("adl_map",)),
+    "meds": (("meds",), ("meds_map",)),
+    "falls": (("falls",), ("fall_sub",)),
+    "home": (("home",), ("home_gain",)),
+    "mobility": (("mobility",), ("mob_sub",)),
+    "supervision": (("supervision_bias_HC",), ()),
+    "isolation": (("isolation",), ("iso_sub",)),
+    "access": (("access",), ("access_sub",)),
+    "support": (("support_penalty", "support_gain"), ()),
+    "behav": (("behav",), ()),
+}
+# Field order in which the bundle engine hits its strict tables (first KeyError wins).
+_STRICT_ORDER = ("adl", "cognition", "meds", "support", "home", "falls", "isolation", "access", "mobility",
+                 "supervision")
+# Tables the bundle engine indexes with ``[]`` (KeyError on unknown tokens).
+_STRICT = {"adl_map", "cog_map", "meds_map", "support_gain", "home_gain", "fall_sub", "iso_sub", "access_sub",
+           "mob_sub", "supervision_bias_HC"}
+
+
+@dataclass(frozen=True)
+class CompiledModel:
+    """Token vocabularies and encoding arrays for one scoring model."""
+
+    version: str
+    vocab: Dict[str, Dict[str, int]]
+    tables: Dict[str, np.ndarray]
+    strict_ok: Dict[str, np.ndarray]
+
+    def code(self, field: str, token: object) -> int:
+        """Return the token index for ``field``; the unknown slot is ``len(vocab)``."""
+        vocab = self.vocab[field]
+        return vocab.get(token, len(vocab)) if isinstance(token, str) else len(vocab)
+
+
+def compile_model(model: Mapping[str, object]) -> CompiledModel:
+    enc = model["encodings"]  # type: ignore[index]
+    hcm = model["hc_component_maps"]  # type: ignore[index]
+    vocab: Dict[str, Dict[str, int]] = {}
+    tables: Dict[str, np.ndarray] = {}
+    strict_ok: Dict[str, np.ndarray] = {}
+    for field, (enc_names, hcm_names) in _TABLES.items():
+        tokens: List[str] = []
+        for name in enc_names:
+            tokens.extend(t for t in enc[name] if t not in tokens)
+        for name in hcm_names:
+            tokens.extend(t for t in hcm[name] if t not in tokens)
+        vocab[field] = {token: i for i, token in enumerate(tokens)}
+        ok = np.ones(len(tokens) + 1, dtype=bool)
+        ok[-1] = False
+        for source, names in ((enc, enc_names), (hcm, hcm_names)):
+            for name in names:
+                # Unknown tokens encode to 0.0, matching ``E[table].get(key, 0.0)``.
+                arr = np.zeros(len(tokens) + 1, dtype=np.float64)
+                for token, value in source[name].items():
+                    arr[vocab[field][token]] = float(value)
+                tables[name] = arr
+                if name in _STRICT:
+                    present = np.zeros(len(tokens) + 1, dtype=bool)
+                    for token in source[name]:
+                        present[vocab[field][token]] = True
+                    ok &= present
+        strict_ok[field] = ok
+    return CompiledModel(str(model.get("version", "")), vocab, tables, strict_ok)
+
+
+@lru_cache(maxsize=4)
+def load_model(path: str = str(SCORING_JSON)) -> CompiledModel:
+    with open(path, "r", encoding="utf-8") as f:
+        return compile_model(json.load(f))
+
+
+def _behavior_value(behav_list: object) -> str:
+    for token in _BEHAVIOR_PRIORITY:
+        if token in behav_list:  # type: ignore[operator]
+            return token
+    return "none"
+
+
+def encode(
+    answers_list: Sequence[Mapping[str, object]],
+    model: Optional[CompiledModel] = None,
+) -> Dict[str, np.ndarray]:
+    """Encode answer dicts into per-field ``int16`` token-code arrays."""
+    model = model or load_model()
+    n = len(answers_list)
+    codes: Dict[str, np.ndarray] = {}
+    for field, key, default in INPUTS:
+        if field == "behav":
+            continue
+        vocab = model.vocab[field]
+        unknown = len(vocab)
+        tokens = [answers.get(key, default) for answers in answers_list]
+        codes[field] = np.fromiter(
+            (vocab.get(t, unknown) if t.__class__ is str else unknown for t in tokens), dtype=np.int16, count=n
+        )
+    behav_lists = [answers.get("behavior_risks") or [] for answers in answers_list]
+    behav_vocab = model.vocab["behav"]
+    codes["behav"] = np.fromiter(
+        (behav_vocab.get(_behavior_value(b), len(behav_vocab)) for b in behav_lists), dtype=np.int16, count=n
+    )
+    codes["wandering"] = np.fromiter(
+        ("wandering" in b or "exit_seeking" in b for b in behav_lists), dtype=bool, count=n
+    )
+    codes["medicaid_yes"] = np.fromiter(
+        (answers.get("medicaid_status") == "yes" for answers in answers_list), dtype=bool, count=n
+    )
+    return codes
+
+
+def _in(codes: np.ndarray, vocab: Mapping[str, int], tokens: Iterable[str]) -> np.ndarray:
+    return np.isin(codes, [vocab[t] for t in tokens if t in vocab])
+
+
+def score_encoded(
+    codes: Mapping[str, np.ndarray],
+    on_medicaid: Optional[np.ndarray] = None,
+    model: Optional[CompiledModel] = None,
+) -> np.ndarray:
+    """Score pre-encoded inputs; returns a ``RESULT_DTYPE`` array."""
+    model = model or load_model()
+    T, V = model.tables, model.vocab
+    cog, adl, meds = codes["cognition"], codes["adl"], codes["meds"]
+    fall, home, mob = codes["falls"], codes["home"], codes["mobility"]
+    sup, iso, acc = codes["supervision"], codes["isolation"], codes["access"]
+    support, behav = codes["support"], codes["behav"]
+    n = len(cog)
+
+    MC = (0.45 * T["cognition"][cog] + 0.20 * T["adl"][adl] + 0.15 * T["meds"][meds]
+          + 0.10 * T["home"][home] + 0.07 * T["falls"][fall]
+          + 0.03 * np.maximum(0.0, T["support_penalty"][support])
+          + 0.10 * np.minimum(T["behav"][behav], 1.2))
+    AL = (0.35 * T["adl"][adl] + 0.20 * T["isolation"][iso]
+          + 0.15 * np.maximum(0.0, -T["support_penalty"][support])
+          + 0.15 * T["home"][home] + 0.10 * T["mobility"][mob]
+          + 0.05 * np.minimum(T["cognition"][cog], 0.6) + 0.05 * T["access"][acc])
+    HC_raw = (1.5
+              - T["adl_map"][adl]
+              - T["cog_map"][cog]
+              - T["meds_map"][meds]
+              + T["support_gain"][support]
+              + T["home_gain"][home]
+              - T["fall_sub"][fall]
+              - T["iso_sub"][iso]
+              - T["access_sub"][acc]
+              - T["mob_sub"][mob])
+    HC = np.clip((HC_raw + 1.0) / 3.0, 0.0, 1.0)
+    HC = np.clip(HC + T["supervision_bias_HC"][sup], 0.0, 1.0)
+
+    home_unsafe = home == V["home"].get("unsafe", -1)
+    low_support = _in(support, V["support"], ("few_days_week", "none"))
+    fell = _in(fall, V["falls"], ("one", "recurrent"))
+    safety_bias = home_unsafe | (fell & low_support)
+    AL = np.where(safety_bias, np.clip(AL + 0.25, 0.0, 1.0), AL)
+    iso_bias = _in(iso, V["isolation"], ("rarely", "almost_never")) & low_support
+    AL = np.where(iso_bias, np.clip(AL + 0.15, 0.0, 1.0), AL)
+    al_bias = safety_bias | iso_bias
+
+    hard_stop = (cog == V["cognition"].get("severe", -1)) & (
+        _in(adl, V["adl"], ("4-5", "6+"))
+        | (meds == V["meds"].get("complex", -1))
+        | home_unsafe
+        | _in(behav, V["behav"], ("wandering", "exit_seeking"))
+    )
+    exception_ok = _in(sup, V["supervision"], ("always", "sometimes")) & ~home_unsafe
+    memory_stop = hard_stop & ~exception_ok
+    memory_score = ~memory_stop & (MC >= 0.85)
+
+    home_wins = HC >= AL
+    tie = np.abs(HC - AL) <= 0.10
+    pick_home = np.where(tie, ~al_bias & home_wins, home_wins)
+    outcome = np.where(pick_home, 1, 2).astype(np.int8)
+    outcome[memory_stop | memory_score] = 3
+    decision = np.where(pick_home, 4, 3).astype(np.int8)
+    decision[memory_score] = 2
+    decision[memory_stop] = 1
+
+    valid = np.ones(n, dtype=bool)
+    for field in ("cognition", "adl", "meds", "falls", "home", "mobility", "supervision", "isolation", "access",
+                  "support"):
+        valid &= model.strict_ok[field][codes[field]]
+
+    out = np.zeros(n, dtype=RESULT_DTYPE)
+    out["MC"], out["AL"], out["HC"] = MC, AL, HC
+    out["al_bias"], out["hard_stop"] = al_bias, hard_stop
+    out["outcome"] = np.where(valid, outcome, 0)
+    out["decision"] = np.where(valid, decision, 0)
+    medicaid = codes["medicaid_yes"] if on_medicaid is None else (codes["medicaid_yes"] | on_medicaid)
+    out["payment"] = medicaid.astype(np.int8)
+    out["falls_flag"] = fell
+    out["wandering_flag"] = codes["wandering"]
+    out["med_mgmt_flag"] = _in(meds, V["meds"], ("several", "complex"))
+    out["valid"] = valid
+    return out
+
+
+def score_batch(
+    answers_list: Sequence[Mapping[str, object]],
+    auds: Optional[Sequence[Mapping[str, object]]] = None,
+    model: Optional[CompiledModel] = None,
+) -> np.ndarray:
+    """Score many answer sets in one vectorized call.
+
+    Rows whose answers use tokens the bundle engine would reject (``KeyError``)
+    come back with ``valid=False`` and outcome ``"none"``.
+    """
+    model = model or load_model()
+    codes = encode(answers_list, model)
+    on_medicaid = None
+    if auds is not None:
+        on_medicaid = np.fromiter((bool(a.get("on_medicaid")) for a in auds), dtype=bool, count=len(auds))
+    return score_encoded(codes, on_medicaid, model)
+
+
+def evaluate_guided_care(answers: Dict, aud: Dict) -> Tuple[Dict, Dict]:
+    """Drop-in equivalent of the bundle engine's ``evaluate_guided_care``, analytics event included."""
+    model = load_model()
+    row = score_batch([answers], [aud], model)[0]
+    if not row["valid"]:
+        defaults = {field: (key, default) for field, key, default in INPUTS}
+        for field in _STRICT_ORDER:
+            key, default = defaults[field]
+            if not model.strict_ok[field][model.code(field, answers.get(key, default))]:
+                raise KeyError(answers.get(key, default))
+
+    medicaid_status = answers.get("medicaid_status")
+    payment_context = PAYMENT_CONTEXTS[int(row["payment"])]
+    funding_conf = answers.get("funding_confidence", "unsure")
+    behav_list = answers.get("behavior_risks") or []
+    outcome = int(row["outcome"])
+
+    gcp = {
+        "recommended_setting": SETTINGS[outcome],
+        "care_intensity": INTENSITIES[outcome],
+        "safety_flags": {
+            "falls": bool(row["falls_flag"]),
+            "wandering": bool(row["wandering_flag"]),
+            "med_mgmt": bool(row["med_mgmt_flag"]),
+        },
+        "chronic_conditions": [c for c in (answers.get("chronic") or []) if c != "none"],
+        "payment_context": payment_context,
+        "funding_confidence": funding_conf,
+        "audiencing_snapshot": dict(aud),
+        "DecisionTrace": [{"rule_id": DECISIONS[int(row["decision"])], "why": "Primary recommendation rule"}],
+    }
+    if payment_context == "medicaid":
+        gcp["DecisionTrace"].append({"rule_id": "gcp.nudge.medicaid_path", "why": "Medicaid pathway"})
+    if payment_context == "private" and funding_conf in {"unsure", "not_confident"}:
+        gcp["DecisionTrace"].append(
+            {"rule_id": "gcp.nudge.financial_confidence", "why": f"Funding confidence is '{funding_conf}'"}
+        )
+    trace("gcp.recommended_setting", f"{gcp['recommended_setting']}/{gcp['care_intensity']} ({payment_context})",
+          "gcp", rule_id=gcp["DecisionTrace"][0]["rule_id"], extra={"safety_flags": gcp["safety_flags"]})
+
+    derived_keys = ("cognition", "adl", "meds", "falls", "home", "mobility", "supervision", "isolation", "access",
+                    "caregiver_support")
+    derived = {
+        name: answers.get(key, default)
+        for name, (_field, key, default) in zip(derived_keys, INPUTS[:-1])
+    }
+    derived["behavior"] = _behavior_value(behav_list)
+    context = {
+        "derived": derived,
+        "route": "medicaid_offramp" if medicaid_status == "yes" else None,
+        "medicaid_unsure_flag": medicaid_status == "unsure",
+    }
+    return context, gcp
@@ -1,83 +1,48 @@
+"""Guided Care Plan engine façade.
+
+Importing this module does no file I/O.  The bundle recommendation engine
+(``gcp_pr_tool_bundle.guided_care_plan.engine``) is imported on the first call
+to :func:`evaluate_guided_care` or the first access to one of its attributes,
+and its scoring model, blurbs and questions are loaded on first use.  Analytics
+go through :mod:`senior_nav.lib.trace`.
+"""
 from __future__ import annotations
-from functools import lru_cache
 from datetime import datetime, timezone
-import sys
-import types
-from typing import Dict, List, Tuple
+import importlib
+from typing import Dict, List, Optional, Tuple
 
-if "senior_nav.lib" not in sys.modules:
-    sys.modules["senior_nav.lib"] = types.ModuleType("senior_nav.lib")
-if "senior_nav.lib.trace" not in sys.modules:
-    trace_module = types.ModuleType("senior_nav.lib.trace")
+from gcp_core.catalog import Question, catalog
+from gcp_core.questions import SECTION_ORDER
+from gcp_core.state import ensure_session
+from gcp_pr_tool_bundle.guided_care_plan.state import get_answers as _bundle_get_answers
+from gcp_core.incremental import IncrementalScorer, session_scorer
+from senior_nav.lib.frozen import FrozenDict, refreeze
 
-    def _noop_trace(*args, **kwargs):
-        return None
+_BUNDLE_ENGINE = "gcp_pr_tool_bundle.guided_care_plan.engine"
 
-    trace_module.trace = _noop_trace
-    sys.modules["senior_nav.lib.trace"] = trace_module
-    sys.modules["senior_nav.lib"].trace = trace_module
 
-from gcp_pr_tool_bundle.guided_care_plan.engine import *  # noqa: F401,F403
-from gcp_pr_tool_bundle.guided_care_plan.engine import evaluate_guided_care  # noqa: F401
-from gcp_core.questions import load_questions
-from gcp_core.state import ensure_session
-from gcp_pr_tool_bundle.guided_care_plan.state import get_answers as _bundle_get_answers
-from gcp_core import scoring as gcp_scoring
-
-SECTION_ORDER: List[Tuple[str, List[str]]] = [
-    ("financial", ["medicaid_status", "funding_confidence"]),
-    ("daily_life_support", ["caregiver_support", "adl_help", "social_isolation", "geographic_access"]),
-    ("health_safety", ["cognition", "behavior_risks", "falls", "med_mgmt", "mobility", "supervision", "home_safety"]),
-    ("context_prefs", ["chronic"]),
-]
-
-
-@lru_cache(maxsize=1)
-def _question_map() -> Dict[str, Dict]:
-    grouped: Dict[str, Dict] = {}
-    for row in load_questions():
-        qid = row["id"]
-        entry = grouped.setdefault(
-            qid,
-            {
-                "id": qid,
-                "label": row.get("label", "").strip(),
-                "type": row.get("type", "single").strip(),
-                "choices": [],
-                "conditional_show": row.get("conditional_show", "").strip(),
-            },
-        )
-        cid = row.get("choice_id")
-        if cid:
-            entry["choices"].append(
-                {
-                    "id": cid,
-                    "label": row.get("choice_label", "").strip(),
-                }
-            )
-    return grouped
-
-
-def questions_for_section(section: str) -> List[Dict]:
+def _bundle():
+    return importlib.import_module(_BUNDLE_ENGINE)
+
+
+def __getattr__(name: str):
+    # Names this module used to star-import from the bundle engine.
+    if name.startswith("__"):
+        raise AttributeError(name)
+    try:
+        return getattr(_bundle(), name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+
+def evaluate_guided_care(answers: Dict, aud: Dict) -> Tuple[Dict, Dict]:
+    return _bundle().evaluate_guided_care(answers, aud)
+
+
+def questions_for_section(section: str) -> Tuple[Question, ...]:
+    """Questions in ``section`` in page order (shared, read-only views)."""
     ensure_session()
-    mapping = dict(SECTION_ORDER)
-    question_ids = mapping.get(section, [])
-    qmap = _question_map()
-    questions: List[Dict] = []
-    for qid in question_ids:
-        if qid not in qmap:
-            continue
-        q = qmap[qid]
-        questions.append(
-            {
-                "id": q["id"],
-                "label": q["label"],
-                "type": q["type"],
-                "choices": list(q["choices"]),
-                "conditional_show": q.get("conditional_show", ""),
-            }
-        )
-    return questions
+    return catalog().section(section)
 
 
 def next_section(current: str) -> str | None:
@@ -91,20 +56,15 @@ def next_section(current: str) -> str | None:
 
 def score_answers() -> Dict:
     ensure_session()
-    answers = _bundle_get_answers()
-    return gcp_scoring.score_answers(answers)
+    scorer = session_scorer("_gcp_bundle_scorer", IncrementalScorer)
+    scorer.sync(_bundle_get_answers())
+    return dict(scorer.scorecard)
 
 
 def _label_for(qid: str, token: str | None) -> str | None:
     if not token:
         return None
-    question = _question_map().get(qid)
-    if not question:
-        return token
-    for choice in question.get("choices", []):
-        if choice.get("id") == token:
-            return choice.get("label")
-    return token
+    return catalog().label_for(qid, token) or token
 
 
 def build_conversational_summary(answers: Dict, scoring: Dict) -> List[str]:
@@ -152,8 +112,9 @@ def build_conversational_summary(answers: Dict, scoring: Dict) -> List[str]:
     return bullets[:7]
 
 
-def snapshot(answers: Dict, scoring: Dict) -> Dict:
-    return {
+def snapshot(answers: Dict, scoring: Dict, previous: Optional[FrozenDict] = None) -> FrozenDict:
+    """Immutable GCP snapshot; answers and scoring parts unchanged since ``previous`` are shared."""
+    return refreeze(previous, {
         "version": "gcp.v1.0",
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "answers": answers,
@@ -162,4 +123,4 @@ def snapshot(answers: Dict, scoring: Dict) -> Dict:
             "setting": scoring.get("recommended_setting"),
             "acuity": scoring.get("acuity_level"),
         },
-    }
+    })
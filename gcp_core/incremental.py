@@ -0,0 +1,230 @@
+"""Incremental Guided Care Plan scoring.
+
+Pages used to call :func:`gcp_core.scoring.score_answers` (or re-run the V3
+matrix) from scratch after every answer.  The scorers here keep the last
+result and a dependency graph from question to what it feeds:
+
+* v2: ``SECTION_ORDER`` gives each question its section; the per-question
+  terms in :mod:`gcp_core.scoring` give the risk flags and score points it
+  owns.  A changed answer recomputes one term, adjusts its section subtotal
+  and the running score, and the payload is re-derived from the merged flags.
+* v3: :func:`gcp_core.v3_scoring.key_dependents` maps an answer key to the
+  matrix questions it reads (plus questions gated on those).  Only those
+  contributions and the domains they touch are recomputed; the tier is then
+  re-derived from the per-domain winners and flag counts.
+
+``update`` costs O(changed inputs).  ``sync`` compares a whole answers dict
+against the last seen values, for stores that are written without going
+through ``set_answer``.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Mapping, Optional, Set, Tuple
+
+from . import scoring, v3_scoring, v3_summary_rules
+from .questions import SECTION_ORDER
+from .v3_scoring import EMPTY, Contribution, V3Result
+
+_MISSING = object()
+
+
+def _snapshot(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+@dataclass(frozen=True)
+class Dependency:
+    section: str
+    flags: Tuple[str, ...]
+
+
+@lru_cache(maxsize=1)
+def dependency_graph() -> Dict[str, Dependency]:
+    """v2 question id -> section and the risk flags it feeds."""
+    section_of = {qid: section for section, qids in SECTION_ORDER for qid in qids}
+    graph: Dict[str, Dependency] = {}
+    for qid in scoring.QUESTION_TERMS:
+        term = scoring.question_term(qid, None)
+        graph[qid] = Dependency(section_of.get(qid, ""), tuple(term.flags))
+    return graph
+
+
+class IncrementalScorer:
+    """Keeps the v2 scoring payload current one answer at a time."""
+
+    def __init__(self, answers: Optional[Mapping[str, Any]] = None) -> None:
+        self._values: Dict[str, Any] = {}
+        self._terms: Dict[str, scoring.Term] = {}
+        self._flags: Dict[str, bool] = {}
+        self._extra: Dict[str, Any] = {}
+        self._sections: Dict[str, float] = {section: 0.0 for section, _qids in SECTION_ORDER}
+        self._score = 0.0
+        for qid in scoring.QUESTION_TERMS:
+            self._apply(qid, None)
+        self._card: Optional[Dict[str, Any]] = None
+        self.recomputed = 0
+        if answers:
+            self.sync(answers)
+
+    def _apply(self, qid: str, value: Any) -> None:
+        term = scoring.question_term(qid, value)
+        old = self._terms.get(qid)
+        section = dependency_graph()[qid].section
+        delta = term.score - (old.score if old else 0.0)
+        self._score += delta
+        if section:
+            self._sections[section] = self._sections.get(section, 0.0) + delta
+        self._flags.update(term.flags)
+        self._extra.update(term.extra)
+        self._terms[qid] = term
+
+    def update(self, qid: str, value: Any) -> bool:
+        """Record one answer; returns ``True`` when anything was recomputed."""
+        snap = _snapshot(value)
+        if self._values.get(qid, _MISSING if value is not None else None) == snap:
+            return False
+        self._values[qid] = snap
+        if qid not in scoring.QUESTION_TERMS:
+            return False
+        self._apply(qid, value)
+        self._card = None
+        self.recomputed += 1
+        return True
+
+    def sync(self, answers: Mapping[str, Any]) -> int:
+        """Apply every changed answer in ``answers``; returns how many terms were recomputed."""
+        changed = 0
+        for qid in scoring.QUESTION_TERMS:
+            changed += self.update(qid, answers.get(qid))
+        return changed
+
+    @property
+    def section_scores(self) -> Dict[str, float]:
+        return dict(self._sections)
+
+    @property
+    def scorecard(self) -> Dict[str, Any]:
+        """The same payload as :func:`gcp_core.scoring.score_answers`; treat it as read-only."""
+        if self._card is None:
+            self._card = scoring.finalize(self._flags, self._score, self._extra)
+        return self._card
+
+
+class V3IncrementalScorer:
+    """Keeps the V3 domain scores, flags and tier current one answer at a time."""
+
+    def __init__(self, answers: Optional[Mapping[str, Any]] = None, flags: Iterable[str] = ()) -> None:
+        self._answers: Dict[str, Any] = {}
+        self._selected: Dict[str, Tuple[str, ...]] = {}
+        self._contribs: Dict[str, Contribution] = {}
+        self._domain_best: Dict[str, Contribution] = {}
+        self._counts: Counter = Counter()
+        self._extra_flags: frozenset = frozenset(flags)
+        self._result: Optional[V3Result] = None
+        self.recomputed = 0
+        if answers:
+            self.sync(answers)
+
+    def _refresh(self, qids: Iterable[str]) -> None:
+        qids = tuple(qids)
+        for qid in qids:
+            options = v3_scoring.question_options(self._answers, qid)
+            if options:
+                self._selected[qid] = options
+            else:
+                self._selected.pop(qid, None)
+        dirty: Set[str] = set()
+        for qid in qids:
+            new = v3_scoring.contribution(qid, self._selected) if qid in self._selected else EMPTY
+            old = self._contribs.get(qid, EMPTY)
+            if new == old:
+                continue
+            self._counts.subtract(old.flags)
+            self._counts.update(new.flags)
+            dirty.update(d for d in (old.domain, new.domain) if d)
+            if new is EMPTY:
+                self._contribs.pop(qid, None)
+            else:
+                self._contribs[qid] = new
+            self.recomputed += 1
+        for domain in dirty:
+            best = v3_scoring.best_for_domain(
+                self._contribs[q] for q in _domain_questions().get(domain, ()) if q in self._contribs
+            )
+            if best is None:
+                self._domain_best.pop(domain, None)
+            else:
+                self._domain_best[domain] = best
+        self._result = None
+
+    def update(self, key: str, value: Any) -> bool:
+        snap = _snapshot(value)
+        if self._answers.get(key, _MISSING if value is not None else None) == snap:
+            return False
+        if value is None:
+            self._answers.pop(key, None)
+        else:
+            self._answers[key] = snap
+        self._refresh(v3_scoring.key_dependents().get(key, ()))
+        return True
+
+    def sync(self, answers: Mapping[str, Any]) -> int:
+        changed = 0
+        for key in set(self._answers) | set(answers):
+            changed += self.update(key, answers.get(key))
+        return changed
+
+    def set_flags(self, flags: Iterable[str]) -> None:
+        flags = frozenset(flags)
+        if flags != self._extra_flags:
+            self._extra_flags = flags
+            self._result = None
+
+    @property
+    def result(self) -> V3Result:
+        if self._result is None:
+            self._result = v3_scoring.combine(self._domain_best, +self._counts, self._extra_flags)
+        return self._result
+
+    @property
+    def scorecard(self) -> Dict[str, Any]:
+        result = self.result
+        return {
+            "domains": dict(result.domain_scores),
+            "tier": result.tier,
+            "tier_label": v3_summary_rules.tier_label(result.tier),
+            "flags": set(result.flags),
+        }
+
+
+@lru_cache(maxsize=1)
+def _domain_questions() -> Dict[str, Tuple[str, ...]]:
+    by_domain: Dict[str, Set[str]] = {}
+    for row in v3_scoring.tables().rows.values():
+        by_domain.setdefault(row.domain, set()).add(row.qid)
+    return {domain: tuple(sorted(qids, key=lambda q: int(q[1:]))) for domain, qids in by_domain.items()}
+
+
+# ------------------------------------------------------------------
+# Session helpers
+# ------------------------------------------------------------------
+def session_scorer(key: str, factory=IncrementalScorer, answers: Optional[Mapping[str, Any]] = None):
+    """Return the scorer stored under ``key`` in ``st.session_state``.
+
+    On first use (a new session, or one restored without its scorer) it is
+    created from ``answers``, so it starts from what is already stored.
+    """
+    import streamlit as st
+
+    scorer = st.session_state.get(key)
+    if not isinstance(scorer, factory):
+        scorer = factory(answers)
+        st.session_state[key] = scorer
+    return scorer
@@ -1,10 +1,17 @@
 from __future__ import annotations
 import csv
 from pathlib import Path
-from typing import Dict, Iterable, Sequence, Tuple
+from typing import Dict, Iterable, List, Sequence, Tuple
 
 _ASSETS = Path(__file__).parent / "assets"
 
+SECTION_ORDER: List[Tuple[str, List[str]]] = [
+    ("financial", ["medicaid_status", "funding_confidence"]),
+    ("daily_life_support", ["caregiver_support", "adl_help", "social_isolation", "geographic_access"]),
+    ("health_safety", ["cognition", "behavior_risks", "falls", "med_mgmt", "mobility", "supervision", "home_safety"]),
+    ("context_prefs", ["chronic"]),
+]
+
 BEHAVIOR_RISKS_QID = "behavior_risks"
 BEHAVIOR_RISKS_LABEL = "Any wandering or unsafe behaviors? (check all that apply)"
 BEHAVIOR_RISKS_OPTIONS: Sequence[Tuple[str, str]] = (
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
 
 from .questions import BEHAVIOR_RISKS_OPTIONS
 
@@ -65,59 +66,94 @@ def score_behavior_risks(selected: List[str]) -> Dict[str, object]:
     return {"subtotal": subtotal, "tier": tier, "flags": normalized}
 
 
-def score_answers(answers: Dict) -> Dict:
-    cognition = (answers.get("cognition") or "").strip()
-    falls = (answers.get("falls") or "none").strip()
-    behavior = _normalize_behavior_risks(answers.get("behavior_risks"))
+RISK_FLAG_ORDER: Tuple[str, ...] = (
+    "cognition_severe",
+    "wandering_risk",
+    "behavior_aggression",
+    "falls_risk",
+    "supervision_gap",
+    "home_unsafe",
+    "med_mgmt_complex",
+    "support_gap",
+    "adl_high",
+    "isolation_high",
+    "mobility_limitations",
+)
+
+
+@dataclass(frozen=True)
+class Term:
+    """What one answer contributes: its risk flags, score points and extras."""
+
+    flags: Dict[str, bool]
+    score: float = 0.0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+def _token(value: Any, default: str) -> str:
+    return (value or default).strip()
+
+
+def _cognition_term(value: Any) -> Term:
+    severe = _token(value, "") in SEVERE_COGNITION
+    return Term({"cognition_severe": severe}, 2.0 if severe else 0.0)
+
+
+def _behavior_term(value: Any) -> Term:
+    behavior = _normalize_behavior_risks(value)
     behavior_score = score_behavior_risks(behavior)
-    supervision = (answers.get("supervision") or "always").strip()
-    home = (answers.get("home_safety") or "safe").strip()
-    med_mgmt = (answers.get("med_mgmt") or "simple").strip()
-    caregiver = (answers.get("caregiver_support") or "24_7").strip()
-    adl = (answers.get("adl_help") or "0-1").strip()
-    isolation = (answers.get("social_isolation") or "daily_or_often").strip()
-    mobility = (answers.get("mobility") or "no_issues").strip()
-
-    risk_flags = {
-        "cognition_severe": cognition in SEVERE_COGNITION,
+    points = {"high": 1.5, "moderate": 1.0, "low": 0.5}.get(behavior_score["tier"], 0.0)
+    flags = {
         "wandering_risk": any(token in {"wandering", "exit_seeking", "elopement"} for token in behavior),
         "behavior_aggression": "aggression" in behavior,
-        "falls_risk": falls in {"one", "recurrent"},
-        "supervision_gap": supervision in {"rarely", "never"},
-        "home_unsafe": home in {"some_risks", "unsafe"},
-        "med_mgmt_complex": med_mgmt in {"several", "complex"},
-        "support_gap": caregiver in LIMITED_SUPPORT,
-        "adl_high": adl in HIGH_ADL_NEED,
-        "isolation_high": isolation in ISOLATION_HIGH,
-        "mobility_limitations": mobility in MOBILITY_LIMITED,
     }
+    return Term(flags, points, {"behavior_risks": behavior_score})
 
-    score = 0.0
-    if risk_flags["cognition_severe"]:
-        score += 2.0
+
+def _falls_term(value: Any) -> Term:
+    falls = _token(value, "none")
+    risk = falls in {"one", "recurrent"}
+    return Term({"falls_risk": risk}, (1.5 if falls == "recurrent" else 1.0) if risk else 0.0)
+
+
+def _flag_term(flag: str, default: str, matches: frozenset, points: float) -> Callable[[Any], Term]:
+    def term(value: Any) -> Term:
+        hit = _token(value, default) in matches
+        return Term({flag: hit}, points if hit else 0.0)
+
+    return term
+
+
+def _mobility_term(value: Any) -> Term:
+    mobility = _token(value, "no_issues")
+    limited = mobility in MOBILITY_LIMITED
+    return Term({"mobility_limitations": limited}, 0.5 if limited else 0.0, {"wheelchair": mobility == "wheelchair"})
+
+
+# question id -> contribution; score_answers and gcp_core.incremental share these.
+QUESTION_TERMS: Dict[str, Callable[[Any], Term]] = {
+    "cognition": _cognition_term,
+    "behavior_risks": _behavior_term,
+    "falls": _falls_term,
+    "supervision": _flag_term("supervision_gap", "always", frozenset({"rarely", "never"}), 1.0),
+    "home_safety": _flag_term("home_unsafe", "safe", frozenset({"some_risks", "unsafe"}), 0.75),
+    "med_mgmt": _flag_term("med_mgmt_complex", "simple", frozenset({"several", "complex"}), 0.75),
+    "caregiver_support": _flag_term("support_gap", "24_7", frozenset(LIMITED_SUPPORT), 0.75),
+    "adl_help": _flag_term("adl_high", "0-1", frozenset(HIGH_ADL_NEED), 1.0),
+    "social_isolation": _flag_term("isolation_high", "daily_or_often", frozenset(ISOLATION_HIGH), 0.5),
+    "mobility": _mobility_term,
+}
+
+
+def question_term(qid: str, value: Any) -> Term:
+    return QUESTION_TERMS[qid](value)
+
+
+def finalize(risk_flags: Dict[str, bool], score: float, extra: Dict[str, Any]) -> Dict:
+    """Turn merged flags and the summed score into the scoring payload."""
+    risk_flags = {flag: bool(risk_flags.get(flag)) for flag in RISK_FLAG_ORDER}
+    behavior_score = extra.get("behavior_risks") or score_behavior_risks([])
     behavior_tier = behavior_score["tier"]
-    if behavior_tier == "high":
-        score += 1.5
-    elif behavior_tier == "moderate":
-        score += 1.0
-    elif behavior_tier == "low":
-        score += 0.5
-    if risk_flags["falls_risk"]:
-        score += 1.5 if falls == "recurrent" else 1.0
-    if risk_flags["supervision_gap"]:
-        score += 1.0
-    if risk_flags["home_unsafe"]:
-        score += 0.75
-    if risk_flags["med_mgmt_complex"]:
-        score += 0.75
-    if risk_flags["support_gap"]:
-        score += 0.75
-    if risk_flags["adl_high"]:
-        score += 1.0
-    if risk_flags["isolation_high"]:
-        score += 0.5
-    if risk_flags["mobility_limitations"]:
-        score += 0.5
 
     if score <= 2.0:
         acuity = "low"
@@ -131,7 +167,7 @@ def score_answers(answers: Dict) -> Dict:
         risk_flags["supervision_gap"] or risk_flags["home_unsafe"]
     ):
         recommended_setting = "memory_care"
-    elif risk_flags["med_mgmt_complex"] and mobility == "wheelchair" and risk_flags["supervision_gap"]:
+    elif risk_flags["med_mgmt_complex"] and extra.get("wheelchair") and risk_flags["supervision_gap"]:
         recommended_setting = "skilled_nursing"
     elif acuity == "high" or (
         risk_flags["home_unsafe"] and risk_flags["support_gap"]
@@ -167,3 +203,15 @@ def score_answers(answers: Dict) -> Dict:
         "rationale": rationale,
         "behavior_risks": behavior_score,
     }
+
+
+def score_answers(answers: Dict) -> Dict:
+    risk_flags: Dict[str, bool] = {}
+    extra: Dict[str, Any] = {}
+    score = 0.0
+    for qid, term_fn in QUESTION_TERMS.items():
+        term = term_fn(answers.get(qid))
+        risk_flags.update(term.flags)
+        extra.update(term.extra)
+        score += term.score
+    return finalize(risk_flags, score, extra)
@@ -5,6 +5,8 @@ from typing import Any, Dict, Iterable, MutableMapping
 
 import streamlit as st
 
+from .incremental import IncrementalScorer, session_scorer
+
 _DEFAULT_PROGRESS: Dict[str, int] = {
     "landing": 0,
     "daily_life": 0,
@@ -15,6 +17,7 @@ _DEFAULT_PROGRESS: Dict[str, int] = {
 
 _DEFAULT_RESUME_PATH = "app_pages/gcp_v2/gcp_landing_v2.py"
 _MEDICAID_FIELD = "medicaid_status"
+_SCORER_KEY = "_gcp_scorer"
 
 _YES_TOKENS = {"yes", "y", "enrolled", "on_medicaid", "medicaid_yes"}
 _NO_TOKENS = {"no", "n", "not_enrolled", "private_pay", "medicaid_no"}
@@ -73,6 +76,8 @@ def set_answer(qid: str, value: Any) -> None:
     else:
         answers[qid] = value
 
+    session_scorer(_SCORER_KEY, IncrementalScorer, answers).update(qid, answers.get(qid))
+
     if qid == _MEDICAID_FIELD:
         current_status = get_medicaid_status(answers)
         if current_status != previous_status:
@@ -80,6 +85,14 @@ def set_answer(qid: str, value: Any) -> None:
             gcp["_last_medicaid_status"] = current_status
 
 
+def scorecard() -> Dict[str, Any]:
+    """Return the current scoring payload, recomputing only answers that changed."""
+    answers = get_answers()
+    scorer = session_scorer(_SCORER_KEY, IncrementalScorer, answers)
+    scorer.sync(answers)
+    return scorer.scorecard
+
+
 def clear_answer(qid: str) -> None:
     """Remove a question answer entirely."""
     set_answer(qid, None)
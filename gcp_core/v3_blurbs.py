@@ -0,0 +1,54 @@
+"""Conversational blurbs for Guided Care Plan V3.
+
+``gcp_v3_logical_pack/gcp_v3_conversational_blurbs.csv`` is loaded once per
+process into a table keyed by ``(QuestionID, AnswerOption)`` using the same
+option keys as :mod:`gcp_core.v3_scoring`.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from . import v3_scoring, v3_summary_rules
+
+BLURBS_CSV = Path(__file__).resolve().parents[1] / "gcp_v3_logical_pack" / "gcp_v3_conversational_blurbs.csv"
+VARIANTS = ("BlurbVariant1", "BlurbVariant2", "BlurbVariant3")
+
+
+def load_blurbs(path: Path = BLURBS_CSV) -> Dict[Tuple[str, str], Tuple[str, ...]]:
+    table: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+    for rec in v3_scoring.read_pack_csv(path):
+        _item, option = v3_scoring.option_key(rec["Question"].strip(), rec["AnswerOption"].strip())
+        table[(rec["QuestionID"].strip(), option)] = tuple((rec.get(v) or "").strip() for v in VARIANTS)
+    return table
+
+
+@lru_cache(maxsize=1)
+def blurbs() -> Dict[Tuple[str, str], Tuple[str, ...]]:
+    """Return the parsed blurb table (loaded once per process)."""
+    return load_blurbs()
+
+
+def blurb_for(qid: str, option: str, variant: int = 3) -> str:
+    row = blurbs().get((qid, option))
+    return row[variant - 1] if row else ""
+
+
+def pick_blurbs_variant3(
+    domain_scores: Mapping[str, int],
+    answers: Mapping[str, Any],
+    flags: Iterable[str] = (),
+) -> List[str]:
+    """Return one BlurbVariant3 sentence per scored domain, in summary-rule order."""
+    result = v3_scoring.evaluate(answers, flags)
+    order = v3_summary_rules.rules().domains or tuple(result.domain_scores)
+    lines: List[str] = []
+    for domain in (*order, *(d for d in result.domain_scores if d not in order)):
+        if not result.domain_scores.get(domain):
+            continue
+        row = result.winners[domain]
+        text = blurb_for(row.qid, row.option)
+        if text:
+            lines.append(text)
+    return lines
@@ -0,0 +1,703 @@
+"""Data-driven scoring for Guided Care Plan V3.
+
+The scoring matrix in ``gcp_v3_logical_pack/gcp_v3_scoring.csv`` is parsed once
+per process into lookup tables keyed by ``(QuestionID, AnswerOption)``.  For
+multi-item questions (BADLs, IADLs, chronic conditions) the option key is
+``"<item> \\u2014 <level>"``, the same shape the matrix already uses for behaviors.
+``GatingLogic`` ("Show only if ...") and the ``RULE`` rows (overrides and
+modifiers) are compiled into small predicates at load time, so an evaluation
+is a handful of dict lookups.
+
+Answers may use the canonical matrix labels keyed by QuestionID (``{"Q2":
+"Regular - needs daily assistance"}``) or the short keys/labels written by the
+V3 pages (``overall_help``, ``badls``, ``cognitive`` ...); :func:`canonical_answers`
+maps the latter onto the matrix.
+
+The pack does not define a base tier from scores, only overrides and modifiers
+on top of one.  The base tier here is the weighted share of the maximum burden
+(``DomainWeight`` of the winning row per domain) bucketed by
+:data:`BASE_TIER_THRESHOLDS`.
+"""
+from __future__ import annotations
+
+import csv
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from . import v3_summary_rules
+
+PACK_DIR = Path(__file__).resolve().parents[1] / "gcp_v3_logical_pack"
+SCORING_CSV = PACK_DIR / "gcp_v3_scoring.csv"
+
+MAX_TIER = 4
+MAX_SCORE = 3
+# Weighted burden share -> base tier (upper bounds, exclusive).
+BASE_TIER_THRESHOLDS: Tuple[Tuple[float, int], ...] = ((0.10, 0), (0.30, 1), (0.60, 2))
+BASE_TIER_CEILING = 3
+
+ADL_DOMAIN = "ADL/IADL Burden"
+_ITEM_QUESTION = re.compile(r"^(?:BADLs|IADLs|Chronic condition)\s+\u2014\s+([^:]+)")
+_ADDITIVE_NOTE = re.compile(r"(adds|contributes) \+1", re.IGNORECASE)
+_SHOW_IF_NOT = re.compile(r'Show only if (Q\d+) ≠ "([^"]+)"')
+_SHOW_IF_IN = re.compile(r"Show only if (Q\d+) ∈ \{([^}]+)\}")
+_SHOW_IF_COUNT = re.compile(r"Show only if (Q\d+) ≥ (\d+)")
+
+Answers = Mapping[str, Any]
+Gate = Callable[[Dict[str, Tuple[str, ...]]], bool]
+
+
+@dataclass(frozen=True)
+class ScoreRow:
+    qid: str
+    domain: str
+    option: str
+    item: str
+    score: int
+    weight: int
+    flags: Tuple[str, ...]
+    order: int
+    priority: int = 0
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    kind: str  # "set", "floor" or "delta"
+    value: int
+    test: Callable[[FrozenSet[str], Mapping[str, int]], bool]
+
+
+@dataclass(frozen=True)
+class ScoringTables:
+    rows: Dict[Tuple[str, str], ScoreRow]
+    options: Dict[str, Tuple[str, ...]]
+    domains: Tuple[str, ...]
+    domain_weight: Dict[str, int]
+    additive: FrozenSet[str]
+    gates: Dict[str, Gate]
+    gate_sources: Dict[str, str]
+    rules: Tuple[Rule, ...]
+
+
+@dataclass(frozen=True)
+class V3Result:
+    """One evaluation: per-domain scores, the row behind each score, flags and tier."""
+
+    domain_scores: Dict[str, int]
+    winners: Dict[str, ScoreRow]
+    flags: FrozenSet[str]
+    counts: Dict[str, int]
+    base_tier: int
+    tier: int
+
+
+# ------------------------------------------------------------------
+# Loading (once per process)
+# ------------------------------------------------------------------
+def read_pack_csv(path: Path) -> Iterator[Dict[str, str]]:
+    """Yield rows of a logical-pack CSV as dicts.
+
+    The pack is exported without quoting, so prose commas ("a few meds, easy to
+    manage") split fields.  Real field boundaries never start with a space, so
+    such fragments are glued back onto the previous field.
+    """
+    with path.open(newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh)
+        header = next(reader)
+        for raw in reader:
+            fields: List[str] = []
+            for value in raw:
+                if fields and value.startswith(" "):
+                    fields[-1] += "," + value
+                else:
+                    fields.append(value)
+            if len(fields) != len(header):
+                raise ValueError(f"{path.name}: cannot realign row {raw!r}")
+            yield dict(zip(header, fields))
+
+
+def _split_flags(raw: str) -> Tuple[str, ...]:
+    return tuple(f.strip() for f in re.split(r"[;|,\s]+", raw or "") if f.strip())
+
+
+def option_key(question: str, option: str) -> Tuple[str, str]:
+    match = _ITEM_QUESTION.match(question)
+    if match is None:
+        return "", option
+    item = match.group(1).strip()
+    return item, f"{item} \u2014 {option}"
+
+
+def _compile_gate(text: str) -> Optional[Tuple[str, Gate]]:
+    """Return ``(source QuestionID, predicate)`` for a "Show only if ..." clause."""
+    match = _SHOW_IF_NOT.search(text)
+    if match:
+        qid, value = match.groups()
+        return qid, lambda sel: bool(sel.get(qid)) and value not in sel[qid]
+    match = _SHOW_IF_IN.search(text)
+    if match:
+        qid, raw = match.groups()
+        prefixes = tuple(p.strip() for p in raw.split(","))
+        return qid, lambda sel: any(opt.startswith(prefixes) for opt in sel.get(qid, ()))
+    match = _SHOW_IF_COUNT.search(text)
+    if match:
+        qid, threshold = match.group(1), int(match.group(2))
+        return qid, lambda sel: sum(1 for opt in sel.get(qid, ()) if not opt.endswith("Not present")) >= threshold
+    return None
+
+
+_RULE_TOKEN = re.compile(r"\(|\)|AND|OR|NOT|count:\w+>=\d+|\w+")
+
+
+def _compile_condition(expr: str) -> Callable[[FrozenSet[str], Mapping[str, int]], bool]:
+    """Compile ``a AND (b OR NOT c)`` with ``sum flag ≥ n`` terms into a predicate."""
+    expr = re.sub(r"sum (\w+) ≥ (\d+)", r"count:\1>=\2", expr)
+    expr = re.sub(r"(\w+) \([^()]*≥[^()]*\)", r"\1", expr)  # drop "(ADL/IADL ≥ 2)" annotations
+    tokens = _RULE_TOKEN.findall(expr)
+    pos = 0
+
+    def peek() -> Optional[str]:
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take() -> str:
+        nonlocal pos
+        pos += 1
+        return tokens[pos - 1]
+
+    def parse_or():
+        left = parse_and()
+        while peek() == "OR":
+            take()
+            right = parse_and()
+            left = (lambda a, b: lambda f, c: a(f, c) or b(f, c))(left, right)
+        return left
+
+    def parse_and():
+        left = parse_not()
+        while peek() == "AND":
+            take()
+            right = parse_not()
+            left = (lambda a, b: lambda f, c: a(f, c) and b(f, c))(left, right)
+        return left
+
+    def parse_not():
+        if peek() == "NOT":
+            take()
+            inner = parse_not()
+            return lambda f, c: not inner(f, c)
+        return parse_atom()
+
+    def parse_atom():
+        token = take()
+        if token == "(":
+            node = parse_or()
+            take()
+            return node
+        if token.startswith("count:"):
+            name, threshold = token[6:].split(">=")
+            bound = int(threshold)
+            return lambda f, c: c.get(name, 0) >= bound
+        return lambda f, c: token in f
+
+    return parse_or()
+
+
+def _compile_effect(text: str) -> Tuple[str, int]:
+    if match := re.search(r"Set Tier = (\d+)", text):
+        return "set", int(match.group(1))
+    if match := re.search(r"Set Tier ≥ (\d+)", text):
+        return "floor", int(match.group(1))
+    if match := re.search(r"Tier ([+-]) (\d+)", text):
+        sign = 1 if match.group(1) == "+" else -1
+        return "delta", sign * int(match.group(2))
+    raise ValueError(f"unrecognised rule effect: {text!r}")
+
+
+def load_tables(path: Path = SCORING_CSV) -> ScoringTables:
+    rows: Dict[Tuple[str, str], ScoreRow] = {}
+    options: Dict[str, List[str]] = {}
+    domains: List[str] = []
+    domain_weight: Dict[str, int] = {}
+    additive = set()
+    gates: Dict[str, Gate] = {}
+    gate_sources: Dict[str, str] = {}
+    rules: List[Rule] = []
+    for order, rec in enumerate(read_pack_csv(path)):
+        qid = rec["QuestionID"].strip()
+        if qid == "RULE":
+            kind, value = _compile_effect(rec["Notes"])
+            rules.append(Rule(
+                name=rec["Question"].strip(),
+                kind=kind,
+                value=value,
+                test=_compile_condition(rec["AnswerOption"]),
+            ))
+            continue
+        domain = rec["Domain"].strip()
+        item, option = option_key(rec["Question"].strip(), rec["AnswerOption"].strip())
+        weight = int(rec["DomainWeight"] or 0)
+        rows[(qid, option)] = ScoreRow(
+            qid=qid,
+            domain=domain,
+            option=option,
+            item=item,
+            score=int(rec["ScoreValue"] or 0),
+            weight=weight,
+            flags=_split_flags(rec["FlagsEmitted"]),
+            order=order,
+            priority=v3_summary_rules.tie_priority(item),
+        )
+        options.setdefault(qid, []).append(option)
+        if weight and domain not in domains:
+            domains.append(domain)
+        domain_weight[domain] = max(domain_weight.get(domain, 0), weight)
+        if _ADDITIVE_NOTE.search(rec["Notes"] or ""):
+            additive.add(qid)
+        if qid not in gates:
+            gate = _compile_gate(rec["GatingLogic"] or "") or _compile_gate(rec["Notes"] or "")
+            if gate is not None:
+                gate_sources[qid], gates[qid] = gate
+    return ScoringTables(
+        rows=rows,
+        options={qid: tuple(opts) for qid, opts in options.items()},
+        domains=tuple(domains),
+        domain_weight=domain_weight,
+        additive=frozenset(additive),
+        gates=gates,
+        gate_sources=gate_sources,
+        rules=tuple(rules),
+    )
+
+
+@lru_cache(maxsize=1)
+def tables() -> ScoringTables:
+    """Return the parsed scoring matrix (loaded once per process)."""
+    return load_tables()
+
+
+# ------------------------------------------------------------------
+# Page answers -> matrix options
+# ------------------------------------------------------------------
+_OVERALL_HELP = {
+    "None": "None \u2013 fully independent",
+    "Occasional": "Occasional \u2013 some help with a few tasks",
+    "Regular": "Regular \u2013 needs daily assistance",
+    "Extensive": "Extensive \u2013 needs full-time support",
+}
+# The pages only record *whether* an activity needs help; the overall level sets how much.
+_HELP_LEVEL = {"Occasional": "Some help", "Regular": "Daily help", "Extensive": "Full assistance"}
+_BADL_ITEMS = {
+    "Bathing": "Bathing/Showering",
+    "Dressing": "Dressing",
+    "Eating": "Eating",
+    "Toileting": "Toileting",
+    "Continence": "Toileting",
+    "Transferring": "Transferring",
+    "Personal Hygiene": "Personal Hygiene",
+    "Mobility": "Mobility",
+}
+_IADL_ITEMS = {
+    "Meal Prep": "Meal preparation",
+    "Housekeeping": "Housekeeping",
+    "Laundry": "Housekeeping",
+    "Shopping": "Shopping",
+    "Transportation": "Transportation",
+    "Finances": "Managing finances",
+    "Med Management": "Medication management",
+    "Phone/Tech": "Communication",
+}
+_COGNITIVE = {
+    "Intact": "No concerns",
+    "Mild": "Occasional forgetfulness",
+    "Moderate": "Moderate memory or thinking issues",
+    "Severe": "Severe memory issues or diagnosis (like dementia or Alzheimer\u2019s)",
+}
+_BEHAVIORS = {
+    "Wandering": "Wandering",
+    "Exit seeking": "Elopement / Exit-seeking",
+    "Aggression": "Aggression",
+    "Agitation": "Aggression",
+    "Sundowning": "Sundowning",
+}
+_MED_PROFILE = {
+    "Simple (≤5 meds)": "Simple \u2013 a few meds, easy to manage",
+    "Moderate (6\u20139)": "Moderate \u2013 daily meds, some complexity",
+    "Complex (≥10)": "Complex \u2013 many meds or caregiver-managed",
+}
+_MOBILITY = {
+    "Independent": "Walks independently",
+    "Uses device": "Uses cane or walker",
+    "Needs assist": "Uses wheelchair or scooter",
+    "Non-ambulatory": "Bed-bound or limited mobility",
+}
+_CHRONIC = {
+    "Diabetes": "Diabetes",
+    "CHF": "Congestive heart failure (CHF)",
+    "COPD": "COPD / Respiratory disease",
+    "Hypertension": "Hypertension",
+    "Arthritis": "Arthritis",
+    "CKD": "Other",
+    "Other": "Other",
+}
+_MGMT_QUALITY = {
+    "Well-managed": "Very well",
+    "Mixed": "Mostly managed",
+    "Poorly-managed / Unstable": "Poorly managed",
+}
+_MOOD = {
+    "Stable": "Mostly good",
+    "Occasional low mood": "Okay \u2013 ups and downs",
+    "Low": "Low \u2013 feeling down a lot",
+}
+_GEO = {
+    "Not isolated": "No \u2013 easily accessible",
+    "Somewhat isolated": "Somewhat isolated",
+    "Isolated (rural / limited support)": "Very isolated",
+}
+_SUPPORT_KEYWORDS = (
+    ("No regular support", ("no one", "nobody", "none", "no regular")),
+    ("Paid caregiver", ("paid", "caregiver", "aide", "nurse")),
+    ("Community or agency", ("agency", "community", "program", "church")),
+    ("Family/friends", ("family", "friend", "spouse", "husband", "wife", "daughter", "son", "neighbor")),
+)
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(v) for v in value]
+
+
+def _hours_option(hours: Any) -> Optional[str]:
+    try:
+        value = float(hours)
+    except (TypeError, ValueError):
+        return None
+    if value < 1:
+        return "Less than 1 hour"
+    if value < 4:
+        return "1\u20133 hours"
+    if value <= 8:
+        return "4\u20138 hours"
+    return "24-hour support"
+
+
+def _support_option(text: Any) -> Optional[str]:
+    lowered = str(text or "").strip().lower()
+    if not lowered:
+        return None
+    for option, keywords in _SUPPORT_KEYWORDS:
+        if any(word in lowered for word in keywords):
+            return option
+    return "Family/friends"
+
+
+def _items(qid: str, picked: Iterable[str], mapping: Mapping[str, str], yes: str, no: str) -> Tuple[str, ...]:
+    chosen = {mapping.get(p, p) for p in picked}
+    items = []
+    for option in tables().options.get(qid, ()):
+        item = option.split(" \u2014 ", 1)[0]
+        if option.endswith(f" \u2014 {yes}"):
+            if item in chosen:
+                items.append(option)
+        elif option.endswith(f" \u2014 {no}") and item not in chosen:
+            items.append(option)
+    return tuple(items)
+
+
+Reader = Callable[[Answers], Optional[Tuple[str, ...]]]
+
+
+def _single(key: str, mapping: Mapping[str, str]) -> Reader:
+    def read(answers: Answers) -> Optional[Tuple[str, ...]]:
+        option = mapping.get(answers.get(key))
+        return (option,) if option else None
+
+    return read
+
+
+def _adl_items(qid: str, key: str, mapping: Mapping[str, str]) -> Reader:
+    def read(answers: Answers) -> Optional[Tuple[str, ...]]:
+        level = _HELP_LEVEL.get(answers.get("overall_help"))
+        if not level:
+            return None
+        return _items(qid, _as_list(answers.get(key)), mapping, level, "Independent")
+
+    return read
+
+
+def _read_behaviors(answers: Answers) -> Optional[Tuple[str, ...]]:
+    if answers.get("cognitive") not in {"Moderate", "Severe"}:
+        return None
+    return _items("Q8", _as_list(answers.get("behavior_risks")), _BEHAVIORS, "Present", "Not present")
+
+
+def _read_hours(answers: Answers) -> Optional[Tuple[str, ...]]:
+    option = _hours_option(answers.get("hours_per_day")) if "hours_per_day" in answers else None
+    return (option,) if option else None
+
+
+def _read_support(answers: Answers) -> Optional[Tuple[str, ...]]:
+    option = _support_option(answers.get("who_supports"))
+    return (option,) if option else None
+
+
+def _read_falls(answers: Answers) -> Optional[Tuple[str, ...]]:
+    if "falls_6mo" not in answers:
+        return None
+    try:
+        falls = int(answers.get("falls_6mo") or 0)
+    except (TypeError, ValueError):
+        falls = 0
+    return ("No falls in past 6 months" if falls <= 0 else "One fall" if falls == 1 else "Multiple falls",)
+
+
+def _read_chronic(answers: Answers) -> Optional[Tuple[str, ...]]:
+    if "chronic_conditions" not in answers:
+        return None
+    return _items("Q12", _as_list(answers.get("chronic_conditions")), _CHRONIC, "Present", "Not present")
+
+
+# QuestionID -> (page answer keys it reads, reader).
+PAGE_FIELDS: Dict[str, Tuple[Tuple[str, ...], Reader]] = {
+    "Q2": (("overall_help",), _single("overall_help", _OVERALL_HELP)),
+    "Q3": (("overall_help", "badls"), _adl_items("Q3", "badls", _BADL_ITEMS)),
+    "Q4": (("overall_help", "iadls"), _adl_items("Q4", "iadls", _IADL_ITEMS)),
+    "Q5": (("hours_per_day",), _read_hours),
+    "Q6": (("who_supports",), _read_support),
+    "Q7": (("cognitive",), _single("cognitive", _COGNITIVE)),
+    "Q8": (("cognitive", "behavior_risks"), _read_behaviors),
+    "Q9": (("med_profile",), _single("med_profile", _MED_PROFILE)),
+    "Q10": (("mobility",), _single("mobility", _MOBILITY)),
+    "Q11": (("falls_6mo",), _read_falls),
+    "Q12": (("chronic_conditions",), _read_chronic),
+    "Q13": (("mgmt_quality",), _single("mgmt_quality", _MGMT_QUALITY)),
+    "Q14": (("mood",), _single("mood", _MOOD)),
+    "Q15": (("geo_isolation",), _single("geo_isolation", _GEO)),
+}
+
+
+def question_options(answers: Answers, qid: str) -> Tuple[str, ...]:
+    """Matrix options selected for ``qid`` (a ``Qn`` key in ``answers`` wins over page keys)."""
+    if qid in answers:
+        return tuple(_as_list(answers[qid]))
+    field = PAGE_FIELDS.get(qid)
+    if field is None:
+        return ()
+    return field[1](answers) or ()
+
+
+def canonical_answers(answers: Answers) -> Dict[str, Tuple[str, ...]]:
+    """Return ``{QuestionID: (options...)}`` for matrix-keyed or page-keyed answers."""
+    selected: Dict[str, Tuple[str, ...]] = {}
+    for qid in tables().options:
+        options = question_options(answers, qid)
+        if options:
+            selected[qid] = options
+    return selected
+
+
+@lru_cache(maxsize=1)
+def key_dependents() -> Dict[str, Tuple[str, ...]]:
+    """Answer key -> QuestionIDs to re-read, including questions gated on them."""
+    gated: Dict[str, List[str]] = {}
+    for qid, source in tables().gate_sources.items():
+        gated.setdefault(source, []).append(qid)
+
+    def closure(qids: Iterable[str]) -> Tuple[str, ...]:
+        seen: List[str] = []
+        stack = list(qids)
+        while stack:
+            qid = stack.pop()
+            if qid not in seen:
+                seen.append(qid)
+                stack.extend(gated.get(qid, ()))
+        return tuple(sorted(seen, key=lambda q: int(q[1:])))
+
+    by_key: Dict[str, List[str]] = {}
+    for qid, (keys, _reader) in PAGE_FIELDS.items():
+        for key in keys:
+            by_key.setdefault(key, []).append(qid)
+    deps = {key: closure(qids) for key, qids in by_key.items()}
+    for qid in tables().options:
+        deps[qid] = closure([qid])
+    return deps
+
+
+# ------------------------------------------------------------------
+# Evaluation
+# ------------------------------------------------------------------
+@dataclass(frozen=True)
+class Contribution:
+    """What one question adds: the row behind its score, the score and emitted flags."""
+
+    row: Optional[ScoreRow]
+    score: int
+    flags: Tuple[str, ...]
+    additive: bool = False
+
+    @property
+    def domain(self) -> str:
+        return self.row.domain if self.row is not None else ""
+
+    def rank(self) -> Tuple[int, bool, int, int, int]:
+        # Ties prefer single-answer rows, then the summary rules' safety order, then weight.
+        row = self.row
+        assert row is not None
+        return self.score, not self.additive, row.priority, row.weight, -row.order
+
+
+EMPTY = Contribution(None, 0, ())
+
+
+def contribution(qid: str, selected: Mapping[str, Tuple[str, ...]]) -> Contribution:
+    t = tables()
+    gate = t.gates.get(qid)
+    if gate is not None and not gate(selected):
+        return EMPTY
+    additive = qid in t.additive
+    flags: List[str] = []
+    best: Optional[Contribution] = None
+    total = 0
+    first: Optional[ScoreRow] = None
+    for option in selected.get(qid, ()):
+        row = t.rows.get((qid, option))
+        if row is None:
+            continue
+        flags.extend(row.flags)
+        if additive:
+            total += row.score
+            if first is None and row.score:
+                first = row
+        elif row.weight:
+            cand = Contribution(row, row.score, ())
+            if best is None or cand.rank() > best.rank():
+                best = cand
+    if additive:
+        return Contribution(first, min(total, MAX_SCORE) if first else 0, tuple(flags), True)
+    if best is None:
+        return Contribution(None, 0, tuple(flags)) if flags else EMPTY
+    return Contribution(best.row, best.score, tuple(flags))
+
+
+def best_for_domain(contribs: Iterable[Contribution]) -> Optional[Contribution]:
+    best: Optional[Contribution] = None
+    for c in contribs:
+        if c.row is not None and (best is None or c.rank() > best.rank()):
+            best = c
+    return best
+
+
+def combine(
+    domain_best: Mapping[str, Contribution],
+    counts: Mapping[str, int],
+    extra_flags: Iterable[str] = (),
+) -> V3Result:
+    """Fold per-domain winners and flag counts into a :class:`V3Result` (tier included)."""
+    t = tables()
+    scores = {d: c.score for d, c in domain_best.items()}
+    flags = {f for f, n in counts.items() if n > 0}
+    flags.update(extra_flags)
+    if scores.get(ADL_DOMAIN, 0) >= 2:
+        flags.add("high_dependence")
+    frozen = frozenset(flags)
+    winners = {d: c.row for d, c in domain_best.items() if c.row is not None}
+    base = _base_tier(scores, winners, t.domain_weight)
+    tier = _apply_rules(base, frozen, counts, t.rules)
+    ordered = {d: scores[d] for d in t.domains if d in scores}
+    return V3Result(ordered, {d: winners[d] for d in ordered}, frozen, dict(counts), base, tier)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(str(v) for v in value))
+    return value
+
+
+def _base_tier(domain_scores: Mapping[str, int], winners: Mapping[str, ScoreRow], weights: Mapping[str, int]) -> int:
+    total = sum(weights.values()) * MAX_SCORE
+    if not total:
+        return 0
+    burden = sum(score * winners[d].weight for d, score in domain_scores.items() if d in winners)
+    share = burden / total
+    for bound, tier in BASE_TIER_THRESHOLDS:
+        if share < bound:
+            return tier
+    return BASE_TIER_CEILING
+
+
+def _apply_rules(base: int, flags: FrozenSet[str], counts: Mapping[str, int], rules: Iterable[Rule]) -> int:
+    tier = base
+    forced: Optional[int] = None
+    for rule in rules:
+        if not rule.test(flags, counts):
+            continue
+        if rule.kind == "set":
+            forced = rule.value if forced is None else max(forced, rule.value)
+        elif rule.kind == "floor":
+            tier = max(tier, rule.value)
+        else:
+            tier = min(max(tier + rule.value, 0), MAX_TIER)
+    return forced if forced is not None else tier
+
+
+@lru_cache(maxsize=256)
+def _evaluate(frozen_answers: Tuple[Tuple[str, Any], ...], frozen_flags: Tuple[str, ...]) -> V3Result:
+    selected = canonical_answers(dict(frozen_answers))
+    counts: Dict[str, int] = {}
+    by_domain: Dict[str, List[Contribution]] = {}
+    for qid in selected:
+        contrib = contribution(qid, selected)
+        for flag in contrib.flags:
+            counts[flag] = counts.get(flag, 0) + 1
+        if contrib.row is not None:
+            by_domain.setdefault(contrib.domain, []).append(contrib)
+    domain_best = {d: best_for_domain(cs) for d, cs in by_domain.items()}
+    return combine({d: c for d, c in domain_best.items() if c is not None}, counts, frozen_flags)
+
+
+def evaluate(answers: Answers, flags: Iterable[str] = ()) -> V3Result:
+    """Score ``answers``; repeated calls with equal inputs hit a per-process cache."""
+    return _evaluate(_freeze(answers), tuple(sorted(set(flags))))
+
+
+def score_domains(answers: Answers, flags: Iterable[str] = ()) -> Dict[str, int]:
+    """Return ``{domain: 0..3}`` for every domain with a non-zero score."""
+    return {d: s for d, s in evaluate(answers, flags).domain_scores.items() if s}
+
+
+def determine_tier(domain_scores: Mapping[str, int], answers: Answers, flags: Iterable[str] = ()) -> int:
+    """Return the final tier (0 none ... 4 high-acuity memory care) after overrides/modifiers.
+
+    The base tier is taken from ``domain_scores``; flags, flag counts and the
+    weight of each domain's winning row come from ``answers``.  Passing
+    :func:`score_domains` of the same answers gives ``evaluate(answers).tier``.
+    """
+    flags = tuple(sorted(set(flags)))
+    result = evaluate(answers, flags)
+    scores = {d: s for d, s in domain_scores.items() if s}
+    if scores == {d: s for d, s in result.domain_scores.items() if s}:
+        return result.tier
+    t = tables()
+    rule_flags = set(result.flags)
+    if not result.counts.get("high_dependence") and "high_dependence" not in flags:
+        rule_flags.discard("high_dependence")
+    if scores.get(ADL_DOMAIN, 0) >= 2:
+        rule_flags.add("high_dependence")
+    base = _base_tier(scores, result.winners, t.domain_weight)
+    return _apply_rules(base, frozenset(rule_flags), result.counts, t.rules)
+
+
+def clear_cache() -> None:
+    tables.cache_clear()
+    key_dependents.cache_clear()
+    _evaluate.cache_clear()
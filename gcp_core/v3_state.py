@@ -7,7 +7,10 @@ import streamlit as st
 
 from ui.state import get_completion, set_completion
 
+from .incremental import V3IncrementalScorer, session_scorer
+
 _SESSION_KEY = "gcp_v3"
+_SCORER_KEY = "_gcp_v3_scorer"
 _DEFAULT_SCORECARD: Dict[str, Any] = {
     "domains": {},
     "tier": None,
@@ -63,11 +66,27 @@ def ensure_session() -> MutableMapping[str, Any]:
     return bucket
 
 
+def _scorer(bucket: MutableMapping[str, Any]) -> V3IncrementalScorer:
+    scorer = session_scorer(_SCORER_KEY, V3IncrementalScorer, bucket["answers"])
+    scorer.set_flags(bucket["flags"])  # no-op unless the flags changed
+    return scorer
+
+
+def _store_scorecard(bucket: MutableMapping[str, Any], scorer: V3IncrementalScorer) -> None:
+    bucket["scorecard"] = {**bucket.get("scorecard", _DEFAULT_SCORECARD), **scorer.scorecard}
+
+
 def reset_partial(keys: Iterable[str]) -> None:
     """Remove specific answer keys."""
-    answers = ensure_session()["answers"]
+    bucket = ensure_session()
+    answers = bucket["answers"]
+    scorer = _scorer(bucket)
+    changed = False
     for key in keys:
         answers.pop(key, None)
+        changed |= scorer.update(key, None)
+    if changed:
+        _store_scorecard(bucket, scorer)
 
 
 def get_answers() -> Dict[str, Any]:
@@ -106,6 +125,10 @@ def set_answer(key: str, value: Any) -> None:
         status = _normalize_status(answers.get(key))
         bucket["medicaid_status"] = status
         st.session_state["medicaid_status"] = status
+    fresh = not isinstance(st.session_state.get(_SCORER_KEY), V3IncrementalScorer)
+    scorer = _scorer(bucket)
+    if scorer.update(key, answers.get(key)) or fresh:
+        _store_scorecard(bucket, scorer)
     _mark_in_progress()
 
 
@@ -124,10 +147,11 @@ def get_medicaid_status() -> str:
 
 
 def update_flags(new_flags: Iterable[str]) -> set[str]:
-    """Replace the derived flag set."""
+    """Replace the derived flag set and re-score with it."""
     bucket = ensure_session()
     flag_set = set(str(flag).strip() for flag in new_flags if str(flag).strip())
     bucket["flags"] = flag_set
+    _store_scorecard(bucket, _scorer(bucket))
     return flag_set
 
 
@@ -157,5 +181,7 @@ def mark_not_started() -> None:
     bucket["completed"] = False
     bucket["scorecard"] = dict(_DEFAULT_SCORECARD)
     bucket["flags"] = set()
+    # The scorer is rebuilt from whatever answers remain on the next change.
+    st.session_state.pop(_SCORER_KEY, None)
     set_completion("gcp", "not_started")
 
@@ -0,0 +1,87 @@
+"""Final summary rules for Guided Care Plan V3.
+
+``gcp_v3_logical_pack/gcp_v3_summary_rules.txt`` is parsed once per process for
+the domain order of the narrative, the tie-break order inside a domain
+("Toileting > Medication > Mobility > ...") and the tier labels used by the
+wrap-up sentence.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Tuple
+
+from . import v3_scoring
+
+RULES_TXT = Path(__file__).resolve().parents[1] / "gcp_v3_logical_pack" / "gcp_v3_summary_rules.txt"
+
+_DOMAIN_LINE = re.compile(r"^\s*-\s+(.+?)\s+\(Q[\d, Q]+\):")
+_PRIORITY_LINE = re.compile(r"prioritize:\s*(.+?)\.?\s*$", re.IGNORECASE)
+_TIER_LINE = re.compile(r"final tier \(([^)]+)\)")
+
+_WRAP_UP = {
+    0: "Taken together, staying independent at home looks right for now, and we\u2019ll keep an eye on changes.",
+    1: "Taken together, {label} looks like the right next step to keep things safe at home.",
+    2: "Taken together, {label} looks like the best fit for the support needed today.",
+    3: "Taken together, {label} looks like the safest fit, with a structured setting and trained staff.",
+    4: "Taken together, {label} is recommended, with specialized support around the clock.",
+}
+
+
+@dataclass(frozen=True)
+class SummaryRules:
+    domains: Tuple[str, ...]
+    priority: Tuple[str, ...]
+    tier_labels: Tuple[str, ...]
+
+
+def _normalize_dashes(text: str) -> str:
+    return text.replace("\u2011", "-").replace("\u2010", "-")
+
+
+def load_rules(path: Path = RULES_TXT) -> SummaryRules:
+    domains = []
+    priority: Tuple[str, ...] = ()
+    tier_labels: Tuple[str, ...] = ()
+    for raw in path.read_text(encoding="utf-8").splitlines():
+        line = _normalize_dashes(raw)
+        if match := _DOMAIN_LINE.match(line):
+            domains.append(match.group(1))
+        elif match := _PRIORITY_LINE.search(line):
+            priority = tuple(p.strip() for p in match.group(1).split(">") if p.strip().lower() != "others")
+        elif match := _TIER_LINE.search(line):
+            tier_labels = tuple(p.strip() for p in match.group(1).split("/"))
+    return SummaryRules(tuple(domains), priority, tier_labels)
+
+
+@lru_cache(maxsize=1)
+def rules() -> SummaryRules:
+    """Return the parsed summary rules (loaded once per process)."""
+    return load_rules()
+
+
+@lru_cache(maxsize=128)
+def tie_priority(item: str) -> int:
+    """Higher for items the rules prefer on ties (0 for "others")."""
+    order = rules().priority
+    for index, name in enumerate(order):
+        if item and item.startswith(name):
+            return len(order) - index
+    return 0
+
+
+def tier_label(tier: int) -> str:
+    labels = rules().tier_labels
+    return labels[max(0, min(tier, len(labels) - 1))] if labels else str(tier)
+
+
+def final_summary_sentence(
+    domain_scores: Mapping[str, int],
+    answers: Mapping[str, Any],
+    flags: Iterable[str] = (),
+) -> str:
+    """Return the wrap-up sentence for the final tier."""
+    tier = v3_scoring.determine_tier(domain_scores, answers, flags)
+    return _WRAP_UP.get(tier, _WRAP_UP[2]).format(label=tier_label(tier))
@@ -1,33 +1,38 @@
 
-import json, csv, os, hashlib
+import json, os, hashlib
+from functools import lru_cache
 from typing import Dict, Tuple
 from senior_nav.lib.trace import trace
 
 PACKAGE_DIR = os.path.dirname(__file__)
 
-# Cache loads
+# Data files are loaded on first use, not at import
 QUESTIONS_CSV = os.path.join(PACKAGE_DIR, "questions", "questions.csv")
 SCORING_JSON  = os.path.join(PACKAGE_DIR, "scoring_model.json")
 BLURBS_JSON   = os.path.join(PACKAGE_DIR, "blurbs", "context_blurbs.json")
 
-def _load_questions():
-    rows = list(csv.DictReader(open(QUESTIONS_CSV, "r", encoding="utf-8")))
-    order, grouped = [], {}
-    for r in rows:
-        qid = r["id"]
-        if qid not in grouped:
-            grouped[qid] = {"id": qid, "label": r["label"], "type": r["type"], "choices": [] , "conditional_show": r.get("conditional_show","")}
-            order.append(qid)
-        grouped[qid]["choices"].append({"id": r["choice_id"], "label": r["choice_label"]})
-    return [grouped[i] for i in order]
-
 def _load_json(path):
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-QUESTIONS = _load_questions()
-SC = _load_json(SCORING_JSON)
-BLURBS = _load_json(BLURBS_JSON)
+@lru_cache(maxsize=1)
+def scoring_model():
+    return _load_json(SCORING_JSON)
+
+@lru_cache(maxsize=1)
+def blurbs():
+    return _load_json(BLURBS_JSON)
+
+def __getattr__(name):
+    # Legacy module attributes, served lazily.
+    if name == "SC":
+        return scoring_model()
+    if name == "BLURBS":
+        return blurbs()
+    if name == "QUESTIONS":
+        from gcp_core.catalog import catalog
+        return catalog("bundle").questions
+    raise AttributeError(name)
 
 def _clamp01(x): return max(0.0, min(1.0, float(x)))
 
@@ -44,6 +49,7 @@ def evaluate_guided_care(answers: Dict, aud: Dict) -> Tuple[Dict, Dict]:
     medicaid_unsure_flag = (medicaid_status == "unsure")
 
     # enc helpers
+    SC = scoring_model()
     E = SC["encodings"]; HCM = SC["hc_component_maps"]
     def enc(table, key): return E[table].get(key, 0.0)
 
@@ -1,18 +1,10 @@
-import streamlit as st, csv, os, json
+import streamlit as st
+from gcp_core.catalog import catalog
 from guided_care_plan.state import get_answers, set_answer, get_aud, normalize_multi
 
-QUESTIONS_CSV = os.path.join(os.path.dirname(os.path.dirname(__file__)), "guided_care_plan", "questions", "questions.csv")
-
 def load_questions():
-    rows = list(csv.DictReader(open(QUESTIONS_CSV, "r", encoding="utf-8")))
-    order, grouped = [], {}
-    for r in rows:
-        qid = r["id"]
-        if qid not in grouped:
-            grouped[qid] = {"id": qid, "label": r["label"], "type": r["type"], "choices": [], "conditional_show": r.get("conditional_show","")}
-            order.append(qid)
-        grouped[qid]["choices"].append({"id": r["choice_id"], "label": r["choice_label"]})
-    return [grouped[i] for i in order]
+    # Parsed once per process by the shared catalog; the rows are read-only.
+    return catalog("bundle").questions
 
 def show_single(q, answers):
     labels = [c["label"] for c in q["choices"]]
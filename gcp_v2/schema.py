@@ -104,4 +104,6 @@ QUESTIONS = [
 
 # Simple helpers
 def questions_for_section(section: str):
-    return sorted([q for q in QUESTIONS if q["section"] == section], key=lambda x: x["order"])
+    # Indexed and sorted once by the shared catalog.
+    from gcp_core.catalog import catalog
+    return catalog("gcp_v2").section(section)
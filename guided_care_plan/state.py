@@ -2,14 +2,13 @@
 from __future__ import annotations
 
 
-import json
-from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Mapping, Tuple
 
 import streamlit as st
 
 from audiencing import ensure_audiencing_state
+from gcp_core.catalog import catalog
 
 PACKAGE_ROOT = Path(__file__).resolve().parent
 
@@ -31,21 +30,13 @@ QUESTION_ORDER: List[str] = [
 ]
 
 
-@lru_cache(maxsize=1)
-def _load_labels() -> Dict[str, Dict[str, Dict[str, str]]]:
-    labels_path = PACKAGE_ROOT / "labels.json"
-    with labels_path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
-
-
-def get_question_meta(question_id: str) -> Dict[str, object]:
+def get_question_meta(question_id: str) -> Mapping[str, object]:
     """Return metadata (label, helper text, options) for a question id."""
 
-    data = _load_labels().get("questions", {})
-    meta = data.get(question_id)
-    if not meta:
+    question = catalog("labels").get(question_id)
+    if question is None:
         raise KeyError(f"Unknown Guided Care Plan question id: {question_id}")
-    return meta
+    return question.extra
 
 
 def ensure_gcp_session() -> Tuple[Dict[str, object], Dict[str, object]]:
@@ -3,11 +3,11 @@ from __future__ import annotations
 
 import streamlit as st
 
+from senior_nav import navigation
+
 
 def safe_switch_page(target: str) -> None:
-    """Attempt to navigate using ``st.switch_page`` with a graceful fallback."""
-    try:
-        st.switch_page(target)
-    except Exception:  # Streamlit < 1.23 fallback behaviour
+    """Navigate via the page registry; unknown targets fall back to a rerun."""
+    if navigation.resolve(target) is None:
         st.session_state["next_page"] = target
-        st.experimental_rerun()
+    navigation.switch_page(target)
@@ -1,17 +1,41 @@
-"""Lightweight documents + exports registry for the simplified flows."""
+"""Lightweight documents + exports registry for the simplified flows.
+
+Bytes go to the content-addressed store in :mod:`senior_nav.lib.doc_store`
+(identical exports are kept once, writes happen off the render thread) and
+each user's documents are rows in its SQLite index, namespaced by the
+``sid`` session key when there is one.
+
+Uploads are streamed: :func:`register_user_upload` reads a Streamlit
+``UploadedFile`` (or any binary file object) in chunks and spools it to
+disk, so a large scan is never held in memory twice and an oversized one
+is rejected part-way through (:data:`MAX_UPLOAD_BYTES`,
+``SENIOR_NAV_MAX_UPLOAD_MB``).
+
+If the background write of a document's bytes keeps failing, the entry
+stays listed with ``status == "failed"`` and :func:`read_document` raises
+:class:`DocumentWriteFailed`.
+"""
 from __future__ import annotations
 
+import io
 import json
+import os
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, MutableMapping, Optional
+from typing import BinaryIO, List, MutableMapping, Optional, Union
+import secrets
 import uuid
 
 import streamlit as st
 
-EXPORTS_DIR = Path("documents/exports")
-EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
+from .lib.doc_store import STORED, BlobTooLarge, BlobWriteFailed, DocumentRecord, get_document_store
+
+NAMESPACE_KEY = "documents_namespace"
+MAX_UPLOAD_BYTES = int(float(os.environ.get("SENIOR_NAV_MAX_UPLOAD_MB", "200")) * 1024 * 1024)
+UPLOAD_CHUNK_BYTES = 1 << 20
+UploadTooLarge = BlobTooLarge  # raised by register_user_upload
+DocumentWriteFailed = BlobWriteFailed  # raised by read_document
+_LEGACY_REGISTRY_KEY = "documents_registry"
 
 
 @dataclass
@@ -22,6 +46,9 @@ class DocumentEntry:
     path: Path
     created_at: str
     metadata: MutableMapping[str, object]
+    digest: str = ""
+    size: int = 0
+    status: str = STORED
 
     def to_dict(self) -> dict:
         return {
@@ -31,6 +58,9 @@ class DocumentEntry:
             "path": str(self.path),
             "created_at": self.created_at,
             "metadata": dict(self.metadata),
+            "digest": self.digest,
+            "size": self.size,
+            "status": self.status,
         }
 
     def __post_init__(self) -> None:
@@ -40,11 +70,63 @@ class DocumentEntry:
             self.metadata = dict(self.metadata)
 
 
-def _registry() -> MutableMapping[str, dict]:
-    from .state import ensure_base_state
+def _entry(record: DocumentRecord) -> DocumentEntry:
+    return DocumentEntry(
+        doc_id=record.doc_id,
+        kind=record.kind,
+        title=record.title,
+        path=get_document_store().path(record),
+        created_at=record.created_at,
+        metadata={**record.metadata, "ext": record.ext},
+        digest=record.digest,
+        size=record.size,
+        status=record.status,
+    )
+
 
-    ensure_base_state()
-    return st.session_state.setdefault("documents_registry", {})
+def document_namespace() -> str:
+    """This user's namespace: the ``sid`` session key, else a per-session token.
+
+    With session persistence configured the key is created here if this is
+    the session's first run, so documents stay reachable after a restart.
+    """
+    namespace = st.session_state.get(NAMESPACE_KEY)
+    if namespace:
+        return namespace
+    from .lib.session_store import get_persister, session_key
+
+    try:
+        namespace = session_key(create=get_persister() is not None)
+    except Exception:  # no query params outside a browser session
+        namespace = None
+    namespace = namespace or secrets.token_urlsafe(18)
+    st.session_state[NAMESPACE_KEY] = namespace
+    _import_legacy_registry(namespace)
+    return namespace
+
+
+def _import_legacy_registry(namespace: str) -> None:
+    # Sessions from before the index kept entries in session state, with files under documents/exports.
+    legacy = st.session_state.pop(_LEGACY_REGISTRY_KEY, None)
+    if not isinstance(legacy, dict):
+        return
+    store = get_document_store()
+    for doc_id, data in legacy.items():
+        try:
+            content = Path(data["path"]).read_bytes()
+        except (KeyError, TypeError, OSError):
+            continue
+        metadata = dict(data.get("metadata") or {})
+        store.register(
+            namespace,
+            str(doc_id),
+            kind=data.get("kind", "export"),
+            title=data.get("title", str(doc_id)),
+            data=content,
+            ext=str(metadata.pop("ext", "json")),
+            metadata=metadata,
+            created_at=data.get("created_at"),
+        )
 
 
 def register_document(
@@ -55,41 +137,45 @@ def register_document(
     content_bytes: bytes,
     metadata: Optional[MutableMapping[str, object]] = None,
 ) -> DocumentEntry:
-    """Register or update a document export on disk and in session."""
+    """Register or update a document export for the current user.
+
+    The bytes are written in the background; :func:`read_document` serves
+    them straight away.
+    """
 
-    EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
     safe_doc_id = doc_id.replace("/", "-")
-    suffix = metadata.get("ext", "json") if metadata else "json"
-    filename = f"{safe_doc_id}.{suffix}"
-    path = EXPORTS_DIR / filename
-    path.write_bytes(content_bytes)
-
-    entry = {
-        "doc_id": safe_doc_id,
-        "kind": kind,
-        "title": title,
-        "path": str(path),
-        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
-        "metadata": dict(metadata or {}),
-    }
-    registry = _registry()
-    registry[safe_doc_id] = entry
-    st.session_state.documents_registry = registry
-    return DocumentEntry(**entry)  # type: ignore[arg-type]
-
-
-def list_documents() -> List[DocumentEntry]:
-    registry = _registry()
-    entries = [DocumentEntry(**data) for data in registry.values()]  # type: ignore[arg-type]
-    return sorted(entries, key=lambda e: e.created_at, reverse=True)
+    extra = dict(metadata or {})
+    ext = str(extra.pop("ext", "json"))
+    record = get_document_store().register(
+        document_namespace(), safe_doc_id, kind=kind, title=title, data=content_bytes, ext=ext, metadata=extra
+    )
+    return _entry(record)
+
+
+def list_documents(kind: Optional[str] = None, limit: Optional[int] = None) -> List[DocumentEntry]:
+    """The current user's documents, newest first."""
+    records = get_document_store().list(document_namespace(), kind, -1 if limit is None else limit)
+    return [_entry(record) for record in records]
 
 
 def get_document(doc_id: str) -> Optional[DocumentEntry]:
-    registry = _registry()
-    data = registry.get(doc_id)
-    if not data:
+    record = get_document_store().get(document_namespace(), doc_id)
+    return _entry(record) if record else None
+
+
+def read_document(doc_id: str) -> Optional[bytes]:
+    """Content of one of the current user's documents (``None`` if unknown or lost).
+
+    Raises :class:`DocumentWriteFailed` if the bytes could not be written.
+    """
+    store = get_document_store()
+    record = store.get(document_namespace(), doc_id)
+    if record is None:
+        return None
+    try:
+        return store.read(record)
+    except FileNotFoundError:
         return None
-    return DocumentEntry(**data)  # type: ignore[arg-type]
 
 
 def register_json(doc_id: str, *, kind: str, title: str, payload: dict) -> DocumentEntry:
@@ -102,9 +188,41 @@ def register_json(doc_id: str, *, kind: str, title: str, payload: dict) -> Docum
     )
 
 
-def register_user_upload(name: str, data: bytes, *, mime_type: str | None = None) -> DocumentEntry:
+def register_user_upload(
+    name: str,
+    data: Union[bytes, BinaryIO],
+    *,
+    mime_type: str | None = None,
+    max_bytes: Optional[int] = None,
+) -> DocumentEntry:
+    """Store an upload for the current user, streaming it in chunks.
+
+    ``data`` is a binary file object (a Streamlit ``UploadedFile`` works
+    as is) or bytes.  Raises :class:`UploadTooLarge` once more than
+    ``max_bytes`` (default :data:`MAX_UPLOAD_BYTES`) have been read.
+    """
     doc_id = f"user_upload_{uuid.uuid4().hex}"
-    metadata = {"ext": Path(name).suffix.lstrip("."), "mime": mime_type or "application/octet-stream"}
-    if not metadata["ext"]:
-        metadata["ext"] = "bin"
-    return register_document(doc_id, kind="user_upload", title=name, content_bytes=data, metadata=metadata)
+    ext = Path(name).suffix.lstrip(".") or "bin"
+    stream = io.BytesIO(data) if isinstance(data, (bytes, bytearray, memoryview)) else data
+    if hasattr(stream, "seek"):
+        stream.seek(0)  # an UploadedFile may have been read already
+    record = get_document_store().register_stream(
+        document_namespace(),
+        doc_id,
+        stream,
+        kind="user_upload",
+        title=name,
+        ext=ext,
+        metadata={"mime": mime_type or "application/octet-stream"},
+        max_bytes=MAX_UPLOAD_BYTES if max_bytes is None else max_bytes,
+        chunk_size=UPLOAD_CHUNK_BYTES,
+    )
+    return _entry(record)
+
+
+def ingest_upload(uploaded_file, *, max_bytes: Optional[int] = None) -> DocumentEntry:
+    """:func:`register_user_upload` for an ``st.file_uploader`` result."""
+    return register_user_upload(
+        uploaded_file.name, uploaded_file, mime_type=getattr(uploaded_file, "type", None), max_bytes=max_bytes
+    )
+
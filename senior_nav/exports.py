@@ -0,0 +1,211 @@
+"""Care plan, cost summary and PFMA exports rendered off the script thread.
+
+:func:`start_export` refreshes the cost planner and takes its frozen CRM
+snapshot.  That snapshot already holds the audiencing and GCP sections; the
+PFMA export adds a frozen copy of the ``pfma`` bucket.  The relevant section
+is queued on :mod:`senior_nav.lib.export_jobs` with one of the renderers
+below.  An unchanged plan maps to the same frozen section, so downloading
+it again is served from the job cache.  A finished export is also
+registered with the documents store for the user who asked for it.
+:func:`export_button` is the page widget: a button, a progress bar while the
+job runs, then a download button.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import streamlit as st
+
+from .lib.doc_store import get_document_store
+from .lib.export_jobs import DONE, FAILED, Progress, get_export_jobs
+from .lib.frozen import FrozenDict, json_default, refreeze
+
+FORMATS: Dict[str, Tuple[str, str]] = {  # fmt -> (extension, mime type)
+    "json": ("json", "application/json"),
+    "csv": ("csv", "text/csv"),
+    "pdf": ("pdf", "application/pdf"),
+}
+TITLES: Dict[str, str] = {
+    "care_plan": "Care Plan",
+    "cost_summary": "Cost Summary",
+    "pfma": "PFMA Summary",
+}
+_PFMA_SNAPSHOT_KEY = "_pfma_export_snapshot"
+_JOB_KEY = "_export_jobs"
+
+
+# ---------------------------------------------------------------------------
+# Renderers: (frozen section, progress) -> bytes
+# ---------------------------------------------------------------------------
+def _leaves(value: Any, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    if isinstance(value, dict):
+        for key in sorted(value, key=str):
+            yield from _leaves(value[key], f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, (list, tuple)) and value:
+        for index, item in enumerate(value):
+            yield from _leaves(item, f"{prefix}[{index}]")
+    elif isinstance(value, (set, frozenset)):
+        yield prefix, ", ".join(sorted(map(str, value)))
+    else:
+        yield prefix, "" if value is None or value == [] else value
+
+
+def render_json(snapshot: Any, progress: Progress) -> bytes:
+    data = json.dumps(snapshot, indent=2, sort_keys=True, default=json_default).encode("utf-8")
+    progress(1.0)
+    return data
+
+
+def render_csv(snapshot: Any, progress: Progress) -> bytes:
+    rows = list(_leaves(snapshot))
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(("field", "value"))
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if i % 500 == 0:
+            progress(i / len(rows))
+    progress(1.0)
+    return out.getvalue().encode("utf-8")
+
+
+def _pdf_text(text: str) -> str:
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_pdf(snapshot: Any, progress: Progress, title: str = "Senior Navigator export") -> bytes:
+    """A plain text PDF (Helvetica, US Letter), one ``field: value`` line per leaf."""
+    lines = [f"{path}: {value}"[:110] for path, value in _leaves(snapshot)]
+    per_page = 56
+    pages = [lines[i : i + per_page] for i in range(0, len(lines), per_page)] or [[]]
+    objects: List[bytes] = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids: List[int] = []
+    for number, page in enumerate(pages, 1):
+        stream = ["BT", "/F1 14 Tf", "50 750 Td", f"({_pdf_text(title)} - page {number}/{len(pages)}) Tj"]
+        stream += ["/F1 9 Tf", "0 -24 Td"]
+        for i, line in enumerate(page):
+            if i:
+                stream.append("0 -12 Td")
+            stream.append(f"({_pdf_text(line)}) Tj")
+        stream.append("ET")
+        content = "\n".join(stream).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >>"
+            b" /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+        progress(number / len(pages))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.write(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def _renderer(kind: str, fmt: str) -> Callable[[Any, Progress], bytes]:
+    if fmt == "json":
+        return render_json
+    if fmt == "csv":
+        return render_csv
+    if fmt == "pdf":
+        title = TITLES.get(kind, kind)
+        return lambda snapshot, progress: render_pdf(snapshot, progress, title)
+    raise ValueError(f"unknown export format {fmt!r}")
+
+
+# ---------------------------------------------------------------------------
+# Snapshots (script thread)
+# ---------------------------------------------------------------------------
+def export_snapshot(kind: str) -> FrozenDict:
+    """The frozen section of the current session that ``kind`` exports."""
+    from cost_planner_shared import recompute_costs
+
+    recompute_costs()
+    crm: FrozenDict = st.session_state["cost_planner"]["snapshot_for_crm"]
+    care_plan = FrozenDict({"audiencing": crm.get("audiencing"), "gcp": crm.get("gcp")})
+    if kind == "care_plan":
+        return care_plan
+    cost_summary = FrozenDict({k: v for k, v in crm.items() if k not in ("audiencing", "gcp")})
+    if kind == "cost_summary":
+        return cost_summary
+    if kind == "pfma":
+        pfma = refreeze(st.session_state.get(_PFMA_SNAPSHOT_KEY), st.session_state.get("pfma") or {})
+        st.session_state[_PFMA_SNAPSHOT_KEY] = pfma
+        return FrozenDict({"pfma": pfma, "care_plan": care_plan, "cost_summary": cost_summary})
+    raise ValueError(f"unknown export {kind!r}")
+
+
+def start_export(kind: str, fmt: str) -> str:
+    """Queue an export of the current session; returns the job id."""
+    from .documents import document_namespace
+
+    snapshot = export_snapshot(kind)
+    ext, mime = FORMATS[fmt]
+    namespace = document_namespace()
+    store = get_document_store()
+
+    def register(data: bytes) -> None:
+        store.register(
+            namespace, f"{kind}_{fmt}", kind=kind, title=TITLES.get(kind, kind), data=data, ext=ext,
+            metadata={"mime": mime},
+        )
+
+    return get_export_jobs().submit(kind, fmt, snapshot, _renderer(kind, fmt), on_done=register)
+
+
+# ---------------------------------------------------------------------------
+# Widget
+# ---------------------------------------------------------------------------
+@st.fragment(run_every=0.5)
+def _export_progress(kind: str, job_id: str) -> None:
+    # Re-runs on its own while the job is in flight; the whole page reruns once it is done.
+    status = get_export_jobs().status(job_id)
+    if status is None or status.state in (DONE, FAILED):
+        st.rerun()
+    st.progress(status.progress, text=f"Preparing your {TITLES.get(kind, kind).lower()}...")
+
+
+def export_button(kind: str, fmt: str, label: str, *, disabled: bool = False, help: Optional[str] = None) -> None:
+    """Button that queues the export, then progress and a download button for it."""
+    jobs: Dict[str, str] = st.session_state.setdefault(_JOB_KEY, {})
+    slot = f"{kind}:{fmt}"
+    if st.button(
+        label, type="primary", disabled=disabled, help=help, key=f"export_{kind}_{fmt}", use_container_width=True
+    ):
+        jobs[slot] = start_export(kind, fmt)
+    job_id = jobs.get(slot)
+    if not job_id or disabled:
+        return
+    status = get_export_jobs().status(job_id)
+    if status is None:
+        return
+    if status.state == FAILED:
+        st.error("That export did not work. Please try again.")
+    elif status.state != DONE:
+        _export_progress(kind, job_id)
+    else:
+        ext, mime = FORMATS[fmt]
+        st.download_button(
+            f"Download {TITLES.get(kind, kind)} ({fmt.upper()})",
+            data=get_export_jobs().result(job_id) or b"",
+            file_name=f"{kind}.{ext}",
+            mime=mime,
+            key=f"export_download_{kind}_{fmt}",
+            use_container_width=True,
+        )
@@ -0,0 +1,203 @@
+"""Pre-encoded image handles for hero photos and card icons.
+
+Pages used to ``read_bytes()`` + base64 multi-megabyte PNGs on every render.
+:func:`get_image` instead returns an :class:`ImageHandle` whose ``src`` is a
+ready-to-embed data URI (or a static URL when Streamlit static serving is on)
+for a resized WebP variant.  Variants are produced by
+``tools/build_image_assets.py`` at build time and stored under
+``static/images/_derived/`` with the source content hash in the file name; if
+the build step has not run, the variant is rendered in-process once.
+
+Everything is cached per process and keyed by the source content hash, so a
+rerun only costs one ``stat()`` per image.  Pillow is optional: without it the
+original file is embedded (still encoded only once per process).
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import html
+import io
+import mimetypes
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+try:  # Pillow ships with Streamlit, but keep the import optional.
+    from PIL import Image
+except ImportError:  # pragma: no cover - exercised only without Pillow
+    Image = None  # type: ignore[assignment]
+
+DERIVED_DIR = Path("static/images/_derived")
+STATIC_ROOT = Path("static")
+SOURCE_GLOBS: Tuple[str, ...] = ("static/images/*.png", "static/images/*.jpg", "static/images/*.jpeg", "assets/*.png")
+
+# Display width in CSS pixels -> (1x, 2x) variant widths.
+PROFILES: Dict[str, Tuple[int, ...]] = {
+    "hero": (420, 840),
+    "logo": (160, 320),
+    "icon": (48, 96),
+}
+DEFAULT_FORMAT = "webp"
+_FORMATS = {"webp": ("WEBP", "image/webp", 80), "jpeg": ("JPEG", "image/jpeg", 82)}
+
+
+@dataclass(frozen=True)
+class ImageHandle:
+    """A resolved, ready-to-embed image."""
+
+    source: str
+    sha: str
+    mime: str
+    src: str
+    srcset: str = ""
+
+    def img_tag(self, *, alt: str = "", cls: str = "", style: str = "", extra: str = "") -> str:
+        cls_attr = f' class="{cls}"' if cls else ""
+        style_attr = f' style="{style}"' if style else ""
+        srcset_attr = f' srcset="{self.srcset}"' if self.srcset else ""
+        extra_attr = f" {extra}" if extra else ""
+        return (
+            f'<img src="{self.src}"{srcset_attr}{cls_attr}{style_attr}'
+            f' alt="{html.escape(alt, quote=True)}"{extra_attr}>'
+        )
+
+
+def variant_path(source: Path, sha: str, width: int, fmt: str = DEFAULT_FORMAT) -> Path:
+    ext = "jpg" if fmt == "jpeg" else fmt
+    return DERIVED_DIR / f"{source.stem}.{sha[:12]}.{width}w.{ext}"
+
+
+def render_variant(raw: bytes, width: int, fmt: str = DEFAULT_FORMAT) -> Optional[bytes]:
+    """Resize ``raw`` to at most ``width`` px wide and re-encode; ``None`` without Pillow."""
+    if Image is None:
+        return None
+    pil_format, _mime, quality = _FORMATS[fmt]
+    with Image.open(io.BytesIO(raw)) as img:
+        img.load()
+        if img.width > width:
+            height = max(1, round(img.height * width / img.width))
+            img = img.resize((width, height), Image.LANCZOS)
+        if pil_format == "JPEG" and img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        elif img.mode not in ("RGB", "RGBA", "L", "LA"):
+            img = img.convert("RGBA")
+        out = io.BytesIO()
+        if pil_format == "WEBP":
+            img.save(out, format=pil_format, quality=quality, method=4)
+        else:
+            img.save(out, format=pil_format, quality=quality, optimize=True)
+        return out.getvalue()
+
+
+def build_variants(
+    source: Path,
+    widths: Iterable[int],
+    formats: Iterable[str] = (DEFAULT_FORMAT,),
+) -> list[Path]:
+    """Write resized variants of ``source`` into :data:`DERIVED_DIR` (build step)."""
+    raw = source.read_bytes()
+    sha = hashlib.sha256(raw).hexdigest()
+    DERIVED_DIR.mkdir(parents=True, exist_ok=True)
+    written = []
+    for fmt in formats:
+        for width in widths:
+            target = variant_path(source, sha, width, fmt)
+            if target.exists():
+                written.append(target)
+                continue
+            data = render_variant(raw, width, fmt)
+            if data is None:
+                continue
+            tmp = target.with_suffix(target.suffix + ".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(target)
+            written.append(target)
+    return written
+
+
+# ------------------------------------------------------------------
+# Process-level caches
+# ------------------------------------------------------------------
+_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=256)
+def _content_sha(path: str, mtime_ns: int, size: int) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _variant_bytes(path: str, sha: str, width: int, fmt: str) -> Optional[bytes]:
+    source = Path(path)
+    derived = variant_path(source, sha, width, fmt)
+    if derived.exists():
+        return derived.read_bytes()
+    try:
+        return render_variant(source.read_bytes(), width, fmt)
+    except Exception:
+        return None
+
+
+def _static_url(path: Path) -> Optional[str]:
+    """Return the ``app/static/...`` URL when static serving is enabled."""
+    try:
+        rel = path.resolve().relative_to(STATIC_ROOT.resolve())
+    except ValueError:
+        return None
+    try:
+        import streamlit as st
+
+        if not st.get_option("server.enableStaticServing"):
+            return None
+    except Exception:
+        return None
+    return f"app/static/{rel.as_posix()}"
+
+
+@lru_cache(maxsize=256)
+def _handle(path: str, sha: str, profile: str, fmt: str) -> ImageHandle:
+    source = Path(path)
+    widths = PROFILES.get(profile, PROFILES["hero"])
+    _pil_format, mime, _quality = _FORMATS[fmt]
+
+    urls = []
+    for width in widths:
+        derived = variant_path(source, sha, width, fmt)
+        url = _static_url(derived) if derived.exists() else None
+        if url is None:
+            break
+        urls.append(f"{url} {width}w")
+    if urls and len(urls) == len(widths):
+        first = urls[0].rsplit(" ", 1)[0]
+        return ImageHandle(path, sha, mime, first, ", ".join(urls))
+
+    data = _variant_bytes(path, sha, max(widths), fmt)
+    if data is None:
+        data = source.read_bytes()
+        mime = mimetypes.guess_type(source.name)[0] or "image/png"
+    encoded = base64.b64encode(data).decode("ascii")
+    return ImageHandle(path, sha, mime, f"data:{mime};base64,{encoded}")
+
+
+def get_image(path: str | Path, *, profile: str = "hero", fmt: str = DEFAULT_FORMAT) -> Optional[ImageHandle]:
+    """Return a cached handle for ``path`` or ``None`` when the file is missing."""
+    source = Path(path)
+    try:
+        stat = source.stat()
+    except OSError:
+        return None
+    if not source.is_file():
+        return None
+    key = source.as_posix()
+    with _LOCK:
+        sha = _content_sha(key, stat.st_mtime_ns, stat.st_size)
+        return _handle(key, sha, profile, fmt)
+
+
+def clear_cache() -> None:
+    _content_sha.cache_clear()
+    _variant_bytes.cache_clear()
+    _handle.cache_clear()
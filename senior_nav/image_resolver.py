@@ -0,0 +1,250 @@
+"""Image resolution for local and remote images without blocking renders.
+
+``welcome.py`` and ``about_us.py`` used to ``urlopen(..., timeout=10)``,
+``PIL.Image.verify()`` and base64-encode inside the render path, so one slow
+remote image could stall a rerun for ten seconds.  :func:`resolve` never does
+network I/O on the caller's thread:
+
+* local files are validated once per content hash and handed to
+  :mod:`senior_nav.image_assets` for a resized, pre-encoded handle;
+* remote URLs are served from a bounded on-disk cache (TTL + size cap).  A miss
+  or an expired entry schedules a background fetch and returns the placeholder
+  (or the stale copy) immediately.
+
+:func:`stats` exposes hit/miss counters and fetch latency.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import logging
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from . import image_assets
+from .image_assets import ImageHandle
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR = Path(".cache/images")
+CACHE_TTL_SECONDS = 24 * 60 * 60
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+FAILURE_TTL_SECONDS = 5 * 60
+FETCH_TIMEOUT_SECONDS = 10
+FETCH_MAX_BYTES = 10 * 1024 * 1024
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_PLACEHOLDER_SVG = (
+    b"<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 4 3'>"
+    b"<rect width='4' height='3' fill='#eef2ff'/></svg>"
+)
+PLACEHOLDER = ImageHandle(
+    source="placeholder",
+    sha="",
+    mime="image/svg+xml",
+    src="data:image/svg+xml;base64," + base64.b64encode(_PLACEHOLDER_SVG).decode("ascii"),
+)
+
+_LOCK = threading.Lock()
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sn-image-fetch")
+_INFLIGHT: Dict[str, object] = {}
+_FAILED: Dict[str, float] = {}
+_STATS: Dict[str, float] = {
+    "hits": 0,
+    "misses": 0,
+    "stale_hits": 0,
+    "placeholders": 0,
+    "fetches": 0,
+    "fetch_errors": 0,
+    "fetch_ms_total": 0.0,
+    "fetch_ms_max": 0.0,
+    "evictions": 0,
+}
+
+
+def _bump(key: str, amount: float = 1) -> None:
+    with _LOCK:
+        _STATS[key] += amount
+
+
+def stats() -> Dict[str, float]:
+    """Return a snapshot of cache counters (``fetch_ms_avg`` is derived)."""
+    with _LOCK:
+        snap = dict(_STATS)
+    snap["fetch_ms_avg"] = snap["fetch_ms_total"] / snap["fetches"] if snap["fetches"] else 0.0
+    return snap
+
+
+def reset_stats() -> None:
+    with _LOCK:
+        for key in _STATS:
+            _STATS[key] = 0
+        _FAILED.clear()
+
+
+def is_remote(src: str) -> bool:
+    return urlparse(src).scheme in {"http", "https"}
+
+
+def _is_valid_image(data: bytes) -> bool:
+    if image_assets.Image is None:
+        return bool(data)
+    try:
+        image_assets.Image.open(io.BytesIO(data)).verify()
+        return True
+    except Exception:
+        return False
+
+
+# ------------------------------------------------------------------
+# Local files
+# ------------------------------------------------------------------
+def _resolve_local(path_str: str) -> Optional[Path]:
+    cand = Path(path_str)
+    if cand.is_absolute() or cand.exists():
+        return cand if cand.exists() else None
+    rooted = _REPO_ROOT / path_str
+    return rooted if rooted.exists() else None
+
+
+@lru_cache(maxsize=256)
+def _local_ok(path: str, mtime_ns: int, size: int) -> bool:
+    try:
+        return _is_valid_image(Path(path).read_bytes())
+    except OSError:
+        return False
+
+
+def _resolve_local_handle(path_str: str, profile: str) -> Optional[ImageHandle]:
+    path = _resolve_local(path_str)
+    if path is None:
+        return None
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    if not _local_ok(path.as_posix(), stat.st_mtime_ns, stat.st_size):
+        return None
+    return image_assets.get_image(path, profile=profile)
+
+
+# ------------------------------------------------------------------
+# Remote files (bounded on-disk cache, background fetch)
+# ------------------------------------------------------------------
+def cache_path(url: str) -> Path:
+    return CACHE_DIR / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.img"
+
+
+def _fetch_bytes(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT_SECONDS) as resp:
+        data = resp.read(FETCH_MAX_BYTES + 1)
+    if len(data) > FETCH_MAX_BYTES:
+        raise ValueError(f"image larger than {FETCH_MAX_BYTES} bytes")
+    return data
+
+
+def _evict() -> None:
+    try:
+        entries = [(p, p.stat()) for p in CACHE_DIR.glob("*.img")]
+    except OSError:
+        return
+    total = sum(st.st_size for _p, st in entries)
+    for path, st in sorted(entries, key=lambda item: item[1].st_mtime):
+        if total <= CACHE_MAX_BYTES:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= st.st_size
+        _bump("evictions")
+
+
+def _fetch_into_cache(url: str) -> None:
+    start = time.perf_counter()
+    try:
+        data = _fetch_bytes(url)
+        if not _is_valid_image(data):
+            raise ValueError("not a valid image")
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        target = cache_path(url)
+        tmp = target.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(target)
+        _evict()
+        with _LOCK:
+            _FAILED.pop(url, None)
+    except Exception as exc:
+        log.warning("image fetch failed for %s: %s", url, exc)
+        with _LOCK:
+            _FAILED[url] = time.monotonic()
+        _bump("fetch_errors")
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        with _LOCK:
+            _STATS["fetches"] += 1
+            _STATS["fetch_ms_total"] += elapsed_ms
+            _STATS["fetch_ms_max"] = max(_STATS["fetch_ms_max"], elapsed_ms)
+            _INFLIGHT.pop(url, None)
+
+
+def _schedule_fetch(url: str) -> object:
+    with _LOCK:
+        future = _INFLIGHT.get(url)
+        if future is not None:
+            return future
+        failed_at = _FAILED.get(url)
+        if failed_at is not None and time.monotonic() - failed_at < FAILURE_TTL_SECONDS:
+            return None
+        future = _EXECUTOR.submit(_fetch_into_cache, url)
+        _INFLIGHT[url] = future
+        return future
+
+
+def _resolve_remote_handle(url: str, profile: str) -> ImageHandle:
+    path = cache_path(url)
+    try:
+        stat = path.stat()
+    except OSError:
+        stat = None
+
+    if stat is not None:
+        if time.time() - stat.st_mtime <= CACHE_TTL_SECONDS:
+            _bump("hits")
+        else:
+            _bump("stale_hits")
+            _schedule_fetch(url)
+        handle = image_assets.get_image(path, profile=profile)
+        if handle is not None:
+            return handle
+
+    _bump("misses")
+    _schedule_fetch(url)
+    _bump("placeholders")
+    return PLACEHOLDER
+
+
+def resolve(src: str, *, profile: str = "hero") -> Optional[ImageHandle]:
+    """Return a handle for ``src`` without blocking on the network.
+
+    Local files that are missing or not images yield ``None`` so pages can show
+    their "add image" hint.  Remote images yield :data:`PLACEHOLDER` until the
+    background fetch lands in the cache.
+    """
+    if is_remote(src):
+        return _resolve_remote_handle(src, profile)
+    return _resolve_local_handle(src, profile)
+
+
+def img_html(src: str, *, cls: str = "", style: str = "", alt: str = "", profile: str = "hero") -> str | None:
+    handle = resolve(src, profile=profile)
+    if handle is None:
+        return None
+    return handle.img_tag(alt=alt, cls=cls, style=style)
@@ -0,0 +1 @@
+"""Shared runtime services (analytics tracing, session persistence, event log, document storage, export jobs, CRM sync)."""
@@ -0,0 +1,347 @@
+"""Batch shipping of cost planner snapshots to the CRM.
+
+``recompute_costs`` keeps a frozen ``snapshot_for_crm`` per session.
+:meth:`CrmSync.offer` hands it over.  Unchanged snapshots are dropped:
+first by identity, which is free for a frozen snapshot that did not change,
+and then by a BLAKE2b hash of the canonical JSON encoding.  That encoding
+is also the record payload, so each new snapshot is serialized once.
+Records collect in a buffer.  A daemon thread ships the buffer as one
+:class:`Batch` when it reaches ``max_records`` or ``max_bytes``, or when
+its oldest record is ``max_age`` seconds old.
+
+A sink is anything with ``send(batch)``:
+
+* :class:`NdjsonFileSink` - one ``.ndjson`` file per batch, written atomically.
+* :class:`ColumnarFileSink` - one column-oriented file per batch: Parquet
+  when ``pyarrow`` is installed, otherwise a JSON object of equal-length
+  column arrays with the same layout.
+* :class:`HttpSink` - POSTs the NDJSON body to a URL.
+* :class:`MemorySink` - keeps batches in a list (tests).
+
+The file sinks put the pid and a random suffix in every file name, so
+several syncs or worker processes can share one directory.
+
+A batch that fails is retried after a backoff that starts at
+``retry_delay`` seconds and doubles each time (a forced :meth:`CrmSync.flush`
+retries at once), up to ``max_retries`` attempts, and then dropped with an
+error in the log.
+
+Sync is off until configured.  Either call :func:`set_crm_sync`, or name a
+``"package.module:factory"`` in ``SENIOR_NAV_CRM_SINK``.  For example,
+``senior_nav.lib.crm_sync:ndjson_sync`` writes to ``SENIOR_NAV_CRM_DIR``,
+which defaults to ``.cache/crm``.
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import itertools
+import json
+import logging
+import os
+import time
+import urllib.request
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Protocol, Tuple
+
+from .frozen import json_default
+from .services import ProcessWide
+from .write_behind import WriteBehind
+
+try:  # optional: Parquet output for the columnar sink
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pyarrow = None  # type: ignore[assignment]
+
+ENV_VAR = "SENIOR_NAV_CRM_SINK"
+DIR_ENV_VAR = "SENIOR_NAV_CRM_DIR"
+CRM_DIR = Path(".cache/crm")
+# Top-level snapshot fields copied into their own columns; the rest stays in ``payload``.
+SUMMARY_FIELDS: Tuple[str, ...] = ("monthly_total", "net_out_of_pocket", "assets", "runway_months")
+COLUMNS: Tuple[str, ...] = ("session_id", "content_hash", "captured_at", *SUMMARY_FIELDS, "payload")
+
+_log = logging.getLogger(__name__)
+_encode = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=json_default).encode
+
+
+class Record(NamedTuple):
+    session_id: str
+    content_hash: str
+    captured_at: float
+    monthly_total: Any
+    net_out_of_pocket: Any
+    assets: Any
+    runway_months: Any
+    payload: str  # canonical JSON of the snapshot
+
+
+class Batch(NamedTuple):
+    seq: int
+    records: List[Record]
+
+    def columns(self) -> Dict[str, List[Any]]:
+        """Column name -> values, one entry per record."""
+        if not self.records:
+            return {name: [] for name in COLUMNS}
+        return {name: list(values) for name, values in zip(COLUMNS, zip(*self.records))}
+
+    def to_ndjson(self) -> bytes:
+        lines = []
+        for record in self.records:
+            head = _encode(dict(zip(COLUMNS[:-1], record[:-1])))
+            # Splice the already-encoded payload in rather than decoding and re-encoding it.
+            lines.append(f'{head[:-1]},"snapshot":{record.payload}}}')
+        return ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+
+
+# ---------------------------------------------------------------------------
+# Sinks
+# ---------------------------------------------------------------------------
+class CrmSink(Protocol):
+    def send(self, batch: Batch) -> None: ...
+
+
+class MemorySink:
+    def __init__(self) -> None:
+        self.batches: List[Batch] = []
+
+    def send(self, batch: Batch) -> None:
+        self.batches.append(batch)
+
+
+def _batch_stem(batch: Batch) -> str:
+    # Unique across sink instances and processes writing to one directory; sorts by time.
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+    return f"crm-{stamp}-{os.getpid()}-{batch.seq:06d}-{uuid.uuid4().hex[:12]}"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")  # unique because ``path`` is
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class NdjsonFileSink:
+    """``crm-<time>-<pid>-<seq>-<random>.ndjson`` per batch under ``directory``."""
+
+    def __init__(self, directory: Path | str = CRM_DIR) -> None:
+        self.directory = Path(directory)
+
+    def send(self, batch: Batch) -> None:
+        _write_atomic(self.directory / f"{_batch_stem(batch)}.ndjson", batch.to_ndjson())
+
+
+class ColumnarFileSink:
+    """One column-oriented file per batch (``.parquet``, or ``.columns.json`` without pyarrow)."""
+
+    def __init__(self, directory: Path | str = CRM_DIR, parquet: Optional[bool] = None) -> None:
+        self.directory = Path(directory)
+        self.parquet = pyarrow is not None if parquet is None else parquet
+        if self.parquet and pyarrow is None:
+            raise RuntimeError("Parquet output needs pyarrow")
+
+    def send(self, batch: Batch) -> None:
+        stem = _batch_stem(batch)
+        columns = batch.columns()
+        if self.parquet:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.directory / f".{stem}.parquet.tmp"
+            pyarrow.parquet.write_table(pyarrow.table(columns), tmp)
+            os.replace(tmp, self.directory / f"{stem}.parquet")
+        else:
+            body = json.dumps(columns, separators=(",", ":"), ensure_ascii=False, default=json_default)
+            _write_atomic(self.directory / f"{stem}.columns.json", body.encode("utf-8"))
+
+
+class HttpSink:
+    """POSTs each batch as ``application/x-ndjson``; any non-2xx answer is a failure."""
+
+    def __init__(self, url: str, timeout: float = 10.0, headers: Optional[Mapping[str, str]] = None) -> None:
+        self.url = url
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/x-ndjson", **dict(headers or {})}
+
+    def send(self, batch: Batch) -> None:
+        request = urllib.request.Request(
+            self.url, data=batch.to_ndjson(), method="POST", headers={**self.headers, "X-Batch-Seq": str(batch.seq)}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:  # raises on 4xx/5xx
+            response.read()
+
+
+# ---------------------------------------------------------------------------
+# Batcher
+# ---------------------------------------------------------------------------
+class CrmSync(WriteBehind):
+    """Deduplicates offered snapshots and ships them in batches from a daemon thread."""
+
+    def __init__(
+        self,
+        sink: CrmSink,
+        *,
+        max_records: int = 1000,
+        max_bytes: int = 4 << 20,
+        max_age: float = 5.0,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        max_sessions: int = 10_000,
+    ) -> None:
+        super().__init__(
+            "senior-nav-crm",
+            ("offered", "unchanged", "queued", "sent", "batches", "send_errors", "dropped"),
+            retry_delay=retry_delay,
+        )
+        self.sink = sink
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_retries = max_retries
+        self.max_sessions = max_sessions
+        # session -> (last snapshot object, its content hash); LRU-bounded.
+        self._last: "OrderedDict[str, Tuple[Any, str]]" = OrderedDict()
+        self._buffer: List[Record] = []
+        self._buffered_bytes = 0
+        self._oldest = 0.0
+        self._retry: List[Tuple[float, Batch, int]] = []  # (due, batch, failed attempts)
+        self._seq = itertools.count(1)
+        self._active = 0  # _take/_send rounds in progress
+        self._start()
+
+    # -- caller side -------------------------------------------------------------
+    def offer(self, session_id: str, snapshot: Mapping[str, Any]) -> bool:
+        """Queue ``snapshot`` unless it matches the last one from ``session_id``; ``True`` if queued."""
+        with self._lock:
+            self._counts["offered"] += 1
+            last = self._last.get(session_id)
+            if last is not None and last[0] is snapshot:
+                self._counts["unchanged"] += 1
+                return False
+        payload = _encode(snapshot)
+        content_hash = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+        record = Record(
+            session_id, content_hash, time.time(), *(snapshot.get(name) for name in SUMMARY_FIELDS), payload
+        )
+        with self._lock:
+            self._last[session_id] = (snapshot, content_hash)
+            self._last.move_to_end(session_id)
+            while len(self._last) > self.max_sessions:
+                self._last.popitem(last=False)
+            if last is not None and last[1] == content_hash:
+                self._counts["unchanged"] += 1
+                return False
+            first = not self._buffer
+            if first:
+                self._oldest = time.monotonic()
+            self._buffer.append(record)
+            self._buffered_bytes += len(payload)
+            self._counts["queued"] += 1
+            full = len(self._buffer) >= self.max_records or self._buffered_bytes >= self.max_bytes
+        if first or full:  # the first record starts the age clock on the thread
+            self._wake.set()
+        return True
+
+    # -- sender thread -------------------------------------------------------------
+    def _take(self, force: bool) -> List[Tuple[Batch, int]]:
+        now = time.monotonic()
+        with self._lock:
+            batches = [(batch, attempts) for due, batch, attempts in self._retry if force or due <= now]
+            self._retry = [] if force else [entry for entry in self._retry if entry[0] > now]
+            buffer = self._buffer
+            if force or self._buffered_bytes >= self.max_bytes or (
+                buffer and time.monotonic() - self._oldest >= self.max_age
+            ):
+                records, self._buffer, self._buffered_bytes = buffer, [], 0
+            elif len(buffer) >= self.max_records:  # full batches only; the rest waits for its age
+                cut = len(buffer) - len(buffer) % self.max_records
+                records, self._buffer = buffer[:cut], buffer[cut:]
+                self._buffered_bytes = sum(len(r.payload) for r in self._buffer)
+            else:
+                records = []
+            if records:
+                for start in range(0, len(records), self.max_records):
+                    batches.append((Batch(next(self._seq), records[start : start + self.max_records]), 0))
+            self._active += 1
+            return batches
+
+    def _send(self, batches: List[Tuple[Batch, int]]) -> None:
+        try:
+            self._send_batches(batches)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._idle.notify_all()
+
+    def _send_batches(self, batches: List[Tuple[Batch, int]]) -> None:
+        for batch, attempts in batches:
+            try:
+                self.sink.send(batch)
+            except Exception:
+                _log.exception("CRM batch %s failed (attempt %s)", batch.seq, attempts + 1)
+                with self._lock:
+                    self._counts["send_errors"] += 1
+                    if attempts + 1 < self.max_retries:
+                        self._retry.append((time.monotonic() + self._backoff(attempts + 1), batch, attempts + 1))
+                    else:
+                        self._counts["dropped"] += len(batch.records)
+                        for record in batch.records:  # let the next change of these sessions through
+                            self._last.pop(record.session_id, None)
+                continue
+            self._count(sent=len(batch.records), batches=1)
+
+    def _timeout(self) -> Optional[float]:
+        # Poll while records age; otherwise sleep until the next retry is due.
+        with self._lock:
+            waits = [min(self.max_age, 1.0)] if self._buffer else []
+            if self._retry:
+                waits.append(max(0.0, min(due for due, _batch, _attempts in self._retry) - time.monotonic()))
+        return min(waits) if waits else None
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self._timeout())
+            self._wake.clear()
+            closing = self._closed
+            self._send(self._take(force=closing))
+            if closing:
+                return
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Ship everything buffered now (one attempt per batch); ``False`` on timeout."""
+        self._send(self._take(force=True))
+        return self._wait_idle(lambda: not self._active, timeout)  # a send the thread started before us
+
+    def _gauges(self) -> Dict[str, int]:
+        return {"buffered": len(self._buffer), "retrying": len(self._retry)}
+
+
+def ndjson_sync() -> CrmSync:
+    """Factory for ``SENIOR_NAV_CRM_SINK``; NDJSON files under ``SENIOR_NAV_CRM_DIR``."""
+    sync = CrmSync(NdjsonFileSink(Path(os.environ.get(DIR_ENV_VAR) or CRM_DIR)))
+    atexit.register(sync.close)
+    return sync
+
+
+def columnar_sync() -> CrmSync:
+    """Factory for ``SENIOR_NAV_CRM_SINK``; columnar files under ``SENIOR_NAV_CRM_DIR``."""
+    sync = CrmSync(ColumnarFileSink(Path(os.environ.get(DIR_ENV_VAR) or CRM_DIR)))
+    atexit.register(sync.close)
+    return sync
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------------------------
+_sync: ProcessWide[CrmSync] = ProcessWide(ENV_VAR, attr="sync", what="CRM sink")
+
+
+def get_crm_sync() -> Optional[CrmSync]:
+    return _sync.get()
+
+
+def set_crm_sync(sync: Optional[CrmSync]) -> Optional[CrmSync]:
+    """Install ``sync`` (``None`` disables CRM sync); returns the previous one."""
+    return _sync.set(sync)
@@ -0,0 +1,553 @@
+"""Content-addressed document storage with a SQLite index.
+
+Exports and uploads are stored once per distinct content:
+
+* :class:`BlobStore` keeps bytes under ``<root>/blobs/<aa>/<sha256>``.  The
+  name is the SHA-256 of the content, so identical exports from any number
+  of sessions share one file and a blob is never rewritten in place.
+  :meth:`BlobStore.put` hashes on the caller and returns at once; a small
+  pool of daemon writers does the disk I/O.  Each writer takes up to
+  ``batch_size`` queued blobs, writes and fsyncs them to temporary files,
+  renames them into place and then fsyncs each directory it touched once,
+  so a burst of exports costs one directory sync rather than one per file.
+  Until a blob is on disk it is served from memory.  A blob whose write
+  fails stays in memory and is retried after ``retry_delay`` seconds,
+  doubling each time, up to ``max_retries`` attempts; after that it is
+  given up and :meth:`BlobStore.failed` reports it.
+  :meth:`BlobStore.put_stream` is the path for uploads: it reads a file
+  object in chunks, hashing as it goes and spooling to a temporary file,
+  so memory stays at one chunk however large the upload is, and a size
+  limit stops the read as soon as it is crossed.
+* :class:`DocumentIndex` is one SQLite row per ``(namespace, doc_id)``
+  pointing at a blob digest.  A namespace is one user (the documents layer
+  uses the ``sid`` session key), so sessions cannot overwrite each other's
+  documents, and "newest documents for this user" is an indexed query.
+  Rows whose blob could not be written are marked ``failed`` rather than
+  left pointing at nothing.
+
+:class:`DocumentStore` puts the two together.  The process-wide store is
+created on first use under ``SENIOR_NAV_DOCUMENTS_DIR`` (default
+``.cache/documents``); :func:`set_document_store` replaces it (tests).
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import heapq
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Deque, Dict, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from .write_behind import WriteBehind
+
+DIR_ENV_VAR = "SENIOR_NAV_DOCUMENTS_DIR"
+DOCUMENTS_DIR = Path(".cache/documents")
+CHUNK_SIZE = 1 << 20
+STORED = "stored"
+FAILED = "failed"  # the blob could not be written; the row has no content
+
+_log = logging.getLogger(__name__)
+
+
+class BlobTooLarge(ValueError):
+    """A streamed blob went past its size limit; nothing was stored."""
+
+    def __init__(self, limit: int) -> None:
+        super().__init__(f"larger than the {limit:,}-byte limit")
+        self.limit = limit
+
+
+class BlobWriteFailed(OSError):
+    """A blob was given up after its last write attempt failed; its content is lost."""
+
+    def __init__(self, digest: str) -> None:
+        super().__init__(f"blob {digest[:12]} could not be written")
+        self.digest = digest
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _fsync_dir(directory: Path) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - platforms without directory handles
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover
+        pass
+    finally:
+        os.close(fd)
+
+
+# ---------------------------------------------------------------------------
+# Blobs
+# ---------------------------------------------------------------------------
+class BlobStore(WriteBehind):
+    """SHA-256 addressed files written by a pool of background writers.
+
+    ``on_failed(digest)`` is called on a writer thread when a blob is given up.
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        workers: int = 2,
+        batch_size: int = 32,
+        fsync: bool = True,
+        *,
+        max_retries: int = 4,
+        retry_delay: float = 0.5,
+        on_failed: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        if batch_size < 1 or max_retries < 1:
+            raise ValueError("batch_size and max_retries must be at least 1")
+        super().__init__(
+            "senior-nav-blobs",
+            ("puts", "deduplicated", "written", "bytes_written", "batches", "write_errors", "retries", "failed"),
+            workers=workers,
+            retry_delay=retry_delay,
+        )
+        self.root = Path(root)
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.max_retries = max_retries
+        self.on_failed = on_failed
+        self._pending: Dict[str, bytes] = {}  # digest -> bytes not yet on disk
+        self._queue: Deque[str] = deque()
+        self._attempts: Dict[str, int] = {}  # digest -> failed writes so far
+        self._retry: List[Tuple[float, str]] = []  # heap of (due, digest)
+        self._failed: Set[str] = set()
+        self._work = threading.Condition(self._lock)  # writers wait here, not on _wake
+        self._busy = 0
+        self._start()
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, data: bytes) -> str:
+        """Queue ``data`` for writing and return its digest; known content is not written again."""
+        digest = content_digest(data)
+        with self._lock:
+            self._counts["puts"] += 1
+            if digest in self._pending or self.path(digest).exists():
+                self._counts["deduplicated"] += 1
+                return digest
+            self._failed.discard(digest)  # same content again: another chance
+            self._pending[digest] = data if type(data) is bytes else bytes(data)
+            self._queue.append(digest)
+            self._work.notify()
+        return digest
+
+    def put_stream(
+        self, stream: BinaryIO, *, max_bytes: Optional[int] = None, chunk_size: int = CHUNK_SIZE
+    ) -> Tuple[str, int]:
+        """Spool ``stream`` to disk in ``chunk_size`` reads; returns ``(digest, size)``.
+
+        Runs on the caller and holds one chunk at a time.  Raises
+        :class:`BlobTooLarge` as soon as more than ``max_bytes`` have been read.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        spool = self.root / f".spool-{uuid.uuid4().hex}.tmp"
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            with open(spool, "wb") as fh:
+                while True:
+                    chunk = stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise BlobTooLarge(max_bytes)
+                    hasher.update(chunk)
+                    fh.write(chunk)
+                if self.fsync:
+                    fh.flush()
+                    os.fsync(fh.fileno())
+            digest = hasher.hexdigest()
+            final = self.path(digest)
+            with self._lock:
+                self._counts["puts"] += 1
+                known = digest in self._pending or final.exists()
+                if known:
+                    self._counts["deduplicated"] += 1
+            if not known:
+                final.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(spool, final)
+                if self.fsync:
+                    _fsync_dir(final.parent)
+                with self._lock:
+                    self._failed.discard(digest)
+                    self._counts["written"] += 1
+                    self._counts["bytes_written"] += size
+        finally:
+            spool.unlink(missing_ok=True)
+        return digest, size
+
+    def read(self, digest: str) -> bytes:
+        """Raises :class:`BlobWriteFailed` for a blob that was given up."""
+        with self._lock:
+            data = self._pending.get(digest)
+            failed = digest in self._failed
+        if data is not None:
+            return data
+        try:
+            return self.path(digest).read_bytes()
+        except FileNotFoundError:
+            if failed:
+                raise BlobWriteFailed(digest) from None
+            raise
+
+    def failed(self, digest: str) -> bool:
+        """Whether the blob was given up after ``max_retries`` failed writes."""
+        with self._lock:
+            return digest in self._failed
+
+    def exists(self, digest: str) -> bool:
+        with self._lock:
+            if digest in self._pending:
+                return True
+        return self.path(digest).exists()
+
+    # -- writers ---------------------------------------------------------------
+    def _take(self) -> Optional[List[str]]:
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._retry and self._retry[0][0] <= now:
+                    self._queue.append(heapq.heappop(self._retry)[1])
+                if self._queue or (self._closed and not self._retry):
+                    break
+                self._work.wait(self._retry[0][0] - now if self._retry else None)
+            if not self._queue:
+                return None
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            self._busy += 1
+            return batch
+
+    def _write_batch(self, batch: List[str]) -> None:
+        with self._lock:
+            items = [(digest, self._pending[digest]) for digest in batch]
+        placed: List[str] = []
+        broken: List[str] = []
+        directories = set()
+        written_bytes = 0
+        for digest, data in items:
+            final = self.path(digest)
+            tmp = final.with_name(f".{digest}.{threading.get_ident()}.tmp")
+            try:
+                final.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp, "wb") as fh:
+                    fh.write(data)
+                    if self.fsync:
+                        fh.flush()
+                        os.fsync(fh.fileno())
+                os.replace(tmp, final)
+            except OSError:
+                broken.append(digest)
+                _log.exception("Could not write blob %s", digest[:12])
+                tmp.unlink(missing_ok=True)
+                continue
+            placed.append(digest)
+            directories.add(final.parent)
+            written_bytes += len(data)
+        if self.fsync:
+            for directory in directories:
+                _fsync_dir(directory)
+        given_up: List[str] = []
+        with self._lock:
+            for digest in placed:
+                self._pending.pop(digest, None)
+                self._attempts.pop(digest, None)
+            for digest in broken:
+                attempts = self._attempts.get(digest, 0) + 1
+                if attempts < self.max_retries:
+                    self._attempts[digest] = attempts
+                    due = time.monotonic() + self._backoff(attempts)
+                    heapq.heappush(self._retry, (due, digest))
+                    self._counts["retries"] += 1
+                else:
+                    self._pending.pop(digest, None)
+                    self._attempts.pop(digest, None)
+                    self._failed.add(digest)
+                    self._counts["failed"] += 1
+                    given_up.append(digest)
+            if self._retry:
+                self._work.notify()  # someone has to wait for the next due retry
+            self._counts["written"] += len(placed)
+            self._counts["bytes_written"] += written_bytes
+            self._counts["write_errors"] += len(broken)
+            self._counts["batches"] += 1
+        for digest in given_up:
+            _log.error("Gave up on blob %s after %s attempts", digest[:12], self.max_retries)
+            if self.on_failed is not None:
+                try:
+                    self.on_failed(digest)
+                except Exception:
+                    _log.exception("on_failed callback failed for blob %s", digest[:12])
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take()
+            if batch is None:
+                return
+            try:
+                self._write_batch(batch)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+                    self._idle.notify_all()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until every queued blob is on disk or given up; ``False`` on timeout."""
+        return self._wait_idle(lambda: not (self._queue or self._busy or self._retry), timeout)
+
+    def _wakeup(self) -> None:
+        with self._lock:
+            self._work.notify_all()
+
+    def _gauges(self) -> Dict[str, int]:
+        return {"pending": len(self._pending), "retrying": len(self._retry)}
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+class DocumentRecord(NamedTuple):
+    namespace: str
+    doc_id: str
+    kind: str
+    title: str
+    digest: str
+    size: int
+    ext: str
+    created_at: str  # ISO-8601 UTC, seconds
+    metadata: Dict[str, Any]
+    status: str = STORED  # FAILED once the blob has been given up
+
+
+class DocumentIndex:
+    """``(namespace, doc_id) -> blob`` rows in a WAL-mode SQLite file."""
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS documents ("
+        " namespace TEXT NOT NULL, doc_id TEXT NOT NULL, kind TEXT NOT NULL, title TEXT NOT NULL,"
+        " digest TEXT NOT NULL, size INTEGER NOT NULL, ext TEXT NOT NULL, created_at TEXT NOT NULL,"
+        " created_ts REAL NOT NULL, metadata TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'stored',"
+        " PRIMARY KEY (namespace, doc_id)) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS documents_recent ON documents (namespace, created_ts DESC)",
+        "CREATE INDEX IF NOT EXISTS documents_digest ON documents (digest)",
+    )
+    _COLUMNS = "namespace, doc_id, kind, title, digest, size, ext, created_at, metadata, status"
+
+    def __init__(self, path: Path | str, timeout: float = 5.0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Script threads come and go with every rerun, so share one connection.
+        self._conn = sqlite3.connect(self.path, timeout=timeout, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in self._SCHEMA:
+                self._conn.execute(statement)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(documents)")}
+            if "status" not in columns:  # index files from before failed writes were recorded
+                self._conn.execute("ALTER TABLE documents ADD COLUMN status TEXT NOT NULL DEFAULT 'stored'")
+
+    @staticmethod
+    def _record(row) -> DocumentRecord:
+        return DocumentRecord(*row[:8], json.loads(row[8]), row[9])
+
+    def upsert(self, record: DocumentRecord) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO documents ({self._COLUMNS}, created_ts)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*record[:8], json.dumps(record.metadata, sort_keys=True, default=str), record.status, time.time()),
+            )
+
+    def mark_failed(self, digest: str) -> int:
+        """Flag every row pointing at ``digest`` as :data:`FAILED`; returns how many."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE documents SET status = ? WHERE digest = ? AND status != ?", (FAILED, digest, FAILED)
+            )
+        return cursor.rowcount
+
+    def get(self, namespace: str, doc_id: str) -> Optional[DocumentRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM documents WHERE namespace = ? AND doc_id = ?", (namespace, doc_id)
+            ).fetchone()
+        return self._record(row) if row else None
+
+    def list(self, namespace: str, kind: Optional[str] = None, limit: int = -1) -> List[DocumentRecord]:
+        """Newest first."""
+        sql = f"SELECT {self._COLUMNS} FROM documents WHERE namespace = ?"
+        args: List[Any] = [namespace]
+        if kind is not None:
+            sql += " AND kind = ?"
+            args.append(kind)
+        sql += " ORDER BY created_ts DESC LIMIT ?"
+        args.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [self._record(row) for row in rows]
+
+    def delete(self, namespace: str, doc_id: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM documents WHERE namespace = ? AND doc_id = ?", (namespace, doc_id)
+            )
+        return cursor.rowcount > 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+class DocumentStore:
+    """Blob store plus index under one root directory."""
+
+    def __init__(self, root: Path | str = DOCUMENTS_DIR, *, workers: int = 2, fsync: bool = True) -> None:
+        self.root = Path(root)
+        self.index = DocumentIndex(self.root / "index.sqlite3")
+        self.blobs = BlobStore(self.root / "blobs", workers=workers, fsync=fsync, on_failed=self.index.mark_failed)
+
+    def register(
+        self,
+        namespace: str,
+        doc_id: str,
+        *,
+        kind: str,
+        title: str,
+        data: bytes,
+        ext: str = "json",
+        metadata: Optional[Mapping[str, Any]] = None,
+        created_at: Optional[str] = None,
+    ) -> DocumentRecord:
+        """Store ``data`` (deduplicated) and point ``namespace/doc_id`` at it."""
+        digest = self.blobs.put(data)
+        return self.link(
+            namespace, doc_id, kind=kind, title=title, digest=digest, size=len(data), ext=ext,
+            metadata=metadata, created_at=created_at,
+        )
+
+    def link(
+        self,
+        namespace: str,
+        doc_id: str,
+        *,
+        kind: str,
+        title: str,
+        digest: str,
+        size: int,
+        ext: str = "json",
+        metadata: Optional[Mapping[str, Any]] = None,
+        created_at: Optional[str] = None,
+    ) -> DocumentRecord:
+        """Index a blob that is already in :attr:`blobs`."""
+        record = DocumentRecord(
+            namespace=namespace,
+            doc_id=doc_id,
+            kind=kind,
+            title=title,
+            digest=digest,
+            size=size,
+            ext=ext,
+            created_at=created_at or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            metadata=dict(metadata or {}),
+        )
+        self.index.upsert(record)
+        if self.blobs.failed(digest):  # given up before the row existed
+            self.index.mark_failed(digest)
+            record = record._replace(status=FAILED)
+        return record
+
+    def register_stream(
+        self,
+        namespace: str,
+        doc_id: str,
+        stream: BinaryIO,
+        *,
+        kind: str,
+        title: str,
+        ext: str = "bin",
+        metadata: Optional[Mapping[str, Any]] = None,
+        max_bytes: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> DocumentRecord:
+        """:meth:`register` for a file object, spooled through :meth:`BlobStore.put_stream`."""
+        digest, size = self.blobs.put_stream(stream, max_bytes=max_bytes, chunk_size=chunk_size)
+        return self.link(
+            namespace, doc_id, kind=kind, title=title, digest=digest, size=size, ext=ext, metadata=metadata
+        )
+
+    def get(self, namespace: str, doc_id: str) -> Optional[DocumentRecord]:
+        return self.index.get(namespace, doc_id)
+
+    def list(self, namespace: str, kind: Optional[str] = None, limit: int = -1) -> List[DocumentRecord]:
+        return self.index.list(namespace, kind, limit)
+
+    def read(self, record: DocumentRecord) -> bytes:
+        """Raises :class:`BlobWriteFailed` if the document's content was never written."""
+        try:
+            return self.blobs.read(record.digest)
+        except FileNotFoundError:
+            if record.status == FAILED:
+                raise BlobWriteFailed(record.digest) from None
+            raise
+
+    def path(self, record: DocumentRecord) -> Path:
+        """Where the blob lives once written (see :meth:`flush`)."""
+        return self.blobs.path(record.digest)
+
+    def delete(self, namespace: str, doc_id: str) -> bool:
+        """Drop the index row; the blob stays, other documents may share it."""
+        return self.index.delete(namespace, doc_id)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        return self.blobs.flush(timeout)
+
+    def close(self) -> None:
+        self.blobs.close()
+        self.index.close()
+
+    def stats(self) -> Dict[str, int]:
+        return self.blobs.stats()
+
+
+_LOCK = threading.Lock()
+_store: Optional[DocumentStore] = None
+
+
+def get_document_store() -> DocumentStore:
+    global _store
+    if _store is None:
+        with _LOCK:
+            if _store is None:
+                _store = DocumentStore(Path(os.environ.get(DIR_ENV_VAR) or DOCUMENTS_DIR))
+                atexit.register(_store.close)
+    return _store
+
+
+def set_document_store(store: Optional[DocumentStore]) -> Optional[DocumentStore]:
+    """Install ``store`` (``None`` recreates the default on next use); returns the previous one."""
+    global _store
+    with _LOCK:
+        previous, _store = _store, store
+    return previous
@@ -0,0 +1,182 @@
+"""Bounded per-session event log.
+
+:class:`EventLog` keeps the newest ``capacity`` events in a ring buffer, plus
+a per-type index over the same window, so "last N events" and "last N
+events of type X" cost O(N) however long the session has run.  When the
+ring is full the oldest event is evicted from both.
+
+Payloads are frozen with :func:`senior_nav.lib.frozen.freeze` when logged.
+A caller that keeps building its snapshots from the same frozen parts
+shares them between events instead of deep-copying every time, and logged
+events cannot change underneath a reader.
+
+Optionally every event is also appended to a JSONL file (:class:`JsonlSpill`)
+so the full history survives eviction.  Set ``SENIOR_NAV_EVENT_LOG_DIR`` to
+enable that for :func:`session_event_log`; each browser session writes its
+own ``events-<session>.jsonl``.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional
+
+from .frozen import freeze, thaw
+
+DIR_ENV_VAR = "SENIOR_NAV_EVENT_LOG_DIR"
+SESSION_KEY = "event_log"
+DEFAULT_CAPACITY = 200
+
+_log = logging.getLogger(__name__)
+
+
+class Event(NamedTuple):
+    seq: int  # 1-based position in the session's full history
+    ts: float
+    type: str
+    payload: Any  # frozen
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"seq": self.seq, "ts": self.ts, "event": self.type, "payload": thaw(self.payload)}
+
+
+Spill = Callable[[Event], None]
+
+
+class JsonlSpill:
+    """Appends each event as one JSON line; the file is opened on first write."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self._fh = None
+        self._lock = threading.Lock()
+        self.errors = 0
+
+    def __call__(self, event: Event) -> None:
+        line = json.dumps(event.as_dict(), default=str, separators=(",", ":")) + "\n"
+        with self._lock:
+            try:
+                if self._fh is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._fh = self.path.open("a", encoding="utf-8", buffering=1)
+                self._fh.write(line)
+            except OSError:
+                self.errors += 1
+                _log.warning("Could not append event %s to %s", event.seq, self.path)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+class EventLog:
+    """Fixed-capacity ring of events with a per-type index over the same window."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, spill: Optional[Spill] = None) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.spill = spill
+        self._ring: Deque[Event] = deque()
+        self._by_type: Dict[str, Deque[Event]] = {}
+        self._counts: Dict[str, int] = {}
+        self._seq = 0
+        self.evicted = 0
+
+    def append(self, event_type: str, payload: Any = None) -> Event:
+        """Log one event; ``payload`` is frozen (frozen parts are kept as they are)."""
+        self._seq += 1
+        event = Event(self._seq, time.time(), event_type, freeze(payload))
+        if len(self._ring) == self.capacity:
+            oldest = self._ring.popleft()
+            same_type = self._by_type[oldest.type]
+            same_type.popleft()  # the oldest event overall is the oldest of its type
+            if not same_type:
+                del self._by_type[oldest.type]
+            self.evicted += 1
+        self._ring.append(event)
+        self._by_type.setdefault(event_type, deque()).append(event)
+        self._counts[event_type] = self._counts.get(event_type, 0) + 1
+        if self.spill is not None:
+            try:
+                self.spill(event)
+            except Exception:
+                _log.exception("Event spill failed")
+        return event
+
+    def last(self, n: int = 1, event_type: Optional[str] = None) -> List[Event]:
+        """Up to ``n`` newest events (optionally of one type), oldest first."""
+        source = self._ring if event_type is None else self._by_type.get(event_type, ())
+        if n <= 0 or not source:
+            return []
+        out: List[Event] = []
+        for event in reversed(source):
+            out.append(event)
+            if len(out) == n:
+                break
+        out.reverse()
+        return out
+
+    def latest(self, event_type: Optional[str] = None) -> Optional[Event]:
+        source = self._ring if event_type is None else self._by_type.get(event_type)
+        return source[-1] if source else None
+
+    def by_type(self, event_type: str) -> List[Event]:
+        """Every retained event of ``event_type``, oldest first."""
+        return list(self._by_type.get(event_type, ()))
+
+    def counts(self) -> Dict[str, int]:
+        """Events logged per type over the whole session, including evicted ones."""
+        return dict(self._counts)
+
+    @property
+    def total(self) -> int:
+        return self._seq
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def __iter__(self) -> Iterator[Event]:
+        return iter(tuple(self._ring))
+
+
+def _session_name() -> str:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx()
+        if ctx is not None:
+            return ctx.session_id
+    except Exception:  # pragma: no cover - outside a Streamlit run
+        pass
+    return uuid.uuid4().hex
+
+
+def session_event_log(capacity: int = DEFAULT_CAPACITY) -> EventLog:
+    """This session's log from ``st.session_state["event_log"]``, created on first use.
+
+    A legacy list of ``{"event": ..., "snapshot": ...}`` dicts is folded into
+    the new log (newest ``capacity`` entries).
+    """
+    import streamlit as st
+
+    current = st.session_state.get(SESSION_KEY)
+    if isinstance(current, EventLog):
+        return current
+    directory = os.environ.get(DIR_ENV_VAR, "").strip()
+    spill = JsonlSpill(Path(directory) / f"events-{_session_name()}.jsonl") if directory else None
+    log = EventLog(capacity, spill)
+    if isinstance(current, list):
+        for entry in current[-capacity:]:
+            if isinstance(entry, dict):
+                log.append(str(entry.get("event", "legacy")), entry.get("snapshot"))
+    st.session_state[SESSION_KEY] = log
+    return log
@@ -0,0 +1,251 @@
+"""Background export rendering with job ids, progress and a result cache.
+
+The Streamlit script thread should never render a PDF.  :class:`ExportJobs`
+takes a *frozen* snapshot (:mod:`senior_nav.lib.frozen`), so a worker can read
+it while the session keeps editing.  It also takes a renderer
+``(snapshot, progress) -> bytes``.  The job is queued on a worker pool, and
+the caller gets a job id back at once and polls :meth:`ExportJobs.status`.
+
+Results are cached by ``(kind, fmt, snapshot)``.  A frozen snapshot hashes
+once and compares by hash first, so asking again for an export of an
+unchanged plan is a dict hit and returns a finished job without rendering.
+A request for a job that is already in flight joins that job.  ``on_done``
+hooks run on the worker (or on the caller, for a cache hit) with the
+rendered bytes.  The documents layer uses this hook to register the export.
+
+The default pool is threads: the renderers are short and mostly build
+strings.  Pass any ``concurrent.futures.Executor`` for heavier formats.  A
+``ProcessPoolExecutor`` needs a picklable (module-level) renderer and
+snapshot; progress cannot cross the process boundary, so such jobs report
+0 until they finish.  Completion is handled in the future's done callback
+in the parent either way.
+"""
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+Progress = Callable[[float], None]
+Renderer = Callable[[Any, Progress], bytes]
+OnDone = Callable[[bytes], None]
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+_log = logging.getLogger(__name__)
+
+
+def _no_progress(fraction: float) -> None:
+    pass
+
+
+def _render(
+    renderer: Renderer, snapshot: Any, progress: Progress, started: Optional[Callable[[], None]]
+) -> Tuple[bytes, float]:
+    # Module level so a process pool can pickle it; returns (bytes, seconds).
+    if started is not None:
+        started()
+    start = time.perf_counter()
+    data = renderer(snapshot, progress)
+    return data, time.perf_counter() - start
+
+
+class JobStatus(NamedTuple):
+    job_id: str
+    kind: str
+    fmt: str
+    state: str
+    progress: float  # 0.0 - 1.0
+    cached: bool
+    error: Optional[str]
+    size: int  # bytes rendered, once done
+    seconds: float  # render time, once done
+
+
+@dataclass
+class _Job:
+    job_id: str
+    kind: str
+    fmt: str
+    key: Optional[Tuple[str, str, Hashable]]
+    state: str = QUEUED
+    progress: float = 0.0
+    cached: bool = False
+    error: Optional[str] = None
+    result: Optional[bytes] = None
+    seconds: float = 0.0
+    hooks: List[OnDone] = field(default_factory=list)
+
+    def status(self) -> JobStatus:
+        size = len(self.result) if self.result is not None else 0
+        return JobStatus(
+            self.job_id, self.kind, self.fmt, self.state, self.progress, self.cached, self.error, size, self.seconds
+        )
+
+
+class ExportJobs:
+    """Queue of export renders sharing one pool and one result cache."""
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        *,
+        workers: int = 2,
+        cache_size: int = 64,
+        keep_jobs: int = 512,
+    ) -> None:
+        self._executor = executor or ThreadPoolExecutor(max_workers=workers, thread_name_prefix="senior-nav-export")
+        self.cache_size = cache_size
+        self.keep_jobs = keep_jobs
+        self._jobs: "OrderedDict[str, _Job]" = OrderedDict()
+        self._cache: "OrderedDict[Tuple[str, str, Hashable], bytes]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str, Hashable], _Job] = {}
+        self._ids = itertools.count(1)
+        self._counts = {"submitted": 0, "rendered": 0, "cache_hits": 0, "joined": 0, "failed": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(kind: str, fmt: str, snapshot: Any) -> Optional[Tuple[str, str, Hashable]]:
+        try:
+            hash(snapshot)
+        except TypeError:  # not frozen all the way down; render, but do not cache
+            return None
+        return (kind, fmt, snapshot)
+
+    def _remember(self, job: _Job) -> None:
+        self._jobs[job.job_id] = job
+        while len(self._jobs) > self.keep_jobs:
+            self._jobs.popitem(last=False)
+
+    def submit(
+        self, kind: str, fmt: str, snapshot: Any, renderer: Renderer, on_done: Optional[OnDone] = None
+    ) -> str:
+        """Queue an export of ``snapshot``; returns its job id."""
+        key = self._key(kind, fmt, snapshot)
+        hooks = [on_done] if on_done else []
+        with self._lock:
+            self._counts["submitted"] += 1
+            job = _Job(f"{kind}-{fmt}-{next(self._ids)}", kind, fmt, key, hooks=hooks)
+            self._remember(job)
+            if key is not None and key in self._cache:
+                self._cache.move_to_end(key)
+                job.result = self._cache[key]
+                job.state, job.progress, job.cached = DONE, 1.0, True
+                self._counts["cache_hits"] += 1
+            elif key is not None and key in self._inflight:
+                self._counts["joined"] += 1
+                leader = self._inflight[key]
+                leader.hooks.extend(hooks)
+                self._jobs[job.job_id] = leader  # the new id reports the shared job
+                return job.job_id
+            elif key is not None:
+                self._inflight[key] = job
+        if job.cached:
+            self._finish_hooks(job, hooks)
+        else:
+            self._start(job, snapshot, renderer)
+        return job.job_id
+
+    def _start(self, job: _Job, snapshot: Any, renderer: Renderer) -> None:
+        if isinstance(self._executor, ThreadPoolExecutor):
+            def progress(fraction: float) -> None:
+                job.progress = min(max(float(fraction), 0.0), 1.0)
+
+            def started() -> None:
+                job.state = RUNNING
+
+            args: Tuple[Progress, Optional[Callable[[], None]]] = (progress, started)
+        else:  # closures over the job do not survive pickling
+            args = (_no_progress, None)
+        try:
+            future = self._executor.submit(_render, renderer, snapshot, *args)
+        except Exception as exc:
+            self._failed(job, exc)
+            raise
+        future.add_done_callback(lambda done: self._complete(job, done))
+
+    def _failed(self, job: _Job, exc: BaseException) -> None:
+        with self._lock:
+            job.state, job.error = FAILED, f"{type(exc).__name__}: {exc}"
+            self._counts["failed"] += 1
+            if job.key is not None and self._inflight.get(job.key) is job:
+                self._inflight.pop(job.key)
+
+    def _complete(self, job: _Job, future: "Future[Tuple[bytes, float]]") -> None:
+        try:
+            data, seconds = future.result()
+        except BaseException as exc:  # renderer error, pickling error or cancelled future
+            _log.error("Export %s failed", job.job_id, exc_info=exc)
+            self._failed(job, exc)
+            return
+        with self._lock:
+            job.result, job.progress, job.seconds = data, 1.0, seconds
+            self._counts["rendered"] += 1
+            if job.key is not None:
+                self._inflight.pop(job.key, None)
+                self._cache[job.key] = data
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            hooks = list(job.hooks)
+        self._finish_hooks(job, hooks)
+        job.state = DONE  # last, so a poller that sees DONE also sees the hooks' effects
+
+    def _finish_hooks(self, job: _Job, hooks: List[OnDone]) -> None:
+        for hook in hooks:
+            try:
+                hook(job.result)  # type: ignore[arg-type]
+            except Exception:
+                _log.exception("on_done hook for export %s failed", job.job_id)
+
+    def status(self, job_id: str) -> Optional[JobStatus]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job.status() if job else None
+
+    def result(self, job_id: str) -> Optional[bytes]:
+        """Rendered bytes once the job is done, else ``None``."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job.result if job is not None and job.state == DONE else None
+
+    def wait(self, job_id: str, timeout: float = 30.0, interval: float = 0.01) -> Optional[JobStatus]:
+        """Poll until the job finishes (tests and scripts; pages poll with a fragment)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.status(job_id)
+            if status is None or status.state in (DONE, FAILED) or time.monotonic() >= deadline:
+                return status
+            time.sleep(interval)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counts, "cached": len(self._cache), "inflight": len(self._inflight)}
+
+
+_LOCK = threading.Lock()
+_jobs: Optional[ExportJobs] = None
+
+
+def get_export_jobs() -> ExportJobs:
+    global _jobs
+    if _jobs is None:
+        with _LOCK:
+            if _jobs is None:
+                _jobs = ExportJobs()
+    return _jobs
+
+
+def set_export_jobs(jobs: Optional[ExportJobs]) -> Optional[ExportJobs]:
+    """Install ``jobs`` (``None`` recreates the default on next use); returns the previous one."""
+    global _jobs
+    with _LOCK:
+        previous, _jobs = _jobs, jobs
+    return previous
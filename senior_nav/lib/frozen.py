@@ -0,0 +1,224 @@
+"""Immutable, structurally shared snapshots of session data.
+
+:func:`freeze` turns nested dicts, lists and sets into :class:`FrozenDict`,
+:class:`FrozenList` and frozensets.  Values that are already frozen are reused rather
+than copied, so a structure built from frozen parts only pays for the parts
+that are new.  :meth:`FrozenDict.set` / :meth:`FrozenDict.merge` are the
+copy-on-write edits: they copy one level and share everything below it.
+:func:`refreeze` freezes a live (mutable) structure against the previous
+snapshot of it and reuses every subtree that did not change, so unchanged
+parts stay the *same objects* from one snapshot to the next.
+
+:class:`FrozenDict` and :class:`FrozenList` are ``dict``/``list`` subclasses
+with every mutator disabled: they compare equal to the data they were made
+from, ``json.dumps``, ``st.json`` and ``isinstance`` checks keep working,
+and their hash is computed once and cached, so comparing two snapshots that
+share parts is cheap.  Frozen values can be handed to exporters and
+background threads without a ``deepcopy``; :func:`thaw` returns plain,
+mutable containers.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+_ATOMS = frozenset((str, int, float, bool, bytes, type(None)))
+
+
+def _readonly(self, *_args, **_kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only; use .set()/.merge() or thaw() it")
+
+
+class FrozenDict(dict):
+    """A read-only, hashable ``dict`` whose values are frozen too."""
+
+    __slots__ = ("_hash",)
+
+    def __init__(self, data: Optional[Mapping[str, Any]] = None, **kwargs: Any) -> None:
+        items = dict(data or {}, **kwargs)
+        dict.__init__(self, ((k, freeze(v)) for k, v in items.items()))
+        self._hash: Optional[int] = None
+
+    @classmethod
+    def _wrap(cls, data: Dict[str, Any]) -> "FrozenDict":
+        # ``data`` holds already-frozen values; skip re-freezing them.
+        self = cls.__new__(cls)
+        dict.update(self, data)
+        self._hash = None
+        return self
+
+    __setitem__ = __delitem__ = setdefault = update = pop = popitem = clear = __ior__ = _readonly
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, FrozenDict) and self._hash is not None and other._hash is not None:
+            if self._hash != other._hash:
+                return False
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({dict.__repr__(self)})"
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, _memo) -> "FrozenDict":
+        return self
+
+    def set(self, key: str, value: Any) -> "FrozenDict":
+        """Copy with ``key`` set; other values are shared."""
+        if key in self and self[key] is value:
+            return self
+        data = dict(self)
+        data[key] = freeze(value)
+        return FrozenDict._wrap(data)
+
+    def merge(self, changes: Mapping[str, Any]) -> "FrozenDict":
+        """Copy with ``changes`` applied; other values are shared."""
+        data = dict(self)
+        data.update((k, freeze(v)) for k, v in changes.items())
+        return FrozenDict._wrap(data)
+
+
+class FrozenList(list):
+    """A read-only, hashable ``list`` whose items are frozen too."""
+
+    __slots__ = ("_hash",)
+
+    def __init__(self, items: Iterable[Any] = ()) -> None:
+        list.__init__(self, map(freeze, items))
+        self._hash: Optional[int] = None
+
+    @classmethod
+    def _wrap(cls, items: Iterable[Any]) -> "FrozenList":
+        self = cls.__new__(cls)
+        list.extend(self, items)
+        self._hash = None
+        return self
+
+    __setitem__ = __delitem__ = append = extend = insert = pop = remove = clear = _readonly
+    sort = reverse = __iadd__ = __imul__ = _readonly
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(tuple(self))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"FrozenList({list.__repr__(self)})"
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def __copy__(self) -> "FrozenList":
+        return self
+
+    def __deepcopy__(self, _memo) -> "FrozenList":
+        return self
+
+
+_FROZEN = (FrozenDict, FrozenList, frozenset)
+_FROZEN_TYPES = frozenset(_FROZEN)
+
+
+def freeze(value: Any) -> Any:
+    """Immutable equivalent of ``value``; frozen parts are shared, not copied."""
+    kind = type(value)
+    if kind in _ATOMS or kind in _FROZEN_TYPES:
+        return value
+    if kind is dict:  # the common cases, ahead of the ABC checks below
+        return FrozenDict._wrap({k: freeze(v) for k, v in value.items()})
+    if kind is list:
+        return FrozenList._wrap(map(freeze, value))
+    if isinstance(value, _FROZEN):
+        return value
+    if isinstance(value, Mapping):
+        return FrozenDict._wrap({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, tuple):
+        items = tuple(map(freeze, value))
+        return value if all(a is b for a, b in zip(items, value)) else items
+    if isinstance(value, list):
+        return FrozenList._wrap(map(freeze, value))
+    if isinstance(value, set):
+        return frozenset(map(freeze, value))
+    return value  # other objects are the caller's responsibility
+
+
+_MISSING = object()
+
+
+def refreeze(previous: Any, value: Any) -> Any:
+    """:func:`freeze` ``value``, reusing the subtrees of ``previous`` it still equals.
+
+    The result compares equal to ``freeze(value)``; when nothing changed it
+    *is* ``previous``.  Only changed branches allocate.
+    """
+    if previous is value:
+        return previous
+    kind = type(value)
+    if kind in _ATOMS:
+        return previous if type(previous) is kind and previous == value else value
+    if type(previous) is FrozenDict and (kind is dict or isinstance(value, Mapping)):
+        data = {}
+        same = len(previous) == len(value)
+        get = previous.get
+        for key, item in value.items():
+            old = get(key, _MISSING)
+            if old is item:
+                new = old
+            elif old is _MISSING:
+                new = freeze(item)
+            elif type(item) in _ATOMS:  # inlined leaf case
+                new = old if type(old) is type(item) and old == item else item
+            else:
+                new = refreeze(old, item)
+            if new is not old:
+                same = False
+            data[key] = new
+        return previous if same else FrozenDict._wrap(data)
+    if type(previous) is FrozenList and (kind is list or isinstance(value, list)) and len(previous) == len(value):
+        items = []
+        same = True
+        for old, item in zip(previous, value):
+            if old is item:
+                new = old
+            elif type(item) in _ATOMS:
+                new = old if type(old) is type(item) and old == item else item
+            else:
+                new = refreeze(old, item)
+            if new is not old:
+                same = False
+            items.append(new)
+        return previous if same else FrozenList._wrap(items)
+    frozen = freeze(value)
+    return previous if type(frozen) is type(previous) and frozen == previous else frozen
+
+
+def thaw(value: Any) -> Any:
+    """Plain dict/list/set copy of a frozen value."""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return {thaw(v) for v in value}
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """``json.dumps(..., default=json_default)`` for frozensets and sets."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
@@ -0,0 +1,75 @@
+"""Process-wide services configured from the environment.
+
+Tracing, session persistence and CRM sync each keep one instance per
+process.  It is installed explicitly (tests, app start-up) or created on
+first use by calling a ``"package.module:factory"`` named in an environment
+variable.  :class:`ProcessWide` is that slot; :func:`resolve_factory` is the
+environment lookup.  A bad spec is logged and leaves the service at its
+default, because misconfiguration must not break pages.
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import threading
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+UNSET: Any = object()  # not resolved from the environment yet
+
+_log = logging.getLogger(__name__)
+
+
+def load_factory(spec: str, attr: str) -> Any:
+    """Resolve ``"package.module:factory"`` (``attr`` if no factory is named) and call it."""
+    module_name, _, name = spec.partition(":")
+    factory: Callable[[], Any] = getattr(importlib.import_module(module_name), name or attr)
+    return factory()
+
+
+def resolve_factory(env_var: str, *, attr: str, what: str, default: Any = None) -> Any:
+    """What the factory named in ``env_var`` returns; ``default`` if unset or broken."""
+    spec = os.environ.get(env_var, "").strip()
+    if not spec:
+        return default
+    try:
+        return load_factory(spec, attr)
+    except Exception:  # pragma: no cover - misconfiguration must not break pages
+        _log.exception("Could not load %s %r; %s disabled", what, spec, what)
+        return default
+
+
+class ProcessWide(Generic[T]):
+    """One instance per process, resolved from ``env_var`` on first :meth:`get`.
+
+    :attr:`value` is :data:`UNSET` until then; hot paths may read it without
+    the lock and fall back to :meth:`get`.
+    """
+
+    def __init__(self, env_var: str, *, attr: str, what: str, default: Optional[T] = None) -> None:
+        self.env_var = env_var
+        self.attr = attr
+        self.what = what
+        self.default = default
+        self.value: Any = UNSET
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[T]:
+        value = self.value
+        if value is UNSET:
+            with self._lock:
+                if self.value is UNSET:
+                    self.value = resolve_factory(self.env_var, attr=self.attr, what=self.what, default=self.default)
+                value = self.value
+        return value
+
+    def set(self, value: Optional[T]) -> Optional[T]:
+        """Install ``value``; returns the previous one (``None`` if never resolved)."""
+        with self._lock:
+            previous, self.value = self.value, value
+        return None if previous is UNSET else previous
+
+    def reset(self) -> Optional[T]:
+        """Forget the instance so the next :meth:`get` reads the environment again."""
+        return self.set(UNSET)
@@ -0,0 +1,313 @@
+"""Schema-aware encoding for persisted session buckets.
+
+Generic JSON spends most of its bytes on repeated key names and has to tag
+sets to round-trip them.  The buckets we persist have a known
+shape, so each known bucket gets a schema:
+
+* :class:`Record` - a dict with known keys, written as a positional array.
+  Its first element is a bitmask of the keys present.  Unknown keys follow
+  as one trailing generic dict, so nothing is lost.
+* :class:`Enum` - a known token is written as its index.  An unknown string
+  is written as the string itself; any other value is wrapped in a list.
+* :class:`SetOf` / :class:`ListOf` / :class:`MapOf` - sets become sorted
+  arrays; lists and maps encode their items with the item schema.
+* :data:`ANY` - plain JSON; sets nested in it are tagged ``{"__set__": [...]}``.
+
+A blob is ``b"S"``, a format byte (raw or deflated), the bucket's schema
+version byte, then the JSON body.  Schemas are only ever extended: new
+record fields and enum tokens are appended.  A change that is not
+backward compatible adds a new version in :func:`schemas`, keeping the
+old ones, plus a :data:`MIGRATIONS` step that upgrades decoded values.
+Blobs written before this codec (``J``/``Z`` generic JSON) still decode.
+
+Known buckets: ``cost_planner`` (the ``ensure_core_state`` defaults),
+``gcp_v3`` (answers, flags, scorecard) and ``audiencing`` (state and
+snapshot).  Any other bucket uses the generic encoding.
+"""
+from __future__ import annotations
+
+import json
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+
+MAGIC = b"S"
+_RAW, _DEFLATE = b"r", b"z"
+_LEGACY_PLAIN, _LEGACY_DEFLATE = b"J", b"Z"
+COMPRESS_OVER = 512  # bytes of JSON
+GENERIC = 0  # schema version byte for buckets without a schema
+
+_dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=lambda v: _generic_default(v)).encode
+_loads = json.JSONDecoder(object_hook=lambda obj: _generic_hook(obj)).decode
+
+
+def _generic_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted(value, key=_sort_key)}
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError(f"cannot persist {type(value).__name__}")
+
+
+def _generic_hook(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and "__set__" in obj:
+        return set(obj["__set__"])
+    return obj
+
+
+def _sort_key(value: Any) -> Tuple[str, str]:
+    # Deterministic order for mixed-type sets: by type name, then by value text.
+    return (type(value).__name__, value if isinstance(value, str) else repr(value))
+
+
+# ---------------------------------------------------------------------------
+# Schema nodes
+# ---------------------------------------------------------------------------
+class Schema:
+    def pack(self, value: Any) -> Any:
+        return value
+
+    def unpack(self, data: Any) -> Any:
+        return data
+
+
+ANY = Schema()
+
+
+class Enum(Schema):
+    def __init__(self, *tokens: Any) -> None:
+        self.tokens = tokens
+        self._index = {token: i for i, token in enumerate(tokens)}
+
+    def pack(self, value: Any) -> Any:
+        try:
+            return self._index[value]
+        except (KeyError, TypeError):
+            return value if isinstance(value, str) else [value]
+
+    def unpack(self, data: Any) -> Any:
+        if isinstance(data, int):
+            return self.tokens[data]
+        return data[0] if isinstance(data, list) else data
+
+
+class SetOf(Schema):
+    def __init__(self, item: Schema = ANY) -> None:
+        self.item = item
+
+    def pack(self, value: Any) -> Any:
+        if not isinstance(value, (set, frozenset)):
+            return {"v": value}  # not a set after all; keep it as is
+        pack = self.item.pack
+        return [pack(v) for v in sorted(value, key=_sort_key)]
+
+    def unpack(self, data: Any) -> Any:
+        if isinstance(data, dict):
+            return data["v"]
+        unpack = self.item.unpack
+        return {unpack(v) for v in data}
+
+
+class ListOf(Schema):
+    def __init__(self, item: Schema = ANY) -> None:
+        self.item = item
+
+    def pack(self, value: Any) -> Any:
+        if self.item is ANY or not isinstance(value, list):
+            return value
+        return [self.item.pack(v) for v in value]
+
+    def unpack(self, data: Any) -> Any:
+        if self.item is ANY or not isinstance(data, list):
+            return data
+        return [self.item.unpack(v) for v in data]
+
+
+class MapOf(Schema):
+    def __init__(self, value: Schema = ANY) -> None:
+        self.value = value
+
+    def pack(self, value: Any) -> Any:
+        if self.value is ANY or not isinstance(value, dict):
+            return value
+        pack = self.value.pack
+        return {k: pack(v) for k, v in value.items()}
+
+    def unpack(self, data: Any) -> Any:
+        if self.value is ANY or not isinstance(data, dict):
+            return data
+        unpack = self.value.unpack
+        return {k: unpack(v) for k, v in data.items()}
+
+
+class Record(Schema):
+    """A dict with known keys, packed as ``[present_mask, *values, extras?]``."""
+
+    def __init__(self, fields: Sequence[Tuple[str, Schema]]) -> None:
+        self.fields: Tuple[Tuple[str, Schema], ...] = tuple(fields)
+        self._names = frozenset(name for name, _schema in self.fields)
+
+    def pack(self, value: Any) -> Any:
+        if not isinstance(value, dict):
+            return {"v": value}
+        out: List[Any] = [0]
+        mask = 0
+        for bit, (name, schema) in enumerate(self.fields):
+            if name in value:
+                mask |= 1 << bit
+                out.append(schema.pack(value[name]))
+        out[0] = mask
+        if len(out) - 1 < len(value):
+            extras = {k: v for k, v in value.items() if k not in self._names}
+            if extras:
+                out.append(extras)
+        return out
+
+    def unpack(self, data: Any) -> Any:
+        if isinstance(data, dict):
+            return data["v"]
+        mask = data[0]
+        out: Dict[str, Any] = {}
+        pos = 1
+        for bit, (name, schema) in enumerate(self.fields):
+            if mask >> bit & 1:
+                out[name] = schema.unpack(data[pos])
+                pos += 1
+        if pos < len(data):
+            out.update(data[pos])
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Bucket schemas
+# ---------------------------------------------------------------------------
+@lru_cache(maxsize=1)
+def _schemas() -> Dict[str, Dict[int, Schema]]:
+    # Built on first use: the field lists come from the modules that own the buckets.
+    from audiencing import AUDIENCING_QUALIFIER_KEYS
+    from cost_planner_model import CATEGORY_NAMES
+
+    flag_set = SetOf(ANY)
+    cost_planner_v1 = Record(
+        [
+            ("mode", Enum("tinkering", "planning", "exploring")),
+            ("household", Enum("single", "couple")),
+            ("inputs", ANY),
+            ("subtotals", Record([(name, ANY) for name in CATEGORY_NAMES])),
+            ("monthly_total", ANY),
+            ("net_out_of_pocket", ANY),
+            ("assets", ANY),
+            ("runway_months", ANY),
+            ("decision_log", ANY),
+            ("expert_flags", ANY),
+            ("snapshot_for_crm", ANY),
+            ("custom_line_items", ANY),
+        ]
+    )
+    gcp_v3_v1 = Record(
+        [
+            ("answers", ANY),
+            ("flags", flag_set),
+            (
+                "scorecard",
+                Record(
+                    [
+                        ("domains", ANY),
+                        ("tier", ANY),
+                        ("tier_label", ANY),
+                        ("flags", flag_set),
+                        ("narrative", ANY),
+                        ("highlights", ANY),
+                    ]
+                ),
+            ),
+            ("completed", ANY),
+            ("medicaid_status", Enum("unknown", "yes", "no")),
+        ]
+    )
+    audiencing_v1 = Record(
+        [
+            ("entry", Enum(None, "self", "proxy", "professional", "pro")),
+            ("qualifiers", Record([(key, ANY) for key in AUDIENCING_QUALIFIER_KEYS])),
+            (
+                "route",
+                Record(
+                    [
+                        ("next", Enum(None, "contextual_welcome", "pfma")),
+                        ("meta", Record([("reasons", ANY), ("urgent_feature_enabled", ANY)])),
+                    ]
+                ),
+            ),
+            ("people", Record([("recipient_name", ANY), ("proxy_name", ANY)])),
+            ("sanitized", ANY),
+            ("visibility", Record([("partner", ANY), ("home", ANY), ("veteran", ANY)])),
+            ("flags", Record([("medicaid", ANY), ("urgent", ANY)])),
+        ]
+    )
+    return {
+        "cost_planner": {1: cost_planner_v1},
+        "gcp_v3": {1: gcp_v3_v1},
+        "audiencing": {1: audiencing_v1},
+        "audiencing_snapshot": {1: audiencing_v1},
+    }
+
+
+def schemas() -> Dict[str, Dict[int, Schema]]:
+    """``bucket -> {version: schema}``; the highest version is written."""
+    return _schemas()
+
+
+# (bucket, version) -> step upgrading a value decoded with that version to version + 1.
+MIGRATIONS: Dict[Tuple[str, int], Callable[[Any], Any]] = {}
+
+
+def current_version(bucket: str) -> int:
+    versions = schemas().get(bucket)
+    return max(versions) if versions else GENERIC
+
+
+# ---------------------------------------------------------------------------
+# Encode / decode
+# ---------------------------------------------------------------------------
+def encode(bucket: str, value: Any) -> bytes:
+    """Blob for ``value`` using ``bucket``'s current schema (generic JSON if it has none)."""
+    version = current_version(bucket)
+    packed = schemas()[bucket][version].pack(value) if version else value
+    raw = _dumps(packed).encode()
+    if len(raw) > COMPRESS_OVER:
+        deflated = zlib.compress(raw, 1)
+        if len(deflated) < len(raw):
+            return MAGIC + _DEFLATE + bytes((version,)) + deflated
+    return MAGIC + _RAW + bytes((version,)) + raw
+
+
+def decode(bucket: str, blob: bytes) -> Any:
+    """Inverse of :func:`encode`, upgrading older schema versions through :data:`MIGRATIONS`."""
+    tag = blob[:1]
+    if tag in (_LEGACY_PLAIN, _LEGACY_DEFLATE):
+        body = zlib.decompress(blob[1:]) if tag == _LEGACY_DEFLATE else blob[1:]
+        return _loads(body.decode())
+    if tag != MAGIC or len(blob) < 3:
+        raise ValueError(f"not a session blob (tag {tag!r})")
+    fmt, version = blob[1:2], blob[2]
+    body = blob[3:]
+    if fmt == _DEFLATE:
+        body = zlib.decompress(body)
+    elif fmt != _RAW:
+        raise ValueError(f"unknown session blob format {fmt!r}")
+    data = _loads(body.decode())
+    if version == GENERIC:
+        return data
+    versions = schemas().get(bucket, {})
+    if version not in versions:
+        raise ValueError(f"{bucket}: no schema version {version}")
+    value = versions[version].unpack(data)
+    while version < current_version(bucket):
+        value = MIGRATIONS[(bucket, version)](value)
+        version += 1
+    return value
+
+
+def stats(buckets: Mapping[str, Any]) -> Dict[str, int]:
+    """Encoded size per bucket (diagnostics)."""
+    return {bucket: len(encode(bucket, value)) for bucket, value in buckets.items()}
@@ -0,0 +1,378 @@
+"""Persist session buckets across restarts and replicas.
+
+The planner's work lives in a handful of ``st.session_state`` buckets
+(:data:`BUCKETS`).  :class:`SessionPersister` keeps them in a
+:class:`SessionBackend` keyed by a stable session key carried in the URL
+(``?sid=...``), so a server restart or a hop to another replica picks the
+session back up.
+
+* :func:`rehydrate` runs once per browser session, before any page, and
+  fills the buckets from the backend.
+* :func:`persist` runs after every rerun.  It encodes each bucket with
+  :mod:`senior_nav.lib.session_codec` on the script thread (the only thread
+  allowed to read session state), compares a digest with what was last
+  written and stages only the buckets that changed.  A daemon thread
+  writes staged buckets once a session has been quiet for ``debounce``
+  seconds (or after ``max_delay`` at the latest), so a burst of widget
+  reruns becomes one write and the rerun never waits on disk.
+
+A backend stores opaque bucket blobs per session: ``load``, ``save`` (upsert
+the given buckets) and ``delete``.  :class:`SQLiteBackend` is the default
+(WAL mode, safe for several worker processes on one host); anything with
+hash semantics, such as Redis ``HGETALL``/``HSET``, fits the same three calls.
+
+Persistence is off until a backend is configured, either with
+:func:`set_persister` or by naming a ``"package.module:factory"`` callable
+in ``SENIOR_NAV_SESSION_STORE``
+(``senior_nav.lib.session_store:sqlite_persister`` writes to
+``SENIOR_NAV_SESSION_DB``, default ``.cache/sessions/sessions.sqlite3``).
+
+The ``sid`` query parameter is a bearer token for the stored answers; it is
+random and long enough not to be guessed, but it must not be shared.
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import logging
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, MutableMapping, Optional, Protocol, Tuple
+
+from . import session_codec
+from .services import ProcessWide, load_factory
+from .write_behind import WriteBehind
+
+ENV_VAR = "SENIOR_NAV_SESSION_STORE"
+DB_ENV_VAR = "SENIOR_NAV_SESSION_DB"
+SESSION_DB = Path(".cache/sessions/sessions.sqlite3")
+BUCKETS: Tuple[str, ...] = ("gcp", "gcp_v3", "cost_planner", "cp", "pfma", "audiencing")
+QUERY_PARAM = "sid"
+_RESTORED_KEY = "_session_restored"
+_SID_RE = re.compile(r"[A-Za-z0-9_-]{16,64}")
+
+_log = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+class SessionBackend(Protocol):
+    def load(self, session_id: str) -> Dict[str, bytes]: ...
+
+    def save(self, session_id: str, buckets: Mapping[str, bytes]) -> None: ...
+
+    def delete(self, session_id: str) -> None: ...
+
+
+class MemoryBackend:
+    """Process-local backend (tests, single-process development)."""
+
+    def __init__(self) -> None:
+        self.sessions: Dict[str, Dict[str, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str) -> Dict[str, bytes]:
+        with self._lock:
+            return dict(self.sessions.get(session_id, {}))
+
+    def save(self, session_id: str, buckets: Mapping[str, bytes]) -> None:
+        with self._lock:
+            self.sessions.setdefault(session_id, {}).update(buckets)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self.sessions.pop(session_id, None)
+
+
+class SQLiteBackend:
+    """One row per (session, bucket) in a WAL-mode SQLite file."""
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS session_buckets ("
+        " session_id TEXT NOT NULL, bucket TEXT NOT NULL, payload BLOB NOT NULL,"
+        " updated_at REAL NOT NULL, PRIMARY KEY (session_id, bucket)) WITHOUT ROWID"
+    )
+
+    def __init__(self, path: Path | str = SESSION_DB, timeout: float = 5.0) -> None:
+        self.path = Path(path)
+        self.timeout = timeout
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(self._SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections belong to the thread that made them.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, session_id: str) -> Dict[str, bytes]:
+        rows = self._connection().execute(
+            "SELECT bucket, payload FROM session_buckets WHERE session_id = ?", (session_id,)
+        )
+        return {bucket: bytes(payload) for bucket, payload in rows}
+
+    def save(self, session_id: str, buckets: Mapping[str, bytes]) -> None:
+        now = time.time()
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT INTO session_buckets (session_id, bucket, payload, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (session_id, bucket) DO UPDATE SET payload = excluded.payload,"
+                " updated_at = excluded.updated_at",
+                [(session_id, bucket, blob, now) for bucket, blob in buckets.items()],
+            )
+
+    def delete(self, session_id: str) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM session_buckets WHERE session_id = ?", (session_id,))
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# ---------------------------------------------------------------------------
+# Write-behind persister
+# ---------------------------------------------------------------------------
+def _digest(blob: bytes) -> bytes:
+    return hashlib.blake2b(blob, digest_size=16).digest()
+
+
+class SessionPersister(WriteBehind):
+    """Stages changed buckets on the caller and writes them from a daemon thread."""
+
+    def __init__(
+        self,
+        backend: SessionBackend,
+        buckets: Iterable[str] = BUCKETS,
+        debounce: float = 0.5,
+        max_delay: float = 5.0,
+        max_sessions: int = 10_000,
+    ) -> None:
+        super().__init__(
+            "senior-nav-sessions", ("staged", "unchanged", "skipped", "written", "batches", "write_errors")
+        )
+        self.backend = backend
+        self.buckets = tuple(buckets)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.max_sessions = max_sessions
+        # Last digest written (or loaded) per session and bucket; LRU-bounded,
+        # an evicted session just writes all of its buckets once more.
+        self._digests: "OrderedDict[str, Dict[str, bytes]]" = OrderedDict()
+        # session -> (first staged, last staged, {bucket: blob}); newer blobs replace older ones.
+        self._pending: Dict[str, Tuple[float, float, Dict[str, bytes]]] = {}
+        self._start()
+
+    # -- caller side -----------------------------------------------------------
+    def stage(self, session_id: str, state: Mapping[str, Any]) -> int:
+        """Encode ``state``'s buckets and queue the ones that changed; returns how many."""
+        changed: Dict[str, bytes] = {}
+        skipped = unchanged = 0
+        with self._lock:
+            known = self._digests.get(session_id)
+        known = dict(known or {})
+        for bucket in self.buckets:
+            value = state.get(bucket)
+            if value is None:
+                continue
+            try:
+                blob = session_codec.encode(bucket, value)
+            except (TypeError, ValueError):
+                skipped += 1
+                _log.warning("Session bucket %r is not serializable; not persisted", bucket)
+                continue
+            digest = _digest(blob)
+            if known.get(bucket) == digest:
+                unchanged += 1
+                continue
+            known[bucket] = digest
+            changed[bucket] = blob
+        now = time.monotonic()
+        with self._lock:
+            self._counts["skipped"] += skipped
+            self._counts["unchanged"] += unchanged
+            if not changed:
+                return 0
+            self._remember(session_id, known)
+            first, _last, blobs = self._pending.get(session_id, (now, now, {}))
+            blobs.update(changed)
+            self._pending[session_id] = (first, now, blobs)
+            self._counts["staged"] += len(changed)
+        self._wake.set()
+        return len(changed)
+
+    def load(self, session_id: str) -> Dict[str, Any]:
+        """Decoded buckets for ``session_id``; staged but unwritten buckets win."""
+        blobs = self.backend.load(session_id)
+        with self._lock:
+            pending = self._pending.get(session_id)
+            if pending:
+                blobs.update(pending[2])
+        out: Dict[str, Any] = {}
+        digests: Dict[str, bytes] = {}
+        for bucket, blob in blobs.items():
+            try:
+                out[bucket] = session_codec.decode(bucket, blob)
+            except (ValueError, zlib.error):
+                _log.warning("Dropping unreadable session bucket %r", bucket)
+                continue
+            digests[bucket] = _digest(blob)
+        with self._lock:
+            self._remember(session_id, digests)
+        return out
+
+    def forget(self, session_id: str) -> None:
+        with self._lock:
+            self._pending.pop(session_id, None)
+            self._digests.pop(session_id, None)
+        self.backend.delete(session_id)
+
+    def _remember(self, session_id: str, digests: Dict[str, bytes]) -> None:
+        self._digests[session_id] = digests
+        self._digests.move_to_end(session_id)
+        while len(self._digests) > self.max_sessions:
+            self._digests.popitem(last=False)
+
+    # -- writer thread --------------------------------------------------------
+    def _due(self, force: bool) -> Dict[str, Dict[str, bytes]]:
+        now = time.monotonic()
+        with self._lock:
+            ready = [
+                sid
+                for sid, (first, last, _blobs) in self._pending.items()
+                if force or now - last >= self.debounce or now - first >= self.max_delay
+            ]
+            return {sid: self._pending.pop(sid)[2] for sid in ready}
+
+    def _write(self, due: Dict[str, Dict[str, bytes]]) -> None:
+        for session_id, blobs in due.items():
+            try:
+                self.backend.save(session_id, blobs)
+            except Exception:
+                _log.exception("Could not persist session %s", session_id[:6])
+                with self._lock:
+                    self._counts["write_errors"] += 1
+                    # Forget the digests so the next rerun stages these buckets again.
+                    self._digests.pop(session_id, None)
+            else:
+                self._count(written=len(blobs), batches=1)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.debounce if self._pending else None)
+            self._wake.clear()
+            closing = self._closed
+            self._write(self._due(force=closing))
+            self._notify_idle()
+            if closing:
+                return
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write everything staged so far, skipping the debounce; ``False`` on timeout."""
+        self._write(self._due(force=True))
+        self._wake.set()  # anything staged meanwhile
+        return self._wait_idle(lambda: not self._pending, timeout)
+
+    def _gauges(self) -> Dict[str, int]:
+        return {"pending": sum(len(blobs) for _first, _last, blobs in self._pending.values())}
+
+
+def sqlite_persister() -> SessionPersister:
+    """Factory for ``SENIOR_NAV_SESSION_STORE``; writes to ``SENIOR_NAV_SESSION_DB``."""
+    persister = SessionPersister(SQLiteBackend(Path(os.environ.get(DB_ENV_VAR) or SESSION_DB)))
+    atexit.register(persister.close)
+    return persister
+
+
+# ---------------------------------------------------------------------------
+# Process-wide persister and Streamlit glue
+# ---------------------------------------------------------------------------
+_persister: ProcessWide[SessionPersister] = ProcessWide(ENV_VAR, attr="persister", what="session store")
+
+
+def load_persister(spec: str) -> SessionPersister:
+    """Resolve ``"package.module:factory"`` and call the factory."""
+    return load_factory(spec, "persister")
+
+
+def get_persister() -> Optional[SessionPersister]:
+    return _persister.get()
+
+
+def set_persister(persister: Optional[SessionPersister]) -> Optional[SessionPersister]:
+    """Install ``persister`` (``None`` disables persistence); returns the previous one."""
+    return _persister.set(persister)
+
+
+def session_key(create: bool = True) -> Optional[str]:
+    """Stable key for this browser session, kept in the ``sid`` query parameter."""
+    import streamlit as st
+
+    sid = st.query_params.get(QUERY_PARAM)
+    if sid and _SID_RE.fullmatch(sid):
+        return sid
+    if not create:
+        return None
+    sid = secrets.token_urlsafe(18)
+    st.query_params[QUERY_PARAM] = sid
+    return sid
+
+
+def rehydrate(state: Optional[MutableMapping[str, Any]] = None) -> int:
+    """Fill empty buckets from the store once per browser session; returns how many."""
+    persister = get_persister()
+    if persister is None:
+        return 0
+    import streamlit as st
+
+    state = st.session_state if state is None else state
+    if state.get(_RESTORED_KEY):
+        return 0
+    state[_RESTORED_KEY] = True
+    sid = session_key(create=False)
+    if sid is None:
+        return 0
+    restored = 0
+    try:
+        stored = persister.load(sid)
+    except Exception:
+        _log.exception("Could not restore session %s", sid[:6])
+        return 0
+    for bucket, value in stored.items():
+        if not state.get(bucket):
+            state[bucket] = value
+            restored += 1
+    return restored
+
+
+def persist(state: Optional[Mapping[str, Any]] = None) -> int:
+    """Stage this session's changed buckets for writing; never raises."""
+    persister = get_persister()
+    if persister is None:
+        return 0
+    import streamlit as st
+
+    state = st.session_state if state is None else state
+    if not any(state.get(bucket) is not None for bucket in persister.buckets):
+        return 0
+    try:
+        return persister.stage(session_key(), state)
+    except Exception:
+        _log.exception("Could not stage session buckets")
+        return 0
@@ -0,0 +1,197 @@
+"""Analytics trace events.
+
+``trace(event, summary, source, **fields)`` hands one :class:`TraceEvent` to
+the installed backend.  The default backend drops events, so tracing costs a
+function call and nothing else until a backend is installed, either with
+:func:`set_backend` or by naming a ``"package.module:factory"`` callable in
+``SENIOR_NAV_TRACE_BACKEND`` (resolved on the first event, not at import).
+
+A backend is any callable taking a :class:`TraceEvent`.  Backends must not
+slow down or break the caller; exceptions are swallowed and counted in
+:func:`stats`.
+
+:class:`BatchedSink` is the production backend
+(``SENIOR_NAV_TRACE_BACKEND=senior_nav.lib.trace:jsonl_backend``).  The
+caller only appends to a bounded in-memory buffer; a daemon thread wakes every
+``flush_interval`` (or once a batch is ready), drains it and appends the batch
+to one JSONL file per day.  When the buffer is full the event is dropped and
+counted rather than blocking scoring.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Mapping, NamedTuple, Optional
+
+from .services import UNSET, ProcessWide, load_factory
+from .write_behind import WriteBehind
+
+ENV_VAR = "SENIOR_NAV_TRACE_BACKEND"
+DIR_ENV_VAR = "SENIOR_NAV_TRACE_DIR"
+TRACE_DIR = Path(".cache/trace")
+
+_log = logging.getLogger(__name__)
+
+
+class TraceEvent(NamedTuple):
+    # A tuple rather than a frozen dataclass: it is built on the scoring hot path.
+    event: str
+    summary: str = ""
+    source: str = ""
+    ts: float = 0.0
+    fields: Mapping[str, Any] = {}
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"event": self.event, "summary": self.summary, "source": self.source, "ts": self.ts, **self.fields}
+
+
+Backend = Callable[[TraceEvent], None]
+
+
+def null_backend(_event: TraceEvent) -> None:
+    return None
+
+
+class MemoryBackend:
+    """Keeps the last ``maxlen`` events in memory (tests and local debugging)."""
+
+    def __init__(self, maxlen: int = 1000) -> None:
+        self.events: Deque[TraceEvent] = deque(maxlen=maxlen)
+
+    def __call__(self, event: TraceEvent) -> None:
+        self.events.append(event)
+
+
+class BatchedSink(WriteBehind):
+    """Bounded in-memory buffer drained into JSONL files by a background thread."""
+
+    def __init__(
+        self,
+        directory: Path = TRACE_DIR,
+        maxsize: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ) -> None:
+        super().__init__("senior-nav-trace", ("enqueued", "dropped", "written", "batches", "write_errors"))
+        self.directory = Path(directory)
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # popleft is atomic, so the writer drains without the lock; callers take it
+        # only for the append and the counters, which the writer thread also updates.
+        self._buffer: Deque[TraceEvent] = deque()
+        self._processed = 0
+        self._start()
+
+    def __call__(self, event: TraceEvent) -> None:
+        buffer = self._buffer
+        with self._lock:
+            if self._closed or len(buffer) >= self.maxsize:
+                self._counts["dropped"] += 1
+                return
+            buffer.append(event)
+            self._counts["enqueued"] += 1
+            size = len(buffer)
+        if size == self.batch_size:
+            self._wake.set()
+
+    def _path(self, ts: float) -> Path:
+        return self.directory / f"trace-{time.strftime('%Y%m%d', time.gmtime(ts))}.jsonl"
+
+    def _write(self, batch: List[TraceEvent]) -> None:
+        by_path: Dict[Path, List[str]] = {}
+        for event in batch:
+            by_path.setdefault(self._path(event.ts), []).append(json.dumps(event.as_dict(), default=str))
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for path, lines in by_path.items():
+                with path.open("a", encoding="utf-8") as fh:
+                    fh.write("\n".join(lines) + "\n")
+        except OSError:
+            self._count(write_errors=1, dropped=len(batch))
+            _log.warning("Dropped %d trace events: could not write to %s", len(batch), self.directory)
+        else:
+            self._count(written=len(batch), batches=1)
+
+    def _drain(self) -> None:
+        buffer = self._buffer
+        while buffer:
+            batch: List[TraceEvent] = []
+            while buffer and len(batch) < self.batch_size:
+                batch.append(buffer.popleft())
+            self._write(batch)
+            with self._lock:
+                self._processed += len(batch)
+                self._idle.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+            if self._closed:
+                self._drain()
+                return
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything buffered so far is written; ``False`` on timeout."""
+        with self._lock:
+            target = self._counts["enqueued"]
+        self._wake.set()
+        return self._wait_idle(lambda: self._processed >= target, timeout)
+
+    def _gauges(self) -> Dict[str, int]:
+        return {"queued": len(self._buffer)}
+
+
+def jsonl_backend() -> BatchedSink:
+    """Factory for ``SENIOR_NAV_TRACE_BACKEND``; writes under ``SENIOR_NAV_TRACE_DIR``."""
+    sink = BatchedSink(Path(os.environ.get(DIR_ENV_VAR) or TRACE_DIR))
+    atexit.register(sink.close)
+    return sink
+
+
+_backend: ProcessWide[Backend] = ProcessWide(ENV_VAR, attr="backend", what="trace backend", default=null_backend)
+_errors = 0
+
+
+def load_backend(spec: str) -> Backend:
+    """Resolve ``"package.module:factory"`` and call the factory."""
+    return load_factory(spec, "backend")
+
+
+def set_backend(backend: Optional[Backend]) -> Backend:
+    """Install ``backend`` (``None`` re-reads the environment); returns the previous one."""
+    previous = _backend.reset() if backend is None else _backend.set(backend)
+    return previous or null_backend
+
+
+def get_backend() -> Backend:
+    return _backend.get() or null_backend
+
+
+def trace(event: str, summary: str = "", source: str = "", **fields: Any) -> None:
+    """Record one analytics event; never raises."""
+    global _errors
+    backend = _backend.value
+    if backend is UNSET:
+        backend = _backend.get()
+    if backend is null_backend:
+        return
+    try:
+        backend(TraceEvent(event, summary, source, time.time(), fields))
+    except Exception:
+        _errors += 1
+
+
+def stats() -> Dict[str, int]:
+    """Error count plus the installed backend's own counters, if it keeps any."""
+    backend = _backend.value
+    counts = dict(backend.stats()) if hasattr(backend, "stats") else {}
+    counts["backend_errors"] = _errors
+    return counts
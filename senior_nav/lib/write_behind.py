@@ -0,0 +1,94 @@
+"""Base class for write-behind buffers.
+
+Trace events, session buckets, document blobs and CRM batches all work the
+same way: the caller puts work into memory and returns, and daemon threads
+write it out.  :class:`WriteBehind` holds the shared pieces:
+
+* one lock guarding the subclass's buffers and the ``stats`` counters;
+* ``_wake`` (an event the threads wait on) and ``_idle`` (a condition the
+  threads notify after each round, for ``flush``);
+* ``close`` (stop accepting, wake the threads, join them) and ``stats``;
+* ``_backoff``: the delay before retry number ``n``, doubling from
+  ``retry_delay`` up to ``max_retry_delay``.
+
+A subclass sets up its own state, then calls :meth:`WriteBehind._start`.  It
+implements ``_run`` (the thread body) and may override ``_wakeup`` (how
+``close`` rouses the threads) and ``_gauges`` (extra ``stats`` entries).
+"""
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, Iterable
+
+
+class WriteBehind:
+    """Caller-side buffer drained by ``workers`` daemon threads."""
+
+    def __init__(
+        self,
+        name: str,
+        counters: Iterable[str],
+        *,
+        workers: int = 1,
+        retry_delay: float = 0.5,
+        max_retry_delay: float = 60.0,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._counts: Dict[str, int] = dict.fromkeys(counters, 0)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Condition(self._lock)
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._run, name=name if workers == 1 else f"{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def _start(self) -> None:
+        for thread in self._threads:
+            thread.start()
+
+    def _run(self) -> None:
+        raise NotImplementedError
+
+    def _wakeup(self) -> None:
+        self._wake.set()
+
+    def _gauges(self) -> Dict[str, int]:
+        """Point-in-time sizes added to :meth:`stats`; called under the lock."""
+        return {}
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                self._counts[name] += delta
+
+    def _backoff(self, attempts: int) -> float:
+        """Seconds to wait after ``attempts`` failed tries."""
+        return min(self.retry_delay * 2 ** (attempts - 1), self.max_retry_delay)
+
+    def _notify_idle(self) -> None:
+        with self._lock:
+            self._idle.notify_all()
+
+    def _wait_idle(self, done: Callable[[], bool], timeout: float) -> bool:
+        """Wait (up to ``timeout``) until ``done()`` holds; it is checked under the lock."""
+        with self._lock:
+            return self._idle.wait_for(done, timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Write what is buffered and stop the threads."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wakeup()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counts, **self._gauges()}
@@ -0,0 +1,186 @@
+"""Process-wide navigation registry for the INTENDED pages.
+
+Page paths, titles and icons are resolved once per process from the page
+manifest (see :mod:`senior_nav.page_manifest`).  In dev mode the registry is
+rebuilt when a registered page or the manifest changes on disk; with
+``SENIOR_NAV_ENV=production`` it is frozen after the first build.
+
+``st.Page`` objects carry per-run state (which page may execute), so they are
+still created on each rerun, but only from the pre-resolved specs here --
+no filesystem access happens on the hot path.
+"""
+from __future__ import annotations
+
+import ast
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import streamlit as st
+
+from . import page_manifest
+
+log = logging.getLogger(__name__)
+
+WELCOME_PAGE = "app_pages/welcome.py"
+AUDIENCING_PAGE = "app_pages/audiencing.py"
+HUB_PAGE = "app_pages/hub.py"
+AI_ADVISOR_PAGE = "app_pages/SeniorNav_ai_advisor.py"
+
+# Functions whose first string argument is a page target.
+SWITCH_FUNCTIONS = frozenset(
+    {"switch_page", "safe_switch", "safe_switch_page", "_safe_switch_page", "_goto", "goto", "go"}
+)
+_LEGACY_PREFIX = "pages/"
+_DEV_RECHECK_SECONDS = 1.0
+
+
+def is_production() -> bool:
+    return os.environ.get("SENIOR_NAV_ENV", "").strip().lower() in {"prod", "production"}
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    path: str
+    title: str
+    icon: str
+    default: bool = False
+
+
+@dataclass(frozen=True)
+class Registry:
+    pages: Tuple[PageSpec, ...]
+    by_path: Dict[str, PageSpec]
+    aliases: Dict[str, str]
+    signature: Tuple[int, ...]
+
+    def resolve(self, target: str) -> Optional[str]:
+        """Map ``target`` (``app_pages/x.py`` or legacy ``pages/x.py``) to a registered path."""
+        key = target.strip()
+        while key.startswith("./"):
+            key = key[2:]
+        if key in self.by_path:
+            return key
+        return self.aliases.get(key)
+
+
+def _signature(paths: Sequence[str]) -> Tuple[int, ...]:
+    stamps = []
+    for path in (str(page_manifest.MANIFEST_PATH), *paths):
+        try:
+            stamps.append(Path(path).stat().st_mtime_ns)
+        except OSError:
+            stamps.append(-1)
+    return tuple(stamps)
+
+
+def _build() -> Registry:
+    specs = [
+        PageSpec(path, title, icon, default)
+        for path, title, icon, default in page_manifest.registered_pages()
+        if Path(path).exists()
+    ]
+    by_path = {spec.path: spec for spec in specs}
+    aliases: Dict[str, str] = {}
+    for spec in specs:
+        rel = spec.path.split("/", 1)[1] if "/" in spec.path else spec.path
+        aliases[_LEGACY_PREFIX + rel] = spec.path
+        aliases[rel] = spec.path
+    return Registry(tuple(specs), by_path, aliases, _signature([s.path for s in specs]))
+
+
+_LOCK = threading.Lock()
+_REGISTRY: Optional[Registry] = None
+_CHECKED_AT = 0.0
+
+
+def registry() -> Registry:
+    """Return the cached registry, rebuilding on file changes in dev mode."""
+    global _REGISTRY, _CHECKED_AT
+    current = _REGISTRY
+    if current is not None and (is_production() or time.monotonic() - _CHECKED_AT < _DEV_RECHECK_SECONDS):
+        return current
+    with _LOCK:
+        now = time.monotonic()
+        if _REGISTRY is None:
+            _REGISTRY = _build()
+        elif not is_production():
+            if _signature([s.path for s in _REGISTRY.pages]) != _REGISTRY.signature:
+                _REGISTRY = _build()
+                stale_targets.cache_clear()
+        _CHECKED_AT = now
+        return _REGISTRY
+
+
+def reset() -> None:
+    global _REGISTRY
+    with _LOCK:
+        _REGISTRY = None
+    stale_targets.cache_clear()
+
+
+def resolve(target: str) -> Optional[str]:
+    return registry().resolve(target)
+
+
+def build_pages() -> List["st.Page"]:
+    """Create the ``st.Page`` list for ``st.navigation`` from the cached specs."""
+    return [
+        st.Page(spec.path, title=spec.title, icon=spec.icon, default=spec.default)
+        for spec in registry().pages
+    ]
+
+
+def switch_page(target: str) -> None:
+    """Navigate to a registered page; fall back to ``?next=`` + rerun otherwise."""
+    resolved = resolve(target)
+    if resolved is None:
+        log.warning("switch to unregistered page %r", target)
+        st.query_params["next"] = target
+        st.rerun()
+        return
+    try:
+        st.switch_page(resolved)
+    except Exception:
+        st.query_params["next"] = resolved
+        st.rerun()
+
+
+# ------------------------------------------------------------------
+# Startup check for stale navigation targets
+# ------------------------------------------------------------------
+def _targets_in(path: Path) -> List[Tuple[int, str]]:
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return []
+    found: List[Tuple[int, str]] = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call) or not node.args:
+            continue
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+        arg = node.args[0]
+        if name in SWITCH_FUNCTIONS and isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+            if arg.value.endswith(".py"):
+                found.append((node.lineno, arg.value))
+    return found
+
+
+@lru_cache(maxsize=1)
+def stale_targets(roots: Tuple[str, ...] = page_manifest.PAGE_ROOTS) -> Tuple[Tuple[str, int, str], ...]:
+    """Return ``(file, line, target)`` for literal switch targets that do not resolve."""
+    reg = registry()
+    stale: List[Tuple[str, int, str]] = []
+    for path in page_manifest.iter_page_files(roots):
+        for line, target in _targets_in(path):
+            if reg.resolve(target) is None:
+                stale.append((path.as_posix(), line, target))
+    for path, line, target in stale:
+        log.warning("stale navigation target %s:%d -> %r", path, line, target)
+    return tuple(stale)
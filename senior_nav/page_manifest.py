@@ -0,0 +1,241 @@
+"""Content-hash manifest for Streamlit pages.
+
+``tools/build_page_manifest.py`` validates every page once (compile) and
+records ``path, mtime, size, sha, ok`` per file together with the ``INTENDED``
+page registration.  ``app.py`` then calls :func:`preflight_errors`
+on each rerun, which only stats files and re-validates the ones whose content
+hash no longer matches the manifest.  Results are cached for the life of the
+process, so a rerun with unchanged files never reads or compiles a page.
+
+This module must stay free of Streamlit imports so the build step can run in
+plain Python.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+MANIFEST_VERSION = 1
+PAGE_ROOTS: Tuple[str, ...] = ("app_pages",)
+MANIFEST_PATH = Path(".page_manifest.json")
+
+# (path, title, icon, default) -- the navigation registration used by app.py.
+INTENDED: Tuple[Tuple[str, str, str, bool], ...] = (
+    ("app_pages/welcome.py", "Welcome", "👋", True),
+
+    # Home & Welcome
+    ("app_pages/SeniorNav_welcome_self.py", "Welcome · For You", "🙂", False),
+    ("app_pages/SeniorNav_welcome_someone_else.py", "Welcome · Someone Else", "👥", False),
+    ("app_pages/SeniorNav_welcome_professional.py", "Welcome · Professional", "🩺", False),
+    ("app_pages/about_us.py", "More About Us", "📘", False),
+    ("app_pages/professional_mode.py", "Professional Mode", "🧑", False),
+
+    # Concierge Care Hub
+    ("app_pages/hub.py", "Your Concierge Care Hub", "🏠", False),
+    ("app_pages/SeniorNav_professional_hub.py", "Professional Hub", "🧰", False),
+
+    # Guided Care Plan (V3)
+    ("app_pages/gcp_v3/gcp_intro_v3.py", "Guided Care Plan · Start (V3)", "🗺️", False),
+    ("app_pages/gcp_v3/gcp_eligibility_v3.py", "GCP · Eligibility (V3)", "✅", False),
+    ("app_pages/gcp_v3/gcp_daily_life_v3.py", "GCP · Daily Life & Support (V3)", "🧭", False),
+    ("app_pages/gcp_v3/gcp_health_safety_v3.py", "GCP · Health & Safety (V3)", "🩺", False),
+    ("app_pages/gcp_v3/gcp_results_v3.py", "GCP · Results (V3)", "📊", False),
+
+    # Cost Planner
+    ("app_pages/cost_planner_v2/cost_planner_landing_v2.py", "Cost Planner v2 · Landing", "💰", False),
+    ("app_pages/cost_planner_v2/cost_planner_modules_hub_v2.py", "Cost Planner v2 · Modules", "🧰", False),
+    ("app_pages/cost_planner_v2/cost_planner_income_v2.py", "Cost Planner v2 · Income", "🧾", False),
+    ("app_pages/cost_planner_v2/cost_planner_expenses_v2.py", "Cost Planner v2 · Expenses", "🧮", False),
+    ("app_pages/cost_planner_v2/cost_planner_benefits_v2.py", "Cost Planner v2 · Benefits", "🎖️", False),
+    ("app_pages/cost_planner_v2/cost_planner_home_v2.py", "Cost Planner v2 · Home", "🏠", False),
+    ("app_pages/cost_planner_v2/cost_planner_home_mods_v2.py", "Cost Planner v2 · Home Mods", "🔧", False),
+    ("app_pages/cost_planner_v2/cost_planner_liquidity_v2.py", "Cost Planner v2 · Liquidity", "💵", False),
+    ("app_pages/cost_planner_v2/cost_planner_caregiver_v2.py", "Cost Planner v2 · Caregiver", "👥", False),
+    ("app_pages/cost_planner_v2/cost_planner_assets_v2.py", "Cost Planner v2 · Assets", "🏦", False),
+    ("app_pages/cost_planner_v2/cost_planner_timeline_v2.py", "Cost Planner v2 · Timeline", "📈", False),
+    ("app_pages/expert_review.py", "Expert Review", "🔎", False),
+
+    # PFMA
+    ("app_pages/pfma.py", "Plan for My Advisor", "🧭", False),
+    ("app_pages/pfma_confirm_care_plan.py", "PFMA * Care Plan Confirmer", "✅", False),
+    ("app_pages/pfma_confirm_cost_plan.py", "PFMA * Cost Plan Confirmer", "💰", False),
+    ("app_pages/pfma_confirm_care_needs.py", "PFMA * Care Needs", "🩺", False),
+    ("app_pages/pfma_confirm_care_prefs.py", "PFMA * Care Preferences", "🎯", False),
+    ("app_pages/pfma_confirm_household_legal.py", "PFMA * Household & Legal", "🏠", False),
+    ("app_pages/pfma_confirm_benefits_coverage.py", "PFMA * Benefits & Coverage", "💳", False),
+    ("app_pages/pfma_confirm_personal_info.py", "PFMA * Personal Info", "👤", False),
+
+    # AI + Waiting Room
+    ("app_pages/SeniorNav_ai_advisor.py", "AI Advisor", "🤖", False),
+    ("app_pages/SeniorNav_waiting_room.py", "Waiting Room", "⏳", False),
+
+    # Utilities
+    ("app_pages/SeniorNav_login.py", "Login", "🔐", False),
+    ("app_pages/SeniorNav_trusted_partners.py", "Trusted Partners", "🤝", False),
+    ("app_pages/SeniorNav_export_details.py", "Export Details", "📤", False),
+    ("app_pages/SeniorNav_my_documents.py", "My Documents", "📁", False),
+    ("app_pages/SeniorNav_my_account.py", "My Account", "👤", False),
+    ("app_pages/SeniorNav_terms.py", "Terms of Use", "📄", False),
+    ("app_pages/SeniorNav_privacy.py", "Privacy Policy", "🔒", False),
+)
+
+
+@dataclass(frozen=True)
+class PageRecord:
+    """Validation result for a single page file."""
+
+    path: str
+    mtime_ns: int
+    size: int
+    sha: str
+    ok: bool
+    line: int = 0
+    col: int = 0
+    msg: str = ""
+    text: str = ""
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def validate_page(path: Path) -> PageRecord:
+    """Read and compile ``path`` (what the old per-rerun preflight did)."""
+    stat = path.stat()
+    raw = path.read_bytes()
+    base = {"path": path.as_posix(), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha": _sha256(raw)}
+    try:
+        src = raw.decode("utf-8")
+        compile(src, str(path), "exec", dont_inherit=True)
+    except SyntaxError as e:
+        return PageRecord(**base, ok=False, line=e.lineno or 0, col=e.offset or 0, msg=e.msg, text=e.text or "")
+    except Exception as e:
+        return PageRecord(**base, ok=False, msg=f"{type(e).__name__}: {e}")
+    return PageRecord(**base, ok=True)
+
+
+def iter_page_files(roots: Sequence[str] = PAGE_ROOTS) -> Iterable[Path]:
+    for root in roots:
+        yield from sorted(Path(root).rglob("*.py"))
+
+
+def build_manifest(roots: Sequence[str] = PAGE_ROOTS) -> Dict[str, object]:
+    """Validate every page under ``roots`` and return the manifest payload."""
+    records = [validate_page(p) for p in iter_page_files(roots)]
+    return {
+        "version": MANIFEST_VERSION,
+        "roots": list(roots),
+        "files": {r.path: asdict(r) for r in records},
+        "pages": [
+            {"path": path, "title": title, "icon": icon, "default": default}
+            for path, title, icon, default in INTENDED
+        ],
+    }
+
+
+def write_manifest(manifest: Dict[str, object], path: Path = MANIFEST_PATH) -> Path:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Optional[Dict[str, object]]:
+    """Return the stored manifest, or ``None`` when missing/unreadable/stale."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return None
+    return data
+
+
+# ------------------------------------------------------------------
+# In-process verification cache
+# ------------------------------------------------------------------
+_LOCK = threading.Lock()
+_VERIFIED: Dict[str, PageRecord] = {}
+_SEEDED = False
+
+
+def _seed_from_manifest(path: Path) -> None:
+    global _SEEDED
+    if _SEEDED:
+        return
+    _SEEDED = True
+    manifest = load_manifest(path) or {}
+    for key, row in (manifest.get("files") or {}).items():
+        try:
+            _VERIFIED[key] = PageRecord(**row)
+        except TypeError:
+            continue
+
+
+def _check(path: Path) -> PageRecord:
+    key = path.as_posix()
+    stat = path.stat()
+    known = _VERIFIED.get(key)
+    if known and known.mtime_ns == stat.st_mtime_ns and known.size == stat.st_size:
+        return known
+    raw = path.read_bytes()
+    sha = _sha256(raw)
+    if known and known.sha == sha:
+        # Touched but unchanged: keep the verdict, refresh the stat fields.
+        record = PageRecord(**{**asdict(known), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size})
+    else:
+        record = validate_page(path)
+    _VERIFIED[key] = record
+    return record
+
+
+def preflight_errors(
+    roots: Sequence[str] = PAGE_ROOTS,
+    manifest_path: Path = MANIFEST_PATH,
+) -> List[PageRecord]:
+    """Return failing pages, re-validating only files whose hash changed."""
+    with _LOCK:
+        _seed_from_manifest(manifest_path)
+        errors: List[PageRecord] = []
+        for p in iter_page_files(roots):
+            try:
+                record = _check(p)
+            except OSError:
+                continue
+            if not record.ok:
+                errors.append(record)
+        return errors
+
+
+def registered_pages(manifest_path: Path = MANIFEST_PATH) -> List[Tuple[str, str, str, bool]]:
+    """Return the page registration from the manifest (falls back to ``INTENDED``)."""
+    try:
+        mtime_ns = manifest_path.stat().st_mtime_ns
+    except OSError:
+        return list(INTENDED)
+    return list(_registered_pages(str(manifest_path), mtime_ns))
+
+
+@lru_cache(maxsize=4)
+def _registered_pages(manifest_path: str, mtime_ns: int) -> Tuple[Tuple[str, str, str, bool], ...]:
+    manifest = load_manifest(Path(manifest_path))
+    if not manifest or not manifest.get("pages"):
+        return INTENDED
+    return tuple(
+        (row["path"], row["title"], row["icon"], bool(row.get("default")))
+        for row in manifest["pages"]  # type: ignore[union-attr]
+    )
+
+
+def reset_cache() -> None:
+    """Forget everything verified in this process (used by tests/benchmarks)."""
+    global _SEEDED
+    with _LOCK:
+        _VERIFIED.clear()
+        _SEEDED = False
+    _registered_pages.cache_clear()
@@ -27,7 +27,6 @@ DEFAULT_STATE: Dict[str, Any] = {
     "gcp": None,
     "cost_planner": {},
     "pfma": None,
-    "documents_registry": {},
     "completion": {},
     "ai_messages": [],
 }
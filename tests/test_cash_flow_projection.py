@@ -0,0 +1,50 @@
+"""Cash-flow ledger for the Cost Planner timeline."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from cost_planner_v2.projection import COLUMNS, ProjectionInputs, inputs_from_state, project
+
+
+def test_flat_ledger_and_views() -> None:
+    ledger = project(ProjectionInputs(income=3_000, setting=7_000, assets=100_000, years=10, cost_change_pct=0))
+    assert ledger.months == 120
+    assert np.all(ledger.column("net") == -4_000)
+    assert ledger.depletion_month == 26  # 25 full months covered, then short
+    assert ledger.column("shortfall")[25] == 4_000
+
+    annual = ledger.annual
+    assert annual.shape == (len(COLUMNS), 10)
+    assert annual[COLUMNS.index("outflows"), 0] == 84_000
+    assert annual[COLUMNS.index("assets"), 0] == 100_000 - 48_000
+    assert ledger.annual_rows()[1]["assets"] == 4_000
+    assert len(ledger.chart_series["assets"]) == 120
+
+
+def test_memoized_and_read_only() -> None:
+    values = {"income": 2_500, "benefits": 400, "va": 1_200, "setting": 6_000, "mods": 150, "assets": 300_000}
+    ledger = project(inputs_from_state(values, years=40, cost_change_pct=4))
+    assert ledger.months == 30 * 12  # clamped to the 30-year maximum
+    assert project(inputs_from_state(dict(values), years=40, cost_change_pct=4)) is ledger
+    assert ledger.annual is ledger.annual
+    with pytest.raises(ValueError):
+        ledger.data[0, 0] = 1.0
+    outflows = ledger.column("outflows")
+    assert outflows[12] == pytest.approx(outflows[0] * 1.04)
+
+
+def test_month_horizon_is_not_clamped_to_whole_decades() -> None:
+    values = {"income": 1_000, "benefits": 500, "setting": 4_500, "assets": 40_000}
+    ledger = project(inputs_from_state(values, months=18, cost_change_pct=0))
+    assert ledger.months == 18 and ledger.depletion_month == 14  # 13 months of a 3,000 gap covered
+    annual = ledger.annual
+    assert annual.shape == (len(COLUMNS), 2)
+    assert annual[COLUMNS.index("outflows"), 1] == 6 * 4_500  # the partial second year
+    assert annual[COLUMNS.index("assets"), 0] == 40_000 - 36_000
+    assert project(inputs_from_state(values, months=999)).months == 360
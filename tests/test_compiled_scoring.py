@@ -0,0 +1,64 @@
+"""Compiled GCP scoring matches the bundle engine exactly."""
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from gcp_core import compiled_scoring
+from gcp_pr_tool_bundle.guided_care_plan import engine as bundle_engine
+
+_CHOICES = {
+    "medicaid_status": ["yes", "no", "unsure"],
+    "funding_confidence": ["no_worries", "confident", "unsure", "not_confident"],
+    "cognition": ["normal", "mild", "moderate", "severe"],
+    "adl_help": ["0-1", "2-3", "4-5", "6+"],
+    "med_mgmt": ["simple", "several", "complex"],
+    "falls": ["none", "one", "recurrent"],
+    "home_safety": ["safe", "some_risks", "unsafe"],
+    "mobility": ["no_issues", "cane_or_walker", "wheelchair"],
+    "supervision": ["always", "sometimes", "rarely", "never"],
+    "social_isolation": ["daily_or_often", "weekly", "rarely", "almost_never"],
+    "geographic_access": ["easy", "moderate", "difficult", "very_difficult"],
+    "caregiver_support": ["24_7", "most_days", "few_days_week", "none"],
+}
+_BEHAVIORS = ["wandering", "agitation", "exit_seeking", "none"]
+
+
+def _random_answers(rng: random.Random) -> dict:
+    answers = {key: rng.choice(options) for key, options in _CHOICES.items() if rng.random() > 0.1}
+    answers["behavior_risks"] = rng.sample(_BEHAVIORS, rng.randint(0, 2))
+    answers["chronic"] = rng.sample(["diabetes", "copd", "none"], rng.randint(0, 2))
+    return answers
+
+
+def test_single_path_matches_bundle_engine() -> None:
+    rng = random.Random(7)
+    for _ in range(3000):
+        answers = _random_answers(rng)
+        aud = {"on_medicaid": rng.random() < 0.2}
+        assert compiled_scoring.evaluate_guided_care(answers, aud) == bundle_engine.evaluate_guided_care(answers, aud)
+
+
+def test_batch_matches_single_rows() -> None:
+    rng = random.Random(11)
+    batch = [_random_answers(rng) for _ in range(500)]
+    result = compiled_scoring.score_batch(batch)
+    assert result.dtype == compiled_scoring.RESULT_DTYPE
+    for answers, row in zip(batch, result):
+        _ctx, gcp = bundle_engine.evaluate_guided_care(answers, {})
+        assert compiled_scoring.SETTINGS[row["outcome"]] == gcp["recommended_setting"]
+        assert compiled_scoring.DECISIONS[row["decision"]] == gcp["DecisionTrace"][0]["rule_id"]
+
+
+def test_unknown_tokens_are_flagged_invalid() -> None:
+    result = compiled_scoring.score_batch([{"adl_help": "lots"}, {}])
+    assert list(result["valid"]) == [False, True]
+    try:
+        compiled_scoring.evaluate_guided_care({"adl_help": "lots"}, {})
+    except KeyError:
+        pass
+    else:  # pragma: no cover
+        raise AssertionError("expected KeyError like the bundle engine")
@@ -0,0 +1,61 @@
+"""Compiled Cost Planner totals match the per-category scan they replace."""
+from __future__ import annotations
+
+from pathlib import Path
+import math
+import random
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import cost_planner_model
+from cost_planner_shared import cost_model, load_field_map
+
+
+def _reference(inputs: dict, planning: bool) -> dict:
+    mapping = load_field_map()
+
+    def total(*normalized: str) -> float:
+        return sum(float(inputs.get(fid, 0) or 0) for fid, norm in mapping.items() if norm in normalized)
+
+    subtotals = {name: total(*keys) for name, keys in cost_planner_model.CATEGORIES}
+    monthly = sum(v for k, v in subtotals.items() if k != "offsets")
+    net = max(0.0, monthly - subtotals["offsets"])
+    assets = float(inputs.get("assets_total", 0) or 0) if planning else 0.0
+    runway = assets / net if planning and net > 0 else None
+    return {"subtotals": subtotals, "monthly_total": monthly, "net_out_of_pocket": net, "runway_months": runway}
+
+
+def _households(n: int) -> list:
+    rng = random.Random(3)
+    fields = list(load_field_map())
+    return [
+        {fid: rng.choice([0, None, "", round(rng.uniform(0, 8000), 2)]) for fid in rng.sample(fields, rng.randint(0, len(fields)))}
+        for _ in range(n)
+    ]
+
+
+def test_single_household_matches_reference() -> None:
+    model = cost_model()
+    for i, inputs in enumerate(_households(300)):
+        planning = bool(i % 2)
+        got = cost_planner_model.compute_totals(model, inputs, planning)
+        want = _reference(inputs, planning)
+        for name, value in want["subtotals"].items():
+            assert math.isclose(got.subtotals[name], value, abs_tol=1e-6)
+        assert math.isclose(got.net_out_of_pocket, want["net_out_of_pocket"], abs_tol=1e-6)
+        assert (got.runway_months is None) == (want["runway_months"] is None)
+
+
+def test_batch_matches_single() -> None:
+    model = cost_model()
+    households = _households(200)
+    batch = cost_planner_model.compute_batch(model, households)
+    for row, inputs in zip(batch, households):
+        single = cost_planner_model.compute_totals(model, inputs, planning=True)
+        assert math.isclose(row["monthly_total"], single.monthly_total, abs_tol=1e-6)
+        assert math.isclose(row["offsets"], single.subtotals["offsets"], abs_tol=1e-6)
+        if single.runway_months is None:
+            assert math.isnan(row["runway_months"])
+        else:
+            assert math.isclose(row["runway_months"], single.runway_months, rel_tol=1e-9)
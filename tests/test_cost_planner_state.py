@@ -0,0 +1,56 @@
+"""Cost Planner state only recomputes derived totals when inputs change."""
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import cost_planner_shared as shared
+
+
+@pytest.fixture()
+def session(monkeypatch):
+    state: dict = {}
+    monkeypatch.setattr(shared, "st", SimpleNamespace(session_state=state))
+    return state
+
+
+def test_reruns_without_changes_hit_the_memo(session) -> None:
+    shared.recompute_costs()
+    first = shared.recompute_stats()
+    snapshot = session["cost_planner"]["snapshot_for_crm"]
+
+    for _ in range(5):
+        shared.recompute_costs()
+    stats = shared.recompute_stats()
+    assert stats["revision"] == first["revision"]
+    assert stats["misses"] == first["misses"]
+    assert stats["hits"] == first["hits"] + 10
+    assert session["cost_planner"]["snapshot_for_crm"] is snapshot
+
+
+def test_helpers_bump_the_revision(session) -> None:
+    shared.recompute_costs()
+    cp = session["cost_planner"]
+
+    shared.set_numeric("housing_base_rent", 2500)
+    shared.recompute_costs()
+    assert cp["subtotals"]["housing"] == 2500.0
+    assert cp["snapshot_for_crm"]["monthly_total"] == 2500.0
+
+    revision = cp.revision
+    shared.set_numeric("housing_base_rent", 2500)  # unchanged value
+    assert cp.revision == revision
+    shared.expert_flag("review")
+    shared.add_decision_log("Chose assisted living")
+    cp["mode"] = "planning"
+    assert cp.revision == revision + 3
+
+    shared.set_numeric("assets_total", 10_000)
+    shared.recompute_costs()
+    assert cp["runway_months"] == 4.0
+    assert cp["snapshot_for_crm"]["expert_flags"] == ["review"]
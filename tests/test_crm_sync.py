@@ -0,0 +1,190 @@
+"""CRM sync deduplicates snapshots and ships them in size/time-bounded batches."""
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+import json
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import cost_planner_shared
+from senior_nav import documents
+from senior_nav.lib import crm_sync
+from senior_nav.lib.frozen import freeze
+
+
+def _snapshot(total: float, flags=("review",)):
+    return freeze({"monthly_total": total, "assets": 1000.0, "expert_flags": list(flags), "gcp": {"tags": {"b", "a"}}})
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_unchanged_snapshots_are_not_queued() -> None:
+    sync = crm_sync.CrmSync(crm_sync.MemorySink(), max_age=60)
+    first = _snapshot(100.0)
+    assert sync.offer("s1", first)
+    assert not sync.offer("s1", first)  # same object
+    assert not sync.offer("s1", _snapshot(100.0))  # equal content
+    assert sync.offer("s2", _snapshot(100.0))  # another session
+    assert sync.offer("s1", _snapshot(200.0))
+    stats = sync.stats()
+    assert stats["queued"] == 3 and stats["unchanged"] == 2 and stats["buffered"] == 3
+    sync.close()
+
+
+def test_flushes_on_record_count_and_on_age() -> None:
+    sink = crm_sync.MemorySink()
+    sync = crm_sync.CrmSync(sink, max_records=3, max_age=60)
+    for i in range(7):
+        sync.offer(f"s{i}", _snapshot(float(i)))
+    _wait_for(lambda: sync.stats()["sent"] >= 6)
+    assert [len(b.records) for b in sink.batches] == [3, 3] and sync.stats()["buffered"] == 1
+    sync.close()
+    assert sum(len(b.records) for b in sink.batches) == 7  # close ships the remainder
+
+    sink = crm_sync.MemorySink()
+    sync = crm_sync.CrmSync(sink, max_records=100, max_age=0.05)
+    sync.offer("s", _snapshot(1.0))
+    _wait_for(lambda: sink.batches)
+    sync.close()
+
+
+def test_ndjson_and_columnar_files(tmp_path) -> None:
+    batch = crm_sync.Batch(1, [])
+    sync = crm_sync.CrmSync(crm_sync.MemorySink(), max_age=60)
+    sync.offer("s1", _snapshot(10.0))
+    sync.offer("s2", _snapshot(20.0))
+    sync.flush()
+    batch = sync.sink.batches[0]
+    sync.close()
+
+    crm_sync.NdjsonFileSink(tmp_path / "nd").send(batch)
+    (path,) = (tmp_path / "nd").glob("*.ndjson")
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["session_id"] for line in lines] == ["s1", "s2"]
+    assert lines[1]["monthly_total"] == 20.0 and lines[1]["snapshot"]["gcp"]["tags"] == ["a", "b"]
+
+    crm_sync.ColumnarFileSink(tmp_path / "col", parquet=False).send(batch)
+    (path,) = (tmp_path / "col").glob("*.columns.json")
+    columns = json.loads(path.read_text())
+    assert list(columns) == list(crm_sync.COLUMNS) and columns["monthly_total"] == [10.0, 20.0]
+
+
+def test_file_sinks_in_one_directory_do_not_collide(tmp_path) -> None:
+    batch = crm_sync.Batch(1, [crm_sync.Record("s1", "h", 0.0, 10.0, 5.0, 1.0, 2.0, "{}")])
+    for _ in range(2):  # two syncs (or processes) each shipping their first batch in the same second
+        crm_sync.NdjsonFileSink(tmp_path).send(batch)
+        crm_sync.ColumnarFileSink(tmp_path, parquet=False).send(batch)
+    assert len(list(tmp_path.glob("*.ndjson"))) == 2 and len(list(tmp_path.glob("*.columns.json"))) == 2
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_parquet_output(tmp_path) -> None:
+    parquet = pytest.importorskip("pyarrow.parquet")
+    batch = crm_sync.Batch(1, [crm_sync.Record("s1", "h", 0.0, 10.0, 5.0, 1.0, 2.0, "{}")])
+    crm_sync.ColumnarFileSink(tmp_path, parquet=True).send(batch)
+    (path,) = tmp_path.glob("*.parquet")
+    assert parquet.read_table(path).column("monthly_total").to_pylist() == [10.0]
+
+
+def test_http_sink_posts_ndjson_and_failures_are_retried() -> None:
+    received = []
+    fail_first = [True]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802 - http.server API
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            if fail_first[0]:
+                fail_first[0] = False
+                self.send_response(503)
+            else:
+                received.append(body)
+                self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        sink = crm_sync.HttpSink(f"http://127.0.0.1:{server.server_port}/crm")
+        sync = crm_sync.CrmSync(sink, max_age=60, max_retries=3)
+        sync.offer("s1", _snapshot(1.0))
+        sync.flush()  # 503: kept for a retry
+        assert sync.stats()["send_errors"] == 1 and sync.stats()["retrying"] == 1
+        sync.flush()
+        assert sync.stats()["sent"] == 1 and len(received) == 1
+        assert json.loads(received[0])["session_id"] == "s1"
+        sync.close()
+    finally:
+        server.shutdown()
+
+
+def test_batches_are_dropped_after_max_retries() -> None:
+    class Broken:
+        def send(self, batch):
+            raise OSError("down")
+
+    sync = crm_sync.CrmSync(Broken(), max_age=60, max_retries=2)
+    snapshot = _snapshot(1.0)
+    sync.offer("s1", snapshot)
+    sync.flush()
+    sync.flush()
+    assert sync.stats()["dropped"] == 1 and sync.stats()["retrying"] == 0
+    assert sync.offer("s1", snapshot)  # dropped sessions are offered again
+    sync.close()
+
+
+def test_recompute_costs_offers_changed_snapshots(monkeypatch) -> None:
+    sink = crm_sync.MemorySink()
+    sync = crm_sync.CrmSync(sink, max_age=60)
+    previous = crm_sync.set_crm_sync(sync)
+    state = {documents.NAMESPACE_KEY: "erin"}
+    fake_st = SimpleNamespace(session_state=state)
+    monkeypatch.setattr(cost_planner_shared, "st", fake_st)
+    monkeypatch.setattr(documents, "st", fake_st)
+    try:
+        cost_planner_shared.recompute_costs()
+        cost_planner_shared.recompute_costs()
+        cost_planner_shared.set_numeric("housing_base_rent", 2500)
+        cost_planner_shared.recompute_costs()
+        sync.flush()
+    finally:
+        crm_sync.set_crm_sync(previous)
+        sync.close()
+    records = [record for batch in sink.batches for record in batch.records]
+    assert [r.session_id for r in records] == ["erin", "erin"]
+    assert records[-1].monthly_total == 2500.0
+    assert sync.stats()["offered"] == 2
+
+
+def test_retries_back_off() -> None:
+    attempts = []
+
+    class Flaky:
+        def send(self, batch):
+            attempts.append(time.monotonic())
+            if len(attempts) < 3:
+                raise OSError("busy")
+
+    sync = crm_sync.CrmSync(Flaky(), max_age=60, max_retries=3, retry_delay=0.2)
+    sync.offer("s1", _snapshot(1.0))
+    sync.flush()  # first attempt fails; the thread retries on its own
+    deadline = time.monotonic() + 5
+    while sync.stats()["sent"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    sync.close()
+    assert sync.stats()["sent"] == 1 and len(attempts) == 3
+    assert attempts[1] - attempts[0] >= 0.19 and attempts[2] - attempts[1] >= 0.39
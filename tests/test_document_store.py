@@ -0,0 +1,163 @@
+"""Documents are content-addressed, namespaced per user and written in the background."""
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+import hashlib
+import sys
+import threading
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from senior_nav import documents
+from senior_nav.lib import doc_store
+
+
+@pytest.fixture()
+def store(tmp_path):
+    store = doc_store.DocumentStore(tmp_path / "docs", fsync=False)
+    previous = doc_store.set_document_store(store)
+    yield store
+    store.close()
+    doc_store.set_document_store(previous)
+
+
+def _session(monkeypatch, namespace: str) -> dict:
+    state = {documents.NAMESPACE_KEY: namespace}
+    monkeypatch.setattr(documents, "st", SimpleNamespace(session_state=state))
+    return state
+
+
+def test_identical_content_is_stored_once(store) -> None:
+    a = store.register("u1", "plan", kind="export", title="Plan", data=b"same bytes")
+    b = store.register("u2", "plan", kind="export", title="Plan", data=b"same bytes")
+    assert a.digest == b.digest == hashlib.sha256(b"same bytes").hexdigest()
+    assert store.read(a) == b"same bytes"  # served before or after the write lands
+    assert store.flush()
+    assert store.path(a).read_bytes() == b"same bytes"
+    stats = store.stats()
+    assert stats["written"] == 1 and stats["deduplicated"] == 1 and stats["pending"] == 0
+    assert not list(store.path(a).parent.glob(".*.tmp"))
+
+
+def test_namespaces_do_not_overwrite_each_other(store, monkeypatch) -> None:
+    _session(monkeypatch, "alice")
+    documents.register_json("care_plan", kind="export", title="Care plan", payload={"who": "alice"})
+    _session(monkeypatch, "bob")
+    documents.register_json("care_plan", kind="export", title="Care plan", payload={"who": "bob"})
+
+    assert b'"bob"' in documents.read_document("care_plan")
+    _session(monkeypatch, "alice")
+    assert b'"alice"' in documents.read_document("care_plan")
+    assert [entry.doc_id for entry in documents.list_documents()] == ["care_plan"]
+
+
+def test_list_is_newest_first_and_filters_by_kind(store, monkeypatch) -> None:
+    _session(monkeypatch, "carol")
+    for i in range(5):
+        documents.register_document(f"export_{i}", kind="export", title=f"Export {i}", content_bytes=b"%d" % i)
+    upload = documents.register_user_upload("scan.pdf", b"%PDF-1.4", mime_type="application/pdf")
+
+    assert [e.doc_id for e in documents.list_documents(kind="export", limit=2)] == ["export_4", "export_3"]
+    latest = documents.list_documents(limit=1)[0]
+    assert latest.doc_id == upload.doc_id and latest.metadata == {"ext": "pdf", "mime": "application/pdf"}
+    assert documents.get_document("missing") is None and documents.read_document("missing") is None
+
+
+def test_legacy_session_registry_is_imported(store, tmp_path, monkeypatch) -> None:
+    old_file = tmp_path / "old.json"
+    old_file.write_bytes(b"{}")
+    state = {
+        "documents_registry": {
+            "old": {"doc_id": "old", "kind": "export", "title": "Old", "path": str(old_file),
+                    "created_at": "2024-01-01T00:00:00Z", "metadata": {"ext": "json"}},
+        }
+    }
+    monkeypatch.setattr(documents, "st", SimpleNamespace(session_state=state))
+    entry = documents.get_document("old")
+    assert entry is not None and entry.created_at == "2024-01-01T00:00:00Z"
+    assert documents.read_document("old") == b"{}"
+    assert "documents_registry" not in state
+
+
+def test_namespace_is_the_persisted_session_key(store, monkeypatch) -> None:
+    from senior_nav.lib import session_store
+
+    query_params: dict = {}
+    monkeypatch.setattr("streamlit.query_params", query_params)
+    monkeypatch.setattr(documents, "st", SimpleNamespace(session_state={}))
+    previous = session_store.set_persister(session_store.SessionPersister(session_store.MemoryBackend()))
+    try:
+        namespace = documents.document_namespace()  # first run: no sid yet
+    finally:
+        session_store.set_persister(previous).close()
+    assert namespace == query_params[session_store.QUERY_PARAM]
+
+    monkeypatch.setattr(documents, "st", SimpleNamespace(session_state={}))  # replica or restart, same URL
+    assert documents.document_namespace() == namespace
+
+
+def test_concurrent_writers_batch_and_finish(tmp_path) -> None:
+    blobs = doc_store.BlobStore(tmp_path / "blobs", workers=3, batch_size=8, fsync=True)
+    payloads = [b"doc-%d" % i for i in range(200)]
+
+    def put_range(start: int) -> None:
+        for payload in payloads[start::4]:
+            blobs.put(payload)
+
+    threads = [threading.Thread(target=put_range, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert blobs.flush()
+    stats = blobs.stats()
+    assert stats["written"] == 200 and stats["write_errors"] == 0
+    assert all(blobs.read(doc_store.content_digest(p)) == p for p in payloads)
+    blobs.close()
+
+
+def _failing_replace(monkeypatch, failures: int) -> list:
+    calls: list = []
+    real = doc_store.os.replace
+
+    def replace(src, dst):
+        calls.append(dst)
+        if len(calls) <= failures:
+            raise OSError("disk full")
+        real(src, dst)
+
+    monkeypatch.setattr(doc_store.os, "replace", replace)
+    return calls
+
+
+def test_failed_writes_are_retried_with_backoff(store, monkeypatch) -> None:
+    store.blobs.retry_delay = 0.01
+    calls = _failing_replace(monkeypatch, failures=2)
+    record = store.register("u1", "plan", kind="export", title="Plan", data=b"flaky disk")
+    assert store.flush()
+    assert len(calls) == 3 and store.path(record).read_bytes() == b"flaky disk"
+    assert store.get("u1", "plan").status == doc_store.STORED
+    stats = store.stats()
+    assert stats["write_errors"] == 2 and stats["retries"] == 2 and stats["failed"] == 0 and stats["pending"] == 0
+
+
+def test_given_up_blob_marks_its_rows_failed(store, monkeypatch) -> None:
+    store.blobs.retry_delay = 0.01
+    calls = _failing_replace(monkeypatch, failures=1000)
+    _session(monkeypatch, "dana")
+    documents.register_document("plan", kind="export", title="Plan", content_bytes=b"lost")
+    assert store.flush()
+    assert len(calls) == store.blobs.max_retries and store.stats()["failed"] == 1
+
+    entry = documents.get_document("plan")
+    assert entry is not None and entry.status == doc_store.FAILED
+    with pytest.raises(documents.DocumentWriteFailed):
+        documents.read_document("plan")
+    late = store.register("u2", "plan", kind="export", title="Plan", data=b"lost")  # queued again
+    assert late.status == doc_store.STORED and store.blobs.exists(late.digest)
+
+    monkeypatch.undo()
+    assert store.flush() and store.read(late) == b"lost"
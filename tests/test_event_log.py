@@ -0,0 +1,75 @@
+"""senior_nav.lib.event_log: bounded ring, typed queries, frozen payloads, JSONL spill."""
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import audiencing
+from senior_nav.lib import event_log
+from senior_nav.lib.frozen import FrozenDict, freeze
+
+
+def test_ring_keeps_the_newest_events_and_type_index_in_step() -> None:
+    log = event_log.EventLog(capacity=5)
+    for i in range(12):
+        log.append("a" if i % 3 else "b", {"i": i})
+    assert len(log) == 5 and log.total == 12 and log.evicted == 7
+    assert [e.payload["i"] for e in log.last(3)] == [9, 10, 11]
+    assert [e.payload["i"] for e in log.by_type("b")] == [9]
+    assert [e.payload["i"] for e in log.last(10, "a")] == [7, 8, 10, 11]
+    assert log.latest("b").seq == 10
+    assert log.counts() == {"b": 4, "a": 8}
+    assert log.last(2, "missing") == [] and log.latest("missing") is None
+
+
+def test_evicting_the_last_event_of_a_type_drops_its_index() -> None:
+    log = event_log.EventLog(capacity=2)
+    log.append("rare")
+    log.append("common")
+    log.append("common")
+    assert log.by_type("rare") == [] and log.counts()["rare"] == 1
+
+
+def test_payloads_are_frozen_and_shared() -> None:
+    people = freeze({"recipient_name": "Pat"})
+    snapshot = {"people": people, "qualifiers": {"urgent": False}, "reasons": ["a"]}
+    log = event_log.EventLog()
+    first = log.append("audiencing_set", snapshot)
+    snapshot["qualifiers"]["urgent"] = True  # later edits do not reach the log
+    second = log.append("audiencing_set", snapshot)
+    assert first.payload["qualifiers"]["urgent"] is False
+    assert second.payload["people"] is people is first.payload["people"]
+    assert isinstance(first.payload, FrozenDict) and first.payload["reasons"] == ["a"]
+    with pytest.raises(TypeError):
+        first.payload["people"] = {}  # type: ignore[index]
+
+
+def test_spill_writes_every_event(tmp_path: Path) -> None:
+    spill = event_log.JsonlSpill(tmp_path / "events.jsonl")
+    log = event_log.EventLog(capacity=2, spill=spill)
+    for i in range(5):
+        log.append("tick", {"i": i, "seen": {"x"}})
+    spill.close()
+    lines = [json.loads(line) for line in (tmp_path / "events.jsonl").read_text().splitlines()]
+    assert [line["payload"]["i"] for line in lines] == [0, 1, 2, 3, 4]
+    assert lines[0]["event"] == "tick" and lines[0]["seq"] == 1
+
+
+def test_audiencing_logs_into_a_bounded_session_log(monkeypatch) -> None:
+    fake = SimpleNamespace(session_state={"event_log": [{"event": "audiencing_set", "snapshot": {"entry": "self"}}]})
+    monkeypatch.setattr(audiencing, "st", fake)
+    import streamlit
+
+    monkeypatch.setattr(streamlit, "session_state", fake.session_state)
+    for _ in range(event_log.DEFAULT_CAPACITY + 10):
+        audiencing.log_audiencing_set({"entry": "proxy", "qualifiers": {"urgent": False}})
+    log = fake.session_state["event_log"]
+    assert isinstance(log, event_log.EventLog)
+    assert len(log) == event_log.DEFAULT_CAPACITY and log.total == event_log.DEFAULT_CAPACITY + 11
+    assert log.last(1, "audiencing_set")[0].payload["entry"] == "proxy"
@@ -0,0 +1,155 @@
+"""Exports render on a worker pool, report progress and are cached by snapshot."""
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+import csv
+import io
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import cost_planner_shared
+from senior_nav import documents, exports
+from senior_nav.lib import doc_store, export_jobs
+from senior_nav.lib.frozen import freeze
+
+
+@pytest.fixture()
+def jobs():
+    jobs = export_jobs.ExportJobs(workers=2)
+    previous = export_jobs.set_export_jobs(jobs)
+    yield jobs
+    jobs.shutdown()
+    export_jobs.set_export_jobs(previous)
+
+
+def test_job_reports_progress_and_result(jobs) -> None:
+    release = threading.Event()
+
+    def slow(snapshot, progress):
+        progress(0.5)
+        release.wait(5)
+        return json.dumps(snapshot).encode()
+
+    job_id = jobs.submit("care_plan", "json", freeze({"a": 1}), slow)
+    while jobs.status(job_id).progress < 0.5:
+        time.sleep(0.001)
+    assert jobs.status(job_id).state == export_jobs.RUNNING and jobs.result(job_id) is None
+    release.set()
+    status = jobs.wait(job_id)
+    assert status.state == export_jobs.DONE and status.progress == 1.0 and not status.cached
+    assert jobs.result(job_id) == b'{"a": 1}'
+
+
+def test_unchanged_snapshot_is_served_from_cache(jobs) -> None:
+    calls = []
+
+    def render(snapshot, progress):
+        calls.append(snapshot)
+        return b"x"
+
+    first = jobs.submit("cost_summary", "csv", freeze({"total": 10, "items": [1, 2]}), render)
+    jobs.wait(first)
+    second = jobs.submit("cost_summary", "csv", freeze({"total": 10, "items": [1, 2]}), render)
+    assert jobs.status(second).cached and jobs.result(second) == b"x"
+    jobs.wait(jobs.submit("cost_summary", "csv", freeze({"total": 11, "items": [1, 2]}), render))
+    assert len(calls) == 2 and jobs.stats()["cache_hits"] == 1
+
+
+def test_identical_requests_in_flight_share_one_render(jobs) -> None:
+    release = threading.Event()
+    calls = []
+    done = []
+
+    def render(snapshot, progress):
+        calls.append(1)
+        release.wait(5)
+        return b"pdf"
+
+    snapshot = freeze({"plan": "home"})
+    a = jobs.submit("care_plan", "pdf", snapshot, render, on_done=done.append)
+    b = jobs.submit("care_plan", "pdf", snapshot, render, on_done=done.append)
+    release.set()
+    assert jobs.wait(a).state == jobs.wait(b).state == export_jobs.DONE
+    assert calls == [1] and done == [b"pdf", b"pdf"] and jobs.stats()["joined"] == 1
+
+
+def test_failures_are_reported_and_not_cached(jobs) -> None:
+    def broken(snapshot, progress):
+        raise RuntimeError("no fonts")
+
+    job_id = jobs.submit("pfma", "pdf", freeze({}), broken)
+    status = jobs.wait(job_id)
+    assert status.state == export_jobs.FAILED and "no fonts" in status.error
+    assert jobs.stats()["cached"] == 0 and jobs.stats()["inflight"] == 0
+
+
+def test_process_pool_renders_and_failures_release_the_snapshot() -> None:
+    jobs = export_jobs.ExportJobs(ProcessPoolExecutor(1))
+    try:
+        done = []
+        job_id = jobs.submit("care_plan", "json", freeze({"a": 1}), exports.render_json, on_done=done.append)
+        assert jobs.wait(job_id).state == export_jobs.DONE and json.loads(jobs.result(job_id)) == {"a": 1}
+        assert done == [jobs.result(job_id)]
+
+        snapshot = freeze({"b": 2})
+        unpicklable = jobs.submit("care_plan", "csv", snapshot, lambda snap, progress: b"x")
+        assert jobs.wait(unpicklable).state == export_jobs.FAILED and jobs.stats()["inflight"] == 0
+        retry = jobs.submit("care_plan", "csv", snapshot, exports.render_csv)
+        assert jobs.wait(retry).state == export_jobs.DONE and jobs.stats()["joined"] == 0
+    finally:
+        jobs.shutdown()
+
+
+def test_submit_errors_do_not_leave_a_job_in_flight() -> None:
+    jobs = export_jobs.ExportJobs(workers=1)
+    jobs.shutdown()
+    with pytest.raises(RuntimeError):
+        jobs.submit("pfma", "json", freeze({}), exports.render_json)
+    assert jobs.stats()["inflight"] == 0 and jobs.stats()["failed"] == 1
+
+
+def test_renderers_produce_valid_output() -> None:
+    snapshot = freeze({"gcp": {"answers": {"q1": "yes"}, "flags": {"b", "a"}}, "notes": "Mom (age 82)"})
+    seen = []
+    rows = list(csv.reader(io.StringIO(exports.render_csv(snapshot, seen.append).decode())))
+    assert rows[0] == ["field", "value"] and ["gcp.flags", "a, b"] in rows and ["gcp.answers.q1", "yes"] in rows
+    pdf = exports.render_pdf(snapshot, seen.append, "Care Plan")
+    assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF")
+    assert b"(notes: Mom \\(age 82\\)) Tj" in pdf
+    xref = int(pdf.rsplit(b"startxref\n", 1)[1].split(b"\n", 1)[0])
+    assert pdf[xref:].startswith(b"xref")
+    assert json.loads(exports.render_json(snapshot, seen.append))["gcp"]["flags"] == ["a", "b"]
+    assert seen[-1] == 1.0
+
+
+def test_start_export_registers_the_document(jobs, tmp_path, monkeypatch) -> None:
+    store = doc_store.DocumentStore(tmp_path / "docs", fsync=False)
+    previous = doc_store.set_document_store(store)
+    state = {
+        documents.NAMESPACE_KEY: "dana",
+        "gcp": {"answers": {"q1": "yes"}, "recommended_setting": "assisted_living"},
+        "audiencing": {"entry": "self"},
+    }
+    fake_st = SimpleNamespace(session_state=state)
+    for module in (exports, documents, cost_planner_shared):
+        monkeypatch.setattr(module, "st", fake_st)
+    try:
+        first = exports.start_export("care_plan", "pdf")
+        assert jobs.wait(first).state == export_jobs.DONE
+        entry = documents.get_document("care_plan_pdf")
+        assert entry is not None and entry.metadata == {"ext": "pdf", "mime": "application/pdf"}
+        assert documents.read_document("care_plan_pdf") == jobs.result(first)
+
+        second = exports.start_export("care_plan", "pdf")  # nothing changed
+        assert jobs.status(second).cached
+    finally:
+        store.close()
+        doc_store.set_document_store(previous)
@@ -0,0 +1,96 @@
+"""Audiencing, GCP and CRM snapshots are frozen and share unchanged parts."""
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+import copy
+import json
+import pickle
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import audiencing
+import cost_planner_shared as shared
+from gcp_core import engine
+from senior_nav.lib.frozen import FrozenDict, FrozenList, freeze, json_default, refreeze, thaw
+
+
+def test_frozen_values_are_read_only_hashable_and_plain_compatible() -> None:
+    live = {"a": [1, {"b": 2}], "s": {"x"}, "t": (1, [2])}
+    frozen = freeze(live)
+    assert frozen == {"a": [1, {"b": 2}], "s": {"x"}, "t": (1, [2])}
+    assert isinstance(frozen, dict) and isinstance(frozen["a"], FrozenList)
+    assert hash(frozen) == hash(freeze(thaw(frozen)))
+    with pytest.raises(TypeError):
+        frozen["a"] = 1  # type: ignore[index]
+    with pytest.raises(TypeError):
+        frozen["a"].append(3)
+    assert copy.deepcopy(frozen) is frozen and pickle.loads(pickle.dumps(frozen)) == frozen
+    assert json.loads(json.dumps(frozen, default=json_default))["s"] == ["x"]
+    assert thaw(frozen) == {"a": [1, {"b": 2}], "s": {"x"}, "t": [1, [2]]}
+
+
+def test_copy_on_write_edits_share_the_rest() -> None:
+    base = FrozenDict({"big": {"n": list(range(50))}, "x": 1})
+    edited = base.set("x", 2)
+    assert edited["x"] == 2 and base["x"] == 1 and edited["big"] is base["big"]
+    merged = base.merge({"y": [3]})
+    assert merged["big"] is base["big"] and merged["y"] == [3]
+    assert base.set("big", base["big"]) is base
+
+
+def test_refreeze_reuses_unchanged_subtrees() -> None:
+    live = {"answers": {"q1": "a", "q2": ["x", "y"]}, "scoring": {"tier": 2}}
+    first = freeze(live)
+    assert refreeze(first, live) is first
+    live["scoring"]["tier"] = 3
+    second = refreeze(first, live)
+    assert second["scoring"]["tier"] == 3 and first["scoring"]["tier"] == 2
+    assert second["answers"] is first["answers"]
+
+
+def test_audiencing_snapshot_is_frozen_and_reused(monkeypatch) -> None:
+    state = {
+        "entry": "self",
+        "qualifiers": {},
+        "route": {"next": "pfma", "meta": {"reasons": ["a"]}},
+        "people": {"recipient_name": "Pat"},
+        "sanitized": {},
+    }
+    session = {"audiencing": state}
+    monkeypatch.setattr(audiencing, "st", SimpleNamespace(session_state=session))
+    first = audiencing.snapshot_audiencing(state)
+    assert isinstance(first, FrozenDict) and first["route"]["meta"] == {"reasons": ["a"]}
+    session["audiencing_snapshot"] = first
+    assert audiencing.snapshot_audiencing(state) is first
+
+    state["people"]["recipient_name"] = "Sam"
+    second = audiencing.snapshot_audiencing(state)
+    assert first["people"]["recipient_name"] == "Pat" and second["people"]["recipient_name"] == "Sam"
+    assert second["route"] is first["route"]
+
+
+def test_gcp_snapshot_shares_answers() -> None:
+    answers = {"q1": "a", "q2": ["x"]}
+    first = engine.snapshot(answers, {"recommended_setting": "home", "acuity_level": "low"})
+    second = engine.snapshot(answers, {"recommended_setting": "al", "acuity_level": "high"}, previous=first)
+    assert isinstance(second, dict) and second["recommendation"]["setting"] == "al"
+    assert second["answers"] is first["answers"]
+
+
+def test_crm_snapshot_is_frozen_and_tracks_live_sections(monkeypatch) -> None:
+    session: dict = {"gcp": {"answers": {"q1": "a"}}}
+    monkeypatch.setattr(shared, "st", SimpleNamespace(session_state=session))
+    shared.recompute_costs()
+    cp = session["cost_planner"]
+    first = cp["snapshot_for_crm"]
+    assert isinstance(first, FrozenDict) and first["gcp"] == {"answers": {"q1": "a"}}
+
+    session["gcp"]["answers"]["q1"] = "b"  # edited in place, no planner revision
+    shared.recompute_costs()
+    second = cp["snapshot_for_crm"]
+    assert first["gcp"]["answers"]["q1"] == "a" and second["gcp"]["answers"]["q1"] == "b"
+    assert second["inputs"] is first["inputs"]
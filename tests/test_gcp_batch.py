@@ -0,0 +1,126 @@
+"""Offline re-scoring streams JSONL through two engines and reports recommendation changes."""
+from __future__ import annotations
+
+from pathlib import Path
+import io
+import json
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from gcp_core import batch, compiled_scoring
+
+
+def _answers(rng: random.Random) -> dict:
+    # Any token the model knows for each input, plus a behavior list.
+    model = compiled_scoring.load_model()
+    answers = {
+        key: rng.choice(list(model.vocab[field])) for field, key, _ in compiled_scoring.INPUTS if field != "behav"
+    }
+    answers["behavior_risks"] = rng.sample(["wandering", "agitation", "exit_seeking"], rng.randint(0, 1))
+    return answers
+
+
+def _lines(n: int, seed: int = 3):
+    rng = random.Random(seed)
+    return [
+        json.dumps({"id": f"s{i}", "answers": _answers(rng), "audiencing": {"on_medicaid": rng.random() < 0.2}})
+        .encode()
+        for i in range(n)
+    ]
+
+
+@pytest.fixture()
+def heavier_cognition(tmp_path) -> str:
+    model = json.loads(compiled_scoring.SCORING_JSON.read_text())
+    model["encodings"]["cognition"]["moderate"] = 1.4
+    model["version"] = "test-v2.1"
+    path = tmp_path / "model.json"
+    path.write_text(json.dumps(model))
+    return f"compiled:{path}"
+
+
+def test_compiled_matches_bundle_and_differs_from_legacy() -> None:
+    lines = _lines(300)
+    report = batch.rescore(lines, "compiled", "bundle", chunk_size=64)
+    assert report.records == 300 and report.changed == 0 and report.unreadable == 0
+    assert report.versions == {"baseline": "gcp-scoring-v2.0", "candidate": "gcp-scoring-v2.0"}
+    assert sum(report.transitions.values()) == 300
+
+    legacy = batch.rescore(lines, "bundle", "legacy", chunk_size=64)
+    assert legacy.changed == sum(n for (old, new), n in legacy.transitions.items() if old != new) > 0
+
+
+def test_new_weights_flip_records_and_changes_are_listed(heavier_cognition) -> None:
+    lines = _lines(500)
+    changes = io.BytesIO()
+    report = batch.rescore(lines, "compiled", heavier_cognition, changes=changes, chunk_size=100)
+
+    answers = [json.loads(line)["answers"] for line in lines]
+    auds = [json.loads(line)["audiencing"] for line in lines]
+    model = compiled_scoring.load_model(heavier_cognition.partition(":")[2])
+    before = compiled_scoring.score_batch(answers, auds)["outcome"]
+    after = compiled_scoring.score_batch(answers, auds, model)["outcome"]
+    flipped = np.flatnonzero(before != after)
+    assert report.changed == len(flipped) > 0
+    assert report.flips("assisted", "memory") == int(np.sum((before == 2) & (after == 3))) > 0
+    assert report.versions["candidate"] == "test-v2.1"
+
+    rows = [json.loads(line) for line in changes.getvalue().splitlines()]
+    assert [row["line"] for row in rows] == [i + 1 for i in flipped]
+    assert rows[0]["id"] == f"s{flipped[0]}" and rows[0]["after_scores"]["MC"] > rows[0]["before_scores"]["MC"]
+
+
+def test_worker_pool_matches_in_process(heavier_cognition) -> None:
+    lines = _lines(400)
+    serial, pooled = io.BytesIO(), io.BytesIO()
+    a = batch.rescore(lines, "compiled", heavier_cognition, changes=serial, chunk_size=37)
+    b = batch.rescore(iter(lines), "compiled", heavier_cognition, changes=pooled, workers=2, chunk_size=37)
+    assert a.to_dict() == b.to_dict() and serial.getvalue() == pooled.getvalue()
+
+
+def test_record_shapes_and_unreadable_lines() -> None:
+    answers = {"cognition": "severe", "adl_help": "6+"}
+    lines = [
+        json.dumps({"answers": answers}).encode(),
+        json.dumps({"session_id": "x", "gcp": {"answers": answers}, "audiencing": {"on_medicaid": True}}).encode(),
+        b"",
+        json.dumps(answers).encode(),
+        b"{not json",
+        b"[1, 2]",
+        json.dumps({"answers": {"adl_help": "lots"}}).encode(),  # rejected by the engine
+    ]
+    report = batch.rescore(lines, "compiled", "compiled")
+    assert report.records == 4 and report.unreadable == 2 and report.unreadable_sample == [5, 6]
+    assert report.flips("memory", "memory") == 3 and report.flips(batch.INVALID, batch.INVALID) == 1
+
+
+def test_cli_writes_summary_and_changes(tmp_path, heavier_cognition, capsys) -> None:
+    source = tmp_path / "answers.jsonl"
+    source.write_bytes(b"\n".join(_lines(200)) + b"\n")
+    out = tmp_path / "report"
+    args = [str(source), "--candidate", heavier_cognition, "--out", str(out), "--workers", "0", "--limit", "150"]
+    assert batch.main(args) == 0
+    summary = json.loads((out / "summary.json").read_text())
+    assert summary["records"] == 150 and summary["candidate"]["version"] == "test-v2.1"
+    assert summary["changed"] == len((out / "changes.jsonl").read_text().splitlines()) > 0
+    assert "before \\ after" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit):
+        batch.main([str(source), "--candidate", "nope"])
+
+
+@pytest.mark.parametrize("candidate", ["compiled", "bundle"])
+def test_malformed_answers_are_invalid_not_fatal(candidate) -> None:
+    lines = _lines(50)
+    lines.insert(10, json.dumps({"id": "bad", "answers": {"behavior_risks": 5}}).encode())
+    changes = io.BytesIO()
+    report = batch.rescore(lines, "compiled", candidate, changes=changes, chunk_size=20)
+    assert report.records == 51 and report.flips(batch.INVALID, batch.INVALID) == 1
+    assert report.changed == 0 and not changes.getvalue()
+    pooled = batch.rescore(lines, "compiled", candidate, workers=2, chunk_size=20)
+    assert pooled.to_dict() == report.to_dict()
@@ -0,0 +1,28 @@
+"""Image handles are resized once and cached by content hash."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from senior_nav import image_assets
+
+
+def test_hero_handle_is_resized_and_cached(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(image_assets, "DERIVED_DIR", tmp_path / "_derived")
+    image_assets.clear_cache()
+    source = Path("static/images/Self.png")
+
+    first = image_assets.get_image(source, profile="hero")
+    assert first is not None
+    assert first.src.startswith("data:image/webp;base64,")
+    assert len(first.src) < source.stat().st_size // 10
+    assert image_assets.get_image(source, profile="hero") is first
+    assert "hero-photo" in first.img_tag(alt="x", cls="hero-photo")
+    image_assets.clear_cache()
+
+
+def test_missing_or_emoji_icon_returns_none() -> None:
+    assert image_assets.get_image("static/images/does-not-exist.png") is None
+    assert image_assets.get_image("🏠", profile="icon") is None
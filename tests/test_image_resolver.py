@@ -0,0 +1,57 @@
+"""Remote images never block: placeholder first, cached copy afterwards."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import threading
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from senior_nav import image_assets, image_resolver
+
+URL = "https://example.test/hero.png"
+
+
+def test_remote_miss_returns_placeholder_then_hits_cache(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(image_resolver, "CACHE_DIR", tmp_path)
+    image_resolver.reset_stats()
+    image_assets.clear_cache()
+    release = threading.Event()
+    payload = Path("static/images/better-business-bureau-logo.png").read_bytes()
+
+    def slow_fetch(url: str) -> bytes:
+        release.wait(5)
+        return payload
+
+    monkeypatch.setattr(image_resolver, "_fetch_bytes", slow_fetch)
+
+    assert image_resolver.resolve(URL) is image_resolver.PLACEHOLDER
+    future = image_resolver._INFLIGHT[URL]
+    release.set()
+    future.result(timeout=5)
+
+    handle = image_resolver.resolve(URL, profile="logo")
+    assert handle is not image_resolver.PLACEHOLDER
+    stats = image_resolver.stats()
+    assert (stats["misses"], stats["hits"], stats["fetches"], stats["fetch_errors"]) == (1, 1, 1, 0)
+    assert stats["fetch_ms_max"] > 0
+
+
+def test_failed_fetch_is_not_retried_immediately(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(image_resolver, "CACHE_DIR", tmp_path)
+    image_resolver.reset_stats()
+    monkeypatch.setattr(image_resolver, "_fetch_bytes", lambda url: b"not an image")
+
+    assert image_resolver.resolve(URL) is image_resolver.PLACEHOLDER
+    future = image_resolver._INFLIGHT.get(URL)
+    if future is not None:
+        future.result(timeout=5)
+    assert image_resolver.resolve(URL) is image_resolver.PLACEHOLDER
+    assert image_resolver.stats()["fetches"] == 1
+    assert image_resolver.stats()["fetch_errors"] == 1
+    image_resolver.reset_stats()
+
+
+def test_local_missing_and_invalid_images_resolve_to_none() -> None:
+    assert image_resolver.resolve("static/images/nope.png") is None
+    assert image_resolver.resolve("static/images/hero_pfma.png") is None
@@ -0,0 +1,34 @@
+"""Importing the GCP core must not read data files."""
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import subprocess
+import sys
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+# Third-party modules are imported before the hook goes in; only our own
+# files count against the budget.  Module sources/bytecode are not data I/O.
+_PROBE = f"""
+import json, sys
+sys.path.insert(0, {str(_ROOT)!r})
+import numpy, streamlit  # noqa: F401
+opened = []
+
+def _hook(event, args):
+    if event == "open" and isinstance(args[0], str):
+        path = args[0]
+        if path.startswith({str(_ROOT)!r}) and not path.endswith((".py", ".pyc")):
+            opened.append(path)
+
+sys.addaudithook(_hook)
+import gcp_core, gcp_core.engine, gcp_core.catalog, senior_nav.lib.trace  # noqa: F401,E401
+import gcp_pr_tool_bundle.guided_care_plan.engine  # noqa: F401
+print(json.dumps(opened))
+"""
+
+
+def test_importing_gcp_core_does_no_file_io() -> None:
+    out = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True, cwd=_ROOT)
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == []
@@ -0,0 +1,132 @@
+"""Incremental GCP scorers agree with full re-scoring after every single change."""
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+import random
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from gcp_core import scoring, v3_scoring, v3_state
+from gcp_core.incremental import IncrementalScorer, V3IncrementalScorer, dependency_graph
+
+_V2_CHOICES = {
+    "cognition": ["", "mild", "moderate", "severe", None],
+    "falls": ["none", "one", "recurrent", None],
+    "supervision": ["always", "rarely", "never"],
+    "home_safety": ["safe", "some_risks", "unsafe"],
+    "med_mgmt": ["simple", "several", "complex"],
+    "caregiver_support": ["24_7", "none", "few_days_week"],
+    "adl_help": ["0-1", "4-5", "6+"],
+    "social_isolation": ["daily_or_often", "rarely"],
+    "mobility": ["no_issues", "cane_or_walker", "wheelchair"],
+    "behavior_risks": [[], ["wandering"], ["aggression", "hoarding"], ["sundowning", "confusion", "exit_seeking"]],
+    "medicaid_status": ["yes", "no"],
+}
+_V3_CHOICES = {
+    "overall_help": ["None", "Occasional", "Regular", "Extensive", None],
+    "badls": [[], ["Toileting"], ["Bathing", "Dressing", "Eating"]],
+    "iadls": [[], ["Finances", "Med Management"], ["Shopping"]],
+    "hours_per_day": [0.0, 2.0, 6.0, 24.0],
+    "who_supports": ["", "daughter", "no one", "paid aide"],
+    "cognitive": ["Intact", "Mild", "Moderate", "Severe", None],
+    "behavior_risks": [[], ["Wandering"], ["Agitation", "Sundowning"]],
+    "med_profile": ["Simple (≤5 meds)", "Complex (≥10)"],
+    "mobility": ["Independent", "Non-ambulatory"],
+    "falls_6mo": [0, 1, 3],
+    "chronic_conditions": [[], ["CHF"], ["CHF", "COPD", "Diabetes"]],
+    "mgmt_quality": ["Well-managed", "Poorly-managed / Unstable", None],
+    "mood": ["Stable", "Low"],
+    "geo_isolation": ["Not isolated", "Isolated (rural / limited support)"],
+}
+
+
+def test_graph_covers_every_scored_question() -> None:
+    graph = dependency_graph()
+    assert set(graph) == set(scoring.QUESTION_TERMS)
+    assert graph["cognition"].section == "health_safety"
+    assert graph["behavior_risks"].flags == ("wandering_risk", "behavior_aggression")
+
+
+def test_v2_matches_full_scoring() -> None:
+    rng = random.Random(11)
+    answers: dict = {}
+    scorer = IncrementalScorer()
+    for _ in range(2000):
+        qid = rng.choice(list(_V2_CHOICES))
+        answers[qid] = rng.choice(_V2_CHOICES[qid])
+        before = scorer.recomputed
+        scorer.update(qid, answers[qid])
+        assert scorer.recomputed - before <= 1
+        assert scorer.scorecard == scoring.score_answers(answers)
+    assert sum(scorer.section_scores.values()) > 0 or not answers
+
+
+def test_v3_matches_full_evaluation() -> None:
+    rng = random.Random(5)
+    answers: dict = {}
+    scorer = V3IncrementalScorer()
+    for _ in range(2000):
+        key = rng.choice(list(_V3_CHOICES))
+        value = rng.choice(_V3_CHOICES[key])
+        if value is None:
+            answers.pop(key, None)
+        else:
+            answers[key] = value
+        scorer.update(key, value)
+        full = v3_scoring.evaluate(answers)
+        assert scorer.result.domain_scores == full.domain_scores
+        assert scorer.result.flags == full.flags
+        assert scorer.result.tier == full.tier
+
+
+def test_v3_single_change_touches_only_dependents() -> None:
+    scorer = V3IncrementalScorer({"overall_help": "Regular", "mood": "Stable", "mobility": "Independent"})
+    before = scorer.recomputed
+    scorer.update("mood", "Low")
+    assert scorer.recomputed - before == 1
+    assert not scorer.update("mood", "Low")
+
+
+def test_v3_session_scorer_starts_from_stored_answers(monkeypatch) -> None:
+    answers = {"overall_help": "Extensive", "badls": ["Toileting"], "cognitive": "Severe", "who_supports": "no one"}
+    fake_st = SimpleNamespace(session_state={"gcp_v3": {"answers": dict(answers)}})  # restored, no scorer yet
+    monkeypatch.setattr(v3_state, "st", fake_st)
+    monkeypatch.setattr("ui.state.st", fake_st)
+    monkeypatch.setattr("streamlit.session_state", fake_st.session_state)  # session_scorer
+
+    v3_state.set_answer("mood", "Low")
+    answers["mood"] = "Low"
+    assert v3_state.get_scorecard()["tier"] == v3_scoring.evaluate(answers).tier > 0
+
+    v3_state.reset_partial(["cognitive", "who_supports"])
+    for key in ("cognitive", "who_supports"):
+        answers.pop(key)
+    assert v3_state.get_scorecard()["domains"] == v3_scoring.evaluate(answers).domain_scores
+
+    v3_state.mark_not_started()
+    fake_st.session_state["gcp_v3"]["answers"]["cognitive"] = "Moderate"  # written directly
+    answers["cognitive"] = "Moderate"
+    v3_state.set_answer("mobility", "Independent")
+    answers["mobility"] = "Independent"
+    assert v3_state.get_scorecard()["tier"] == v3_scoring.evaluate(answers).tier
+
+
+def test_v3_flag_changes_rescore_the_stored_scorecard(monkeypatch) -> None:
+    answers = {"overall_help": "Regular", "mood": "Stable"}
+    fake_st = SimpleNamespace(session_state={"gcp_v3": {"answers": dict(answers)}})
+    monkeypatch.setattr(v3_state, "st", fake_st)
+    monkeypatch.setattr("ui.state.st", fake_st)
+    monkeypatch.setattr("streamlit.session_state", fake_st.session_state)
+
+    v3_state.set_answer("mobility", "Independent")
+    answers["mobility"] = "Independent"
+    assert v3_state.get_scorecard()["tier"] == v3_scoring.evaluate(answers).tier < 3
+
+    v3_state.update_flags(["cog_severe"])
+    card = v3_state.get_scorecard()
+    assert "cog_severe" in card["flags"] and card["tier"] == v3_scoring.evaluate(answers, ["cog_severe"]).tier >= 3
+
+    v3_state.update_flags([])
+    assert v3_state.get_scorecard()["tier"] == v3_scoring.evaluate(answers).tier
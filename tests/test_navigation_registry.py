@@ -0,0 +1,52 @@
+"""Navigation registry resolves legacy targets and flags stale ones."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from senior_nav import navigation, page_manifest
+
+
+def test_registry_resolves_registered_and_legacy_paths() -> None:
+    navigation.reset()
+    registered = {path for path, _t, _i, _d in page_manifest.INTENDED if Path(path).exists()}
+    reg = navigation.registry()
+    assert set(reg.by_path) == registered
+    assert navigation.resolve("app_pages/hub.py") == "app_pages/hub.py"
+    assert navigation.resolve("pages/hub.py") == "app_pages/hub.py"
+    assert navigation.resolve("pages/does_not_exist.py") is None
+    assert navigation.resolve("./app_pages/hub.py") == navigation.resolve("././app_pages/hub.py") == "app_pages/hub.py"
+    assert navigation.resolve("../app_pages/hub.py") is None and navigation.resolve("/app_pages/hub.py") is None
+    assert navigation.registry() is reg
+
+
+def test_production_registry_is_frozen(monkeypatch) -> None:
+    navigation.reset()
+    monkeypatch.setenv("SENIOR_NAV_ENV", "production")
+    reg = navigation.registry()
+    monkeypatch.setattr(navigation, "_signature", lambda paths: (-2,))
+    monkeypatch.setattr(navigation, "_CHECKED_AT", 0.0)
+    assert navigation.registry() is reg
+    navigation.reset()
+
+
+def test_stale_targets_report_unregistered_pages(tmp_path) -> None:
+    navigation.reset()
+    pages = tmp_path / "pages_under_test"
+    (pages / "nested").mkdir(parents=True)
+    (pages / "ok.py").write_text(
+        "import streamlit as st\n"
+        "st.switch_page('app_pages/hub.py')\n"
+        "st.switch_page('pages/hub.py')  # legacy path, still registered\n"
+        "st.switch_page(some_variable)\n"
+    )
+    (pages / "nested" / "stale.py").write_text(
+        "import streamlit as st\n"
+        "\n"
+        "if True:\n"
+        "    st.switch_page('pages/no_such_page.py')\n"
+    )
+    stale = navigation.stale_targets((str(pages),))
+    assert stale == (((pages / "nested" / "stale.py").as_posix(), 4, "pages/no_such_page.py"),)
@@ -0,0 +1,46 @@
+"""Page manifest only re-validates files whose content changed."""
+from __future__ import annotations
+
+from pathlib import Path
+import os
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from senior_nav import page_manifest
+
+
+def test_manifest_revalidates_only_changed_pages(tmp_path, monkeypatch) -> None:
+    root = tmp_path / "pages_root"
+    root.mkdir()
+    good = root / "good.py"
+    good.write_text("x = 1\n", encoding="utf-8")
+    other = root / "other.py"
+    other.write_text("y = 2\n", encoding="utf-8")
+
+    manifest_path = tmp_path / "manifest.json"
+    monkeypatch.chdir(tmp_path)
+    page_manifest.write_manifest(page_manifest.build_manifest(("pages_root",)), manifest_path)
+    page_manifest.reset_cache()
+
+    compiled = []
+    real_validate = page_manifest.validate_page
+    monkeypatch.setattr(page_manifest, "validate_page", lambda p: compiled.append(p.name) or real_validate(p))
+
+    assert page_manifest.preflight_errors(("pages_root",), manifest_path) == []
+    assert compiled == []
+
+    # Touch without changing content: hash matches, no recompile.
+    os.utime(other, ns=(1, 1))
+    assert page_manifest.preflight_errors(("pages_root",), manifest_path) == []
+    assert compiled == []
+
+    good.write_text("def broken(:\n", encoding="utf-8")
+    errors = page_manifest.preflight_errors(("pages_root",), manifest_path)
+    assert [e.path for e in errors] == ["pages_root/good.py"]
+    assert compiled == ["good.py"]
+    page_manifest.reset_cache()
+
+
+def test_registered_pages_fall_back_to_intended(tmp_path) -> None:
+    assert page_manifest.registered_pages(tmp_path / "missing.json") == list(page_manifest.INTENDED)
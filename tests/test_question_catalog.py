@@ -0,0 +1,40 @@
+"""Shared question catalog: one load per source, immutable indexed views."""
+from __future__ import annotations
+
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from gcp_core import catalog as question_catalog
+from gcp_core.questions import SECTION_ORDER
+
+
+def test_sources_load_once_and_index() -> None:
+    question_catalog.reset()
+    core = question_catalog.catalog()
+    assert question_catalog.catalog("gcp_core") is core
+    assert question_catalog.loaded_sources() == ("gcp_core",)
+
+    for section, qids in SECTION_ORDER:
+        assert [q.id for q in core.section(section)] == [q for q in qids if q in core.by_id]
+    assert core.label_for("behavior_risks", "wandering") == "Wandering"
+    assert core.by_id["behavior_risks"].type == "multi"
+
+    for source in ("bundle", "labels", "gcp_v2"):
+        assert question_catalog.catalog(source).questions
+
+
+def test_views_are_immutable_and_dict_compatible() -> None:
+    question = question_catalog.catalog("gcp_v2").section("financial")[0]
+    choice = question["choices"][0]
+    assert question["label"] == question.label and question.get("maps_to")
+    assert choice["id"] == choice.id and tuple(choice) == (choice.id, choice.label)
+    assert question.get("missing", "x") == "x"
+    with pytest.raises(FrozenInstanceError):
+        question.label = "changed"  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        question_catalog.catalog().by_id["x"] = question  # type: ignore[index]
@@ -0,0 +1,40 @@
+"""Monte Carlo runway bands for the Cost Planner timeline."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from cost_planner_v2.runway_sim import RunwayInputs, simulate_runway
+
+_FLAT = dict(cost_change_pct=0, cost_volatility_pct=0, asset_return_pct=0, asset_volatility_pct=0, escalation_prob_pct=0)
+
+
+def test_no_randomness_matches_assets_over_gap() -> None:
+    bands = simulate_runway(RunwayInputs(250_000, 7_000, 3_000, horizon_months=120, **_FLAT))
+    assert set(bands.months) == {63}  # 62.5 months of gap, so month 63 goes negative
+    assert bands.depletion_probability == 1.0
+
+    with_event = simulate_runway(RunwayInputs(250_000, 7_000, 3_000, horizon_months=120, events=((10, 40_000),), **_FLAT))
+    assert with_event.month_at(50) == 53
+
+
+def test_bands_are_ordered_and_censored_at_the_horizon() -> None:
+    bands = simulate_runway(RunwayInputs(2_500_000, 7_000, 3_000, horizon_months=360))
+    known = [m for m in bands.months if m is not None]
+    assert known == sorted(known)
+    assert bands.months[-1] is None and 0 < bands.depletion_probability < 1
+
+    costlier = simulate_runway(RunwayInputs(2_500_000, 7_000, 3_000, horizon_months=360, cost_change_pct=6))
+    assert costlier.depletion_probability > bands.depletion_probability
+
+
+def test_interactive_budget_and_cache() -> None:
+    inputs = RunwayInputs(400_000, 9_000, 2_500, horizon_months=360, paths=10_000, seed=7)
+    start = time.perf_counter()
+    first = simulate_runway(inputs)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.5  # ~45 ms here; generous for slow CI machines
+    assert simulate_runway(RunwayInputs(400_000, 9_000, 2_500, horizon_months=360, paths=10_000, seed=7)) is first
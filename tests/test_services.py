@@ -0,0 +1,32 @@
+"""Process-wide services resolve their factory from the environment once."""
+from __future__ import annotations
+
+from pathlib import Path
+from collections import OrderedDict
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from senior_nav.lib import services
+
+
+def test_resolved_once_and_replaceable(monkeypatch) -> None:
+    monkeypatch.setenv("SENIOR_NAV_TEST_SERVICE", "collections:OrderedDict")
+    slot = services.ProcessWide("SENIOR_NAV_TEST_SERVICE", attr="service", what="test service")
+    assert slot.value is services.UNSET
+    first = slot.get()
+    assert isinstance(first, OrderedDict) and slot.get() is first
+
+    assert slot.set(None) is first and slot.get() is None  # None disables
+    assert slot.reset() is None
+    assert isinstance(slot.get(), OrderedDict) and slot.get() is not first
+
+
+def test_missing_or_broken_spec_falls_back_to_default(monkeypatch) -> None:
+    default = object()
+    slot = services.ProcessWide("SENIOR_NAV_TEST_SERVICE", attr="service", what="test service", default=default)
+    monkeypatch.delenv("SENIOR_NAV_TEST_SERVICE", raising=False)
+    assert slot.get() is default
+    monkeypatch.setenv("SENIOR_NAV_TEST_SERVICE", "no_such_module_here")
+    slot.reset()
+    assert slot.get() is default
@@ -0,0 +1,101 @@
+"""senior_nav.lib.session_codec: schema-aware bucket encoding."""
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import sys
+import zlib
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from senior_nav.lib import session_codec
+from senior_nav.lib.session_codec import Enum, Record, SetOf
+
+
+def _buckets() -> dict:
+    return {
+        "cost_planner": {
+            "mode": "planning",
+            "household": "single",
+            "inputs": {"housing_rent": 1800.0, "care_base": 5200.0},
+            "subtotals": {"housing": 1800.0, "care": 5200.0, "medical": 0.0, "insurance": 0.0,
+                          "debts": 0.0, "other": 0.0, "offsets": 2100.0},
+            "monthly_total": 7000.0,
+            "net_out_of_pocket": 4900.0,
+            "assets": 250000.0,
+            "runway_months": 51.02,
+            "decision_log": [{"ts": "2024-01-01", "msg": "Started"}],
+            "expert_flags": [],
+            "snapshot_for_crm": {},
+            "custom_line_items": [],
+        },
+        "gcp_v3": {
+            "answers": {"q1": "Yes", "q7": ["Bathing", "Dressing"]},
+            "flags": {"fall_risk", "meds_complex"},
+            "scorecard": {"domains": {"adl": 3}, "tier": 2, "tier_label": "Assisted Living",
+                          "flags": {"fall_risk"}, "narrative": [], "highlights": []},
+            "completed": False,
+            "medicaid_status": "unknown",
+        },
+        "audiencing": {
+            "entry": "proxy",
+            "qualifiers": {"is_veteran": True, "has_partner": False, "owns_home": True,
+                           "on_medicaid": False, "urgent": False},
+            "route": {"next": "contextual_welcome", "meta": {"reasons": ["entry_proxy"], "urgent_feature_enabled": True}},
+            "people": {"recipient_name": "Pat", "proxy_name": "Sam"},
+            "sanitized": {"household_size": 1, "va_applicable": True},
+        },
+        "cp": {"ui": {"suggestions_shown": {"a", "b"}}},
+    }
+
+
+@pytest.mark.parametrize("bucket", ["cost_planner", "gcp_v3", "audiencing", "cp"])
+def test_round_trip(bucket: str) -> None:
+    value = _buckets()[bucket]
+    assert session_codec.decode(bucket, session_codec.encode(bucket, value)) == value
+
+
+def test_schema_buckets_are_smaller_than_json() -> None:
+    for bucket in ("cost_planner", "gcp_v3", "audiencing"):
+        value = _buckets()[bucket]
+        plain = json.dumps(value, default=sorted).encode()
+        assert len(session_codec.encode(bucket, value)) < 0.7 * len(plain), bucket
+
+
+def test_unexpected_shapes_survive() -> None:
+    odd = {
+        "mode": "brand-new-mode",  # unknown enum token
+        "household": 2,  # not even a string
+        "subtotals": None,  # record field that is not a dict
+        "legacy_key": {"kept": {1, 2}},  # key the schema does not know
+    }
+    assert session_codec.decode("cost_planner", session_codec.encode("cost_planner", odd)) == odd
+    flags_as_list = {"flags": ["x", "y"]}
+    assert session_codec.decode("gcp_v3", session_codec.encode("gcp_v3", flags_as_list)) == flags_as_list
+
+
+def test_legacy_generic_blobs_still_decode() -> None:
+    raw = b'{"gcp":{"step":2},"seen":{"__set__":["a"]}}'
+    assert session_codec.decode("x", b"J" + raw) == {"gcp": {"step": 2}, "seen": {"a"}}
+    assert session_codec.decode("x", b"Z" + zlib.compress(raw)) == {"gcp": {"step": 2}, "seen": {"a"}}
+
+
+def test_old_versions_migrate(monkeypatch) -> None:
+    v1 = Record([("status", Enum("new", "done")), ("tags", SetOf())])
+    v2 = Record([("state", Enum("new", "done", "archived")), ("tags", SetOf())])
+    monkeypatch.setitem(session_codec.schemas(), "demo", {1: v1})
+    old = session_codec.encode("demo", {"status": "done", "tags": {"b", "a"}})
+
+    monkeypatch.setitem(session_codec.schemas(), "demo", {1: v1, 2: v2})
+    monkeypatch.setitem(
+        session_codec.MIGRATIONS, ("demo", 1), lambda v: {"state": v.pop("status"), **v}
+    )
+    assert old[2] == 1 and session_codec.encode("demo", {})[2] == 2
+    assert session_codec.decode("demo", old) == {"state": "done", "tags": {"a", "b"}}
+
+
+def test_garbage_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        session_codec.decode("gcp", b"?junk")
@@ -0,0 +1,101 @@
+"""senior_nav.lib.session_store: SQLite backend and the write-behind persister."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import threading
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from senior_nav.lib import session_codec, session_store
+
+SID = "a" * 24
+
+
+def _state() -> dict:
+    return {
+        "gcp": {"answers": {"cognition": "severe", "adl_help": "6+"}, "step": 3},
+        "gcp_v3": {"flags": {"fall_risk", "meds_complex"}, "scores": [1, 2, 3]},
+        "cp": {"ui": {"suggestions_shown": {"a", "b"}}, "notes": "x" * 2000},
+        "audiencing": {"entry": "self", "people": [{"name": "Pat"}]},
+        "unrelated": object(),
+    }
+
+
+def test_sqlite_round_trip_and_partial_updates(tmp_path: Path) -> None:
+    backend = session_store.SQLiteBackend(tmp_path / "s.sqlite3")
+    persister = session_store.SessionPersister(backend, debounce=60)
+    state = _state()
+    assert persister.stage(SID, state) == 4
+    assert persister.load(SID)["gcp_v3"]["flags"] == {"fall_risk", "meds_complex"}  # staged, not yet written
+    assert persister.flush()
+    assert persister.stage(SID, state) == 0  # nothing changed
+
+    state["gcp"]["step"] = 4
+    assert persister.stage(SID, state) == 1
+    persister.close()
+    assert persister.stats()["written"] == 5
+
+    # A fresh process (new backend, new persister) sees the latest state.
+    reopened = session_store.SessionPersister(session_store.SQLiteBackend(tmp_path / "s.sqlite3"))
+    loaded = reopened.load(SID)
+    reopened.close()
+    assert loaded["gcp"]["step"] == 4 and set(loaded) == {"gcp", "gcp_v3", "cp", "audiencing"}
+
+
+def test_writes_are_debounced() -> None:
+    saves = []
+
+    class Recording(session_store.MemoryBackend):
+        def save(self, session_id, buckets):
+            saves.append(dict(buckets))
+            super().save(session_id, buckets)
+
+    persister = session_store.SessionPersister(Recording(), debounce=0.2, max_delay=5)
+    state = {"gcp": {"step": 0}}
+    for step in range(20):
+        state["gcp"]["step"] = step
+        persister.stage(SID, state)
+    assert saves == []
+    assert persister.flush()
+    persister.close()
+    assert len(saves) == 1
+    assert session_codec.decode("gcp", saves[0]["gcp"]) == {"step": 19}
+
+
+def test_failed_writes_are_retried_on_next_stage() -> None:
+    fail = threading.Event()
+    fail.set()
+
+    class Flaky(session_store.MemoryBackend):
+        def save(self, session_id, buckets):
+            if fail.is_set():
+                raise OSError("disk full")
+            super().save(session_id, buckets)
+
+    backend = Flaky()
+    persister = session_store.SessionPersister(backend, debounce=60)
+    state = {"gcp": {"step": 1}}
+    persister.stage(SID, state)
+    persister.flush()
+    assert persister.stats()["write_errors"] == 1
+    fail.clear()
+    assert persister.stage(SID, state) == 1
+    persister.close()
+    assert session_codec.decode("gcp", backend.sessions[SID]["gcp"]) == {"step": 1}
+
+
+def test_rehydrate_fills_empty_buckets_once(monkeypatch) -> None:
+    persister = session_store.SessionPersister(session_store.MemoryBackend(), debounce=60)
+    persister.stage(SID, {"gcp": {"step": 7}, "pfma": {"booked": True}})
+    persister.flush()
+    previous = session_store.set_persister(persister)
+    monkeypatch.setattr(session_store, "session_key", lambda create=True: SID)
+    try:
+        state = {"gcp": None, "pfma": {"booked": False, "kept": 1}}
+        assert session_store.rehydrate(state) == 1
+        assert state["gcp"] == {"step": 7} and state["pfma"]["kept"] == 1
+        assert session_store.rehydrate(state) == 0
+    finally:
+        session_store.set_persister(previous)
+        persister.close()
@@ -0,0 +1,96 @@
+"""Uploads are streamed to disk in chunks with a size limit enforced mid-stream."""
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+import hashlib
+import io
+import sys
+import tracemalloc
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from senior_nav import documents
+from senior_nav.lib import doc_store
+
+CHUNK = 64 * 1024
+
+
+class PatternStream(io.RawIOBase):
+    """``size`` bytes of a repeating pattern, produced on demand; counts what was read."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.position = 0
+        self._block = bytes(range(256)) * (CHUNK // 256)
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, n: int = -1) -> bytes:
+        remaining = self.size - self.position
+        n = remaining if n is None or n < 0 else min(n, remaining)
+        n = min(n, len(self._block))
+        self.position += n
+        return self._block[:n]
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        self.position = offset
+        return offset
+
+
+@pytest.fixture()
+def session(tmp_path, monkeypatch):
+    store = doc_store.DocumentStore(tmp_path / "docs", fsync=False)
+    previous = doc_store.set_document_store(store)
+    monkeypatch.setattr(documents, "st", SimpleNamespace(session_state={documents.NAMESPACE_KEY: "u"}))
+    monkeypatch.setattr(documents, "UPLOAD_CHUNK_BYTES", CHUNK)
+    yield store
+    store.close()
+    doc_store.set_document_store(previous)
+
+
+def _expected_digest(size: int) -> str:
+    stream, hasher = PatternStream(size), hashlib.sha256()
+    while chunk := stream.read(CHUNK):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def test_large_upload_stays_under_the_memory_ceiling(session) -> None:
+    size = 48 * 1024 * 1024  # 768 chunks
+    tracemalloc.start()
+    try:
+        entry = documents.register_user_upload("scan.pdf", PatternStream(size), mime_type="application/pdf")
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 8 * CHUNK, f"peak {peak:,} bytes for a {size:,}-byte upload"
+    assert entry.size == size and entry.digest == _expected_digest(size)
+    assert entry.path.stat().st_size == size
+    assert entry.metadata == {"ext": "pdf", "mime": "application/pdf"}
+
+
+def test_size_limit_stops_reading_mid_stream(session) -> None:
+    stream = PatternStream(10 * 1024 * 1024)
+    with pytest.raises(documents.UploadTooLarge):
+        documents.register_user_upload("big.tif", stream, max_bytes=CHUNK * 3)
+    assert stream.position <= CHUNK * 4  # gave up right after crossing the limit
+    assert documents.list_documents() == []
+    assert not list((session.root / "blobs").rglob("*.tmp"))
+
+
+def test_identical_uploads_share_one_blob(session) -> None:
+    first = documents.register_user_upload("a.pdf", PatternStream(CHUNK * 5 + 7))
+    upload = SimpleNamespace(name="b.pdf", type="application/pdf", read=PatternStream(CHUNK * 5 + 7).read)
+    second = documents.ingest_upload(upload)
+    assert first.doc_id != second.doc_id and first.digest == second.digest
+    assert session.stats()["deduplicated"] == 1
+
+
+def test_bytes_are_still_accepted(session) -> None:
+    entry = documents.register_user_upload("notes.txt", b"hello")
+    assert documents.read_document(entry.doc_id) == b"hello"
+    assert entry.metadata["ext"] == "txt"
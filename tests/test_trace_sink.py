@@ -0,0 +1,83 @@
+"""senior_nav.lib.trace: pluggable backend and the batched JSONL sink."""
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import sys
+import threading
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from senior_nav.lib import trace as tracing
+from gcp_pr_tool_bundle.guided_care_plan import engine as bundle_engine
+
+
+def test_recommendation_events_reach_the_sink(tmp_path: Path) -> None:
+    sink = tracing.BatchedSink(tmp_path, batch_size=2, flush_interval=0.05)
+    previous = tracing.set_backend(sink)
+    try:
+        for _ in range(5):
+            bundle_engine.evaluate_guided_care({"cognition": "severe", "adl_help": "6+"}, {})
+        assert sink.flush()
+    finally:
+        tracing.set_backend(previous)
+        sink.close()
+
+    lines = [json.loads(line) for f in tmp_path.glob("trace-*.jsonl") for line in f.read_text().splitlines()]
+    assert len(lines) == 5
+    assert lines[0]["event"] == "gcp.recommended_setting"
+    assert lines[0]["rule_id"].startswith("gcp.rec.memory")
+    assert sink.stats()["written"] == 5 and sink.stats()["dropped"] == 0
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path: Path) -> None:
+    release = threading.Event()
+
+    class SlowSink(tracing.BatchedSink):
+        def _write(self, batch):
+            release.wait(5)
+            super()._write(batch)
+
+    sink = SlowSink(tmp_path, maxsize=3, batch_size=1)
+    event = tracing.TraceEvent("x", ts=0.0)
+    for _ in range(20):
+        sink(event)
+    stats = sink.stats()
+    assert stats["dropped"] >= 20 - 3 - 1
+    assert stats["enqueued"] + stats["dropped"] == 20
+    release.set()
+    assert sink.flush()
+    sink.close()
+    assert sink.stats()["written"] == stats["enqueued"]
+
+
+def test_counters_add_up_under_concurrent_callers(tmp_path: Path) -> None:
+    sink = tracing.BatchedSink(tmp_path, maxsize=500, batch_size=50, flush_interval=0.01)
+    event = tracing.TraceEvent("x", ts=0.0)
+
+    def emit() -> None:
+        for _ in range(5000):
+            sink(event)
+
+    threads = [threading.Thread(target=emit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sink.flush()
+    sink.close()
+    stats = sink.stats()
+    assert stats["enqueued"] + stats["dropped"] == 40_000 and stats["written"] == stats["enqueued"]
+
+
+def test_backend_errors_never_reach_the_caller() -> None:
+    def broken(_event):
+        raise RuntimeError("boom")
+
+    previous = tracing.set_backend(broken)
+    try:
+        before = tracing.stats()["backend_errors"]
+        tracing.trace("gcp.test", "summary", "tests")
+        assert tracing.stats()["backend_errors"] == before + 1
+    finally:
+        tracing.set_backend(previous)
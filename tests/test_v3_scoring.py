@@ -0,0 +1,66 @@
+"""GCP V3 engine built from gcp_v3_logical_pack."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from gcp_core import v3_blurbs, v3_scoring, v3_summary_rules
+
+_HIGH_NEED = {
+    "overall_help": "Regular",
+    "badls": ["Toileting", "Bathing"],
+    "iadls": ["Finances", "Med Management"],
+    "hours_per_day": 2.0,
+    "who_supports": "my daughter",
+    "cognitive": "Severe",
+    "behavior_risks": ["Wandering"],
+    "med_profile": "Complex (≥10)",
+    "mobility": "Uses device",
+    "falls_6mo": 2,
+    "chronic_conditions": ["CHF", "Diabetes"],
+    "mgmt_quality": "Mixed",
+    "mood": "Low",
+    "geo_isolation": "Not isolated",
+}
+
+
+def test_pack_loads_with_unquoted_commas() -> None:
+    tables = v3_scoring.tables()
+    assert ("Q9", "Simple \u2013 a few meds, easy to manage") in tables.rows
+    assert tables.rows[("Q3", "Toileting \u2014 Full assistance")].weight == 3
+    assert {"Q3", "Q4", "Q8", "Q13"} <= set(tables.gates)
+    assert any(rule.kind == "set" and rule.value == 4 for rule in tables.rules)
+    assert v3_scoring.tables() is tables
+
+
+def test_empty_answers_score_nothing() -> None:
+    assert v3_scoring.score_domains({}) == {}
+    assert v3_scoring.determine_tier({}, {}) == 0
+
+
+def test_gating_skips_detailed_adls_when_independent() -> None:
+    answers = {"Q2": "None \u2013 fully independent", "Q3": ["Toileting \u2014 Full assistance"]}
+    assert v3_scoring.score_domains(answers) == {}
+
+
+def test_overrides_and_narrative() -> None:
+    flags = {"behavior_risk", "falls_multiple"}
+    scores = v3_scoring.score_domains(_HIGH_NEED, flags)
+    assert scores["Cognitive Function"] == 3
+    assert v3_scoring.determine_tier(scores, _HIGH_NEED, flags) == 3
+
+    regular = {"Q2": "Regular \u2013 needs daily assistance"}
+    assert v3_scoring.determine_tier(v3_scoring.score_domains(regular), regular) == 1
+    assert v3_scoring.determine_tier({"ADL/IADL Burden": 0}, regular) == 0  # base tier follows the scores
+
+    result = v3_scoring.evaluate(_HIGH_NEED, flags)
+    assert result.winners["ADL/IADL Burden"].item == "Toileting"  # tie-break from the summary rules
+
+    blurbs = v3_blurbs.pick_blurbs_variant3(scores, _HIGH_NEED, flags)
+    assert len(blurbs) == len(scores)
+    assert "Memory Care" in v3_summary_rules.final_summary_sentence(scores, _HIGH_NEED, flags)
+
+    no_support = {**_HIGH_NEED, "who_supports": "no one"}
+    assert v3_scoring.determine_tier(v3_scoring.score_domains(no_support, flags), no_support, flags) == 4
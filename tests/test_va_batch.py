@@ -0,0 +1,78 @@
+"""Batch VA pension estimates match the per-household estimator."""
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import math
+import random
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from ui import va_mapr, va_rules
+
+_CHOICES = {
+    "ben_va_survivor_status": [None, "Surviving spouse/dependent", "Veteran"],
+    "profile_marital_status": [None, "Married/partnered", "Single"],
+    "gcp_reco_setting": [None, "", "Assisted Living", "In-home care", "Memory Care"],
+    "care_setting_expected": [None, "Nursing home", "Stay at home"],
+    "gcp_health_cognition_level": [None, "Severe", "Mild"],
+    "dl_support_amount": [None, "Most days", "A few hours"],
+    "safety_supervision": [None, "Not covered at night", "Fully covered", "Uncertain"],
+}
+_MONEY = ["inc_ss_monthly", "inc_pension_monthly", "inc_other_monthly", "inc_va_monthly", *va_rules.MEDICAL_KEYS]
+
+
+def _households(n: int) -> list:
+    rng = random.Random(15)
+    rows = []
+    for _ in range(n):
+        row = {key: rng.choice(values) for key, values in _CHOICES.items() if rng.random() < 0.8}
+        for key in rng.sample(_MONEY, rng.randint(0, len(_MONEY))):
+            row[key] = rng.choice([None, "", "n/a", 0, round(rng.uniform(0, 3000), 2)])
+        rows.append(row)
+    return rows
+
+
+def _assert_matches(batch: dict, households: list) -> None:
+    for i, ans in enumerate(households):
+        single = va_rules.estimate_pension(ans)
+        for key, value in single.items():
+            if isinstance(value, str):
+                assert batch[key][i] == value, (i, key)
+            else:
+                assert math.isclose(batch[key][i], value, abs_tol=0.011), (i, key)
+
+
+def test_rows_match_single_estimates() -> None:
+    households = _households(500)
+    _assert_matches(va_rules.estimate_pension_batch(households), households)
+
+
+def test_columns_match_rows() -> None:
+    households = _households(100)
+    keys = {key for row in households for key in row}
+    columns = {key: [row.get(key) for row in households] for key in keys}
+    _assert_matches(va_rules.estimate_pension_batch(columns), households)
+
+
+def test_per_household_years(tmp_path: Path) -> None:
+    doc = json.loads((va_mapr.DATA_DIR / "mapr-2024-v1.json").read_text())
+    (tmp_path / "mapr-2024-v1.json").write_text(json.dumps(doc))
+    doc.update(year=2025, mapr={c: {t: v * 2 for t, v in tiers.items()} for c, tiers in doc["mapr"].items()})
+    (tmp_path / "mapr-2025-v1.json").write_text(json.dumps(doc))
+    previous = va_mapr.set_store(va_mapr.MaprStore(tmp_path))
+    try:
+        households = [{"profile_marital_status": "Single"}] * 2
+        out = va_rules.estimate_pension_batch(households, year=[2024, 2025])
+        latest = va_rules.estimate_pension_batch(households)
+    finally:
+        va_mapr.set_store(previous)
+    assert out["mapr"][1] == 2 * out["mapr"][0]
+    assert list(out["mapr_year"]) == [2024, 2025]
+    assert list(latest["mapr_year"]) == [2025, 2025]
+
+
+def test_empty_batch() -> None:
+    out = va_rules.estimate_pension_batch([])
+    assert len(out["pension_annual"]) == 0
@@ -0,0 +1,91 @@
+"""ui.va_mapr: versioned MAPR tables, validation and hot reload."""
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from ui import va_mapr, va_rules
+
+_BASE = json.loads((va_mapr.DATA_DIR / "mapr-2024-v1.json").read_text())
+
+
+def _write(directory: Path, year: int, version: int, scale: float = 1.0, **overrides) -> Path:
+    doc = dict(_BASE, year=year, version=version, **overrides)
+    doc.setdefault("mapr", _BASE["mapr"])
+    doc["mapr"] = {c: {t: v * scale for t, v in tiers.items()} for c, tiers in doc["mapr"].items()}
+    path = directory / f"mapr-{year}-v{version}.json"
+    path.write_text(json.dumps(doc))
+    return path
+
+
+def test_shipped_tables_validate() -> None:
+    snap = va_mapr.MaprStore().reload()
+    assert 2024 in snap.years
+    assert va_rules.MAPR_2024["VET_SINGLE"]["AID_ATTENDANCE"] == 27900.0
+
+
+def test_latest_version_wins_and_old_versions_reproduce(tmp_path: Path) -> None:
+    _write(tmp_path, 2024, 1)
+    _write(tmp_path, 2024, 2, scale=1.1)
+    store = va_mapr.MaprStore(tmp_path)
+    previous = va_mapr.set_store(store)
+    try:
+        ans = {"profile_marital_status": "Single", "inc_ss_monthly": 900}
+        latest = va_rules.estimate_pension(ans, year=2024)
+        pinned = va_rules.estimate_pension(ans, year=latest["mapr_year"], version=1)
+    finally:
+        va_mapr.set_store(previous)
+    assert latest["mapr_version"] == 2 and pinned["mapr_version"] == 1
+    assert latest["mapr"] == round(1.1 * pinned["mapr"], 2)
+    assert store.versions(2024) == (1, 2)
+
+
+@pytest.mark.parametrize(
+    "mapr",
+    [
+        {"VET_SINGLE": _BASE["mapr"]["VET_SINGLE"]},
+        dict(_BASE["mapr"], SURVIVOR={"BASE": 1.0, "HOUSEBOUND": 2.0}),
+        dict(_BASE["mapr"], SURVIVOR={"BASE": -1.0, "HOUSEBOUND": 2.0, "AID_ATTENDANCE": 3.0}),
+        dict(_BASE["mapr"], SURVIVOR={"BASE": 3.0, "HOUSEBOUND": 2.0, "AID_ATTENDANCE": 1.0}),
+    ],
+)
+def test_invalid_tables_are_rejected(mapr: dict) -> None:
+    with pytest.raises(va_mapr.MaprError):
+        va_mapr.parse_table(json.dumps(dict(_BASE, mapr=mapr)).encode())
+
+
+def test_hot_reload_swaps_tables_and_survives_bad_files(tmp_path: Path) -> None:
+    _write(tmp_path, 2024, 1)
+    store = va_mapr.MaprStore(tmp_path, check_interval=0.0)
+    first = store.snapshot()
+    assert store.table().label == "2024 v1"
+
+    _write(tmp_path, 2025, 1)
+    assert store.table().label == "2025 v1"
+    assert store.snapshot().generation == first.generation + 1
+
+    bad = tmp_path / "mapr-2026-v1.json"
+    bad.write_text("{not json")
+    assert store.table().label == "2025 v1"  # old snapshot keeps serving
+    assert store.last_error is not None
+    with pytest.raises(va_mapr.MaprError):
+        store.reload()
+
+    os.remove(bad)
+    assert not store.refresh()  # back to the files already live
+    assert store.last_error is None and store.years() == (2024, 2025)
+
+
+def test_unknown_year_is_an_error(tmp_path: Path) -> None:
+    _write(tmp_path, 2024, 1)
+    store = va_mapr.MaprStore(tmp_path)
+    with pytest.raises(va_mapr.MaprError):
+        store.table(2019)
+    with pytest.raises(va_mapr.MaprError):
+        store.snapshot().rows([2024, 2019])
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+bench_catalog.py - startup cost and memory of the shared GCP question catalog.
+
+For each source it reports the cold load time, the traced memory held by the
+catalog, and the per-call cost of ``questions_for_section`` before and after.
+"Before" is the old engine code: an ``lru_cache``d question map, built once
+(reported separately as the cold build), then a copy of each question and
+its choice list on every call.  "After" is the cached tuple lookup.
+
+Run from the repo root:
+  python3 tools/bench_catalog.py [--calls 10000]
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+import argparse
+import pathlib
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from gcp_core import catalog as question_catalog  # noqa: E402
+from gcp_core.questions import SECTION_ORDER, load_questions  # noqa: E402
+
+
+@lru_cache(maxsize=1)
+def _legacy_question_map() -> dict:
+    # engine._question_map before the catalog: CSV rows grouped into dicts, once per process.
+    grouped: dict = {}
+    for row in load_questions():
+        qid = row["id"]
+        entry = grouped.setdefault(
+            qid,
+            {
+                "id": qid,
+                "label": row.get("label", "").strip(),
+                "type": row.get("type", "single").strip(),
+                "choices": [],
+                "conditional_show": row.get("conditional_show", "").strip(),
+            },
+        )
+        if row.get("choice_id"):
+            entry["choices"].append({"id": row["choice_id"], "label": row.get("choice_label", "").strip()})
+    return grouped
+
+
+def _legacy_questions_for_section(section: str) -> list[dict]:
+    # engine.questions_for_section before the catalog: copy each question and its choices per call.
+    qmap = _legacy_question_map()
+    return [
+        {
+            "id": qmap[qid]["id"],
+            "label": qmap[qid]["label"],
+            "type": qmap[qid]["type"],
+            "choices": list(qmap[qid]["choices"]),
+            "conditional_show": qmap[qid].get("conditional_show", ""),
+        }
+        for qid in dict(SECTION_ORDER).get(section, [])
+        if qid in qmap
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the GCP question catalog")
+    parser.add_argument("--calls", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    print(f"{'source':<10} {'load ms':>9} {'memory KiB':>11} {'questions':>10}")
+    question_catalog.reset()
+    tracemalloc.start()
+    for source in question_catalog.SOURCES:
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        loaded = question_catalog.catalog(source)
+        elapsed = time.perf_counter() - start
+        held = tracemalloc.get_traced_memory()[0] - before
+        print(f"{source:<10} {elapsed * 1e3:>9.2f} {held / 1024:>11.1f} {len(loaded.questions):>10}")
+    tracemalloc.stop()
+
+    sections = [name for name, _qids in SECTION_ORDER]
+    start = time.perf_counter()
+    _legacy_question_map()
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(args.calls):
+        _legacy_questions_for_section(sections[i % len(sections)])
+    legacy = (time.perf_counter() - start) / args.calls
+
+    start = time.perf_counter()
+    for i in range(args.calls):
+        question_catalog.catalog().section(sections[i % len(sections)])
+    cached = (time.perf_counter() - start) / args.calls
+
+    print(f"questions_for_section: old map build {build * 1e3:.2f} ms once")
+    print(
+        f"questions_for_section: old cached map + copy {legacy * 1e6:.2f} us/call, "
+        f"catalog {cached * 1e6:.2f} us/call"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
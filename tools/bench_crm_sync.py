@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+bench_crm_sync.py - throughput of CRM snapshot batching at 10k snapshots.
+
+Builds realistic frozen ``snapshot_for_crm`` payloads (a full cost planner,
+a few dozen GCP answers) and reports:
+
+* offer() rate for new snapshots (encode + hash + buffer),
+* offer() rate for unchanged ones (same object, and equal but rebuilt),
+* end-to-end rate through the NDJSON and columnar file sinks.
+
+Run from the repo root:
+  python3 tools/bench_crm_sync.py [--snapshots 10000] [--batch 1000]
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from senior_nav.lib import crm_sync  # noqa: E402
+from senior_nav.lib.frozen import freeze  # noqa: E402
+
+
+def _snapshot(i: int):
+    return freeze(
+        {
+            "audiencing": {"entry": "self", "qualifiers": {"is_veteran": i % 2 == 0, "owns_home": True}},
+            "gcp": {"answers": {f"q{q}": "Sometimes" for q in range(40)}, "recommended_setting": "assisted_living"},
+            "inputs": {f"field_{f}": (i + f) * 10.5 for f in range(60)},
+            "subtotals": {"housing": 1800.0 + i, "care": 5200.0, "offsets": 2100.0},
+            "monthly_total": 7000.0 + i,
+            "net_out_of_pocket": 4900.0,
+            "assets": 250000.0,
+            "runway_months": 51.02,
+            "decision_log": [{"ts": "2024-01-01", "msg": "Started"}] * 10,
+            "expert_flags": ["review"],
+            "custom_line_items": [],
+            "notes": "",
+        }
+    )
+
+
+def _rate(n: int, seconds: float) -> str:
+    return f"{n / seconds:>10,.0f}/s  ({seconds * 1e6 / n:,.1f} us each)"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snapshots", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    n = args.snapshots
+
+    snapshots = [_snapshot(i) for i in range(n)]
+    rebuilt = [_snapshot(i) for i in range(n)]
+
+    sync = crm_sync.CrmSync(crm_sync.MemorySink(), max_records=n + 1, max_bytes=1 << 40, max_age=3600)
+    start = time.perf_counter()
+    for i, snap in enumerate(snapshots):
+        sync.offer(f"s{i}", snap)
+    print(f"offer, new           {_rate(n, time.perf_counter() - start)}")
+    start = time.perf_counter()
+    for i, snap in enumerate(snapshots):
+        sync.offer(f"s{i}", snap)
+    print(f"offer, same object   {_rate(n, time.perf_counter() - start)}")
+    start = time.perf_counter()
+    for i, snap in enumerate(rebuilt):
+        sync.offer(f"s{i}", snap)
+    print(f"offer, equal content {_rate(n, time.perf_counter() - start)}")
+    sync.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sinks = {
+            "ndjson": crm_sync.NdjsonFileSink(pathlib.Path(tmp) / "ndjson"),
+            "columnar json": crm_sync.ColumnarFileSink(pathlib.Path(tmp) / "json", parquet=False),
+        }
+        if crm_sync.pyarrow is not None:
+            sinks["parquet"] = crm_sync.ColumnarFileSink(pathlib.Path(tmp) / "parquet", parquet=True)
+        for name, sink in sinks.items():
+            sync = crm_sync.CrmSync(sink, max_records=args.batch, max_age=3600)
+            start = time.perf_counter()
+            for i, snap in enumerate(snapshots):
+                sync.offer(f"s{i}", snap)
+            sync.flush(timeout=120)
+            elapsed = time.perf_counter() - start
+            stats = sync.stats()
+            sync.close()
+            size = sum(p.stat().st_size for p in sink.directory.iterdir())
+            print(
+                f"end-to-end {name:<13} {_rate(n, elapsed)}  {stats['batches']} batches, "
+                f"{size / 1e6:,.1f} MB on disk"
+            )
+
+
+if __name__ == "__main__":
+    main()
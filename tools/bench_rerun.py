@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+bench_rerun.py - measure the per-rerun page bootstrap cost in app.py.
+
+"before" replays the old ``_syntax_preflight`` (rglob + read + compile of every
+page) plus ``Path.exists()`` for each INTENDED entry; "after" uses the
+content-hash manifest check and the manifest page registration.
+
+Run from the repo root:
+  python3 tools/bench_rerun.py [--reruns 50]
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+import tokenize
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from senior_nav import page_manifest  # noqa: E402
+
+
+def _legacy_rerun() -> int:
+    errors = 0
+    for p in pathlib.Path("app_pages").rglob("*.py"):
+        try:
+            src = p.read_text(encoding="utf-8")
+            tokenize.generate_tokens(io.StringIO(src).readline)
+            compile(src, str(p), "exec", dont_inherit=True)
+        except Exception:
+            errors += 1
+    pages = [path for (path, _t, _i, _d) in page_manifest.INTENDED if pathlib.Path(path).exists()]
+    return errors + len(pages)
+
+
+def _manifest_rerun(manifest_path: pathlib.Path) -> int:
+    errors = page_manifest.preflight_errors(manifest_path=manifest_path)
+    pages = page_manifest.registered_pages(manifest_path)
+    return len(errors) + len(pages)
+
+
+def _time(fn, reruns: int) -> list[float]:
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{label:<28} median {statistics.median(samples):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark app.py page bootstrap per rerun")
+    parser.add_argument("--reruns", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    print(f"{len(page_manifest.INTENDED)} INTENDED pages, {args.reruns} reruns each")
+    _report("before (compile all)", _time(_legacy_rerun, args.reruns))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest_path = pathlib.Path(tmp) / "page_manifest.json"
+        page_manifest.write_manifest(page_manifest.build_manifest(), manifest_path)
+
+        page_manifest.reset_cache()
+        _report("after (first rerun)", _time(lambda: _manifest_rerun(manifest_path), 1))
+        _report("after (steady state)", _time(lambda: _manifest_rerun(manifest_path), args.reruns))
+    page_manifest.reset_cache()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
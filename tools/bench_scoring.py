@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+bench_scoring.py - compare per-call GCP scoring with the compiled batch engine.
+
+Run from the repo root:
+  python3 tools/bench_scoring.py [--rows 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from gcp_core import compiled_scoring  # noqa: E402
+from gcp_pr_tool_bundle.guided_care_plan import engine as bundle_engine  # noqa: E402
+
+_TOKENS = {
+    "cognition": ["normal", "mild", "moderate", "severe"],
+    "adl_help": ["0-1", "2-3", "4-5", "6+"],
+    "med_mgmt": ["simple", "several", "complex"],
+    "falls": ["none", "one", "recurrent"],
+    "home_safety": ["safe", "some_risks", "unsafe"],
+    "mobility": ["no_issues", "cane_or_walker", "wheelchair"],
+    "supervision": ["always", "sometimes", "rarely", "never"],
+    "social_isolation": ["daily_or_often", "weekly", "rarely", "almost_never"],
+    "geographic_access": ["easy", "moderate", "difficult", "very_difficult"],
+    "caregiver_support": ["24_7", "most_days", "few_days_week", "none"],
+}
+
+
+def _answers(n: int) -> list[dict]:
+    rng = random.Random(42)
+    rows = []
+    for _ in range(n):
+        row = {key: rng.choice(opts) for key, opts in _TOKENS.items()}
+        row["behavior_risks"] = rng.sample(["wandering", "agitation", "exit_seeking"], rng.randint(0, 2))
+        rows.append(row)
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark GCP scoring throughput")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    rows = _answers(args.rows)
+    compiled_scoring.load_model()
+
+    start = time.perf_counter()
+    for row in rows:
+        bundle_engine.evaluate_guided_care(row, {})
+    per_call = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = compiled_scoring.score_batch(rows)
+    batch = time.perf_counter() - start
+
+    print(f"{args.rows} answer sets")
+    print(f"per-call engine   {per_call:8.3f} s  ({args.rows / per_call:,.0f} rows/s)")
+    print(f"compiled batch    {batch:8.3f} s  ({args.rows / batch:,.0f} rows/s)  valid={int(result['valid'].sum())}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+bench_session_codec.py - size and speed of the session bucket codec.
+
+Encodes realistic ``cost_planner``, ``gcp_v3`` and ``audiencing`` buckets with
+the schema codec, generic JSON (sets tagged) and pickle, and reports bytes
+per bucket plus encode/decode throughput.
+
+Run from the repo root:
+  python3 tools/bench_session_codec.py [--rounds 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import pickle
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from senior_nav.lib import session_codec  # noqa: E402
+
+
+
+def _buckets() -> dict:
+    # A long-running session: a full cost planner, a few dozen GCP answers.
+    return {
+        "cost_planner": {
+            "mode": "planning",
+            "household": "single",
+            "inputs": {f"field_{i}": i * 10.5 for i in range(60)},
+            "subtotals": {"housing": 1800.0, "care": 5200.0, "medical": 0.0, "insurance": 0.0,
+                          "debts": 0.0, "other": 0.0, "offsets": 2100.0},
+            "monthly_total": 7000.0,
+            "net_out_of_pocket": 4900.0,
+            "assets": 250000.0,
+            "runway_months": 51.02,
+            "decision_log": [{"ts": "2024-01-01", "msg": "Started"}] * 25,
+            "expert_flags": [],
+            "snapshot_for_crm": {},
+            "custom_line_items": [],
+        },
+        "gcp_v3": {
+            "answers": {f"q{i}": "Sometimes" for i in range(40)},
+            "flags": {"fall_risk", "meds_complex"},
+            "scorecard": {"domains": {"adl": 3}, "tier": 2, "tier_label": "Assisted Living",
+                          "flags": {"fall_risk"}, "narrative": [], "highlights": []},
+            "completed": False,
+            "medicaid_status": "unknown",
+        },
+        "audiencing": {
+            "entry": "proxy",
+            "qualifiers": {"is_veteran": True, "has_partner": False, "owns_home": True,
+                           "on_medicaid": False, "urgent": False},
+            "route": {"next": "contextual_welcome", "meta": {"reasons": ["entry_proxy"], "urgent_feature_enabled": True}},
+            "people": {"recipient_name": "Pat", "proxy_name": "Sam"},
+            "sanitized": {"household_size": 1, "va_applicable": True},
+        },
+    }
+
+
+def _json_encode(value):
+    return json.dumps(value, separators=(",", ":"), default=session_codec._generic_default).encode()
+
+
+def _json_decode(blob):
+    return json.loads(blob, object_hook=session_codec._generic_hook)
+
+
+def _rate(fn, arg, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(arg)
+    return rounds / (time.perf_counter() - start)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the session bucket codec")
+    parser.add_argument("--rounds", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    buckets = _buckets()
+
+    print(f"{'bucket':<13} {'codec':<7} {'bytes':>6} {'enc/s':>9} {'dec/s':>9}")
+    for bucket in ("cost_planner", "gcp_v3", "audiencing"):
+        value = buckets[bucket]
+        codecs = {
+            "schema": (lambda v, b=bucket: session_codec.encode(b, v), lambda blob, b=bucket: session_codec.decode(b, blob)),
+            "json": (_json_encode, _json_decode),
+            "pickle": (lambda v: pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+        }
+        for name, (enc, dec) in codecs.items():
+            blob = enc(value)
+            assert dec(blob) == value
+            print(
+                f"{bucket:<13} {name:<7} {len(blob):>6} {_rate(enc, value, args.rounds):>9,.0f}"
+                f" {_rate(dec, blob, args.rounds):>9,.0f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
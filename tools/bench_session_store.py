@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+bench_session_store.py - save/load latency of persisted sessions by size.
+
+Builds synthetic sessions (the real bucket layout with answer lists scaled up)
+and reports, per size: encoded bytes, the cost ``persist()`` adds to a rerun
+(encode + digest + stage), the backend write, and a cold restore
+(SQLite read + decode).
+
+Run from the repo root:
+  python3 tools/bench_session_store.py [--sessions 200] [--db /tmp/bench.sqlite3]
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from senior_nav.lib import session_store  # noqa: E402
+
+
+def _session(rng: random.Random, scale: int) -> dict:
+    answers = {f"q{i}": rng.choice(["yes", "no", "sometimes", rng.randint(0, 5000)]) for i in range(20 * scale)}
+    return {
+        "gcp": {"answers": answers, "step": rng.randint(0, 9)},
+        "gcp_v3": {"flags": {f"flag_{i}" for i in range(3 * scale)}, "scores": [rng.random() for _ in range(10)]},
+        "cost_planner": {"inputs": {f"field_{i}": round(rng.uniform(0, 9000), 2) for i in range(15 * scale)}},
+        "cp": {"ui": {"suggestions_shown": {f"s{i}" for i in range(scale)}}, "decision_log": ["note " * 8] * scale},
+        "pfma": {"booked": False, "notes": "x" * 40 * scale},
+        "audiencing": {"entry": "self", "people": [{"name": f"P{i}", "age": 80 + i} for i in range(2)]},
+        "documents_registry": {f"doc{i}": {"title": f"Doc {i}", "path": f"/tmp/doc{i}.pdf"} for i in range(scale)},
+    }
+
+
+def _ms(samples: list) -> str:
+    return f"{statistics.median(samples) * 1e3:8.3f}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark session persistence")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--db", type=pathlib.Path, default=None)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(17)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = args.db or pathlib.Path(tmp) / "bench.sqlite3"
+        backend = session_store.SQLiteBackend(db)
+        persister = session_store.SessionPersister(backend, debounce=3600, max_delay=3600)
+        print(f"{'scale':>5} {'bytes':>8} {'stage ms':>9} {'restage ms':>10} {'write ms':>9} {'restore ms':>10}")
+        for scale in (1, 10, 50, 200):
+            sessions = [_session(rng, scale) for _ in range(args.sessions)]
+            sids = [f"bench{scale:04d}{i:012d}" for i in range(len(sessions))]
+            stage, restage, write, restore, size = [], [], [], [], []
+            for sid, state in zip(sids, sessions):
+                start = time.perf_counter()
+                persister.stage(sid, state)
+                stage.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                persister.stage(sid, state)  # unchanged rerun
+                restage.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                persister.flush()
+                write.append(time.perf_counter() - start)
+            for sid in sids:
+                start = time.perf_counter()
+                loaded = persister.load(sid)
+                restore.append(time.perf_counter() - start)
+                size.append(sum(len(blob) for blob in backend.load(sid).values()))
+            assert loaded["gcp"]["answers"] == sessions[-1]["gcp"]["answers"]
+            print(
+                f"{scale:>5} {int(statistics.median(size)):>8} {_ms(stage)} {_ms(restage):>10}"
+                f" {_ms(write):>9} {_ms(restore):>10}"
+            )
+        persister.close()
+        backend.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+build_image_assets.py - pre-render resized WebP variants of hero/icon images.
+
+Writes static/images/_derived/<stem>.<sha12>.<width>w.webp for every source in
+senior_nav.image_assets.SOURCE_GLOBS so pages never resize or re-encode the
+multi-megabyte originals at runtime. Requires Pillow.
+
+Run from the repo root:
+  python3 tools/build_image_assets.py [--formats webp,jpeg]
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from senior_nav import image_assets  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-render responsive image variants")
+    parser.add_argument("--formats", default=image_assets.DEFAULT_FORMAT)
+    args = parser.parse_args(argv)
+
+    if image_assets.Image is None:
+        print("❌ Pillow is not installed; cannot build image variants.")
+        return 1
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    widths = sorted({w for ws in image_assets.PROFILES.values() for w in ws})
+    sources = sorted({p for pattern in image_assets.SOURCE_GLOBS for p in pathlib.Path().glob(pattern)})
+    before = after = 0
+    for src in sources:
+        written = image_assets.build_variants(src, widths, formats)
+        embedded = [p for p in written if f".{max(widths)}w." in p.name]
+        before += src.stat().st_size
+        after += min(p.stat().st_size for p in embedded) if embedded else src.stat().st_size
+        print(f"🖼  {src}: {len(written)} variant(s)")
+    print(f"✅ {len(sources)} source image(s); largest-variant payload {before / 1e6:.1f} MB -> {after / 1e6:.2f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
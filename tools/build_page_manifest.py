@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+build_page_manifest.py - validate app_pages/ once and write .page_manifest.json.
+
+app.py reads the manifest on startup and only re-compiles pages whose content
+hash changed since the build, instead of compiling every page on every rerun.
+
+Run from the repo root (exit code 1 when any page fails to compile):
+  python3 tools/build_page_manifest.py
+  python3 tools/build_page_manifest.py --check   # validate only, do not write
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from senior_nav import page_manifest  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default=str(page_manifest.MANIFEST_PATH))
+    parser.add_argument("--check", action="store_true", help="validate only; do not write the manifest")
+    args = parser.parse_args(argv)
+
+    manifest = page_manifest.build_manifest()
+    files = manifest["files"]
+    failed = [row for row in files.values() if not row["ok"]]
+    for row in failed:
+        print(f"❌ {row['path']}: line {row['line']}, col {row['col']}: {row['msg']}")
+
+    missing = [row["path"] for row in manifest["pages"] if row["path"] not in files]
+    for path in missing:
+        print(f"⚠️  registered page not found: {path}")
+
+    if not args.check:
+        page_manifest.write_manifest(manifest, pathlib.Path(args.output))
+        print(f"📝 wrote {args.output} ({len(files)} files, {len(manifest['pages'])} pages)")
+
+    if failed:
+        return 1
+    print("✅ No syntax errors in app_pages/")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,17 +1,16 @@
 from __future__ import annotations
 
-import base64
 import html
-import mimetypes
 import re
 from contextlib import contextmanager
-from pathlib import Path
 from typing import Callable, Iterable, Literal, Optional, Sequence
 from uuid import uuid4
 
 import streamlit as st
 from streamlit.delta_generator import DeltaGenerator
 
+from senior_nav import image_assets
+
 StatusValue = Literal["not_started", "in_progress", "complete"]
 ModuleStatus = Literal["locked", "in_progress", "complete"]
 
@@ -37,18 +36,13 @@ def _icon_markup(icon: str | None) -> str:
     if not icon:
         return ""
 
-    path = Path(icon)
-    if path.exists() and path.is_file():
-        try:
-            mime = mimetypes.guess_type(path.name)[0] or "image/png"
-            data = base64.b64encode(path.read_bytes()).decode("ascii")
-            return (
-                "<span class='sn-icon sn-icon--image' aria-hidden='true'>"
-                f"<img src='data:{mime};base64,{data}' alt='' role='presentation' />"
-                "</span>"
-            )
-        except Exception:
-            pass
+    try:
+        image = image_assets.get_image(icon, profile="icon")
+    except Exception:
+        image = None
+    if image is not None:
+        tag = image.img_tag(extra='role="presentation"')
+        return f"<span class='sn-icon sn-icon--image' aria-hidden='true'>{tag}</span>"
 
     return f"<span class='sn-icon sn-icon--emoji' aria-hidden='true'>{html.escape(icon)}</span>"
 
@@ -150,6 +150,7 @@ def render_in_sidebar() -> Tuple[bool, float]:
                     {
                         "MAPR category": calc.get("category"),
                         "MAPR tier": calc.get("tier"),
+                        "MAPR table": f"{calc['mapr_year']} v{calc['mapr_version']}",
                         "MAPR (annual)": calc["mapr"],
                         "Annual income (pre-VA)": calc["income_annual"],
                         "Medical allowed (annual)": calc["med_allowed"],
@@ -171,6 +172,10 @@ def render_in_sidebar() -> Tuple[bool, float]:
         with col1:
             if st.button("Save", type="primary", use_container_width=True):
                 answers["inc_va_monthly"] = round(float(estimate), 2)
+                if auto:
+                    # Keep the table the estimate used so it can be reproduced later.
+                    answers["ben_va_mapr_year"] = calc["mapr_year"]
+                    answers["ben_va_mapr_version"] = calc["mapr_version"]
                 close_drawer()
                 st.rerun()
                 return True, float(answers["inc_va_monthly"])
@@ -0,0 +1,268 @@
+"""Versioned MAPR tables for the VA pension estimate.
+
+Each JSON file in ``ui/assets/va_mapr`` holds one table::
+
+    {"year": 2024, "version": 1, "effective": "2023-12-01",
+     "mapr": {"VET_SINGLE": {"BASE": ..., "HOUSEBOUND": ..., "AID_ATTENDANCE": ...}, ...}}
+
+Files are named ``mapr-<year>-v<version>.json``.  A published version is
+never edited: corrections ship as a new version, so an estimate that
+recorded ``(mapr_year, mapr_version)`` can be recomputed against the exact
+table it used.
+
+:class:`MaprStore` parses and validates every file into an immutable
+:class:`Snapshot` the first time a table is needed and shares it
+process-wide.  Lookups are dict hits on the current snapshot.  Every
+``check_interval`` seconds a lookup also compares the directory listing
+(names, sizes, mtimes) with the one the snapshot was built from and
+reloads on change, so new tables go live without restarting Streamlit.
+A reload builds a complete new snapshot and swaps it in with one
+assignment; if any file fails validation the old snapshot stays in
+service and the error is kept in :attr:`MaprStore.last_error`.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+import hashlib
+import json
+import math
+import threading
+import time
+
+import numpy as np
+
+CATEGORIES: Tuple[str, ...] = ("VET_SINGLE", "VET_MARRIED", "SURVIVOR")
+TIERS: Tuple[str, ...] = ("BASE", "HOUSEBOUND", "AID_ATTENDANCE")
+DATA_DIR = Path(__file__).resolve().parent / "assets" / "va_mapr"
+
+
+class MaprError(ValueError):
+    """A MAPR data file is missing, malformed or fails validation."""
+
+
+@dataclass(frozen=True)
+class MaprTable:
+    year: int
+    version: int
+    effective: str
+    source: str  # file name
+    digest: str  # sha256 of the file, first 12 hex digits
+    values: Mapping[str, Mapping[str, float]]  # category -> tier -> USD/year, read-only
+
+    def get(self, category: str, default=None):
+        """``table.get(category, {}).get(tier)``, as with the old plain dicts."""
+        return self.values.get(category, default)
+
+    def mapr(self, category: str, tier: str) -> float:
+        return self.values[category][tier]
+
+    @property
+    def label(self) -> str:
+        return f"{self.year} v{self.version}"
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    generation: int
+    signature: Tuple[Tuple[str, int, int], ...]
+    tables: Mapping[Tuple[int, int], MaprTable]  # (year, version) -> table
+    latest: Mapping[int, MaprTable]  # year -> highest version
+    # Latest tables compiled for batch estimates: matrix[row_of[year], category, tier].
+    row_of: Mapping[int, int]
+    matrix: np.ndarray
+
+    @property
+    def years(self) -> Tuple[int, ...]:
+        return tuple(self.row_of)
+
+    def rows(self, years: Iterable[int]) -> np.ndarray:
+        """Matrix row for each year; raises :class:`MaprError` for years without a table."""
+        row_of = self.row_of
+        try:
+            return np.fromiter((row_of[int(y)] for y in years), dtype=np.intp)
+        except KeyError as exc:
+            raise MaprError(f"no MAPR table for {exc.args[0]} (have {', '.join(map(str, self.years))})") from None
+
+
+def parse_table(raw: bytes, source: str = "<memory>") -> MaprTable:
+    """Parse and validate one table file."""
+    try:
+        doc = json.loads(raw)
+        year, version = int(doc["year"]), int(doc["version"])
+        mapr = doc["mapr"]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise MaprError(f"{source}: {exc}") from exc
+    if not isinstance(mapr, dict) or set(mapr) != set(CATEGORIES):
+        raise MaprError(f"{source}: categories must be exactly {', '.join(CATEGORIES)}")
+    values: Dict[str, Mapping[str, float]] = {}
+    for category in CATEGORIES:
+        tiers = mapr[category]
+        if not isinstance(tiers, dict) or set(tiers) != set(TIERS):
+            raise MaprError(f"{source}: {category} tiers must be exactly {', '.join(TIERS)}")
+        row = []
+        for tier in TIERS:
+            try:
+                amount = float(tiers[tier])
+            except (TypeError, ValueError):
+                amount = math.nan
+            if not math.isfinite(amount) or amount <= 0:
+                raise MaprError(f"{source}: {category}/{tier} must be a positive amount")
+            row.append(amount)
+        if row != sorted(row):
+            raise MaprError(f"{source}: {category} amounts must not decrease from BASE to AID_ATTENDANCE")
+        values[category] = MappingProxyType(dict(zip(TIERS, row)))
+    return MaprTable(
+        year=year,
+        version=version,
+        effective=str(doc.get("effective", "")),
+        source=source,
+        digest=hashlib.sha256(raw).hexdigest()[:12],
+        values=MappingProxyType(values),
+    )
+
+
+class MaprStore:
+    def __init__(self, directory: Path | str = DATA_DIR, check_interval: Optional[float] = 5.0) -> None:
+        self.directory = Path(directory)
+        self.check_interval = check_interval
+        self.last_error: Optional[MaprError] = None
+        self._snapshot: Optional[Snapshot] = None
+        self._checked = 0.0
+        self._failed: Optional[Tuple[Tuple[str, int, int], ...]] = None
+        self._lock = threading.Lock()
+
+    # -- loading ------------------------------------------------------------
+    def _signature(self) -> Tuple[Tuple[str, int, int], ...]:
+        entries = []
+        for path in sorted(self.directory.glob("*.json")):
+            st = path.stat()
+            entries.append((path.name, st.st_size, st.st_mtime_ns))
+        return tuple(entries)
+
+    def _build(self, generation: int) -> Snapshot:
+        signature = self._signature()
+        tables: Dict[Tuple[int, int], MaprTable] = {}
+        for name, _size, _mtime in signature:
+            table = parse_table((self.directory / name).read_bytes(), name)
+            key = (table.year, table.version)
+            if key in tables:
+                raise MaprError(f"{name}: {table.label} is also defined in {tables[key].source}")
+            tables[key] = table
+        if not tables:
+            raise MaprError(f"no MAPR tables in {self.directory}")
+        latest: Dict[int, MaprTable] = {}
+        for (year, _version), table in sorted(tables.items()):
+            latest[year] = table
+        years = sorted(latest)
+        matrix = np.array(
+            [[[latest[y].values[c][t] for t in TIERS] for c in CATEGORIES] for y in years],
+            dtype=np.float64,
+        )
+        matrix.flags.writeable = False
+        return Snapshot(
+            generation=generation,
+            signature=signature,
+            tables=MappingProxyType(tables),
+            latest=MappingProxyType(latest),
+            row_of=MappingProxyType({y: row for row, y in enumerate(years)}),
+            matrix=matrix,
+        )
+
+    def _swap_locked(self) -> Snapshot:
+        current = self._snapshot
+        try:
+            fresh = self._build(current.generation + 1 if current else 1)
+        except MaprError as exc:
+            self.last_error = exc
+            raise
+        except OSError as exc:
+            self.last_error = MaprError(str(exc))
+            raise self.last_error from exc
+        self._snapshot = fresh
+        self.last_error = None
+        self._checked = time.monotonic()
+        return fresh
+
+    def reload(self) -> Snapshot:
+        """Re-read every file and swap in the result.
+
+        Raises :class:`MaprError` and keeps serving the old tables if any
+        file is invalid.
+        """
+        with self._lock:
+            return self._swap_locked()
+
+    def refresh(self) -> bool:
+        """Reload if the files changed; ``True`` when a new snapshot went live."""
+        current = self._snapshot
+        self._checked = time.monotonic()
+        if current is None:
+            self.snapshot()
+            return True
+        signature = None
+        try:
+            signature = self._signature()
+            if signature == current.signature:
+                self.last_error = None  # back to the files the snapshot was built from
+                return False
+            if signature == self._failed:
+                return False  # already rejected; wait for the next edit
+            self.reload()
+        except (MaprError, OSError):
+            self._failed = signature
+            return False
+        return True
+
+    def snapshot(self) -> Snapshot:
+        current = self._snapshot
+        if current is None:
+            with self._lock:
+                return self._snapshot or self._swap_locked()
+        if self.check_interval is not None and time.monotonic() - self._checked >= self.check_interval:
+            self.refresh()
+            return self._snapshot
+        return current
+
+    # -- lookups -------------------------------------------------------------
+    def table(self, year: Optional[int] = None, version: Optional[int] = None) -> MaprTable:
+        """Table for ``year`` (latest year when ``None``), latest version unless ``version`` is pinned."""
+        snap = self.snapshot()
+        if year is None:
+            year = snap.years[-1]
+        table = snap.latest.get(year) if version is None else snap.tables.get((year, version))
+        if table is None:
+            wanted = f"{year}" if version is None else f"{year} v{version}"
+            raise MaprError(f"no MAPR table for {wanted} (have {', '.join(map(str, snap.years))})")
+        return table
+
+    def years(self) -> Tuple[int, ...]:
+        return self.snapshot().years
+
+    def versions(self, year: int) -> Tuple[int, ...]:
+        return tuple(sorted(v for (y, v) in self.snapshot().tables if y == year))
+
+    def stats(self) -> Dict[str, object]:
+        snap = self._snapshot
+        return {
+            "generation": snap.generation if snap else 0,
+            "tables": [t.label for t in snap.tables.values()] if snap else [],
+            "last_error": str(self.last_error) if self.last_error else None,
+        }
+
+
+_STORE = MaprStore()
+
+
+def store() -> MaprStore:
+    return _STORE
+
+
+def set_store(new: MaprStore) -> MaprStore:
+    """Install ``new`` as the process-wide store; returns the previous one (tests)."""
+    global _STORE
+    previous, _STORE = _STORE, new
+    return previous
+
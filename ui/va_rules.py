@@ -1,34 +1,40 @@
-from __future__ import annotations
-
-from typing import Any, Dict
-
 """
-VA MAPR/A&A rules (configurable). Update annually.
-Numbers below are *placeholders* for development and MUST be validated
-against the latest VA MAPR tables before production.
+VA MAPR/A&A rules.
+MAPR tables (USD/year) are versioned data files served by ``ui.va_mapr``;
+add a new file each year (or a new version for corrections) rather than
+editing this module.  The figures shipped so far are *placeholders* for
+development and MUST be validated against the latest VA MAPR tables before
+production.
 We separate: Veteran (single), Veteran+spouse, Surviving spouse (DIC/pension).
 Tiers: BASE (pension), HOUSEBOUND, AID_ATTENDANCE.
-
-MAPR dict units: USD/year.
 """
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ui.va_mapr import CATEGORIES, TIERS, MaprTable, store
+
+
+def __getattr__(name: str):
+    # Former hard-coded table, now read from mapr-2024-v1.json on first use.
+    if name == "MAPR_2024":
+        return {category: dict(tiers) for category, tiers in store().table(2024, 1).values.items()}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-MAPR_2024: Dict[str, Dict[str, float]] = {
-    "VET_SINGLE": {
-        "BASE": 16800.0,
-        "HOUSEBOUND": 20500.0,
-        "AID_ATTENDANCE": 27900.0,
-    },
-    "VET_MARRIED": {
-        "BASE": 22100.0,
-        "HOUSEBOUND": 25800.0,
-        "AID_ATTENDANCE": 33300.0,
-    },
-    "SURVIVOR": {
-        "BASE": 11400.0,
-        "HOUSEBOUND": 14000.0,
-        "AID_ATTENDANCE": 18600.0,
-    },
-}
+
+MEDICAL_KEYS: Tuple[str, ...] = (
+    "exp_med_premiums_monthly",
+    "exp_rx_out_of_pocket_monthly",
+    "exp_home_care_monthly",
+    "exp_al_monthly",
+    "exp_memory_care_monthly",
+    "exp_nursing_home_monthly",
+)
+_AA_SETTINGS = ("assisted", "memory", "nursing", "board & care")
+_SEVERE_COGNITION = ("serious confusion", "severe", "advanced dementia")
+_CAREGIVER_MOST = ("support most/all of the time", "most days")
 
 
 def pick_category(ans: Dict[str, Any]) -> str:
@@ -41,16 +47,9 @@ def pick_category(ans: Dict[str, Any]) -> str:
 
 def pick_tier(ans: Dict[str, Any]) -> str:
     setting = str(ans.get("gcp_reco_setting") or ans.get("care_setting_expected", "")).lower()
-    cognition_severe = str(ans.get("gcp_health_cognition_level", "")).lower() in (
-        "serious confusion",
-        "severe",
-        "advanced dementia",
-    )
-    caregiver_most = str(ans.get("dl_support_amount", "")).lower() in (
-        "support most/all of the time",
-        "most days",
-    )
-    if any(flag in setting for flag in ("assisted", "memory", "nursing", "board & care")) or (
+    cognition_severe = str(ans.get("gcp_health_cognition_level", "")).lower() in _SEVERE_COGNITION
+    caregiver_most = str(ans.get("dl_support_amount", "")).lower() in _CAREGIVER_MOST
+    if any(flag in setting for flag in _AA_SETTINGS) or (
         cognition_severe and caregiver_most
     ):
         return "AID_ATTENDANCE"
@@ -88,22 +87,25 @@ def gather_income(ans: Dict[str, Any]) -> float:
 
 
 def gather_medical_deductions(ans: Dict[str, Any]) -> float:
-    keys = (
-        "exp_med_premiums_monthly",
-        "exp_rx_out_of_pocket_monthly",
-        "exp_home_care_monthly",
-        "exp_al_monthly",
-        "exp_memory_care_monthly",
-        "exp_nursing_home_monthly",
-    )
-    monthly_total = sum(_num(ans.get(key, 0.0), 0.0) for key in keys)
+    monthly_total = sum(_num(ans.get(key, 0.0), 0.0) for key in MEDICAL_KEYS)
     return monthly_total * 12.0
 
 
 def estimate_pension(
     ans: Dict[str, Any],
-    mapr_table: Dict[str, Dict[str, float]] = MAPR_2024,
+    mapr_table: Optional[Mapping[str, Mapping[str, float]]] = None,
+    *,
+    year: Optional[int] = None,
+    version: Optional[int] = None,
 ) -> Dict[str, float]:
+    """Estimate the VA pension for one household.
+
+    Uses ``mapr_table`` when given, otherwise the stored table for ``year``
+    (latest year by default), pinned to ``version`` if given.  The result
+    records ``mapr_year``/``mapr_version`` so it can be reproduced later.
+    """
+    if mapr_table is None:
+        mapr_table = store().table(year, version)
     category = pick_category(ans)
     tier = pick_tier(ans)
     mapr = float(mapr_table.get(category, {}).get(tier, 0.0))
@@ -129,4 +131,132 @@ def estimate_pension(
         "pension_monthly": pension_monthly,
         "category": category,
         "tier": tier,
+        "mapr_year": mapr_table.year if isinstance(mapr_table, MaprTable) else None,
+        "mapr_version": mapr_table.version if isinstance(mapr_table, MaprTable) else None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Batch estimates
+# ---------------------------------------------------------------------------
+Households = Union[Sequence[Mapping[str, Any]], Mapping[str, Sequence[Any]]]
+
+
+def _columns(households: Households) -> Tuple[int, Dict[str, Sequence[Any]]]:
+    """Normalize row dicts or a column mapping to ``(n, {column: values})``."""
+    if isinstance(households, Mapping):
+        columns = {key: values for key, values in households.items()}
+        n = len(next(iter(columns.values()))) if columns else 0
+        return n, columns
+    rows = list(households)
+    keys: Dict[str, None] = {}
+    for row in rows:
+        keys.update(dict.fromkeys(row))
+    return len(rows), {key: [row.get(key) for row in rows] for key in keys}
+
+
+def _parsed(value: Any, memo: Dict[Any, float]) -> float:
+    try:
+        return memo[value]
+    except KeyError:
+        memo[value] = parsed = _num(value, 0.0)
+        return parsed
+    except TypeError:  # unhashable
+        return _num(value, 0.0)
+
+
+def _numbers(values: Sequence[Any] | None, n: int) -> np.ndarray:
+    """Column as floats with :func:`_num` semantics (``None``/junk -> 0)."""
+    if values is None:
+        return np.zeros(n)
+    try:
+        return np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0)
+    except (TypeError, ValueError):
+        memo: Dict[Any, float] = {}
+        return np.fromiter(
+            (v if isinstance(v, (int, float)) else _parsed(v, memo) for v in values),
+            dtype=np.float64,
+            count=n,
+        )
+
+
+def _flags(values: Sequence[Any] | None, n: int, test, lower: bool = True) -> np.ndarray:
+    """``test(str(value).lower())`` per household, evaluated once per distinct answer."""
+    if values is None:
+        return np.full(n, bool(test("")))
+    text = (lambda v: str(v).lower()) if lower else str
+    seen: Dict[Any, bool] = {}
+    out = np.empty(n, dtype=bool)
+    for i, value in enumerate(values):
+        key = "" if value is None else value
+        hit = seen.get(key)
+        if hit is None:
+            hit = seen[key] = bool(test(text(key)))
+        out[i] = hit
+    return out
+
+
+def estimate_pension_batch(
+    households: Households,
+    year: Union[None, int, Sequence[int]] = None,
+) -> Dict[str, np.ndarray]:
+    """:func:`estimate_pension` for many households in one call.
+
+    ``households`` is a list of answer dicts or a mapping of column name to
+    values.  ``year`` selects the MAPR table (latest version of that year),
+    either for the whole batch or per household; ``None`` means the latest
+    year.  Returns the same keys as :func:`estimate_pension`, each an
+    array with one entry per household.
+    """
+    n, cols = _columns(households)
+    get = cols.get
+
+    survivor = _flags(get("ben_va_survivor_status"), n, "Surviving spouse/dependent".__eq__, lower=False)
+    married = _flags(get("profile_marital_status"), n, "Married/partnered".__eq__, lower=False)
+    category = np.where(survivor, 2, np.where(married, 1, 0)).astype(np.intp)
+
+    reco = get("gcp_reco_setting")
+    expected = get("care_setting_expected")
+    if reco is None:
+        setting = expected
+    elif expected is None:
+        setting = reco
+    else:
+        setting = [r or e for r, e in zip(reco, expected)]
+    aid = _flags(setting, n, lambda v: any(flag in v for flag in _AA_SETTINGS)) | (
+        _flags(get("gcp_health_cognition_level"), n, _SEVERE_COGNITION.__contains__)
+        & _flags(get("dl_support_amount"), n, _CAREGIVER_MOST.__contains__)
+    )
+    housebound = _flags(get("safety_supervision"), n, lambda v: "not covered" in v or "uncertain" in v)
+    tier = np.where(aid, 2, np.where(housebound, 1, 0)).astype(np.intp)
+
+    snap = store().snapshot()
+    years = np.broadcast_to(np.asarray(snap.years[-1] if year is None else year), (n,))
+    unique, inverse = np.unique(years, return_inverse=True)
+    rows = snap.rows(unique)[inverse]
+    mapr = snap.matrix[rows, category, tier]
+    versions = np.array([snap.latest[int(y)].version for y in unique], dtype=np.int64)[inverse]
+
+    income_keys = [k for k in cols if k.startswith("inc_") and k != "inc_va_monthly"]
+    income_annual = sum((_numbers(cols[k], n) for k in income_keys), np.zeros(n)) * 12.0
+    medical_annual = sum((_numbers(get(k), n) for k in MEDICAL_KEYS), np.zeros(n)) * 12.0
+
+    med_threshold = 0.05 * mapr
+    med_deductible = np.maximum(0.0, medical_annual - med_threshold)
+    countable = np.maximum(0.0, income_annual - med_deductible)
+    pension_annual = np.maximum(0.0, mapr - countable)
+
+    return {
+        "mapr": np.round(mapr, 2),
+        "income_annual": np.round(income_annual, 2),
+        "med_allowed": np.round(medical_annual, 2),
+        "med_threshold": np.round(med_threshold, 2),
+        "med_deductible": np.round(med_deductible, 2),
+        "countable": np.round(countable, 2),
+        "pension_annual": np.round(pension_annual, 2),
+        "pension_monthly": np.round(pension_annual / 12.0, 2),
+        "category": np.asarray(CATEGORIES)[category],
+        "tier": np.asarray(TIERS)[tier],
+        "mapr_year": years.astype(np.int64),
+        "mapr_version": versions,
     }